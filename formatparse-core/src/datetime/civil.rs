@@ -0,0 +1,272 @@
+//! Parsed datetimes as plain values, and their epoch and ISO 8601 renderings
+//!
+//! The datetime converters read a value into a `CivilDateTime` (calendar fields plus an
+//! optional UTC offset). With `DateTimeOutput::DateTime` it becomes a Python datetime;
+//! the other outputs are computed here, with the offset applied so they are in UTC.
+//! Values without an offset are taken to be in UTC.
+
+/// What a datetime field is converted to (the `datetime_output=` option)
+#[derive(Clone, Copy, Debug, Default, PartialEq, Eq, Hash)]
+pub enum DateTimeOutput {
+    /// A `datetime.datetime` (or `date`/`time` for strftime formats that only have those parts)
+    #[default]
+    DateTime,
+    /// Seconds since the Unix epoch, as an int
+    EpochSeconds,
+    /// Nanoseconds since the Unix epoch, as an int
+    EpochNanos,
+    /// An ISO 8601 string in UTC
+    Iso,
+}
+
+impl DateTimeOutput {
+    pub fn from_name(name: &str) -> Option<Self> {
+        match name {
+            "datetime" => Some(DateTimeOutput::DateTime),
+            "epoch_s" => Some(DateTimeOutput::EpochSeconds),
+            "epoch_ns" => Some(DateTimeOutput::EpochNanos),
+            "iso" => Some(DateTimeOutput::Iso),
+            _ => None,
+        }
+    }
+
+    pub fn name(&self) -> &'static str {
+        match self {
+            DateTimeOutput::DateTime => "datetime",
+            DateTimeOutput::EpochSeconds => "epoch_s",
+            DateTimeOutput::EpochNanos => "epoch_ns",
+            DateTimeOutput::Iso => "iso",
+        }
+    }
+}
+
+/// Epoch seconds of 0001-01-01T00:00:00 and 10000-01-01T00:00:00 (the range datetime covers)
+const MIN_SECONDS: i64 = -62_135_596_800;
+const MAX_SECONDS: i64 = 253_402_300_800;
+
+/// Calendar date and time read from a value
+#[derive(Clone, Debug, Default, PartialEq)]
+pub struct CivilDateTime {
+    pub year: i32,
+    pub month: u8,
+    pub day: u8,
+    pub hour: u8,
+    pub minute: u8,
+    pub second: u8,
+    pub microsecond: u32,
+    pub utc_offset: Option<i32>, // Seconds east of UTC (None for a naive value)
+    pub tz_name: &'static str, // Name of the tzinfo a datetime gets ("UTC" for a Z suffix)
+}
+
+impl CivilDateTime {
+    /// Midnight on the given date, without an offset
+    pub fn date(year: i32, month: u8, day: u8) -> Self {
+        Self { year, month, day, ..Default::default() }
+    }
+
+    /// Check the fields the way `datetime.datetime()` does
+    pub fn validate(&self) -> Result<(), String> {
+        if !(1..=9999).contains(&self.year) {
+            return Err(format!("year {} is out of range", self.year));
+        }
+        if !(1..=12).contains(&self.month) {
+            return Err("month must be in 1..12".to_string());
+        }
+        if self.day < 1 || self.day as u32 > days_in_month(self.year, self.month) {
+            return Err("day is out of range for month".to_string());
+        }
+        if self.hour > 23 {
+            return Err("hour must be in 0..23".to_string());
+        }
+        if self.minute > 59 {
+            return Err("minute must be in 0..59".to_string());
+        }
+        if self.second > 59 {
+            return Err("second must be in 0..59".to_string());
+        }
+        if self.microsecond > 999_999 {
+            return Err("microsecond must be in 0..999999".to_string());
+        }
+        Ok(())
+    }
+
+    /// Seconds since the Unix epoch, without checking the range
+    fn seconds(&self) -> i64 {
+        days_from_civil(self.year, self.month, self.day) * 86_400
+            + self.hour as i64 * 3600
+            + self.minute as i64 * 60
+            + self.second as i64
+            - self.utc_offset.unwrap_or(0) as i64
+    }
+
+    /// Seconds since the Unix epoch of the value in UTC, or None if that is outside years
+    /// 1..=9999 (where `astimezone` raises OverflowError)
+    fn utc_seconds(&self) -> Option<i64> {
+        let seconds = self.seconds();
+        (MIN_SECONDS..MAX_SECONDS).contains(&seconds).then_some(seconds)
+    }
+
+    /// Whole seconds since the Unix epoch (microseconds are dropped)
+    /// None if the value moved to UTC is outside years 1..=9999
+    pub fn epoch_seconds(&self) -> Option<i64> {
+        self.utc_seconds()
+    }
+
+    /// Nanoseconds since the Unix epoch (None if out of range, as for epoch_seconds)
+    pub fn epoch_nanos(&self) -> Option<i128> {
+        Some(self.utc_seconds()? as i128 * 1_000_000_000 + self.microsecond as i128 * 1000)
+    }
+
+    /// ISO 8601 in UTC, as `datetime.isoformat()` writes it: `2011-11-21T00:21:36+00:00`,
+    /// with `.ffffff` when there are microseconds and no offset for a naive value
+    /// None if the value moved to UTC is outside years 1..=9999
+    pub fn to_iso(&self) -> Option<String> {
+        let seconds = self.utc_seconds()?;
+        let (year, month, day) = civil_from_days(seconds.div_euclid(86_400));
+        let time_of_day = seconds.rem_euclid(86_400);
+        let mut iso = format!(
+            "{:04}-{:02}-{:02}T{:02}:{:02}:{:02}",
+            year,
+            month,
+            day,
+            time_of_day / 3600,
+            time_of_day % 3600 / 60,
+            time_of_day % 60
+        );
+        if self.microsecond != 0 {
+            iso.push_str(&format!(".{:06}", self.microsecond));
+        }
+        if self.utc_offset.is_some() {
+            iso.push_str("+00:00");
+        }
+        Some(iso)
+    }
+
+    /// ISO 8601 date (`2011-11-21`), for values that only have a date
+    pub fn to_iso_date(&self) -> String {
+        format!("{:04}-{:02}-{:02}", self.year, self.month, self.day)
+    }
+}
+
+fn is_leap_year(year: i32) -> bool {
+    (year % 4 == 0 && year % 100 != 0) || year % 400 == 0
+}
+
+pub(crate) fn days_in_month(year: i32, month: u8) -> u32 {
+    match month {
+        2 if is_leap_year(year) => 29,
+        2 => 28,
+        4 | 6 | 9 | 11 => 30,
+        _ => 31,
+    }
+}
+
+/// Days from 1970-01-01 to a proleptic Gregorian date
+fn days_from_civil(year: i32, month: u8, day: u8) -> i64 {
+    // Count from March 1st so the leap day is the last day of the (shifted) year
+    let year = year as i64 - (month <= 2) as i64;
+    let era = year.div_euclid(400);
+    let year_of_era = year - era * 400;
+    let month = month as i64;
+    let day_of_year = (153 * (month + if month > 2 { -3 } else { 9 }) + 2) / 5 + day as i64 - 1;
+    let day_of_era = year_of_era * 365 + year_of_era / 4 - year_of_era / 100 + day_of_year;
+    era * 146_097 + day_of_era - 719_468
+}
+
+/// Date of a day counted from 1970-01-01 (inverse of days_from_civil)
+fn civil_from_days(days: i64) -> (i64, u8, u8) {
+    let days = days + 719_468;
+    let era = days.div_euclid(146_097);
+    let day_of_era = days - era * 146_097;
+    let year_of_era = (day_of_era - day_of_era / 1460 + day_of_era / 36_524 - day_of_era / 146_096) / 365;
+    let day_of_year = day_of_era - (365 * year_of_era + year_of_era / 4 - year_of_era / 100);
+    let shifted_month = (5 * day_of_year + 2) / 153;
+    let day = (day_of_year - (153 * shifted_month + 2) / 5 + 1) as u8;
+    let month = if shifted_month < 10 { shifted_month + 3 } else { shifted_month - 9 } as u8;
+    let year = year_of_era + era * 400 + (month <= 2) as i64;
+    (year, month, day)
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn datetime(year: i32, month: u8, day: u8, hour: u8, minute: u8, second: u8) -> CivilDateTime {
+        CivilDateTime { year, month, day, hour, minute, second, ..Default::default() }
+    }
+
+    #[test]
+    fn test_output_names() {
+        for name in ["datetime", "epoch_s", "epoch_ns", "iso"] {
+            assert_eq!(DateTimeOutput::from_name(name).unwrap().name(), name);
+        }
+        assert!(DateTimeOutput::from_name("epoch").is_none());
+        assert_eq!(DateTimeOutput::default(), DateTimeOutput::DateTime);
+    }
+
+    #[test]
+    fn test_epoch_seconds() {
+        assert_eq!(CivilDateTime::date(1970, 1, 1).epoch_seconds(), Some(0));
+        assert_eq!(datetime(2011, 11, 21, 10, 21, 36).epoch_seconds(), Some(1_321_870_896));
+        assert_eq!(CivilDateTime::date(2000, 3, 1).epoch_seconds(), Some(951_868_800));
+        assert_eq!(datetime(1969, 12, 31, 23, 59, 59).epoch_seconds(), Some(-1));
+        assert_eq!(CivilDateTime::date(1, 1, 1).epoch_seconds(), Some(MIN_SECONDS));
+        assert_eq!(datetime(9999, 12, 31, 23, 59, 59).epoch_seconds(), Some(MAX_SECONDS - 1));
+    }
+
+    #[test]
+    fn test_epoch_with_offset() {
+        let value = CivilDateTime {
+            utc_offset: Some(10 * 3600),
+            microsecond: 250_000,
+            ..datetime(2011, 11, 21, 10, 21, 36)
+        };
+        assert_eq!(value.epoch_seconds(), Some(1_321_870_896 - 36_000));
+        assert_eq!(value.epoch_nanos(), Some((1_321_870_896 - 36_000) * 1_000_000_000 + 250_000_000));
+    }
+
+    #[test]
+    fn test_iso() {
+        assert_eq!(datetime(2011, 11, 21, 10, 21, 36).to_iso().unwrap(), "2011-11-21T10:21:36");
+        let aware = CivilDateTime { utc_offset: Some(11 * 3600), ..datetime(2011, 1, 1, 5, 0, 0) };
+        assert_eq!(aware.to_iso().unwrap(), "2010-12-31T18:00:00+00:00");
+        let fraction = CivilDateTime { microsecond: 5, ..datetime(2024, 2, 29, 0, 0, 0) };
+        assert_eq!(fraction.to_iso().unwrap(), "2024-02-29T00:00:00.000005");
+        assert_eq!(CivilDateTime::date(812, 3, 4).to_iso_date(), "0812-03-04");
+    }
+
+    #[test]
+    fn test_out_of_range_in_utc() {
+        // Valid local times that fall outside years 1..=9999 once moved to UTC
+        let late = CivilDateTime { utc_offset: Some(-5 * 3600), ..datetime(9999, 12, 31, 23, 0, 0) };
+        assert!(late.validate().is_ok());
+        assert_eq!(late.to_iso(), None);
+        assert_eq!(late.epoch_seconds(), None);
+        assert_eq!(late.epoch_nanos(), None);
+        let early = CivilDateTime { utc_offset: Some(5 * 3600), ..datetime(1, 1, 1, 0, 0, 0) };
+        assert_eq!(early.to_iso(), None);
+        assert_eq!(early.epoch_seconds(), None);
+        // The last and first instants in range
+        let last = CivilDateTime { utc_offset: Some(-5 * 3600), ..datetime(9999, 12, 31, 18, 59, 59) };
+        assert_eq!(last.to_iso().unwrap(), "9999-12-31T23:59:59+00:00");
+        let first = CivilDateTime { utc_offset: Some(5 * 3600), ..datetime(1, 1, 1, 5, 0, 0) };
+        assert_eq!(first.to_iso().unwrap(), "0001-01-01T00:00:00+00:00");
+    }
+
+    #[test]
+    fn test_civil_round_trip() {
+        for days in [-800_000, -1, 0, 59, 11_016, 2_932_896] {
+            let (year, month, day) = civil_from_days(days);
+            assert_eq!(days_from_civil(year as i32, month, day), days);
+        }
+    }
+
+    #[test]
+    fn test_validate() {
+        assert!(datetime(2024, 2, 29, 23, 59, 59).validate().is_ok());
+        assert!(datetime(2023, 2, 29, 0, 0, 0).validate().is_err());
+        assert!(datetime(2023, 13, 1, 0, 0, 0).validate().is_err());
+        assert!(datetime(2023, 1, 1, 24, 0, 0).validate().is_err());
+        assert!(datetime(0, 1, 1, 0, 0, 0).validate().is_err());
+    }
+}
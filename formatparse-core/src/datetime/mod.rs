@@ -0,0 +1,10 @@
+//! Pure Rust datetime utilities
+//!
+//! - `civil`: parsed datetimes as plain values, rendered as epoch times or ISO strings
+//! - `strftime`: strftime-style formats compiled into directive programs
+
+pub mod civil;
+pub mod strftime;
+
+pub use civil::{CivilDateTime, DateTimeOutput};
+pub use strftime::{StrftimeKind, StrftimeProgram, StrftimeValue};
@@ -0,0 +1,467 @@
+//! strftime-style formats compiled into a directive program
+//!
+//! A format like `%Y-%m-%d %H:%M:%S.%f %z` is compiled once into a list of steps (literal
+//! text and directives). Parsing a value walks the steps, reading each component straight
+//! from the text, so no regex is built and `datetime.strptime` isn't called per value.
+//!
+//! Matching follows `strptime`: numeric directives take one or two digits (or up to six
+//! for `%f`), names are matched case-insensitively, whitespace in the format matches any
+//! run of whitespace, and when a longer number leaves the rest unmatched a shorter one is
+//! tried (so `%H%M` reads `930` as 9:30). Locale-dependent directives (`%c`, `%x`, `%X`,
+//! `%Z`, week numbers, ...) aren't compiled; formats using them are left to `strptime`.
+
+/// English month names, January first
+const MONTH_NAMES: [&str; 12] = [
+    "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+];
+
+/// English weekday names, Monday first
+const WEEKDAY_NAMES: [&str; 7] = [
+    "monday", "tuesday", "wednesday", "thursday", "friday", "saturday", "sunday",
+];
+
+/// A `%` directive the program can read
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum Directive {
+    Year,          // %Y
+    ShortYear,     // %y
+    Month,         // %m
+    Day,           // %d
+    Hour,          // %H
+    Hour12,        // %I
+    Minute,        // %M
+    Second,        // %S
+    Microsecond,   // %f
+    AmPm,          // %p
+    UtcOffset,     // %z
+    DayOfYear,     // %j
+    MonthAbbr,     // %b, %h
+    MonthName,     // %B
+    WeekdayAbbr,   // %a
+    WeekdayName,   // %A
+    WeekdayNumber, // %w
+}
+
+impl Directive {
+    fn from_code(code: char) -> Option<Self> {
+        Some(match code {
+            'Y' => Directive::Year,
+            'y' => Directive::ShortYear,
+            'm' => Directive::Month,
+            'd' => Directive::Day,
+            'H' => Directive::Hour,
+            'I' => Directive::Hour12,
+            'M' => Directive::Minute,
+            'S' => Directive::Second,
+            'f' => Directive::Microsecond,
+            'p' => Directive::AmPm,
+            'z' => Directive::UtcOffset,
+            'j' => Directive::DayOfYear,
+            'b' | 'h' => Directive::MonthAbbr,
+            'B' => Directive::MonthName,
+            'a' => Directive::WeekdayAbbr,
+            'A' => Directive::WeekdayName,
+            'w' => Directive::WeekdayNumber,
+            _ => return None,
+        })
+    }
+
+    /// (minimum digits, maximum digits, minimum value, maximum value) of a numeric directive
+    fn digits(self) -> Option<(usize, usize, u32, u32)> {
+        Some(match self {
+            Directive::Year => (4, 4, 0, 9999),
+            Directive::ShortYear => (2, 2, 0, 99),
+            Directive::Month => (1, 2, 1, 12),
+            Directive::Day => (1, 2, 1, 31),
+            Directive::Hour => (1, 2, 0, 23),
+            Directive::Hour12 => (1, 2, 1, 12),
+            Directive::Minute => (1, 2, 0, 59),
+            Directive::Second => (1, 2, 0, 61),
+            Directive::Microsecond => (1, 6, 0, 999_999),
+            Directive::DayOfYear => (1, 3, 1, 366),
+            Directive::WeekdayNumber => (1, 1, 0, 6),
+            _ => return None,
+        })
+    }
+}
+
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum Step {
+    Literal(char),
+    Whitespace,  // One or more whitespace characters
+    Directive(Directive),
+}
+
+/// What a format produces: the value's type follows from the directives it contains
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum StrftimeKind {
+    /// Date directives only (`%Y`, `%y`, `%m`, `%d`, `%j`): a date
+    Date,
+    /// Time directives only (`%H`, `%M`, `%S`, `%f`): a time
+    Time,
+    /// Both, or neither: a datetime
+    DateTime,
+}
+
+/// Components read from a value; unset ones take strptime's defaults
+#[derive(Clone, Debug, Default, PartialEq)]
+pub struct StrftimeValue {
+    pub year: Option<i32>,
+    pub month: Option<u8>,
+    pub day: Option<u8>,
+    pub hour: u8,
+    pub minute: u8,
+    pub second: u8,
+    pub microsecond: u32,
+    pub day_of_year: Option<u16>,
+    pub utc_offset: Option<i32>,  // Seconds east of UTC (%z)
+    hour12: Option<u8>,
+    pm: Option<bool>,
+}
+
+impl StrftimeValue {
+    /// Year, month and day, with `default_year` when the value has no year
+    ///
+    /// A day of the year (`%j`) takes precedence over the month and day, as in strptime,
+    /// and days past the end of the year run into the next one.
+    pub fn date(&self, default_year: i32) -> (i32, u8, u8) {
+        let mut year = self.year.unwrap_or(default_year);
+        let day_of_year = match self.day_of_year {
+            Some(day_of_year) => day_of_year,
+            None => return (year, self.month.unwrap_or(1), self.day.unwrap_or(1)),
+        };
+        let mut remaining = day_of_year as u32;
+        loop {
+            let year_length = if is_leap_year(year) { 366 } else { 365 };
+            if remaining <= year_length {
+                break;
+            }
+            remaining -= year_length;
+            year += 1;
+        }
+        let mut month = 1u8;
+        loop {
+            let length = days_in_month(year, month);
+            if remaining <= length {
+                return (year, month, remaining as u8);
+            }
+            remaining -= length;
+            month += 1;
+        }
+    }
+
+    /// Apply %I/%p to the hour (strptime reads %I without %p as AM)
+    fn resolve_hour(&mut self) {
+        if let Some(hour12) = self.hour12 {
+            self.hour = match (hour12, self.pm.unwrap_or(false)) {
+                (12, false) => 0,
+                (12, true) => 12,
+                (hour, false) => hour,
+                (hour, true) => hour + 12,
+            };
+        }
+    }
+}
+
+fn is_leap_year(year: i32) -> bool {
+    (year % 4 == 0 && year % 100 != 0) || year % 400 == 0
+}
+
+fn days_in_month(year: i32, month: u8) -> u32 {
+    match month {
+        2 if is_leap_year(year) => 29,
+        2 => 28,
+        4 | 6 | 9 | 11 => 30,
+        _ => 31,
+    }
+}
+
+/// A strftime format compiled for parsing
+#[derive(Clone, Debug)]
+pub struct StrftimeProgram {
+    steps: Vec<Step>,
+    kind: StrftimeKind,
+}
+
+impl StrftimeProgram {
+    /// Compile a format; None if it uses a directive the program can't read
+    pub fn compile(format_str: &str) -> Option<Self> {
+        let mut steps = Vec::new();
+        let mut chars = format_str.chars();
+        while let Some(ch) = chars.next() {
+            if ch == '%' {
+                let code = chars.next()?;
+                if code == '%' {
+                    steps.push(Step::Literal('%'));
+                } else {
+                    steps.push(Step::Directive(Directive::from_code(code)?));
+                }
+            } else if ch.is_whitespace() {
+                if steps.last() != Some(&Step::Whitespace) {
+                    steps.push(Step::Whitespace);
+                }
+            } else {
+                steps.push(Step::Literal(ch));
+            }
+        }
+
+        let has = |wanted: &[Directive]| steps.iter().any(|step| {
+            matches!(step, Step::Directive(directive) if wanted.contains(directive))
+        });
+        let has_time = has(&[Directive::Hour, Directive::Minute, Directive::Second, Directive::Microsecond]);
+        let has_date = has(&[Directive::Year, Directive::ShortYear, Directive::Month, Directive::Day, Directive::DayOfYear]);
+        let kind = match (has_date, has_time) {
+            (true, false) => StrftimeKind::Date,
+            (false, true) => StrftimeKind::Time,
+            _ => StrftimeKind::DateTime,
+        };
+        Some(Self { steps, kind })
+    }
+
+    pub fn kind(&self) -> StrftimeKind {
+        self.kind
+    }
+
+    /// Read the components of a value; None if it doesn't match the format
+    pub fn parse(&self, value: &str) -> Option<StrftimeValue> {
+        let mut parsed = StrftimeValue::default();
+        if !self.parse_from(0, value, &mut parsed) {
+            return None;
+        }
+        parsed.resolve_hour();
+        Some(parsed)
+    }
+
+    /// Match steps[index..] against all of `rest`, trying shorter readings of a directive
+    /// when a longer one leaves the remaining steps unmatched
+    fn parse_from(&self, index: usize, rest: &str, parsed: &mut StrftimeValue) -> bool {
+        let step = match self.steps.get(index) {
+            Some(step) => *step,
+            None => return rest.is_empty(),
+        };
+        match step {
+            Step::Literal(expected) => {
+                let mut chars = rest.chars();
+                match chars.next() {
+                    Some(ch) if ch == expected || ch.to_lowercase().eq(expected.to_lowercase()) => {
+                        self.parse_from(index + 1, chars.as_str(), parsed)
+                    }
+                    _ => false,
+                }
+            }
+            Step::Whitespace => {
+                let trimmed = rest.trim_start();
+                trimmed.len() < rest.len() && self.parse_from(index + 1, trimmed, parsed)
+            }
+            Step::Directive(directive) => {
+                if let Some((min, max, low, high)) = directive.digits() {
+                    let available = rest.bytes().take(max).take_while(u8::is_ascii_digit).count();
+                    for len in (min..=available).rev() {
+                        let number: u32 = rest[..len].parse().unwrap_or(u32::MAX);
+                        if number < low || number > high {
+                            continue;
+                        }
+                        set_number(parsed, directive, number, len);
+                        if self.parse_from(index + 1, &rest[len..], parsed) {
+                            return true;
+                        }
+                    }
+                    return false;
+                }
+                match directive {
+                    Directive::MonthAbbr | Directive::MonthName => {
+                        let abbreviated = directive == Directive::MonthAbbr;
+                        (0..12).any(|i| {
+                            let name = if abbreviated { &MONTH_NAMES[i][..3] } else { MONTH_NAMES[i] };
+                            match strip_prefix_ignore_case(rest, name) {
+                                Some(after) => {
+                                    parsed.month = Some(i as u8 + 1);
+                                    self.parse_from(index + 1, after, parsed)
+                                }
+                                None => false,
+                            }
+                        })
+                    }
+                    Directive::WeekdayAbbr | Directive::WeekdayName => {
+                        let abbreviated = directive == Directive::WeekdayAbbr;
+                        WEEKDAY_NAMES.iter().any(|name| {
+                            let name = if abbreviated { &name[..3] } else { name };
+                            strip_prefix_ignore_case(rest, name)
+                                .map_or(false, |after| self.parse_from(index + 1, after, parsed))
+                        })
+                    }
+                    Directive::AmPm => {
+                        [("am", false), ("pm", true)].iter().any(|&(marker, pm)| {
+                            match strip_prefix_ignore_case(rest, marker) {
+                                Some(after) => {
+                                    parsed.pm = Some(pm);
+                                    self.parse_from(index + 1, after, parsed)
+                                }
+                                None => false,
+                            }
+                        })
+                    }
+                    Directive::UtcOffset => utc_offsets(rest).into_iter().any(|(len, offset)| {
+                        parsed.utc_offset = Some(offset);
+                        self.parse_from(index + 1, &rest[len..], parsed)
+                    }),
+                    _ => false,
+                }
+            }
+        }
+    }
+}
+
+fn set_number(parsed: &mut StrftimeValue, directive: Directive, number: u32, len: usize) {
+    match directive {
+        Directive::Year => parsed.year = Some(number as i32),
+        // Two-digit years: 69-99 are 1969-1999, 00-68 are 2000-2068 (as in strptime)
+        Directive::ShortYear => parsed.year = Some(if number <= 68 { 2000 } else { 1900 } + number as i32),
+        Directive::Month => parsed.month = Some(number as u8),
+        Directive::Day => parsed.day = Some(number as u8),
+        Directive::Hour => parsed.hour = number as u8,
+        Directive::Hour12 => parsed.hour12 = Some(number as u8),
+        Directive::Minute => parsed.minute = number as u8,
+        Directive::Second => parsed.second = number as u8,
+        // Digits are fractions of a second: "5" is 500000 microseconds
+        Directive::Microsecond => parsed.microsecond = number * 10u32.pow((6 - len) as u32),
+        Directive::DayOfYear => parsed.day_of_year = Some(number as u16),
+        _ => {}
+    }
+}
+
+fn strip_prefix_ignore_case<'a>(text: &'a str, prefix: &str) -> Option<&'a str> {
+    let head = text.get(..prefix.len())?;
+    if head.eq_ignore_ascii_case(prefix) {
+        Some(&text[prefix.len()..])
+    } else {
+        None
+    }
+}
+
+/// Readings of a UTC offset at the start of `text`, longest first, as
+/// (length, seconds east of UTC): `Z`, `+HHMM`, `+HH:MM`, `+HHMMSS` or `+HH:MM:SS`
+fn utc_offsets(text: &str) -> Vec<(usize, i32)> {
+    let bytes = text.as_bytes();
+    if matches!(bytes.first(), Some(b'Z') | Some(b'z')) {
+        return vec![(1, 0)];
+    }
+    let sign = match bytes.first() {
+        Some(b'+') => 1,
+        Some(b'-') => -1,
+        _ => return Vec::new(),
+    };
+    let two_digits = |at: usize| -> Option<i32> {
+        let digits = bytes.get(at..at + 2)?;
+        if digits.iter().all(u8::is_ascii_digit) {
+            Some(((digits[0] - b'0') * 10 + (digits[1] - b'0')) as i32)
+        } else {
+            None
+        }
+    };
+    let hours = match two_digits(1) {
+        Some(hours) => hours,
+        None => return Vec::new(),
+    };
+    let colon = bytes.get(3) == Some(&b':');
+    let minutes_at = if colon { 4 } else { 3 };
+    let minutes = match two_digits(minutes_at) {
+        Some(minutes) if minutes < 60 => minutes,
+        _ => return Vec::new(),
+    };
+    let mut readings = Vec::new();
+    // Seconds use the same separator as the minutes
+    let seconds_at = if colon { minutes_at + 3 } else { minutes_at + 2 };
+    let separator_ok = !colon || bytes.get(minutes_at + 2) == Some(&b':');
+    if separator_ok {
+        if let Some(seconds) = two_digits(seconds_at).filter(|&seconds| seconds < 60) {
+            readings.push((seconds_at + 2, sign * (hours * 3600 + minutes * 60 + seconds)));
+        }
+    }
+    readings.push((minutes_at + 2, sign * (hours * 3600 + minutes * 60)));
+    readings
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn parse(format_str: &str, value: &str) -> Option<StrftimeValue> {
+        StrftimeProgram::compile(format_str).unwrap().parse(value)
+    }
+
+    #[test]
+    fn test_compile_kind() {
+        assert_eq!(StrftimeProgram::compile("%Y-%m-%d").unwrap().kind(), StrftimeKind::Date);
+        assert_eq!(StrftimeProgram::compile("%H:%M:%S").unwrap().kind(), StrftimeKind::Time);
+        assert_eq!(StrftimeProgram::compile("%Y-%m-%d %H:%M").unwrap().kind(), StrftimeKind::DateTime);
+        assert_eq!(StrftimeProgram::compile("%b").unwrap().kind(), StrftimeKind::DateTime);
+    }
+
+    #[test]
+    fn test_compile_unsupported() {
+        assert!(StrftimeProgram::compile("%c").is_none());
+        assert!(StrftimeProgram::compile("%Y %Z").is_none());
+        assert!(StrftimeProgram::compile("%Y%").is_none());
+        assert!(StrftimeProgram::compile("100%%").is_some());
+    }
+
+    #[test]
+    fn test_parse_datetime() {
+        let value = parse("%Y-%m-%d %H:%M:%S.%f", "2023-11-21 13:23:27.1234").unwrap();
+        assert_eq!(value.date(1900), (2023, 11, 21));
+        assert_eq!((value.hour, value.minute, value.second), (13, 23, 27));
+        assert_eq!(value.microsecond, 123400);
+        assert!(parse("%Y-%m-%d", "2023-13-01").is_none());
+        assert!(parse("%Y-%m-%d", "2023-11-21x").is_none());
+    }
+
+    #[test]
+    fn test_parse_single_digits_and_backtracking() {
+        assert_eq!(parse("%Y/%m/%d", "2023/1/1").unwrap().date(1900), (2023, 1, 1));
+        assert_eq!(parse("%Y%m%d", "19970716").unwrap().date(1900), (1997, 7, 16));
+        let value = parse("%H%M", "930").unwrap();
+        assert_eq!((value.hour, value.minute), (9, 30));
+    }
+
+    #[test]
+    fn test_parse_names() {
+        assert_eq!(parse("%Y-%b-%d", "1997-feb-16").unwrap().date(1900), (1997, 2, 16));
+        assert_eq!(parse("%d %B %Y", "16 February 1997").unwrap().date(1900), (1997, 2, 16));
+        assert!(parse("%d %B %Y", "16 Feb 1997").is_none());
+        assert_eq!(parse("%a, %d %b %Y", "Sun, 16 Feb 1997").unwrap().date(1900), (1997, 2, 16));
+    }
+
+    #[test]
+    fn test_parse_twelve_hour_clock() {
+        assert_eq!(parse("%I:%M %p", "12:15 AM").unwrap().hour, 0);
+        assert_eq!(parse("%I:%M %p", "12:15 pm").unwrap().hour, 12);
+        assert_eq!(parse("%I:%M %p", "1:15 PM").unwrap().hour, 13);
+        assert_eq!(parse("%I:%M", "12:15").unwrap().hour, 0);
+    }
+
+    #[test]
+    fn test_parse_utc_offset() {
+        let offset = |value| parse("%H:%M %z", value).and_then(|v| v.utc_offset);
+        assert_eq!(offset("10:00 +0530"), Some(19800));
+        assert_eq!(offset("10:00 -05:30"), Some(-19800));
+        assert_eq!(offset("10:00 +00:00:30"), Some(30));
+        assert_eq!(offset("10:00 Z"), Some(0));
+        assert_eq!(offset("10:00 +5"), None);
+    }
+
+    #[test]
+    fn test_parse_day_of_year() {
+        assert_eq!(parse("%Y/%j", "2024/60").unwrap().date(1900), (2024, 2, 29));
+        assert_eq!(parse("%Y/%j", "2023/60").unwrap().date(1900), (2023, 3, 1));
+        assert_eq!(parse("%Y/%j", "2023/366").unwrap().date(1900), (2024, 1, 1));
+        assert_eq!(parse("%j", "32").unwrap().date(2020), (2020, 2, 1));
+    }
+
+    #[test]
+    fn test_parse_whitespace() {
+        assert!(parse("%d %m", "1   2").is_some());
+        assert!(parse("%d %m", "12").is_none());
+    }
+}
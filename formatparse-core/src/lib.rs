@@ -6,14 +6,18 @@
 pub mod error;
 pub mod types;
 pub mod parser;
+pub mod datetime;
 
 pub use parser::{
     validate_pattern_length, validate_input_length, validate_field_name,
     MAX_PATTERN_LENGTH, MAX_INPUT_LENGTH, MAX_FIELDS, MAX_FIELD_NAME_LENGTH,
 };
-// pub mod datetime;  // TODO: Extract pure Rust datetime utilities
 
 pub use types::{FieldType, FieldSpec};
 pub use types::regex::strftime_to_regex;
+pub use datetime::{CivilDateTime, DateTimeOutput, StrftimeKind, StrftimeProgram, StrftimeValue};
 pub use parser::regex::*;
+pub use parser::chunks::split_at_newlines;
+pub use parser::prefilter::{Prefilter, required_literals};
+pub use parser::split::{SplitMatch, SplitMatcher};
 
@@ -0,0 +1,91 @@
+/// Split text into at most `max_chunks` byte ranges that end on newline boundaries
+///
+/// Each range ends just after a `\n` (or at the end of the text), so ranges are
+/// always valid UTF-8 slice boundaries and no line is split across two ranges.
+/// Ranges are contiguous, in order, and cover the whole text (str or bytes).
+pub fn split_at_newlines<T: AsRef<[u8]> + ?Sized>(text: &T, max_chunks: usize) -> Vec<(usize, usize)> {
+    let bytes = text.as_ref();
+    let len = bytes.len();
+    if len == 0 {
+        return Vec::new();
+    }
+    let max_chunks = max_chunks.max(1);
+    let target = (len + max_chunks - 1) / max_chunks;
+    
+    let mut ranges = Vec::with_capacity(max_chunks);
+    let mut start = 0;
+    while start < len {
+        let tentative = start + target;
+        let end = if tentative >= len {
+            len
+        } else {
+            // Extend to the end of the current line (include the newline itself)
+            match bytes[tentative..].iter().position(|&b| b == b'\n') {
+                Some(offset) => tentative + offset + 1,
+                None => len,
+            }
+        };
+        ranges.push((start, end));
+        start = end;
+    }
+    ranges
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_split_empty() {
+        assert!(split_at_newlines("", 4).is_empty());
+    }
+
+    #[test]
+    fn test_split_single_chunk() {
+        assert_eq!(split_at_newlines("a\nb\nc", 1), vec![(0, 5)]);
+    }
+
+    #[test]
+    fn test_split_ends_on_newlines() {
+        let text = "line1\nline2\nline3\nline4\n";
+        let ranges = split_at_newlines(text, 2);
+        assert_eq!(ranges, vec![(0, 18), (18, 24)]);
+        for &(start, end) in &ranges {
+            assert!(text[start..end].ends_with('\n'));
+        }
+    }
+
+    #[test]
+    fn test_split_covers_text() {
+        let text = "alpha\nbeta\ngamma\ndelta\nepsilon";
+        for max_chunks in 1..10 {
+            let ranges = split_at_newlines(text, max_chunks);
+            assert!(ranges.len() <= max_chunks);
+            assert_eq!(ranges.first().unwrap().0, 0);
+            assert_eq!(ranges.last().unwrap().1, text.len());
+            for pair in ranges.windows(2) {
+                assert_eq!(pair[0].1, pair[1].0);
+            }
+        }
+    }
+
+    #[test]
+    fn test_split_bytes() {
+        let bytes: &[u8] = b"one\n\xfftwo\nthree";
+        assert_eq!(split_at_newlines(bytes, 2), vec![(0, 9), (9, 14)]);
+    }
+
+    #[test]
+    fn test_split_no_newlines() {
+        assert_eq!(split_at_newlines("no newlines here", 4), vec![(0, 16)]);
+    }
+
+    #[test]
+    fn test_split_multibyte() {
+        let text = "héllo\nwörld\n日本語\n";
+        for &(start, end) in &split_at_newlines(text, 3) {
+            assert!(text.is_char_boundary(start));
+            assert!(text.is_char_boundary(end));
+        }
+    }
+}
@@ -1,5 +1,8 @@
 /// Parser module for formatparse-core
 pub mod regex;
+pub mod chunks;
+pub mod prefilter;
+pub mod split;
 
 /// Security constants for input validation
 pub const MAX_PATTERN_LENGTH: usize = 10_000;
@@ -19,12 +22,13 @@ pub fn validate_pattern_length(pattern: &str) -> Result<(), String> {
     Ok(())
 }
 
-/// Validate input string length
-pub fn validate_input_length(input: &str) -> Result<(), String> {
-    if input.len() > MAX_INPUT_LENGTH {
+/// Validate input string length (str or bytes input)
+pub fn validate_input_length<T: AsRef<[u8]> + ?Sized>(input: &T) -> Result<(), String> {
+    let len = input.as_ref().len();
+    if len > MAX_INPUT_LENGTH {
         return Err(format!(
             "Input length {} exceeds maximum allowed length of {} characters",
-            input.len(),
+            len,
             MAX_INPUT_LENGTH
         ));
     }
@@ -0,0 +1,216 @@
+//! Literal prefilter: reject inputs that can't match a pattern without running its regex
+//!
+//! Every match of a format pattern contains the pattern's literal text (the parts outside
+//! `{}` fields). Looking for those fragments with memchr's SIMD `memmem` is much cheaper
+//! than running the capture regex, so inputs that lack one of them are rejected up front.
+
+use memchr::memmem::Finder;
+
+/// Most literals checked per input (the longest ones, which are the most selective)
+const MAX_CHECKED_LITERALS: usize = 3;
+
+/// The literal fragments of a format pattern, in pattern order
+///
+/// Escaped braces (`{{`, `}}`) are unescaped. Trailing whitespace is dropped from each
+/// fragment because the regex accepts any run of whitespace there; fragments that are
+/// only whitespace are left out.
+pub fn required_literals(pattern: &str) -> Vec<String> {
+    let mut literals = Vec::new();
+    let mut literal = String::new();
+    let mut chars = pattern.chars().peekable();
+
+    while let Some(ch) = chars.next() {
+        match ch {
+            '{' if chars.peek() == Some(&'{') => {
+                chars.next();
+                literal.push('{');
+            }
+            '{' => {
+                push_literal(&mut literals, &literal);
+                literal.clear();
+                // A field runs up to the first closing brace
+                for field_ch in chars.by_ref() {
+                    if field_ch == '}' {
+                        break;
+                    }
+                }
+            }
+            '}' => {
+                if chars.peek() == Some(&'}') {
+                    chars.next();
+                }
+                literal.push('}');
+            }
+            _ => literal.push(ch),
+        }
+    }
+    push_literal(&mut literals, &literal);
+    literals
+}
+
+fn push_literal(literals: &mut Vec<String>, literal: &str) {
+    let trimmed = literal.trim_end();
+    if !trimmed.is_empty() {
+        literals.push(trimmed.to_string());
+    }
+}
+
+/// How a literal can be looked for when the regex is case-insensitive
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub(crate) enum CaseInsensitive {
+    /// No cased characters: the exact search is also correct
+    Exact,
+    /// ASCII letters whose only case variants are ASCII (not k or s, which also match
+    /// U+212A KELVIN SIGN and U+017F LONG S under Unicode case folding)
+    Ascii,
+    /// Can't be checked cheaply; skipped for case-insensitive matching
+    Unsupported,
+}
+
+impl CaseInsensitive {
+    pub(crate) fn of(literal: &str) -> Self {
+        if !literal.is_ascii() {
+            CaseInsensitive::Unsupported
+        } else if !literal.bytes().any(|b| b.is_ascii_alphabetic()) {
+            CaseInsensitive::Exact
+        } else if literal.bytes().any(|b| matches!(b.to_ascii_lowercase(), b'k' | b's')) {
+            CaseInsensitive::Unsupported
+        } else {
+            CaseInsensitive::Ascii
+        }
+    }
+}
+
+#[derive(Clone, Debug)]
+struct Literal {
+    text: String,
+    finder: Finder<'static>,
+    case_insensitive: CaseInsensitive,
+}
+
+impl Literal {
+    /// Whether the haystack contains the literal (None if that can't be decided cheaply)
+    fn is_in(&self, haystack: &[u8], case_sensitive: bool) -> Option<bool> {
+        match (case_sensitive, self.case_insensitive) {
+            (true, _) | (false, CaseInsensitive::Exact) => Some(self.finder.find(haystack).is_some()),
+            (false, CaseInsensitive::Ascii) => Some(contains_ascii_caseless(haystack, self.text.as_bytes())),
+            (false, CaseInsensitive::Unsupported) => None,
+        }
+    }
+}
+
+/// ASCII case-insensitive substring test: memchr for the first byte in either case,
+/// then compare the rest
+fn contains_ascii_caseless(haystack: &[u8], needle: &[u8]) -> bool {
+    let first = needle[0];
+    let (lower, upper) = (first.to_ascii_lowercase(), first.to_ascii_uppercase());
+    let last_start = match haystack.len().checked_sub(needle.len()) {
+        Some(last_start) => last_start,
+        None => return false,
+    };
+    memchr::memchr2_iter(lower, upper, &haystack[..=last_start])
+        .any(|start| haystack[start..start + needle.len()].eq_ignore_ascii_case(needle))
+}
+
+/// Literal fragments every match of a pattern contains
+#[derive(Clone, Debug)]
+pub struct Prefilter {
+    literals: Vec<Literal>,  // Longest first
+}
+
+impl Prefilter {
+    /// Build the prefilter of a format pattern (None if the pattern has no literal text)
+    pub fn new(pattern: &str) -> Option<Self> {
+        let mut texts = required_literals(pattern);
+        texts.sort_by(|a, b| b.len().cmp(&a.len()).then_with(|| a.cmp(b)));
+        texts.dedup();
+        if texts.is_empty() {
+            return None;
+        }
+        let literals = texts.into_iter()
+            .map(|text| Literal {
+                finder: Finder::new(text.as_bytes()).into_owned(),
+                case_insensitive: CaseInsensitive::of(&text),
+                text,
+            })
+            .collect();
+        Some(Self { literals })
+    }
+
+    /// False if the haystack can't contain a match (true doesn't mean it does)
+    pub fn may_match(&self, haystack: &str, case_sensitive: bool) -> bool {
+        self.may_match_bytes(haystack.as_bytes(), case_sensitive)
+    }
+
+    /// `may_match` for bytes input, which doesn't have to be valid UTF-8
+    pub fn may_match_bytes(&self, haystack: &[u8], case_sensitive: bool) -> bool {
+        self.literals.iter()
+            .filter_map(|literal| literal.is_in(haystack, case_sensitive))
+            .take(MAX_CHECKED_LITERALS)
+            .all(|found| found)
+    }
+}
+
+/// Apply an optional prefilter (no prefilter accepts everything)
+pub fn may_match(prefilter: Option<&Prefilter>, haystack: &str, case_sensitive: bool) -> bool {
+    prefilter.map_or(true, |prefilter| prefilter.may_match(haystack, case_sensitive))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    fn test_required_literals() {
+        assert_eq!(required_literals("ERROR {code:d}: {msg}"), vec!["ERROR", ":"]);
+        assert_eq!(required_literals("{a}{b}"), Vec::<String>::new());
+        assert_eq!(required_literals("{{x}} {a} end  "), vec!["{x}", " end"]);
+        assert_eq!(required_literals("a }}{b}} c"), vec!["a }", "} c"]);
+        assert_eq!(required_literals("[{level}] {host} "), vec!["[", "]"]);
+    }
+
+    #[test]
+    fn test_case_insensitive_kind() {
+        assert_eq!(CaseInsensitive::of(": ["), CaseInsensitive::Exact);
+        assert_eq!(CaseInsensitive::of("ERROR"), CaseInsensitive::Ascii);
+        assert_eq!(CaseInsensitive::of("status="), CaseInsensitive::Unsupported);
+        assert_eq!(CaseInsensitive::of("\u{e9}t\u{e9}"), CaseInsensitive::Unsupported);
+    }
+
+    #[test]
+    fn test_may_match_case_sensitive() {
+        let prefilter = Prefilter::new("ERROR {code:d}: {msg}").unwrap();
+        assert!(prefilter.may_match("x ERROR 5: disk full", true));
+        assert!(!prefilter.may_match("INFO 5: ok", true));
+        assert!(!prefilter.may_match("error 5: disk full", true));
+        assert!(!prefilter.may_match("ERROR 5 disk full", true));
+    }
+
+    #[test]
+    fn test_may_match_case_insensitive() {
+        let prefilter = Prefilter::new("ERROR {code:d}: {msg}").unwrap();
+        assert!(prefilter.may_match("error 5: disk full", false));
+        assert!(prefilter.may_match("eRrOr 5: disk full", false));
+        assert!(!prefilter.may_match("warn 5: disk full", false));
+        assert!(!prefilter.may_match("ERRO", false));
+
+        // Literals with k or s aren't checked case-insensitively (KELVIN SIGN matches k)
+        let prefilter = Prefilter::new("{n:d} kb").unwrap();
+        assert!(prefilter.may_match("5 \u{212a}B", false));
+        assert!(!prefilter.may_match("5 \u{212a}B", true));
+    }
+
+    #[test]
+    fn test_may_match_bytes() {
+        let prefilter = Prefilter::new("ERROR {code:d}: {msg}").unwrap();
+        assert!(prefilter.may_match_bytes(b"\xff\xfe ERROR 5: disk full", true));
+        assert!(prefilter.may_match_bytes(b"\xffError 5: x", false));
+        assert!(!prefilter.may_match_bytes(b"\xffINFO 5: ok", true));
+    }
+
+    #[test]
+    fn test_no_literals() {
+        assert!(Prefilter::new("{a} {b}").is_none());
+        assert!(may_match(None, "anything", true));
+    }
+}
@@ -1,5 +1,5 @@
 use crate::error::FormatParseError;
-use regex::Regex;
+use regex::{Regex, RegexSet};
 use std::time::Instant;
 
 /// Maximum time allowed for regex compilation (in milliseconds)
@@ -115,6 +115,107 @@ pub fn build_search_regex(regex_str: &str, case_sensitive: bool) -> Result<Regex
     Ok(regex)
 }
 
+/// Build a RegexSet from compiled regex strings (as returned by `Regex::as_str`)
+/// Matching the set reports every regex that matches in a single scan of the input
+/// Includes timeout protection against ReDoS attacks (same budget per regex as build_regex)
+pub fn build_regex_set<S: AsRef<str>>(regex_strs: &[S], case_sensitive: bool) -> Result<RegexSet, FormatParseError> {
+    let start = Instant::now();
+    
+    let patterns: Vec<String> = regex_strs.iter()
+        .map(|regex_str| {
+            if case_sensitive {
+                regex_str.as_ref().to_string()
+            } else {
+                format!("(?i){}", regex_str.as_ref())
+            }
+        })
+        .collect();
+    
+    let regex_set = RegexSet::new(&patterns).map_err(|e| {
+        // Sanitize error message - don't expose full regex pattern to prevent information disclosure
+        FormatParseError::RegexError(format!("Invalid regex pattern: {}", e))
+    })?;
+    
+    // Check compilation time
+    let elapsed = start.elapsed().as_millis();
+    let max_elapsed = MAX_REGEX_COMPILATION_TIME_MS * patterns.len().max(1) as u128;
+    if elapsed > max_elapsed {
+        return Err(FormatParseError::RegexError(format!(
+            "Regex compilation took {}ms, exceeding maximum allowed time of {}ms",
+            elapsed, max_elapsed
+        )));
+    }
+    
+    Ok(regex_set)
+}
+
+/// Rewrite every capturing group of a regex as a non-capturing group
+/// Used for fields that are matched but not extracted, so the regex engine doesn't track them
+pub fn non_capturing(pattern: &str) -> String {
+    let mut result = String::with_capacity(pattern.len() + 8);
+    let mut chars = pattern.chars().peekable();
+    let mut class_depth = 0;  // Nesting depth of character classes ([...] can nest in Rust regex)
+    
+    while let Some(ch) = chars.next() {
+        match ch {
+            '\\' => {
+                // Escaped character - copy as-is
+                result.push(ch);
+                if let Some(escaped) = chars.next() {
+                    result.push(escaped);
+                }
+            }
+            '[' => {
+                result.push(ch);
+                class_depth += 1;
+                // A ']' right after '[' or '[^' is a literal
+                if chars.peek() == Some(&'^') {
+                    result.push(chars.next().unwrap());
+                }
+                if chars.peek() == Some(&']') {
+                    result.push(chars.next().unwrap());
+                }
+            }
+            ']' if class_depth > 0 => {
+                result.push(ch);
+                class_depth -= 1;
+            }
+            '(' if class_depth == 0 => {
+                if chars.peek() != Some(&'?') {
+                    result.push_str("(?:");
+                    continue;
+                }
+                // Named groups (?P<name>...) and (?<name>...) become (?:...); flags and
+                // non-capturing groups are kept
+                let rest: String = chars.clone().take(3).collect();
+                let name_prefix = if rest.starts_with("?P<") {
+                    3
+                } else if rest.starts_with("?<") && !rest.starts_with("?<=") && !rest.starts_with("?<!") {
+                    2
+                } else {
+                    0
+                };
+                if name_prefix == 0 {
+                    result.push(ch);
+                    continue;
+                }
+                for _ in 0..name_prefix {
+                    chars.next();
+                }
+                for name_ch in chars.by_ref() {
+                    if name_ch == '>' {
+                        break;
+                    }
+                }
+                result.push_str("(?:");
+            }
+            _ => result.push(ch),
+        }
+    }
+    
+    result
+}
+
 #[cfg(test)]
 mod tests {
     use super::*;
@@ -142,6 +243,25 @@ mod tests {
         assert!(!regex.is_match("notest"));
     }
 
+    #[test]
+    fn test_build_regex_set() {
+        let set = build_regex_set(&["(?s)^a(.+?)$", "(?s)^(.+?)b$", "(?s)^c$"], true).unwrap();
+        let matches: Vec<usize> = set.matches("axb").into_iter().collect();
+        assert_eq!(matches, vec![0, 1]);
+        assert!(!set.is_match("C"));
+    }
+
+    #[test]
+    fn test_build_regex_set_case_insensitive() {
+        let set = build_regex_set(&["(?s)^c$"], false).unwrap();
+        assert!(set.is_match("C"));
+    }
+
+    #[test]
+    fn test_build_regex_set_invalid() {
+        assert!(build_regex_set(&["(unclosed"], true).is_err());
+    }
+
     #[test]
     fn test_build_case_insensitive_regex_with_dotall() {
         let regex = build_case_insensitive_regex(r"test.line").unwrap();
@@ -203,5 +323,15 @@ mod tests {
         assert!(regex.is_match("test\nline"));
         assert!(regex.is_match("prefix test\nline suffix"));
     }
-}
 
+    #[test]
+    fn test_non_capturing() {
+        assert_eq!(non_capturing(r"(\d+)-(?P<x>\w+)"), r"(?:\d+)-(?:\w+)");
+        assert_eq!(non_capturing(r"(?:a|b)(?i)c"), r"(?:a|b)(?i)c");
+        assert_eq!(non_capturing(r"\(([(])"), r"\((?:[(])");
+        assert_eq!(non_capturing(r"([]()]+)"), r"(?:[]()]+)");
+        let regex = build_regex(&non_capturing(r"^( *(.+?))-(?<y>\d)$")).unwrap();
+        assert_eq!(regex.captures_len(), 1);
+        assert!(regex.is_match("  ab-1"));
+    }
+}
@@ -0,0 +1,572 @@
+//! Regex-free matcher for patterns whose fields are separated by literal text
+//!
+//! Many patterns are a sequence of literals and plain fields, like
+//! `"{ip} - {user} [{ts}] {status:d} {size:d}"`. They can be matched by walking the input
+//! once: a `{}` field ends at the next occurrence of the literal after it, and a typed field
+//! that can't contain the first character of the following literal ends right before it.
+//!
+//! The walk takes, at every step, the choice the anchored regex would try first, so when it
+//! reaches the end of the input it has found the same match (and the same field spans) as
+//! the regex. When it fails after a choice that had alternatives, the result is left
+//! undecided and the caller falls back to the regex.
+
+use crate::error::FormatParseError;
+use crate::parser::prefilter::CaseInsensitive;
+use crate::parser::regex::{build_case_insensitive_regex, build_regex};
+use crate::types::{FieldSpec, FieldType};
+use memchr::memmem::Finder;
+use regex::Regex;
+use std::collections::HashMap;
+
+/// Whitespace the regex accepts after a literal
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum Trailing {
+    /// The literal doesn't end with whitespace
+    None,
+    /// `\s+`: the literal ends with whitespace and is followed by a field
+    OneOrMore,
+    /// `\s*`: the literal ends with whitespace and ends the pattern
+    ZeroOrMore,
+}
+
+#[derive(Clone, Debug)]
+struct Delimiter {
+    text: String,  // Without the trailing whitespace (may be empty)
+    finder: Finder<'static>,
+    case_insensitive: CaseInsensitive,
+    trailing: Trailing,
+}
+
+impl Delimiter {
+    fn new(literal: &str, is_last: bool) -> Self {
+        let text = literal.trim_end().to_string();
+        let trailing = if text.len() == literal.len() {
+            Trailing::None
+        } else if is_last {
+            Trailing::ZeroOrMore
+        } else {
+            Trailing::OneOrMore
+        };
+        Self {
+            finder: Finder::new(text.as_bytes()).into_owned(),
+            case_insensitive: CaseInsensitive::of(&text),
+            text,
+            trailing,
+        }
+    }
+
+    /// Whether the literal text starts at `pos`
+    fn is_at(&self, haystack: &str, pos: usize, case_sensitive: bool) -> bool {
+        let candidate = match haystack.as_bytes().get(pos..pos + self.text.len()) {
+            Some(candidate) => candidate,
+            None => return false,
+        };
+        if case_sensitive {
+            candidate == self.text.as_bytes()
+        } else {
+            candidate.eq_ignore_ascii_case(self.text.as_bytes())
+        }
+    }
+
+    /// First position at or after `from` where the literal text starts and is followed by the
+    /// whitespace it requires
+    fn find(&self, haystack: &str, from: usize, case_sensitive: bool) -> Option<usize> {
+        if self.text.is_empty() {
+            return haystack[from..].find(char::is_whitespace).map(|offset| from + offset);
+        }
+        let bytes = haystack.as_bytes();
+        let mut start = from;
+        while start < bytes.len() {
+            let found = if case_sensitive {
+                self.finder.find(&bytes[start..])
+            } else {
+                find_ascii_caseless(&bytes[start..], self.text.as_bytes())
+            };
+            let pos = start + found?;
+            let end = pos + self.text.len();
+            if self.trailing != Trailing::OneOrMore || starts_with_whitespace(&haystack[end..]) {
+                return Some(pos);
+            }
+            start = pos + 1;
+        }
+        None
+    }
+}
+
+/// Position of the first ASCII case-insensitive occurrence of `needle`
+fn find_ascii_caseless(haystack: &[u8], needle: &[u8]) -> Option<usize> {
+    let first = needle[0];
+    let last_start = haystack.len().checked_sub(needle.len())?;
+    memchr::memchr2_iter(first.to_ascii_lowercase(), first.to_ascii_uppercase(), &haystack[..=last_start])
+        .find(|&start| haystack[start..start + needle.len()].eq_ignore_ascii_case(needle))
+}
+
+/// Offset of the first occurrence of a stop character, in either case for an ASCII letter
+/// when matching case-insensitively (other cased characters make the literal unsupported)
+fn find_stop_char(haystack: &str, ch: char, case_sensitive: bool) -> Option<usize> {
+    if case_sensitive || !ch.is_ascii_alphabetic() {
+        return haystack.find(ch);
+    }
+    let byte = ch as u8;
+    memchr::memchr2(byte.to_ascii_lowercase(), byte.to_ascii_uppercase(), haystack.as_bytes())
+}
+
+fn starts_with_whitespace(text: &str) -> bool {
+    text.chars().next().map_or(false, char::is_whitespace)
+}
+
+/// Byte length of the char at `pos` (None at the end of the input)
+fn char_len_at(haystack: &str, pos: usize) -> Option<usize> {
+    haystack[pos..].chars().next().map(char::len_utf8)
+}
+
+/// Where a typed field ends: at the first occurrence of a character it can't contain
+#[derive(Clone, Copy, Debug)]
+enum Stop {
+    /// The field runs to the end of the input
+    End,
+    /// The field ends at the first whitespace character (or at the end of the input, when
+    /// only whitespace can follow it)
+    Whitespace { or_end: bool },
+    /// The field ends at the first occurrence of this character
+    Char(char),
+}
+
+#[derive(Clone, Debug)]
+enum Segment {
+    Literal(Delimiter),
+    /// `{}` (`.+?`): ends at the first place the rest of the pattern can start
+    Text,
+    /// A field whose regex can't match its own stop character, checked with its anchored regex
+    Typed {
+        stop: Stop,
+        regex: Regex,
+        regex_case_insensitive: Option<Regex>,
+    },
+}
+
+/// Result of running the split matcher on an input
+#[derive(Clone, Debug, PartialEq)]
+pub enum SplitMatch {
+    /// The input matches; byte span of each field, in pattern order
+    Matched(Vec<(usize, usize)>),
+    /// The input can't match the pattern
+    NoMatch,
+    /// The matcher couldn't decide; run the regex
+    Undecided,
+}
+
+/// Delimiter-split matcher for a format pattern (see the module docs)
+#[derive(Clone, Debug)]
+pub struct SplitMatcher {
+    segments: Vec<Segment>,
+    field_count: usize,
+    case_insensitive: bool,  // Whether case-insensitive matching can be done without the regex
+}
+
+impl SplitMatcher {
+    /// Build the matcher for a pattern and its field specs (None if the pattern isn't eligible)
+    ///
+    /// Eligible patterns alternate literals and fields (no two fields side by side) and only
+    /// use plain `{}` fields and `d`, `f`, `l`, `w` and `S` fields without width, precision,
+    /// alignment or fill. A typed field must be followed by the end of the pattern or by a
+    /// literal starting with a character the field can't match.
+    pub fn new(pattern: &str, field_specs: &[FieldSpec]) -> Result<Option<Self>, FormatParseError> {
+        let pieces = match split_pattern(pattern) {
+            Some(pieces) => pieces,
+            None => return Ok(None),
+        };
+        if pieces.iter().filter(|piece| piece.is_none()).count() != field_specs.len() {
+            return Ok(None);
+        }
+
+        let mut segments = Vec::with_capacity(pieces.len());
+        let mut specs = field_specs.iter();
+        for (i, piece) in pieces.iter().enumerate() {
+            let next = pieces.get(i + 1);
+            let segment = match piece {
+                Some(literal) => Segment::Literal(Delimiter::new(literal, next.is_none())),
+                None => {
+                    let spec = specs.next().unwrap();
+                    let next_literal = match next {
+                        Some(Some(literal)) => Some(Delimiter::new(literal, i + 2 == pieces.len())),
+                        Some(None) => return Ok(None),  // Two fields side by side
+                        None => None,
+                    };
+                    match field_segment(spec, next_literal.as_ref())? {
+                        Some(segment) => segment,
+                        None => return Ok(None),
+                    }
+                }
+            };
+            segments.push(segment);
+        }
+
+        let case_insensitive = segments.iter().all(|segment| match segment {
+            Segment::Literal(delimiter) => delimiter.case_insensitive != CaseInsensitive::Unsupported,
+            Segment::Text => true,
+            Segment::Typed { regex_case_insensitive, .. } => regex_case_insensitive.is_some(),
+        });
+        Ok(Some(Self { segments, field_count: field_specs.len(), case_insensitive }))
+    }
+
+    /// Match the whole input (like the pattern's anchored regex)
+    pub fn captures(&self, haystack: &str, case_sensitive: bool) -> SplitMatch {
+        if !case_sensitive && !self.case_insensitive {
+            return SplitMatch::Undecided;
+        }
+        let mut fields = Vec::with_capacity(self.field_count);
+        let mut pos = 0;
+        // Whether every step so far was the only possible one; a failure is then final
+        let mut forced = true;
+        let fail = |forced: bool| if forced { SplitMatch::NoMatch } else { SplitMatch::Undecided };
+
+        let mut i = 0;
+        while i < self.segments.len() {
+            match &self.segments[i] {
+                Segment::Literal(delimiter) => {
+                    if !delimiter.is_at(haystack, pos, case_sensitive) {
+                        return fail(forced);
+                    }
+                    pos += delimiter.text.len();
+                    if delimiter.trailing != Trailing::None {
+                        let rest = &haystack[pos..];
+                        let whitespace = rest.len() - rest.trim_start().len();
+                        if whitespace == 0 && delimiter.trailing == Trailing::OneOrMore {
+                            return fail(forced);
+                        }
+                        // A `{}` field after the whitespace could also start with some of it
+                        if matches!(self.segments.get(i + 1), Some(Segment::Text))
+                            && rest[..whitespace].chars().nth(1).is_some()
+                        {
+                            forced = false;
+                        }
+                        pos += whitespace;
+                    }
+                }
+                Segment::Text => {
+                    let min_end = match char_len_at(haystack, pos) {
+                        Some(len) => pos + len,
+                        None => return fail(forced),
+                    };
+                    match self.segments.get(i + 1) {
+                        None => {
+                            fields.push((pos, haystack.len()));
+                            pos = haystack.len();
+                        }
+                        Some(Segment::Literal(delimiter)) if i + 2 == self.segments.len() => {
+                            // The final literal is anchored to the end, so the field's end is known
+                            let end = match delimiter.trailing {
+                                Trailing::ZeroOrMore => haystack.trim_end().len(),
+                                _ => haystack.len(),
+                            };
+                            let field_end = if delimiter.text.is_empty() {
+                                end.max(min_end)
+                            } else {
+                                match end.checked_sub(delimiter.text.len()) {
+                                    Some(start) if start >= min_end && haystack.is_char_boundary(start) => start,
+                                    _ => return fail(forced),
+                                }
+                            };
+                            if !delimiter.is_at(haystack, field_end, case_sensitive) {
+                                return fail(forced);
+                            }
+                            fields.push((pos, field_end));
+                            return SplitMatch::Matched(fields);
+                        }
+                        Some(Segment::Literal(delimiter)) => {
+                            let field_end = match delimiter.find(haystack, min_end, case_sensitive) {
+                                Some(field_end) => field_end,
+                                None => return fail(forced),
+                            };
+                            fields.push((pos, field_end));
+                            pos = field_end;
+                            // A later occurrence of the literal could also end the field
+                            forced = false;
+                        }
+                        Some(_) => unreachable!("fields are always separated by literals"),
+                    }
+                }
+                Segment::Typed { stop, regex, regex_case_insensitive } => {
+                    let rest = &haystack[pos..];
+                    let end = pos + match stop {
+                        Stop::End => rest.len(),
+                        Stop::Whitespace { or_end } => match rest.find(char::is_whitespace) {
+                            Some(offset) => offset,
+                            None if *or_end => rest.len(),
+                            None => return fail(forced),
+                        },
+                        Stop::Char(ch) => match find_stop_char(rest, *ch, case_sensitive) {
+                            Some(offset) => offset,
+                            None => return fail(forced),
+                        },
+                    };
+                    let regex = if case_sensitive { regex } else { regex_case_insensitive.as_ref().unwrap() };
+                    if !regex.is_match(&haystack[pos..end]) {
+                        return fail(forced);
+                    }
+                    fields.push((pos, end));
+                    pos = end;
+                }
+            }
+            i += 1;
+        }
+
+        if pos != haystack.len() {
+            return fail(forced);
+        }
+        SplitMatch::Matched(fields)
+    }
+}
+
+/// Split a pattern into literals (Some, unescaped) and fields (None), in order
+/// Returns None for fields the matcher doesn't handle (conversions like `{!r}`)
+fn split_pattern(pattern: &str) -> Option<Vec<Option<String>>> {
+    let mut pieces = Vec::new();
+    let mut literal = String::new();
+    let mut chars = pattern.chars().peekable();
+
+    while let Some(ch) = chars.next() {
+        match ch {
+            '{' if chars.peek() == Some(&'{') => {
+                chars.next();
+                literal.push('{');
+            }
+            '{' => {
+                if !literal.is_empty() {
+                    pieces.push(Some(std::mem::take(&mut literal)));
+                }
+                for field_ch in chars.by_ref() {
+                    match field_ch {
+                        '}' => break,
+                        '!' => return None,
+                        _ => {}
+                    }
+                }
+                pieces.push(None);
+            }
+            '}' => {
+                if chars.peek() == Some(&'}') {
+                    chars.next();
+                }
+                literal.push('}');
+            }
+            _ => literal.push(ch),
+        }
+    }
+    if !literal.is_empty() {
+        pieces.push(Some(literal));
+    }
+    Some(pieces)
+}
+
+/// Segment for a field followed by `next` (None if the field isn't supported)
+fn field_segment(spec: &FieldSpec, next: Option<&Delimiter>) -> Result<Option<Segment>, FormatParseError> {
+    if spec.width.is_some() || spec.precision.is_some() || spec.alignment.is_some()
+        || spec.fill.is_some() || spec.zero_pad
+    {
+        return Ok(None);
+    }
+    if matches!(spec.field_type, FieldType::String) {
+        return Ok(Some(Segment::Text));
+    }
+    if !can_split_typed(spec) {
+        return Ok(None);
+    }
+
+    let stop = match next {
+        None => Stop::End,
+        Some(delimiter) => match delimiter.text.chars().next() {
+            None => Stop::Whitespace { or_end: delimiter.trailing == Trailing::ZeroOrMore },
+            Some(ch) if ch.is_whitespace() => Stop::Whitespace { or_end: false },
+            Some(ch) if !can_contain(&spec.field_type, ch) => Stop::Char(ch),
+            Some(_) => return Ok(None),
+        },
+    };
+    let anchored = format!("^(?:{})$", spec.to_regex_pattern(&HashMap::new(), None));
+    Ok(Some(Segment::Typed {
+        stop,
+        regex: build_regex(&anchored)?,
+        regex_case_insensitive: build_case_insensitive_regex(&anchored),
+    }))
+}
+
+/// Typed fields the matcher supports: their regexes never match whitespace
+fn can_split_typed(spec: &FieldSpec) -> bool {
+    match spec.field_type {
+        // A ' ' sign lets the regex match a leading space
+        FieldType::Integer | FieldType::Float => spec.sign != Some(' '),
+        FieldType::Letters | FieldType::Word | FieldType::NonWhitespace => true,
+        _ => false,
+    }
+}
+
+/// Whether a field of this type might match text containing `ch` (conservative, also under
+/// Unicode case folding)
+fn can_contain(field_type: &FieldType, ch: char) -> bool {
+    if ch.is_whitespace() {
+        return false;
+    }
+    match field_type {
+        FieldType::Integer => ch.is_ascii_hexdigit() || "+-xXoObB".contains(ch),
+        // \d in the float regex also matches non-ASCII digits
+        FieldType::Float => !ch.is_ascii() || ch.is_ascii_digit() || "+-.eE".contains(ch),
+        // Under case folding [a-zA-Z] also matches non-ASCII letters (KELVIN SIGN)
+        FieldType::Letters => !ch.is_ascii() || ch.is_ascii_alphabetic(),
+        FieldType::Word => !ch.is_ascii() || ch.is_ascii_alphanumeric() || ch == '_',
+        _ => true,
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn spec(field_type: FieldType) -> FieldSpec {
+        FieldSpec { field_type, ..FieldSpec::default() }
+    }
+
+    fn matcher(pattern: &str, field_types: Vec<FieldType>) -> Option<SplitMatcher> {
+        let specs: Vec<FieldSpec> = field_types.into_iter().map(spec).collect();
+        SplitMatcher::new(pattern, &specs).unwrap()
+    }
+
+    /// Fields of a match as strings
+    fn fields<'a>(result: SplitMatch, haystack: &'a str) -> Vec<&'a str> {
+        match result {
+            SplitMatch::Matched(spans) => spans.iter().map(|&(start, end)| &haystack[start..end]).collect(),
+            other => panic!("expected a match, got {:?}", other),
+        }
+    }
+
+    #[test]
+    fn test_log_line() {
+        let m = matcher(
+            "{ip} - {user} [{ts}] {status:d} {size:d}",
+            vec![FieldType::String, FieldType::String, FieldType::String, FieldType::Integer, FieldType::Integer],
+        ).unwrap();
+        let line = "10.0.0.1 - bob [10/Oct/2000:13:55:36 -0700] 200 2326";
+        assert_eq!(fields(m.captures(line, true), line), vec!["10.0.0.1", "bob", "10/Oct/2000:13:55:36 -0700", "200", "2326"]);
+        let line = "10.0.0.1 - bob [10/Oct/2000:13:55:36 -0700] 200 -";
+        assert_eq!(m.captures(line, true), SplitMatch::Undecided);
+    }
+
+    #[test]
+    fn test_no_fields() {
+        let m = matcher("hello world  ", vec![]).unwrap();
+        assert_eq!(m.captures("hello world", true), SplitMatch::Matched(vec![]));
+        assert_eq!(m.captures("hello world \n", true), SplitMatch::Matched(vec![]));
+        assert_eq!(m.captures("hello  world", true), SplitMatch::NoMatch);
+        assert_eq!(m.captures("HELLO WORLD", false), SplitMatch::Matched(vec![]));
+        assert_eq!(matcher("", vec![]).unwrap().captures("", true), SplitMatch::Matched(vec![]));
+    }
+
+    #[test]
+    fn test_single_trailing_field() {
+        let m = matcher("name: {}", vec![FieldType::String]).unwrap();
+        assert_eq!(fields(m.captures("name: Ada Lovelace", true), "name: Ada Lovelace"), vec!["Ada Lovelace"]);
+        assert_eq!(m.captures("nome: Ada", true), SplitMatch::NoMatch);
+        // With several spaces the field could also start with one of them
+        assert_eq!(fields(m.captures("name:   x", true), "name:   x"), vec!["x"]);
+        assert_eq!(m.captures("name:   ", true), SplitMatch::Undecided);
+        assert_eq!(m.captures("name: ", true), SplitMatch::NoMatch);
+    }
+
+    #[test]
+    fn test_final_literal() {
+        let m = matcher("<{}> ", vec![FieldType::String]).unwrap();
+        assert_eq!(fields(m.captures("<a> b>  ", true), "<a> b>  "), vec!["a> b"]);
+        assert_eq!(m.captures("<a> b", true), SplitMatch::NoMatch);
+        assert_eq!(m.captures("<>", true), SplitMatch::NoMatch);
+    }
+
+    #[test]
+    fn test_text_field_takes_first_delimiter() {
+        let m = matcher("{a}:{b}", vec![FieldType::String, FieldType::String]).unwrap();
+        assert_eq!(fields(m.captures("x:y:z", true), "x:y:z"), vec!["x", "y:z"]);
+        assert_eq!(m.captures(":y", true), SplitMatch::NoMatch);
+        assert_eq!(m.captures("x:", true), SplitMatch::Undecided);
+    }
+
+    #[test]
+    fn test_typed_field_stops() {
+        let m = matcher("{code:d}: {msg}", vec![FieldType::Integer, FieldType::String]).unwrap();
+        assert_eq!(fields(m.captures("404: not found", true), "404: not found"), vec!["404", "not found"]);
+        assert_eq!(m.captures("4x4: not found", true), SplitMatch::NoMatch);
+        // 'b' can be part of an integer (0b101), so the field has no stop character
+        assert!(matcher("{n:d}b", vec![FieldType::Integer]).is_none());
+    }
+
+    #[test]
+    fn test_case_insensitive() {
+        let m = matcher("ERROR {code:d}", vec![FieldType::Integer]).unwrap();
+        assert_eq!(fields(m.captures("error 5", false), "error 5"), vec!["5"]);
+        assert_eq!(m.captures("error 5", true), SplitMatch::NoMatch);
+        // k also matches KELVIN SIGN: left to the regex
+        let m = matcher("{n:d} kb", vec![FieldType::Integer]).unwrap();
+        assert_eq!(m.captures("5 \u{212a}B", false), SplitMatch::Undecided);
+        // A letter ending a typed field is found in either case
+        let m = matcher("{n:d}pm", vec![FieldType::Integer]).unwrap();
+        assert_eq!(fields(m.captures("5PM", false), "5PM"), vec!["5"]);
+        assert_eq!(m.captures("5PM", true), SplitMatch::NoMatch);
+    }
+
+    /// Compare the matcher for `{}` + `literal` (with one field of the given type) with the
+    /// anchored regex, in both case modes (undecided results and ineligible patterns are skipped)
+    fn assert_same_as_regex(field_type: FieldType, literal: &str, inputs: &[String]) {
+        let field_spec = spec(field_type);
+        let Some(m) = SplitMatcher::new(&format!("{{}}{}", literal), std::slice::from_ref(&field_spec)).unwrap() else {
+            return;
+        };
+        let field = field_spec.to_regex_pattern(&HashMap::new(), None);
+        for case_sensitive in [true, false] {
+            let flags = if case_sensitive { "" } else { "(?i)" };
+            let regex = Regex::new(&format!("{}^({}){}$", flags, field, regex::escape(literal))).unwrap();
+            for input in inputs {
+                let expected = regex.captures(input).map(|captures| {
+                    let found = captures.get(1).unwrap();
+                    vec![(found.start(), found.end())]
+                });
+                match m.captures(input, case_sensitive) {
+                    SplitMatch::Matched(spans) => assert_eq!(Some(spans), expected, "{:?} on {:?}", literal, input),
+                    SplitMatch::NoMatch => assert_eq!(None, expected, "{:?} on {:?}", literal, input),
+                    SplitMatch::Undecided => {}
+                }
+            }
+        }
+    }
+
+    #[test]
+    fn test_non_ascii_delimiters_match_like_regex() {
+        // Arabic-Indic digit three, KELVIN SIGN, superscript two, ASCII letters in both cases
+        // and a few other delimiters
+        let delimiters = [
+            "\u{663}", "\u{212a}", "\u{b2}", "\u{e9}", "\u{2192}", ":", "_", "pm", "PM", "x", "X", "g",
+        ];
+        let values = ["12", "1.5", "-3.", "ab", "a_1", "\u{663}", "\u{661}.\u{665}", "\u{e9}t\u{e9}"];
+        for field_type in [FieldType::Integer, FieldType::Float, FieldType::Letters, FieldType::Word, FieldType::NonWhitespace] {
+            for delimiter in delimiters {
+                let mut inputs = vec![delimiter.repeat(2)];
+                for value in values {
+                    inputs.push(format!("{}{}", value, delimiter));
+                    inputs.push(format!("{}{}", value, delimiter.to_uppercase()));
+                    inputs.push(format!("{}{}", value, delimiter.to_lowercase()));
+                    inputs.push(format!("{}{}{}", value, delimiter, delimiter));
+                    inputs.push(format!("{}{}{}{}", value, delimiter, value, delimiter));
+                }
+                assert_same_as_regex(field_type.clone(), delimiter, &inputs);
+            }
+        }
+        // A float field can't end at a non-ASCII digit
+        assert!(matcher("{:f}\u{663}", vec![FieldType::Float]).is_none());
+    }
+
+    #[test]
+    fn test_ineligible_patterns() {
+        assert!(matcher("{a}{b}", vec![FieldType::String, FieldType::String]).is_none());
+        assert!(matcher("{a!r}", vec![FieldType::String]).is_none());
+        assert!(matcher("{:ti}", vec![FieldType::DateTimeISO]).is_none());
+        let width = FieldSpec { width: Some(5), ..FieldSpec::default() };
+        assert!(SplitMatcher::new("{:5} x", &[width]).unwrap().is_none());
+    }
+}
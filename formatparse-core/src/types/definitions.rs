@@ -1,5 +1,8 @@
 /// Type definitions for field specifications
 
+use crate::datetime::{DateTimeOutput, StrftimeProgram};
+use std::sync::Arc;
+
 #[derive(Debug, Clone)]
 pub enum FieldType {
     String,
@@ -38,6 +41,8 @@ pub struct FieldSpec {
     pub fill: Option<char>,
     pub zero_pad: bool,
     pub strftime_format: Option<String>, // For strftime-style patterns
+    pub strftime_program: Option<Arc<StrftimeProgram>>, // strftime_format compiled (None if it needs strptime)
+    pub datetime_output: DateTimeOutput, // What datetime types convert to (datetime, epoch int or ISO string)
     pub original_type_char: Option<char>, // Original type character (e.g., 'b', 'o', 'x' for binary/octal/hex)
 }
 
@@ -53,6 +58,8 @@ impl Default for FieldSpec {
             fill: None,
             zero_pad: false,
             strftime_format: None,
+            strftime_program: None,
+            datetime_output: DateTimeOutput::DateTime,
             original_type_char: None,
         }
     }
@@ -62,6 +69,12 @@ impl FieldSpec {
     pub fn new() -> Self {
         Self::default()
     }
+
+    /// Set the strftime format, compiling it into the program used to parse values
+    pub fn set_strftime_format(&mut self, format_str: String) {
+        self.strftime_program = StrftimeProgram::compile(&format_str).map(Arc::new);
+        self.strftime_format = Some(format_str);
+    }
 }
 
 #[cfg(test)]
@@ -80,9 +93,22 @@ mod tests {
         assert!(spec.fill.is_none());
         assert!(!spec.zero_pad);
         assert!(spec.strftime_format.is_none());
+        assert!(spec.strftime_program.is_none());
+        assert_eq!(spec.datetime_output, DateTimeOutput::DateTime);
         assert!(spec.original_type_char.is_none());
     }
 
+    #[test]
+    fn test_set_strftime_format() {
+        let mut spec = FieldSpec::new();
+        spec.set_strftime_format("%Y-%m-%d".to_string());
+        assert_eq!(spec.strftime_format.as_deref(), Some("%Y-%m-%d"));
+        assert!(spec.strftime_program.is_some());
+
+        spec.set_strftime_format("%c".to_string());
+        assert!(spec.strftime_program.is_none());
+    }
+
     #[test]
     fn test_field_spec_new() {
         let spec = FieldSpec::new();
@@ -128,6 +154,8 @@ mod tests {
             fill: Some('x'),
             zero_pad: true,
             strftime_format: Some("%Y-%m-%d".to_string()),
+            strftime_program: None,
+            datetime_output: DateTimeOutput::EpochSeconds,
             original_type_char: Some('d'),
         };
 
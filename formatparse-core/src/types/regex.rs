@@ -18,6 +18,10 @@ pub fn strftime_to_regex(format_str: &str) -> String {
                     'H' => r"\d{1,2}",         // Hour (0-23 or 00-23) - flexible
                     'M' => r"\d{1,2}",         // Minute (0-59 or 00-59) - flexible
                     'S' => r"\d{1,2}",         // Second (0-59 or 00-59) - flexible
+                    'I' => r"\d{1,2}",         // Hour on a 12-hour clock (1-12 or 01-12) - flexible
+                    'p' => r"[AaPp][Mm]",      // AM/PM
+                    'f' => r"\d{1,6}",         // Microseconds
+                    'z' => r"(?:[Zz]|[+-]\d{2}(?::?\d{2}){1,2})", // UTC offset: Z, +HHMM, +HH:MM, +HH:MM:SS
                     'b' | 'h' => r"[A-Za-z]{3}", // Abbreviated month name
                     'B' => r"[A-Za-z]+",       // Full month name
                     'a' => r"[A-Za-z]{3}",     // Abbreviated weekday
@@ -313,6 +317,17 @@ mod tests {
         assert_eq!(strftime_to_regex("%w"), r"\d");
     }
 
+    #[test]
+    fn test_strftime_to_regex_time_parts() {
+        assert_eq!(strftime_to_regex("%I:%M %p"), r"\d{1,2}:\d{1,2} [AaPp][Mm]");
+        assert_eq!(strftime_to_regex("%f"), r"\d{1,6}");
+        let offset = regex::Regex::new(&format!("^{}$", strftime_to_regex("%z"))).unwrap();
+        for value in ["Z", "+0530", "-05:30", "+00:00:00"] {
+            assert!(offset.is_match(value), "{}", value);
+        }
+        assert!(!offset.is_match("+5"));
+    }
+
     #[test]
     fn test_strftime_to_regex_literal() {
         assert_eq!(strftime_to_regex("%%"), "%");
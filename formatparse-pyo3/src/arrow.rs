@@ -0,0 +1,577 @@
+//! Arrow C Data Interface export
+//!
+//! Results are exported as a struct array with one child per field, built directly from
+//! the raw match data. The buffers are handed to the consumer (pyarrow, polars, ...) through
+//! PyCapsules and imported without copying, so no Arrow library is needed on our side.
+//! See https://arrow.apache.org/docs/format/CDataInterface.html
+
+use std::ffi::{c_char, c_int, c_void, CString};
+use std::ptr;
+use pyo3::prelude::*;
+use pyo3::types::{PyCapsule, PyTuple};
+use formatparse_core::FieldType;
+use crate::columns::{Column, ColumnKey};
+use crate::parser::raw_match::{RawMatchData, RawValue};
+
+/// Field may contain nulls (ArrowSchema.flags)
+const ARROW_FLAG_NULLABLE: i64 = 2;
+
+/// C Data Interface schema (layout fixed by the Arrow specification)
+#[repr(C)]
+pub struct ArrowSchema {
+    format: *const c_char,
+    name: *const c_char,
+    metadata: *const c_char,
+    flags: i64,
+    n_children: i64,
+    children: *mut *mut ArrowSchema,
+    dictionary: *mut ArrowSchema,
+    release: Option<unsafe extern "C" fn(*mut ArrowSchema)>,
+    private_data: *mut c_void,
+}
+
+/// C Data Interface array (layout fixed by the Arrow specification)
+#[repr(C)]
+pub struct ArrowArray {
+    length: i64,
+    null_count: i64,
+    offset: i64,
+    n_buffers: i64,
+    n_children: i64,
+    buffers: *mut *const c_void,
+    children: *mut *mut ArrowArray,
+    dictionary: *mut ArrowArray,
+    release: Option<unsafe extern "C" fn(*mut ArrowArray)>,
+    private_data: *mut c_void,
+}
+
+/// C Stream Interface stream (layout fixed by the Arrow specification)
+#[repr(C)]
+pub struct ArrowArrayStream {
+    get_schema: Option<unsafe extern "C" fn(*mut ArrowArrayStream, *mut ArrowSchema) -> c_int>,
+    get_next: Option<unsafe extern "C" fn(*mut ArrowArrayStream, *mut ArrowArray) -> c_int>,
+    get_last_error: Option<unsafe extern "C" fn(*mut ArrowArrayStream) -> *const c_char>,
+    release: Option<unsafe extern "C" fn(*mut ArrowArrayStream)>,
+    private_data: *mut c_void,
+}
+
+// The structs only point at memory owned by their private_data, which has no thread affinity
+unsafe impl Send for ArrowSchema {}
+unsafe impl Send for ArrowArray {}
+unsafe impl Send for ArrowArrayStream {}
+
+/// Arrow type of an exported column
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum ArrowType {
+    Int64,
+    Float64,
+    Boolean,
+    Utf8,
+    LargeUtf8,  // Used when the string data doesn't fit 32-bit offsets
+}
+
+impl ArrowType {
+    /// Arrow type for a field type (strings may be widened to LargeUtf8 once the data is known)
+    fn for_field_type(field_type: &FieldType) -> Self {
+        match field_type {
+            FieldType::Integer | FieldType::NumberWithThousands => ArrowType::Int64,
+            FieldType::Float
+            | FieldType::Scientific
+            | FieldType::GeneralNumber
+            | FieldType::Percentage => ArrowType::Float64,
+            FieldType::Boolean => ArrowType::Boolean,
+            _ => ArrowType::Utf8,
+        }
+    }
+
+    /// Format string (see the C Data Interface format strings table)
+    fn format(self) -> &'static str {
+        match self {
+            ArrowType::Int64 => "l",
+            ArrowType::Float64 => "g",
+            ArrowType::Boolean => "b",
+            ArrowType::Utf8 => "u",
+            ArrowType::LargeUtf8 => "U",
+        }
+    }
+}
+
+/// Name and type of an exported column (kept to export the schema again for streams)
+pub struct FieldDesc {
+    name: String,
+    arrow_type: ArrowType,
+}
+
+/// A buffer owned by an exported array
+enum OwnedBuffer {
+    Bytes(Vec<u8>),
+    Int32(Vec<i32>),
+    Int64(Vec<i64>),
+    Float64(Vec<f64>),
+}
+
+impl OwnedBuffer {
+    fn as_ptr(&self) -> *const c_void {
+        match self {
+            OwnedBuffer::Bytes(values) => values.as_ptr() as *const c_void,
+            OwnedBuffer::Int32(values) => values.as_ptr() as *const c_void,
+            OwnedBuffer::Int64(values) => values.as_ptr() as *const c_void,
+            OwnedBuffer::Float64(values) => values.as_ptr() as *const c_void,
+        }
+    }
+}
+
+/// Memory behind an exported array, freed by `release_array`
+struct ArrayPrivate {
+    _buffers: Vec<Option<OwnedBuffer>>,
+    buffer_ptrs: Vec<*const c_void>,
+    children: Vec<*mut ArrowArray>,
+}
+
+/// Memory behind an exported schema, freed by `release_schema`
+struct SchemaPrivate {
+    _format: CString,
+    _name: CString,
+    children: Vec<*mut ArrowSchema>,
+}
+
+/// Batch waiting to be pulled from an exported stream
+struct StreamPrivate {
+    fields: Vec<FieldDesc>,
+    array: Option<ArrowArray>,
+}
+
+impl ArrowArray {
+    /// An array marked as released (also the end-of-stream marker)
+    fn released() -> Self {
+        Self {
+            length: 0,
+            null_count: 0,
+            offset: 0,
+            n_buffers: 0,
+            n_children: 0,
+            buffers: ptr::null_mut(),
+            children: ptr::null_mut(),
+            dictionary: ptr::null_mut(),
+            release: None,
+            private_data: ptr::null_mut(),
+        }
+    }
+
+    fn new(length: usize, null_count: usize, buffers: Vec<Option<OwnedBuffer>>, children: Vec<ArrowArray>) -> Self {
+        let buffer_ptrs = buffers.iter()
+            .map(|buffer| buffer.as_ref().map_or(ptr::null(), |buffer| buffer.as_ptr()))
+            .collect();
+        let children = children.into_iter()
+            .map(|child| Box::into_raw(Box::new(child)))
+            .collect();
+        let mut private = Box::new(ArrayPrivate {
+            _buffers: buffers,
+            buffer_ptrs,
+            children,
+        });
+
+        Self {
+            length: length as i64,
+            null_count: null_count as i64,
+            offset: 0,
+            n_buffers: private.buffer_ptrs.len() as i64,
+            n_children: private.children.len() as i64,
+            buffers: private.buffer_ptrs.as_mut_ptr(),
+            children: if private.children.is_empty() { ptr::null_mut() } else { private.children.as_mut_ptr() },
+            dictionary: ptr::null_mut(),
+            release: Some(release_array),
+            private_data: Box::into_raw(private) as *mut c_void,
+        }
+    }
+}
+
+impl ArrowSchema {
+    fn new(format: &str, name: &str, flags: i64, children: Vec<ArrowSchema>) -> Self {
+        // Formats are static ASCII and names come from patterns, which can't contain null bytes
+        let format = CString::new(format).unwrap_or_default();
+        let name = CString::new(name).unwrap_or_default();
+        let children = children.into_iter()
+            .map(|child| Box::into_raw(Box::new(child)))
+            .collect();
+        let mut private = Box::new(SchemaPrivate {
+            _format: format,
+            _name: name,
+            children,
+        });
+
+        Self {
+            format: private._format.as_ptr(),
+            name: private._name.as_ptr(),
+            metadata: ptr::null(),
+            flags,
+            n_children: private.children.len() as i64,
+            children: if private.children.is_empty() { ptr::null_mut() } else { private.children.as_mut_ptr() },
+            dictionary: ptr::null_mut(),
+            release: Some(release_schema),
+            private_data: Box::into_raw(private) as *mut c_void,
+        }
+    }
+}
+
+unsafe extern "C" fn release_array(array: *mut ArrowArray) {
+    if array.is_null() || (*array).release.is_none() {
+        return;
+    }
+    let private = Box::from_raw((*array).private_data as *mut ArrayPrivate);
+    for &child in &private.children {
+        if let Some(release) = (*child).release {
+            release(child);
+        }
+        drop(Box::from_raw(child));
+    }
+    drop(private);
+    (*array).release = None;
+}
+
+unsafe extern "C" fn release_schema(schema: *mut ArrowSchema) {
+    if schema.is_null() || (*schema).release.is_none() {
+        return;
+    }
+    let private = Box::from_raw((*schema).private_data as *mut SchemaPrivate);
+    for &child in &private.children {
+        if let Some(release) = (*child).release {
+            release(child);
+        }
+        drop(Box::from_raw(child));
+    }
+    drop(private);
+    (*schema).release = None;
+}
+
+unsafe extern "C" fn stream_get_schema(stream: *mut ArrowArrayStream, out: *mut ArrowSchema) -> c_int {
+    let private = &*((*stream).private_data as *const StreamPrivate);
+    ptr::write(out, export_schema(&private.fields));
+    0
+}
+
+unsafe extern "C" fn stream_get_next(stream: *mut ArrowArrayStream, out: *mut ArrowArray) -> c_int {
+    let private = &mut *((*stream).private_data as *mut StreamPrivate);
+    // The single batch is moved to the consumer; afterwards a released array marks the end
+    ptr::write(out, private.array.take().unwrap_or_else(ArrowArray::released));
+    0
+}
+
+unsafe extern "C" fn stream_get_last_error(_stream: *mut ArrowArrayStream) -> *const c_char {
+    ptr::null()
+}
+
+unsafe extern "C" fn release_stream(stream: *mut ArrowArrayStream) {
+    if stream.is_null() || (*stream).release.is_none() {
+        return;
+    }
+    let mut private = Box::from_raw((*stream).private_data as *mut StreamPrivate);
+    if let Some(mut array) = private.array.take() {
+        release_array(&mut array);
+    }
+    drop(private);
+    (*stream).release = None;
+}
+
+/// Validity bitmap (bit set = valid), or None when every value is valid
+fn validity_bitmap(valid: &[bool]) -> (Option<OwnedBuffer>, usize) {
+    let null_count = valid.iter().filter(|&&is_valid| !is_valid).count();
+    if null_count == 0 {
+        return (None, 0);
+    }
+    (Some(OwnedBuffer::Bytes(pack_bits(valid))), null_count)
+}
+
+/// Pack booleans into an LSB-first bitmap
+fn pack_bits(bits: &[bool]) -> Vec<u8> {
+    let mut bytes = vec![0u8; (bits.len() + 7) / 8];
+    for (i, _) in bits.iter().enumerate().filter(|(_, &bit)| bit) {
+        bytes[i / 8] |= 1 << (i % 8);
+    }
+    bytes
+}
+
+/// Build the child array of one column; returns its final Arrow type
+fn export_column(cells: &[Option<&RawValue>], arrow_type: ArrowType) -> (ArrowArray, ArrowType) {
+    let length = cells.len();
+    match arrow_type {
+        ArrowType::Int64 => {
+            let values: Vec<Option<i64>> = cells.iter()
+                .map(|cell| match cell {
+                    Some(RawValue::Integer(n)) => Some(*n),
+                    _ => None,
+                })
+                .collect();
+            let valid: Vec<bool> = values.iter().map(Option::is_some).collect();
+            let (validity, null_count) = validity_bitmap(&valid);
+            let data = values.into_iter().map(|value| value.unwrap_or(0)).collect();
+            (ArrowArray::new(length, null_count, vec![validity, Some(OwnedBuffer::Int64(data))], Vec::new()), arrow_type)
+        }
+        ArrowType::Float64 => {
+            let values: Vec<Option<f64>> = cells.iter()
+                .map(|cell| match cell {
+                    Some(RawValue::Float(f)) => Some(*f),
+                    Some(RawValue::Integer(n)) => Some(*n as f64),  // 'g' fields hold ints or floats
+                    _ => None,
+                })
+                .collect();
+            let valid: Vec<bool> = values.iter().map(Option::is_some).collect();
+            let (validity, null_count) = validity_bitmap(&valid);
+            let data = values.into_iter().map(|value| value.unwrap_or(0.0)).collect();
+            (ArrowArray::new(length, null_count, vec![validity, Some(OwnedBuffer::Float64(data))], Vec::new()), arrow_type)
+        }
+        ArrowType::Boolean => {
+            let values: Vec<Option<bool>> = cells.iter()
+                .map(|cell| match cell {
+                    Some(RawValue::Boolean(b)) => Some(*b),
+                    _ => None,
+                })
+                .collect();
+            let valid: Vec<bool> = values.iter().map(Option::is_some).collect();
+            let (validity, null_count) = validity_bitmap(&valid);
+            let bits: Vec<bool> = values.into_iter().map(|value| value.unwrap_or(false)).collect();
+            (ArrowArray::new(length, null_count, vec![validity, Some(OwnedBuffer::Bytes(pack_bits(&bits)))], Vec::new()), arrow_type)
+        }
+        ArrowType::Utf8 | ArrowType::LargeUtf8 => {
+            let strings: Vec<Option<&str>> = cells.iter()
+                .map(|cell| match cell {
+                    Some(RawValue::String(s)) => Some(s.as_str()),
+                    _ => None,
+                })
+                .collect();
+            let valid: Vec<bool> = strings.iter().map(Option::is_some).collect();
+            let (validity, null_count) = validity_bitmap(&valid);
+
+            let total_len: usize = strings.iter().flatten().map(|s| s.len()).sum();
+            let mut data = Vec::with_capacity(total_len);
+            let mut offsets = Vec::with_capacity(length + 1);
+            offsets.push(0usize);
+            for s in &strings {
+                data.extend_from_slice(s.unwrap_or("").as_bytes());
+                offsets.push(data.len());
+            }
+
+            let (offsets, arrow_type) = if total_len <= i32::MAX as usize {
+                (OwnedBuffer::Int32(offsets.into_iter().map(|o| o as i32).collect()), ArrowType::Utf8)
+            } else {
+                (OwnedBuffer::Int64(offsets.into_iter().map(|o| o as i64).collect()), ArrowType::LargeUtf8)
+            };
+            (ArrowArray::new(length, null_count, vec![validity, Some(offsets), Some(OwnedBuffer::Bytes(data))], Vec::new()), arrow_type)
+        }
+    }
+}
+
+/// Name of an exported column (positional fields use their index)
+fn field_name(key: &ColumnKey) -> String {
+    match key {
+        ColumnKey::Fixed(index) => index.to_string(),
+        ColumnKey::Named(name) => name.clone(),
+    }
+}
+
+/// Build the struct array for a batch of matches: one row per entry, one child per column
+/// Unmatched entries (None) are rows whose fields are all null
+pub fn export_batch(entries: &[Option<RawMatchData>], columns: &[Column]) -> (Vec<FieldDesc>, ArrowArray) {
+    let mut fields = Vec::with_capacity(columns.len());
+    let mut children = Vec::with_capacity(columns.len());
+    for column in columns {
+        let cells: Vec<Option<&RawValue>> = entries.iter()
+            .map(|entry| column.key.raw_cell(entry))
+            .collect();
+        let (child, arrow_type) = export_column(&cells, ArrowType::for_field_type(&column.field_type));
+        fields.push(FieldDesc { name: field_name(&column.key), arrow_type });
+        children.push(child);
+    }
+    // Struct arrays have a single (validity) buffer; the top level itself is never null
+    let array = ArrowArray::new(entries.len(), 0, vec![None], children);
+    (fields, array)
+}
+
+/// Build the struct schema matching `export_batch`
+pub fn export_schema(fields: &[FieldDesc]) -> ArrowSchema {
+    let children = fields.iter()
+        .map(|field| ArrowSchema::new(field.arrow_type.format(), &field.name, ARROW_FLAG_NULLABLE, Vec::new()))
+        .collect();
+    ArrowSchema::new("+s", "", 0, children)
+}
+
+/// Build a stream that yields the batch once
+pub fn export_stream(fields: Vec<FieldDesc>, array: ArrowArray) -> ArrowArrayStream {
+    let private = Box::new(StreamPrivate {
+        fields,
+        array: Some(array),
+    });
+    ArrowArrayStream {
+        get_schema: Some(stream_get_schema),
+        get_next: Some(stream_get_next),
+        get_last_error: Some(stream_get_last_error),
+        release: Some(release_stream),
+        private_data: Box::into_raw(private) as *mut c_void,
+    }
+}
+
+/// Wrap a schema in an "arrow_schema" capsule
+/// If the consumer never moves the schema out, it is released with the capsule
+fn schema_capsule(py: Python, schema: ArrowSchema) -> PyResult<Bound<'_, PyCapsule>> {
+    PyCapsule::new_with_destructor(py, schema, CString::new("arrow_schema").ok(), |mut schema, _| {
+        if let Some(release) = schema.release {
+            unsafe { release(&mut schema) };
+        }
+    })
+}
+
+/// Wrap an array in an "arrow_array" capsule (released with the capsule unless moved out)
+fn array_capsule(py: Python, array: ArrowArray) -> PyResult<Bound<'_, PyCapsule>> {
+    PyCapsule::new_with_destructor(py, array, CString::new("arrow_array").ok(), |mut array, _| {
+        if let Some(release) = array.release {
+            unsafe { release(&mut array) };
+        }
+    })
+}
+
+/// Wrap a stream in an "arrow_array_stream" capsule (released with the capsule unless moved out)
+fn stream_capsule(py: Python, stream: ArrowArrayStream) -> PyResult<Bound<'_, PyCapsule>> {
+    PyCapsule::new_with_destructor(py, stream, CString::new("arrow_array_stream").ok(), |mut stream, _| {
+        if let Some(release) = stream.release {
+            unsafe { release(&mut stream) };
+        }
+    })
+}
+
+/// `__arrow_c_array__`: (schema capsule, array capsule) for raw match data
+pub fn arrow_c_array<'py>(
+    py: Python<'py>,
+    entries: &[Option<RawMatchData>],
+    columns: &[Column],
+) -> PyResult<Bound<'py, PyTuple>> {
+    let (fields, array) = export_batch(entries, columns);
+    let schema = schema_capsule(py, export_schema(&fields))?;
+    let array = array_capsule(py, array)?;
+    PyTuple::new(py, [schema.into_any(), array.into_any()])
+}
+
+/// `__arrow_c_stream__`: stream capsule yielding the raw match data as one batch
+pub fn arrow_c_stream<'py>(
+    py: Python<'py>,
+    entries: &[Option<RawMatchData>],
+    columns: &[Column],
+) -> PyResult<Bound<'py, PyCapsule>> {
+    let (fields, array) = export_batch(entries, columns);
+    stream_capsule(py, export_stream(fields, array))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::ffi::CStr;
+
+    fn raw(named: &[(&str, RawValue)]) -> Option<RawMatchData> {
+        let mut data = RawMatchData::new();
+        for (name, value) in named {
+            data.named.insert(name.to_string(), value.clone());
+        }
+        Some(data)
+    }
+
+    fn column(name: &str, field_type: FieldType) -> Column {
+        Column { key: ColumnKey::Named(name.to_string()), field_type }
+    }
+
+    unsafe fn buffer<T: Copy>(array: &ArrowArray, index: usize, len: usize) -> Vec<T> {
+        let ptr = *array.buffers.add(index) as *const T;
+        std::slice::from_raw_parts(ptr, len).to_vec()
+    }
+
+    #[test]
+    fn test_pack_bits() {
+        assert_eq!(pack_bits(&[true, false, true, true, false, false, false, false, true]), vec![0b0000_1101, 0b1]);
+    }
+
+    #[test]
+    fn test_export_batch_buffers() {
+        let entries = vec![
+            raw(&[("n", RawValue::Integer(1)), ("s", RawValue::String("ab".to_string()))]),
+            None,
+            raw(&[("n", RawValue::Integer(3)), ("s", RawValue::String("c".to_string()))]),
+        ];
+        let columns = vec![column("n", FieldType::Integer), column("s", FieldType::String)];
+        let (fields, mut array) = export_batch(&entries, &columns);
+
+        assert_eq!(fields.len(), 2);
+        assert_eq!(fields[1].arrow_type, ArrowType::Utf8);
+        assert_eq!(array.length, 3);
+        assert_eq!(array.n_children, 2);
+        unsafe {
+            let ints = &**array.children;
+            assert_eq!(ints.null_count, 1);
+            assert_eq!(buffer::<u8>(ints, 0, 1), vec![0b101]);
+            assert_eq!(buffer::<i64>(ints, 1, 3), vec![1, 0, 3]);
+
+            let strings = &**array.children.add(1);
+            assert_eq!(buffer::<i32>(strings, 1, 4), vec![0, 2, 2, 3]);
+            assert_eq!(buffer::<u8>(strings, 2, 3), b"abc".to_vec());
+
+            release_array(&mut array);
+        }
+        assert!(array.release.is_none());
+    }
+
+    #[test]
+    fn test_export_batch_no_nulls_has_no_validity_buffer() {
+        let entries = vec![raw(&[("x", RawValue::Float(0.5))]), raw(&[("x", RawValue::Integer(2))])];
+        let (_, mut array) = export_batch(&entries, &[column("x", FieldType::GeneralNumber)]);
+        unsafe {
+            let floats = &**array.children;
+            assert_eq!(floats.null_count, 0);
+            assert!((*floats.buffers).is_null());
+            assert_eq!(buffer::<f64>(floats, 1, 2), vec![0.5, 2.0]);
+            release_array(&mut array);
+        }
+    }
+
+    #[test]
+    fn test_export_schema() {
+        let fields = vec![
+            FieldDesc { name: "n".to_string(), arrow_type: ArrowType::Int64 },
+            FieldDesc { name: "0".to_string(), arrow_type: ArrowType::Utf8 },
+        ];
+        let mut schema = export_schema(&fields);
+        unsafe {
+            assert_eq!(CStr::from_ptr(schema.format).to_str().unwrap(), "+s");
+            assert_eq!(schema.n_children, 2);
+            let child = &**schema.children.add(1);
+            assert_eq!(CStr::from_ptr(child.format).to_str().unwrap(), "u");
+            assert_eq!(CStr::from_ptr(child.name).to_str().unwrap(), "0");
+            assert_eq!(child.flags, ARROW_FLAG_NULLABLE);
+            release_schema(&mut schema);
+        }
+        assert!(schema.release.is_none());
+    }
+
+    #[test]
+    fn test_export_stream_yields_batch_once() {
+        let entries = vec![raw(&[("n", RawValue::Integer(7))])];
+        let (fields, array) = export_batch(&entries, &[column("n", FieldType::Integer)]);
+        let mut stream = export_stream(fields, array);
+        unsafe {
+            let mut schema = std::mem::MaybeUninit::<ArrowSchema>::uninit();
+            assert_eq!(stream_get_schema(&mut stream, schema.as_mut_ptr()), 0);
+            let mut schema = schema.assume_init();
+            assert_eq!(schema.n_children, 1);
+            release_schema(&mut schema);
+
+            let mut batch = std::mem::MaybeUninit::<ArrowArray>::uninit();
+            assert_eq!(stream_get_next(&mut stream, batch.as_mut_ptr()), 0);
+            let mut batch = batch.assume_init();
+            assert_eq!(batch.length, 1);
+            release_array(&mut batch);
+
+            let mut end = std::mem::MaybeUninit::<ArrowArray>::uninit();
+            stream_get_next(&mut stream, end.as_mut_ptr());
+            assert!(end.assume_init().release.is_none());
+
+            release_stream(&mut stream);
+        }
+        assert!(stream.release.is_none());
+    }
+}
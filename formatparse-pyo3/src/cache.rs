@@ -0,0 +1,313 @@
+//! Cache of compiled patterns used by the module-level functions
+//!
+//! `parse`, `search`, `findall`, ... look their pattern up here instead of compiling it on
+//! every call. The cache is an LRU with hit/miss/eviction counters; its size comes from
+//! the FORMATPARSE_CACHE_SIZE environment variable and can be changed at runtime.
+//!
+//! Each thread also keeps its most recently used parsers in a small thread-local cache
+//! that is checked before the shared LRU, so repeated calls with the same patterns don't
+//! take the shared lock (which is contended when many threads parse at once). The front
+//! caches only hold weak references, so a parser (and the converters it calls) is freed as
+//! soon as the shared cache drops it, whichever threads used it.
+
+use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
+use std::cell::RefCell;
+use std::collections::HashMap;
+use std::collections::hash_map::DefaultHasher;
+use std::hash::{Hash, Hasher};
+use std::num::NonZeroUsize;
+use std::sync::atomic::{AtomicU64, Ordering};
+use std::sync::{Arc, Mutex, Weak};
+use once_cell::sync::Lazy;
+use lru::LruCache;
+use formatparse_core::DateTimeOutput;
+use crate::parser::FormatParser;
+
+/// Number of patterns cached when FORMATPARSE_CACHE_SIZE isn't set
+pub const DEFAULT_CACHE_SIZE: usize = 1000;
+
+/// Environment variable with the initial cache size (read once, on first use)
+pub const CACHE_SIZE_ENV_VAR: &str = "FORMATPARSE_CACHE_SIZE";
+
+/// Number of parsers each thread keeps in front of the shared cache
+const FRONT_CACHE_SIZE: usize = 16;
+
+/// LRU of compiled parsers plus miss/eviction counters (hits are counted in HITS)
+///
+/// Parsers are cached in two levels. `entries` is keyed on everything a parser depends on,
+/// including which converter objects it calls. `structures` is keyed on what the compiled
+/// regex depends on (the converters' patterns and group counts, but not the converters), so
+/// calls with new converter functions for a known pattern reuse its regex and field specs.
+struct PatternCache {
+    entries: LruCache<u64, Arc<FormatParser>>,
+    structures: LruCache<u64, Arc<FormatParser>>,
+    misses: u64,
+    evictions: u64,
+}
+
+impl PatternCache {
+    fn new(size: NonZeroUsize) -> Self {
+        Self {
+            entries: LruCache::new(size),
+            structures: LruCache::new(size),
+            misses: 0,
+            evictions: 0,
+        }
+    }
+
+    /// Look a parser up, counting a hit or a miss
+    fn get(&mut self, key: u64) -> Option<Arc<FormatParser>> {
+        let parser = self.entries.get(&key).cloned();
+        if parser.is_some() {
+            HITS.fetch_add(1, Ordering::Relaxed);
+        } else {
+            self.misses += 1;
+        }
+        parser
+    }
+
+    /// Look up a compiled parser with the same structure (bound to other converters)
+    fn get_structure(&mut self, key: u64) -> Option<Arc<FormatParser>> {
+        self.structures.get(&key).cloned()
+    }
+
+    /// Insert a parser, counting the entry pushed out if the cache is full
+    fn insert(&mut self, keys: CacheKeys, parser: Arc<FormatParser>) {
+        INSERTS.fetch_add(1, Ordering::Relaxed);
+        if keys.binding != keys.structure {
+            self.structures.push(keys.structure, parser.clone());
+        }
+        // push returns the replaced entry for an existing key (another thread compiled the
+        // same pattern first), which isn't an eviction
+        if let Some((evicted_key, _)) = self.entries.push(keys.binding, parser) {
+            if evicted_key != keys.binding {
+                self.evictions += 1;
+            }
+        }
+    }
+
+    fn resize(&mut self, size: NonZeroUsize) {
+        let evicted = self.entries.len().saturating_sub(size.get());
+        self.entries.resize(size);
+        self.structures.resize(size);
+        self.evictions += evicted as u64;
+    }
+
+    fn clear(&mut self) {
+        self.entries.clear();
+        self.structures.clear();
+        HITS.store(0, Ordering::Relaxed);
+        self.misses = 0;
+        self.evictions = 0;
+    }
+}
+
+/// Initial cache size: FORMATPARSE_CACHE_SIZE if it is a positive integer, else the default
+fn initial_cache_size() -> NonZeroUsize {
+    std::env::var(CACHE_SIZE_ENV_VAR)
+        .ok()
+        .and_then(|value| value.trim().parse::<usize>().ok())
+        .and_then(NonZeroUsize::new)
+        .unwrap_or(NonZeroUsize::new(DEFAULT_CACHE_SIZE).unwrap())
+}
+
+// Using u64 hash as key for faster lookups
+// Using Arc to avoid expensive clones
+static PATTERN_CACHE: Lazy<Mutex<PatternCache>> = Lazy::new(|| {
+    Mutex::new(PatternCache::new(initial_cache_size()))
+});
+
+/// Cache hits, in the shared cache or a thread's front cache (atomic so front hits don't lock)
+static HITS: AtomicU64 = AtomicU64::new(0);
+
+/// Bumped by clear_cache() and set_cache_size() so every thread drops its front cache
+static GENERATION: AtomicU64 = AtomicU64::new(0);
+
+/// Parsers added to the shared cache (only insertions evict, so a front hit only needs to
+/// refresh its entry in the shared LRU when this has changed since the entry was refreshed)
+static INSERTS: AtomicU64 = AtomicU64::new(0);
+
+/// Parsers the current thread used recently, valid while `generation` is current
+/// Entries are weak: they stop resolving once the shared cache has dropped the parser
+struct FrontCache {
+    generation: u64,
+    entries: LruCache<u64, FrontEntry>,
+}
+
+struct FrontEntry {
+    parser: Weak<FormatParser>,
+    /// INSERTS when the entry was last made most recent in the shared cache
+    inserts: u64,
+}
+
+thread_local! {
+    static FRONT_CACHE: RefCell<FrontCache> = RefCell::new(FrontCache {
+        generation: 0,
+        entries: LruCache::new(NonZeroUsize::new(FRONT_CACHE_SIZE).unwrap()),
+    });
+}
+
+/// Look a parser up in the current thread's front cache
+///
+/// A hit also counts as a use in the shared LRU, so patterns that are only ever front hits
+/// aren't evicted first. It is promoted there lazily: only if parsers were added since its
+/// last promotion.
+fn front_cache_get(key: u64) -> Option<Arc<FormatParser>> {
+    let generation = GENERATION.load(Ordering::Acquire);
+    let inserts = INSERTS.load(Ordering::Relaxed);
+    // try_with: the thread-local is gone while the thread shuts down
+    let (parser, stale) = FRONT_CACHE.try_with(|front| {
+        let mut front = front.borrow_mut();
+        if front.generation != generation {
+            front.entries.clear();
+            front.generation = generation;
+        }
+        let entry = front.entries.get_mut(&key)?;
+        let parser = entry.parser.upgrade();
+        let stale = entry.inserts != inserts;
+        entry.inserts = inserts;
+        if parser.is_none() {
+            front.entries.pop(&key);
+        }
+        Some((parser?, stale))
+    }).ok().flatten()?;
+    if stale {
+        PATTERN_CACHE.lock().unwrap().entries.promote(&key);
+    }
+    Some(parser)
+}
+
+fn front_cache_insert(key: u64, parser: &Arc<FormatParser>) {
+    let entry = FrontEntry { parser: Arc::downgrade(parser), inserts: INSERTS.load(Ordering::Relaxed) };
+    let _ = FRONT_CACHE.try_with(|front| {
+        front.borrow_mut().entries.put(key, entry);
+    });
+}
+
+/// Cache keys of a parser (equal when there are no custom converters)
+#[derive(Clone, Copy)]
+struct CacheKeys {
+    /// Pattern, projection and what each converter contributes to the regex
+    structure: u64,
+    /// Structure key plus the identity of each converter object
+    binding: u64,
+}
+
+/// Create the cache keys from pattern, extra_types, field projection and datetime output
+///
+/// Converters are identified by id(). A cached parser holds a reference to its converters,
+/// so their ids can't be reused by other objects while the entry exists.
+fn create_cache_keys(
+    py: Python,
+    pattern: &str,
+    extra_types: &Option<HashMap<String, PyObject>>,
+    fields: &Option<Vec<String>>,
+    datetime_output: DateTimeOutput,
+) -> CacheKeys {
+    let mut hasher = DefaultHasher::new();
+    pattern.hash(&mut hasher);
+    fields.hash(&mut hasher);
+    datetime_output.hash(&mut hasher);
+
+    // Sort names for consistent hashing
+    let mut converters: Vec<(&String, &PyObject)> = extra_types.iter().flatten().collect();
+    converters.sort_by(|a, b| a.0.cmp(b.0));
+    for (name, converter) in &converters {
+        let converter = converter.bind(py);
+        let converter_pattern = converter.getattr("pattern")
+            .ok()
+            .and_then(|attr| attr.extract::<String>().ok());
+        let group_count = converter.getattr("regex_group_count")
+            .ok()
+            .map(|attr| attr.extract::<i64>().ok());
+        name.hash(&mut hasher);
+        converter_pattern.hash(&mut hasher);
+        group_count.hash(&mut hasher);
+    }
+    let structure = hasher.finish();
+
+    if converters.is_empty() {
+        return CacheKeys { structure, binding: structure };
+    }
+    for (_, converter) in &converters {
+        (converter.as_ptr() as usize).hash(&mut hasher);
+    }
+    CacheKeys { structure, binding: hasher.finish() }
+}
+
+/// Get or create a FormatParser from cache
+pub fn get_or_create_parser(
+    pattern: &str,
+    extra_types: Option<HashMap<String, PyObject>>,
+    fields: Option<Vec<String>>,
+    datetime_output: DateTimeOutput,
+) -> PyResult<Arc<FormatParser>> {
+    let keys = Python::with_gil(|py| create_cache_keys(py, pattern, &extra_types, &fields, datetime_output));
+
+    if let Some(cached_parser) = front_cache_get(keys.binding) {
+        HITS.fetch_add(1, Ordering::Relaxed);
+        return Ok(cached_parser);
+    }
+
+    // Try to get from the shared cache (minimize lock scope)
+    let (cached, structure) = {
+        let mut cache = PATTERN_CACHE.lock().unwrap();
+        match cache.get(keys.binding) {
+            Some(parser) => (Some(parser), None),
+            None if keys.binding != keys.structure => (None, cache.get_structure(keys.structure)),
+            None => (None, None),
+        }
+    };
+    if let Some(cached_parser) = cached {
+        front_cache_insert(keys.binding, &cached_parser);
+        return Ok(cached_parser);
+    }
+
+    // Not in cache: bind the new converters to a parser with the same structure, or
+    // create a new parser (without holding the lock)
+    let parser = match structure {
+        Some(structure) => Arc::new(structure.with_extra_types(extra_types)),
+        None => {
+            let parser = FormatParser::new_with_fields(pattern, extra_types, fields)?;
+            Arc::new(parser.with_datetime_output(datetime_output))
+        },
+    };
+    PATTERN_CACHE.lock().unwrap().insert(keys, parser.clone());
+    front_cache_insert(keys.binding, &parser);
+
+    Ok(parser)
+}
+
+/// Cache statistics: (hits, misses, evictions, maxsize, currsize)
+#[pyfunction]
+pub fn cache_info() -> (u64, u64, u64, usize, usize) {
+    let cache = PATTERN_CACHE.lock().unwrap();
+    (
+        HITS.load(Ordering::Relaxed),
+        cache.misses,
+        cache.evictions,
+        cache.entries.cap().get(),
+        cache.entries.len(),
+    )
+}
+
+/// Change the maximum number of cached patterns (least recently used ones are evicted)
+#[pyfunction]
+pub fn set_cache_size(size: usize) -> PyResult<()> {
+    let size = NonZeroUsize::new(size)
+        .ok_or_else(|| PyValueError::new_err("cache size must be at least 1"))?;
+    PATTERN_CACHE.lock().unwrap().resize(size);
+    GENERATION.fetch_add(1, Ordering::Release);
+    Ok(())
+}
+
+/// Remove every cached pattern and reset the statistics
+///
+/// Parsers and their converters are freed here, not on each thread's next lookup, unless a
+/// call that is still running holds them
+#[pyfunction]
+pub fn clear_cache() {
+    PATTERN_CACHE.lock().unwrap().clear();
+    GENERATION.fetch_add(1, Ordering::Release);
+}
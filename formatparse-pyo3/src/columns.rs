@@ -0,0 +1,304 @@
+use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
+use pyo3::types::{PyBool, PyBytes, PyDict, PyFloat, PyList, PyInt};
+use crate::parser::raw_match::{RawMatchData, RawValue};
+use formatparse_core::{FieldSpec, FieldType};
+use crate::result::ParseResult;
+use crate::results::Results;
+use crate::types::conversion::infallible_object;
+
+/// Key of an output column: a positional field index or a field name
+#[derive(Clone, Debug, PartialEq)]
+pub enum ColumnKey {
+    Fixed(usize),
+    Named(String),
+}
+
+impl ColumnKey {
+    pub(crate) fn to_object(&self, py: Python) -> PyObject {
+        match self {
+            ColumnKey::Fixed(index) => infallible_object(py, index),
+            ColumnKey::Named(name) => infallible_object(py, name),
+        }
+    }
+
+    /// Value of this column in one raw match (None if unmatched or the field didn't participate)
+    pub(crate) fn raw_cell<'a>(&self, entry: &'a Option<RawMatchData>) -> Option<&'a RawValue> {
+        let raw_data = entry.as_ref()?;
+        match self {
+            ColumnKey::Fixed(index) => raw_data.fixed.get(*index),
+            ColumnKey::Named(name) => raw_data.named.get(name),
+        }
+    }
+
+    /// Value of this column in one ParseResult
+    pub(crate) fn object_cell(&self, py: Python, result: &ParseResult) -> Option<PyObject> {
+        match self {
+            ColumnKey::Fixed(index) => result.fixed.get(*index).map(|v| v.clone_ref(py)),
+            ColumnKey::Named(name) => result.named.get(name).map(|v| v.clone_ref(py)),
+        }
+    }
+}
+
+/// A field of the pattern as reported in columnar output
+#[derive(Clone, Debug)]
+pub struct Column {
+    pub key: ColumnKey,
+    pub field_type: FieldType,
+}
+
+/// Output columns in pattern order: positional fields by index, named fields once each
+/// Nested names like "a[b]" share the column of their top-level name
+pub fn pattern_columns(field_specs: &[FieldSpec], field_names: &[Option<String>]) -> Vec<Column> {
+    let mut columns: Vec<Column> = Vec::with_capacity(field_names.len());
+    let mut fixed_index = 0;
+    for (spec, name) in field_specs.iter().zip(field_names) {
+        let key = match name {
+            None => {
+                fixed_index += 1;
+                ColumnKey::Fixed(fixed_index - 1)
+            }
+            Some(name) => {
+                let top_level = name.split('[').next().unwrap_or(name);
+                ColumnKey::Named(top_level.to_string())
+            }
+        };
+        if !columns.iter().any(|column| column.key == key) {
+            columns.push(Column { key, field_type: spec.field_type.clone() });
+        }
+    }
+    columns
+}
+
+/// Create an array.array from native-endian item bytes (one copy, no per-item objects)
+fn new_array(py: Python, typecode: &str, bytes: &[u8]) -> PyResult<PyObject> {
+    let array = py.import("array")?.getattr("array")?.call1((typecode,))?;
+    array.call_method1("frombytes", (PyBytes::new(py, bytes),))?;
+    Ok(array.unbind())
+}
+
+fn int_array(py: Python, values: &[i64]) -> PyResult<PyObject> {
+    let bytes: Vec<u8> = values.iter().flat_map(|n| n.to_ne_bytes()).collect();
+    new_array(py, "q", &bytes)
+}
+
+fn float_array(py: Python, values: &[f64]) -> PyResult<PyObject> {
+    let bytes: Vec<u8> = values.iter().flat_map(|f| f.to_ne_bytes()).collect();
+    new_array(py, "d", &bytes)
+}
+
+fn bool_array(py: Python, values: &[bool]) -> PyResult<PyObject> {
+    let bytes: Vec<u8> = values.iter().map(|&b| b as u8).collect();
+    new_array(py, "B", &bytes)
+}
+
+/// Build one column from raw values
+/// Uses an array.array when every row holds an int ('q'), float ('d') or bool ('B'), otherwise a list
+fn raw_column(py: Python, cells: &[Option<&RawValue>]) -> PyResult<PyObject> {
+    if !cells.is_empty() {
+        let ints: Option<Vec<i64>> = cells.iter()
+            .map(|cell| match cell {
+                Some(RawValue::Integer(n)) => Some(*n),
+                _ => None,
+            })
+            .collect();
+        if let Some(ints) = ints {
+            return int_array(py, &ints);
+        }
+
+        let floats: Option<Vec<f64>> = cells.iter()
+            .map(|cell| match cell {
+                Some(RawValue::Float(f)) => Some(*f),
+                _ => None,
+            })
+            .collect();
+        if let Some(floats) = floats {
+            return float_array(py, &floats);
+        }
+
+        let bools: Option<Vec<bool>> = cells.iter()
+            .map(|cell| match cell {
+                Some(RawValue::Boolean(b)) => Some(*b),
+                _ => None,
+            })
+            .collect();
+        if let Some(bools) = bools {
+            return bool_array(py, &bools);
+        }
+    }
+
+    let items: Vec<PyObject> = cells.iter()
+        .map(|cell| cell.map(|value| value.to_py_object(py)).unwrap_or_else(|| py.None()))
+        .collect();
+    Ok(PyList::new(py, items)?.into_any().unbind())
+}
+
+/// Build one column from Python values (same typing rules as `raw_column`)
+fn object_column(py: Python, cells: Vec<Option<PyObject>>) -> PyResult<PyObject> {
+    if !cells.is_empty() {
+        // Exact type checks: bool is a subclass of int, and int subclasses may carry extra state
+        let ints: Option<Vec<i64>> = cells.iter()
+            .map(|cell| cell.as_ref()
+                .map(|value| value.bind(py))
+                .filter(|value| value.is_exact_instance_of::<PyInt>())
+                .and_then(|value| value.extract::<i64>().ok()))
+            .collect();
+        if let Some(ints) = ints {
+            return int_array(py, &ints);
+        }
+
+        let floats: Option<Vec<f64>> = cells.iter()
+            .map(|cell| cell.as_ref()
+                .map(|value| value.bind(py))
+                .filter(|value| value.is_exact_instance_of::<PyFloat>())
+                .and_then(|value| value.extract::<f64>().ok()))
+            .collect();
+        if let Some(floats) = floats {
+            return float_array(py, &floats);
+        }
+
+        let bools: Option<Vec<bool>> = cells.iter()
+            .map(|cell| cell.as_ref()
+                .map(|value| value.bind(py))
+                .filter(|value| value.is_exact_instance_of::<PyBool>())
+                .and_then(|value| value.extract::<bool>().ok()))
+            .collect();
+        if let Some(bools) = bools {
+            return bool_array(py, &bools);
+        }
+    }
+
+    let items: Vec<PyObject> = cells.into_iter()
+        .map(|cell| cell.unwrap_or_else(|| py.None()))
+        .collect();
+    Ok(PyList::new(py, items)?.into_any().unbind())
+}
+
+/// Build a {key: column} dict straight from raw match data (no ParseResult objects are created)
+/// None entries (unmatched inputs) become None in every column
+pub fn raw_columns(py: Python, entries: &[Option<RawMatchData>], columns: &[Column]) -> PyResult<PyObject> {
+    let output = PyDict::new(py);
+    for column in columns {
+        let cells: Vec<Option<&RawValue>> = entries.iter()
+            .map(|entry| column.key.raw_cell(entry))
+            .collect();
+        output.set_item(column.key.to_object(py), raw_column(py, &cells)?)?;
+    }
+    Ok(output.into_any().unbind())
+}
+
+/// Build a {key: column} dict from ParseResult objects (None items are unmatched inputs)
+pub fn object_columns(py: Python, results: &[PyObject], columns: &[Column]) -> PyResult<PyObject> {
+    let parse_results = borrow_parse_results(py, results);
+
+    let output = PyDict::new(py);
+    for column in columns {
+        let cells: Vec<Option<PyObject>> = parse_results.iter()
+            .map(|result| result.as_ref().and_then(|result| column.key.object_cell(py, result)))
+            .collect();
+        output.set_item(column.key.to_object(py), object_column(py, cells)?)?;
+    }
+    Ok(output.into_any().unbind())
+}
+
+/// Borrow the ParseResult behind each item (None for unmatched items)
+pub fn borrow_parse_results<'py>(py: Python<'py>, results: &[PyObject]) -> Vec<Option<PyRef<'py, ParseResult>>> {
+    results.iter()
+        .map(|obj| obj.bind(py).downcast::<ParseResult>().ok().map(|result| result.borrow()))
+        .collect()
+}
+
+/// Items of a batch that isn't a Results object (a list of ParseResult/None)
+pub fn batch_items(batch: &Bound<'_, PyAny>) -> PyResult<Vec<PyObject>> {
+    batch.try_iter()?
+        .map(|item| item.map(|item| item.unbind()))
+        .collect()
+}
+
+/// Convert a batch (Results, or a list of ParseResult/None) to columns
+pub fn batch_columns(py: Python, batch: &PyObject, columns: &[Column]) -> PyResult<PyObject> {
+    let batch = batch.bind(py);
+    if let Ok(results) = batch.downcast::<Results>() {
+        return results.borrow().columns(py);
+    }
+    object_columns(py, &batch_items(batch)?, columns)
+}
+
+/// Check the output options of a batch API before doing any work
+pub fn validate_batch_output(
+    evaluate_result: bool,
+    as_columns: bool,
+    as_numpy: bool,
+    has_out: bool,
+) -> PyResult<()> {
+    if as_columns && as_numpy {
+        return Err(PyValueError::new_err("columns=True and as_numpy=True can't be combined"));
+    }
+    if has_out && !as_numpy {
+        return Err(PyValueError::new_err("out requires as_numpy=True"));
+    }
+    if as_columns && !evaluate_result {
+        return Err(PyValueError::new_err("columns=True requires evaluate_result=True"));
+    }
+    if as_numpy && !evaluate_result {
+        return Err(PyValueError::new_err("as_numpy=True requires evaluate_result=True"));
+    }
+    Ok(())
+}
+
+/// Return a batch (Results, or a list of ParseResult/None) in the requested output format
+pub fn finish_batch(
+    py: Python,
+    batch: PyObject,
+    columns: &[Column],
+    as_columns: bool,
+    as_numpy: bool,
+    out: Option<&Bound<'_, PyAny>>,
+) -> PyResult<PyObject> {
+    if as_numpy {
+        crate::numpy::batch_to_numpy(py, &batch, columns, out)
+    } else if as_columns {
+        batch_columns(py, &batch, columns)
+    } else {
+        Ok(batch)
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn keys(columns: &[Column]) -> Vec<ColumnKey> {
+        columns.iter().map(|column| column.key.clone()).collect()
+    }
+
+    #[test]
+    fn test_pattern_columns_order() {
+        let specs = vec![FieldSpec::default(); 4];
+        let names = vec![None, Some("b".to_string()), None, Some("a".to_string())];
+        assert_eq!(keys(&pattern_columns(&specs, &names)), vec![
+            ColumnKey::Fixed(0),
+            ColumnKey::Named("b".to_string()),
+            ColumnKey::Fixed(1),
+            ColumnKey::Named("a".to_string()),
+        ]);
+    }
+
+    #[test]
+    fn test_pattern_columns_repeated_and_nested_names() {
+        let mut specs = vec![FieldSpec::default(); 4];
+        specs[0].field_type = FieldType::Integer;
+        let names = vec![
+            Some("x".to_string()),
+            Some("x".to_string()),
+            Some("d[a]".to_string()),
+            Some("d[b]".to_string()),
+        ];
+        let columns = pattern_columns(&specs, &names);
+        assert_eq!(keys(&columns), vec![
+            ColumnKey::Named("x".to_string()),
+            ColumnKey::Named("d".to_string()),
+        ]);
+        assert!(matches!(columns[0].field_type, FieldType::Integer));
+    }
+}
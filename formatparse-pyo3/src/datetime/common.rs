@@ -1,7 +1,13 @@
 use pyo3::prelude::*;
+use pyo3::IntoPyObjectExt;
+use pyo3::types::{PyDate, PyDateAccess, PyDateTime, PyDelta, PyDeltaAccess, PyTime, PyTimeAccess, PyTzInfo};
+use formatparse_core::{CivilDateTime, DateTimeOutput};
 use regex::Regex;
 use once_cell::sync::Lazy;
 use std::collections::HashMap;
+use std::sync::atomic::{AtomicBool, Ordering};
+use std::sync::Mutex;
+use std::time::{SystemTime, UNIX_EPOCH};
 
 // Cached regex patterns for timezone and time parsing
 pub(crate) static RE_TZ_COLON: Lazy<Regex> = Lazy::new(|| {
@@ -45,25 +51,124 @@ pub fn get_abbreviated_month_map() -> HashMap<&'static str, u8> {
     ].iter().cloned().collect()
 }
 
-/// Create a FixedTzOffset from offset minutes
+/// tzinfo objects already created, by (builtin timezone, offset seconds, name). Logs repeat
+/// a handful of offsets, so each value's tzinfo is looked up here instead of being constructed.
+static TZ_CACHE: Lazy<Mutex<HashMap<(bool, i32, String), PyObject>>> = Lazy::new(|| Mutex::new(HashMap::new()));
+
+/// Whether tz-aware values get datetime.timezone instead of formatparse.FixedTzOffset
+static BUILTIN_TIMEZONES: AtomicBool = AtomicBool::new(false);
+
+/// Switch between FixedTzOffset and datetime.timezone for parsed offsets
+/// (drops the cached objects of the previous type)
+#[pyfunction]
+pub fn set_builtin_timezones(enabled: bool) {
+    BUILTIN_TIMEZONES.store(enabled, Ordering::Relaxed);
+    TZ_CACHE.lock().unwrap().retain(|(builtin, _, _), _| *builtin == enabled);
+}
+
+/// Build a new datetime.timezone or FixedTzOffset
+fn new_tzinfo(py: Python, builtin: bool, offset_seconds: i32, name: &str) -> PyResult<PyObject> {
+    if builtin {
+        let timezone_class = py.import("datetime")?.getattr("timezone")?;
+        let offset = PyDelta::new(py, 0, offset_seconds, 0, true)?;
+        // Without a name, tzname() gives "UTC+HH:MM" (or "UTC" for a zero offset)
+        let tz = if name.is_empty() {
+            timezone_class.call1((offset,))?
+        } else {
+            timezone_class.call1((offset, name))?
+        };
+        return Ok(tz.unbind());
+    }
+    let fixed_tz_class = py.import("formatparse")?.getattr("FixedTzOffset")?;
+    Ok(fixed_tz_class.call1((offset_seconds / 60, name))?.unbind())
+}
+
+/// Look a tzinfo up in the cache, creating it on first use
+fn cached_tzinfo(py: Python, builtin: bool, offset_seconds: i32, name: &str) -> PyResult<PyObject> {
+    let key = (builtin, offset_seconds, name.to_string());
+    if let Some(tz) = TZ_CACHE.lock().unwrap().get(&key) {
+        return Ok(tz.clone_ref(py));
+    }
+    // Built without holding the lock: the constructor runs Python code, during which
+    // another thread may take the GIL and then wait for the lock
+    let tz = new_tzinfo(py, builtin, offset_seconds, name)?;
+    let mut cache = TZ_CACHE.lock().unwrap();
+    Ok(cache.entry(key).or_insert(tz).clone_ref(py))
+}
+
+/// Get the tzinfo for an offset in minutes (shared by every value with the same offset and name)
 pub fn create_fixed_tz(py: Python, offset_minutes: i32, name: &str) -> PyResult<PyObject> {
-    let fixed_tz_module = py.import_bound("formatparse")?;
-    let fixed_tz_class = fixed_tz_module.getattr("FixedTzOffset")?;
-    let tz = fixed_tz_class.call1((offset_minutes, name.to_string(),))?;
-    Ok(tz.to_object(py))
+    cached_tzinfo(py, BUILTIN_TIMEZONES.load(Ordering::Relaxed), offset_minutes * 60, name)
+}
+
+/// Get a datetime.timezone for an offset in seconds, as strptime's %z gives
+pub fn create_timezone(py: Python, offset_seconds: i32) -> PyResult<PyObject> {
+    cached_tzinfo(py, true, offset_seconds, "")
+}
+
+/// The tzinfo argument of the constructors below (None for a naive value)
+fn tzinfo_arg<'a, 'py>(tzinfo: &'a Bound<'py, PyAny>) -> PyResult<Option<&'a Bound<'py, PyTzInfo>>> {
+    if tzinfo.is_none() {
+        Ok(None)
+    } else {
+        Ok(Some(tzinfo.downcast::<PyTzInfo>()?))
+    }
+}
+
+/// Create a datetime.datetime through the C API (no Python-level constructor call)
+pub fn new_datetime(
+    py: Python,
+    year: i32,
+    month: u8,
+    day: u8,
+    hour: u8,
+    minute: u8,
+    second: u8,
+    microsecond: u32,
+    tzinfo: &PyObject,
+) -> PyResult<PyObject> {
+    let tzinfo = tzinfo.bind(py);
+    let dt = PyDateTime::new(py, year, month, day, hour, minute, second, microsecond, tzinfo_arg(tzinfo)?)?;
+    Ok(dt.into_any().unbind())
+}
+
+/// Create a datetime.date through the C API
+pub fn new_date(py: Python, year: i32, month: u8, day: u8) -> PyResult<PyObject> {
+    Ok(PyDate::new(py, year, month, day)?.into_any().unbind())
+}
+
+/// Create a datetime.date from a year and a 1-based day of the year
+pub fn new_date_from_ordinal_day(py: Python, year: i32, day_of_year: u16) -> PyResult<PyObject> {
+    let jan1 = PyDate::new(py, year, 1, 1)?;
+    let days = PyDelta::new(py, day_of_year as i32 - 1, 0, 0, true)?;
+    Ok(jan1.add(days)?.unbind())
+}
+
+/// Create a datetime.time through the C API
+pub fn new_time(py: Python, hour: u8, minute: u8, second: u8, microsecond: u32, tzinfo: &PyObject) -> PyResult<PyObject> {
+    let tzinfo = tzinfo.bind(py);
+    let time = PyTime::new(py, hour, minute, second, microsecond, tzinfo_arg(tzinfo)?)?;
+    Ok(time.into_any().unbind())
 }
 
-/// Parse timezone string into FixedTzOffset
+/// The current year in local time (what datetime.today().year gives)
+pub fn local_year(py: Python) -> PyResult<i32> {
+    let now = SystemTime::now()
+        .duration_since(UNIX_EPOCH)
+        .map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(e.to_string()))?;
+    Ok(PyDate::from_timestamp(py, now.as_secs() as i64)?.get_year())
+}
+
+/// Parse a timezone string into its offset in seconds (None if it isn't one)
 /// Handles formats: +1:00, +10:00, +10:30, +1000, etc.
-pub fn parse_timezone(py: Python, tz_str: &str) -> PyResult<PyObject> {
+pub fn parse_timezone_offset(tz_str: &str) -> PyResult<Option<i32>> {
     // Handle formats: +1:00, +10:00, +10:30, +1000, etc.
     if let Some(caps) = RE_TZ_COLON.captures(tz_str) {
         if let (Some(sign_match), Some(hour_match), Some(min_match)) = (caps.get(1), caps.get(2), caps.get(3)) {
             let sign = if sign_match.as_str() == "+" { 1 } else { -1 };
             let hour: i32 = hour_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone"))?;
             let min: i32 = min_match.as_str().parse().unwrap_or(0);
-            let offset_minutes = sign * (hour * 60 + min);
-            return create_fixed_tz(py, offset_minutes, "");
+            return Ok(Some(sign * (hour * 60 + min) * 60));
         }
     }
     // Also handle 4-digit format: +1000 (1 hour, 00 minutes)
@@ -75,12 +180,73 @@ pub fn parse_timezone(py: Python, tz_str: &str) -> PyResult<PyObject> {
             if tz_str.len() >= 4 {
                 let hour: i32 = tz_str[..2].parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone"))?;
                 let min: i32 = tz_str[2..4].parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone"))?;
-                let offset_minutes = sign * (hour * 60 + min);
-                return create_fixed_tz(py, offset_minutes, "");
+                return Ok(Some(sign * (hour * 60 + min) * 60));
             }
         }
     }
-    Ok(py.None())
+    Ok(None)
+}
+
+/// Give a parsed datetime in the field's output: a datetime.datetime (with a shared
+/// tzinfo), or an epoch int or ISO string computed without touching the datetime module
+pub fn datetime_value(py: Python, parsed: CivilDateTime, output: DateTimeOutput) -> PyResult<PyObject> {
+    if output == DateTimeOutput::DateTime {
+        let tzinfo = match parsed.utc_offset {
+            Some(offset) => create_fixed_tz(py, offset / 60, parsed.tz_name)?,
+            None => py.None(),
+        };
+        return new_datetime(py, parsed.year, parsed.month, parsed.day, parsed.hour, parsed.minute, parsed.second, parsed.microsecond, &tzinfo);
+    }
+    parsed.validate().map_err(PyErr::new::<pyo3::exceptions::PyValueError, _>)?;
+    // Moved to UTC, the value can leave years 1..=9999 (astimezone raises the same error)
+    let out_of_range = || PyErr::new::<pyo3::exceptions::PyOverflowError, _>("date value out of range");
+    match output {
+        DateTimeOutput::EpochSeconds => parsed.epoch_seconds().ok_or_else(out_of_range)?.into_py_any(py),
+        DateTimeOutput::EpochNanos => parsed.epoch_nanos().ok_or_else(out_of_range)?.into_py_any(py),
+        _ => parsed.to_iso().ok_or_else(out_of_range)?.into_py_any(py),
+    }
+}
+
+/// Like datetime_value for a value that only has a date (ISO output is `YYYY-MM-DD`)
+pub fn date_value(py: Python, parsed: CivilDateTime, output: DateTimeOutput) -> PyResult<PyObject> {
+    match output {
+        DateTimeOutput::DateTime => new_date(py, parsed.year, parsed.month, parsed.day),
+        DateTimeOutput::Iso => {
+            parsed.validate().map_err(PyErr::new::<pyo3::exceptions::PyValueError, _>)?;
+            parsed.to_iso_date().into_py_any(py)
+        },
+        _ => datetime_value(py, parsed, output),
+    }
+}
+
+/// Re-express a date or datetime built by strptime in the field's output (times are kept)
+pub fn convert_py_datetime(py: Python, value: PyObject, output: DateTimeOutput) -> PyResult<PyObject> {
+    if output == DateTimeOutput::DateTime {
+        return Ok(value);
+    }
+    let bound = value.bind(py);
+    if let Ok(dt) = bound.downcast::<PyDateTime>() {
+        let offset = dt.call_method0("utcoffset")?;
+        let utc_offset = if offset.is_none() {
+            None
+        } else {
+            let offset = offset.downcast::<PyDelta>()?;
+            Some(offset.get_days() * 86_400 + offset.get_seconds())
+        };
+        let parsed = CivilDateTime {
+            hour: dt.get_hour(),
+            minute: dt.get_minute(),
+            second: dt.get_second(),
+            microsecond: dt.get_microsecond(),
+            utc_offset,
+            ..CivilDateTime::date(dt.get_year(), dt.get_month(), dt.get_day())
+        };
+        return datetime_value(py, parsed, output);
+    }
+    if let Ok(date) = bound.downcast::<PyDate>() {
+        return date_value(py, CivilDateTime::date(date.get_year(), date.get_month(), date.get_day()), output);
+    }
+    Ok(value)
 }
 
 /// Parse time string with optional AM/PM indicator
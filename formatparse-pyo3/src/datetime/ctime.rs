@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::get_abbreviated_month_map;
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, get_abbreviated_month_map};
 
 // Cached regex pattern for ctime datetime parsing
 static RE_CTIME_DATETIME: Lazy<Regex> = Lazy::new(|| {
@@ -9,10 +10,7 @@ static RE_CTIME_DATETIME: Lazy<Regex> = Lazy::new(|| {
 });
 
 /// Parse ctime() format: Mon Nov 21 10:21:36 2011
-pub fn parse_ctime_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    
+pub fn parse_ctime_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
     let month_map = get_abbreviated_month_map();
     
     if let Some(caps) = RE_CTIME_DATETIME.captures(value) {
@@ -26,8 +24,8 @@ pub fn parse_ctime_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let second: u8 = second_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid second"))?;
             let year: i32 = year_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid year"))?;
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, py.None()))?;
-            return Ok(dt.to_object(py));
+            let parsed = CivilDateTime { hour, minute, second, ..CivilDateTime::date(year, month, day) };
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
+use pyo3::types::PyDelta;
 
 /// Fixed timezone offset for datetime parsing
-#[pyclass]
+#[pyclass(frozen)]
 pub struct FixedTzOffset {
     offset_seconds: i32,
     name: String,
@@ -55,11 +56,9 @@ impl FixedTzOffset {
 
     /// tzinfo.utcoffset() - returns timedelta for offset
     fn utcoffset(&self, py: Python, _dt: Option<&Bound<'_, PyAny>>) -> PyResult<PyObject> {
-        let datetime_module = py.import_bound("datetime")?;
-        let timedelta_class = datetime_module.getattr("timedelta")?;
         // timedelta(seconds=offset_seconds)
-        let delta = timedelta_class.call1((0, 0, self.offset_seconds,))?;
-        Ok(delta.to_object(py))
+        let delta = PyDelta::new(py, 0, self.offset_seconds, 0, true)?;
+        Ok(delta.into_any().unbind())
     }
 
     /// tzinfo.dst() - returns None (no DST)
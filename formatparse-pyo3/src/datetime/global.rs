@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::{get_month_map, parse_timezone, RE_TZ_IN_STRING};
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, get_month_map, parse_timezone_offset, RE_TZ_IN_STRING};
 
 // Cached regex patterns for global datetime parsing
 static RE_GLOBAL_NUMERIC: Lazy<Regex> = Lazy::new(|| {
@@ -14,15 +15,12 @@ static RE_GLOBAL_NAMED: Lazy<Regex> = Lazy::new(|| {
 
 /// Parse Global (day/month) datetime format
 /// Formats: 21/11/2011, 21-11-2011, 21-Nov-2011, 21-November-2011
-pub fn parse_global_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    
+pub fn parse_global_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
     let month_map = get_month_map();
     
     // Helper to parse timezone - use common function
-    let parse_tz = |tz_str: &str| -> PyResult<PyObject> {
-        parse_timezone(py, tz_str)
+    let parse_tz = |tz_str: &str| -> PyResult<Option<i32>> {
+        parse_timezone_offset(tz_str)
     };
     
     // Helper to parse AM/PM - use common function
@@ -44,9 +42,8 @@ pub fn parse_global_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                         let tz_str = tz_match.as_str();
                         let time_only = time_str[..time_str.len() - tz_str.len()].trim();
                         let (h, m, s) = parse_time_with_ampm(time_only)?;
-                        let tzinfo = parse_tz(tz_str)?;
-                        let dt = datetime_class.call1((year, month, day, h, m, s, 0, tzinfo))?;
-                        return Ok(dt.to_object(py));
+                        let parsed = CivilDateTime { hour: h, minute: m, second: s, utc_offset: parse_tz(tz_str)?, ..CivilDateTime::date(year, month, day) };
+                        return datetime_value(py, parsed, output);
                     } else {
                         parse_time_with_ampm(time_str)?
                     }
@@ -54,8 +51,8 @@ pub fn parse_global_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                     (0, 0, 0)
                 };
                 
-                let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, py.None()))?;
-                return Ok(dt.to_object(py));
+                let parsed = CivilDateTime { hour, minute, second, ..CivilDateTime::date(year, month, day) };
+                return datetime_value(py, parsed, output);
         }
     }
     
@@ -67,7 +64,7 @@ pub fn parse_global_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                 let month = *month_map.get(month_name).ok_or_else(|| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Invalid month: {}", month_name)))?;
                 let year: i32 = year_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid year"))?;
                 
-                let (hour, minute, second, tzinfo) = if let Some(time_part) = caps.get(4) {
+                let (hour, minute, second, utc_offset) = if let Some(time_part) = caps.get(4) {
                     let time_str = time_part.as_str().trim();
                     if let Some(tz_match) = RE_TZ_IN_STRING.captures(time_str).and_then(|c| c.get(1)) {
                         let tz_str = tz_match.as_str();
@@ -77,14 +74,14 @@ pub fn parse_global_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                         (h, m, s, tz)
                     } else {
                         let (h, m, s) = parse_time_with_ampm(time_str)?;
-                        (h, m, s, py.None())
+                        (h, m, s, None)
                     }
                 } else {
-                    (0, 0, 0, py.None())
+                    (0, 0, 0, None)
                 };
                 
-                let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-                return Ok(dt.to_object(py));
+                let parsed = CivilDateTime { hour, minute, second, utc_offset, ..CivilDateTime::date(year, month, day) };
+                return datetime_value(py, parsed, output);
         }
     }
     
@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::{get_abbreviated_month_map, create_fixed_tz};
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, get_abbreviated_month_map};
 
 // Cached regex pattern for HTTP datetime parsing
 static RE_HTTP_DATETIME: Lazy<Regex> = Lazy::new(|| {
@@ -9,10 +10,7 @@ static RE_HTTP_DATETIME: Lazy<Regex> = Lazy::new(|| {
 });
 
 /// Parse HTTP log format: 21/Nov/2011:10:21:36 +1000
-pub fn parse_http_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    
+pub fn parse_http_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
     let month_map = get_abbreviated_month_map();
     
     // 21/Nov/2011:10:21:36 +1000 or +10:00
@@ -32,10 +30,9 @@ pub fn parse_http_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let tz_min: i32 = tz_min_match.as_str().parse().unwrap_or(0);
             let sign = if sign_str == "+" { 1 } else { -1 };
             let offset_minutes = sign * (tz_hour * 60 + tz_min);
-            let tzinfo = create_fixed_tz(py, offset_minutes, "")?;
+            let parsed = CivilDateTime { hour, minute, second, utc_offset: Some(offset_minutes * 60), ..CivilDateTime::date(year, month, day) };
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, parsed, output);
         }
     }
     
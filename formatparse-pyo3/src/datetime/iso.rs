@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::{create_fixed_tz, extract_microseconds};
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, extract_microseconds};
 
 // Cached regex patterns for ISO 8601 datetime parsing
 static RE_ISO_DATE: Lazy<Regex> = Lazy::new(|| {
@@ -24,11 +25,8 @@ static RE_ISO_DATETIME_NO_TZ: Lazy<Regex> = Lazy::new(|| {
     Regex::new(r"^(\d{4})-(\d{2})-(\d{2})[T ](\d{2}):(\d{2})(?::(\d{2})(?:\.(\d+))?)?$").unwrap()
 });
 
-/// Parse ISO 8601 datetime string and return Python datetime object
-pub fn parse_iso_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    
+/// Parse ISO 8601 datetime string into the field's output (a Python datetime by default)
+pub fn parse_iso_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
     // Try to parse various ISO 8601 formats
     // YYYY-MM-DD
     if let Some(caps) = RE_ISO_DATE.captures(value) {
@@ -37,8 +35,7 @@ pub fn parse_iso_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let month: u8 = month_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid month"))?;
             let day: u8 = day_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid day"))?;
             // Return datetime with time 00:00:00
-            let dt = datetime_class.call1((year, month, day, 0, 0, 0, 0, py.None()))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, CivilDateTime::date(year, month, day), output);
         }
     }
     
@@ -55,9 +52,8 @@ pub fn parse_iso_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let second: u8 = caps.get(6).map(|m| m.as_str().parse().unwrap_or(0)).unwrap_or(0);
             let microsecond: u32 = extract_microseconds(caps.get(7));
             
-            let tzinfo = create_fixed_tz(py, 0, "UTC")?;
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, microsecond, tzinfo))?;
-            return Ok(dt.to_object(py));
+            let parsed = CivilDateTime { hour, minute, second, microsecond, utc_offset: Some(0), tz_name: "UTC", ..CivilDateTime::date(year, month, day) };
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -78,10 +74,9 @@ pub fn parse_iso_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let tz_min: i32 = tz_min_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone minute"))?;
             let sign = if sign_str == "+" { 1 } else { -1 };
             let offset_minutes = sign * (tz_hour * 60 + tz_min);
-            let tzinfo = create_fixed_tz(py, offset_minutes, "")?;
+            let parsed = CivilDateTime { hour, minute, second, microsecond, utc_offset: Some(offset_minutes * 60), ..CivilDateTime::date(year, month, day) };
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, microsecond, tzinfo))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -102,10 +97,9 @@ pub fn parse_iso_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let tz_min: i32 = tz_min_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone minute"))?;
             let sign = if sign_str == "+" { 1 } else { -1 };
             let offset_minutes = sign * (tz_hour * 60 + tz_min);
-            let tzinfo = create_fixed_tz(py, offset_minutes, "")?;
+            let parsed = CivilDateTime { hour, minute, second, microsecond, utc_offset: Some(offset_minutes * 60), ..CivilDateTime::date(year, month, day) };
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, microsecond, tzinfo))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -121,8 +115,8 @@ pub fn parse_iso_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let second: u8 = caps.get(6).map(|m| m.as_str().parse().unwrap_or(0)).unwrap_or(0);
             let microsecond: u32 = extract_microseconds(caps.get(7));
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, microsecond, py.None()))?;
-            return Ok(dt.to_object(py));
+            let parsed = CivilDateTime { hour, minute, second, microsecond, ..CivilDateTime::date(year, month, day) };
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -1,7 +1,9 @@
 //! Datetime parsing module for formatparse
 //!
 //! This module provides datetime parsing for various formats:
-//! - `common`: Shared utilities for datetime parsing
+//! - `common`: Shared utilities for datetime parsing, including the datetime/date/time
+//!   constructors (built through the C API rather than by calling the Python classes)
+//!   and the conversion of parsed values to the `datetime_output` epoch and ISO forms
 //! - `iso`: ISO 8601 format parsing
 //! - `rfc2822`: RFC 2822 email date format
 //! - `global`: Global date formats
@@ -10,7 +12,7 @@
 //! - `http`: HTTP date format
 //! - `system`: System date format
 //! - `time`: Time-only parsing
-//! - `strftime`: strftime format parsing
+//! - `strftime`: strftime format parsing (compiled programs, strptime for locale-dependent formats)
 //! - `fixed_tz`: Fixed timezone offset support
 
 pub mod common;
@@ -33,6 +35,7 @@ pub use us::parse_us_datetime;
 pub use ctime::parse_ctime_datetime;
 pub use http::parse_http_datetime;
 pub use system::parse_system_datetime;
+pub use common::convert_py_datetime;
 pub use time::parse_time;
-pub use strftime::parse_strftime_datetime;
+pub use strftime::{parse_strftime_datetime, parse_strftime_with_program};
 
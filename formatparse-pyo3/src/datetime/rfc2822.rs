@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::{get_abbreviated_month_map, create_fixed_tz};
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, get_abbreviated_month_map};
 
 // Cached regex patterns for RFC2822 datetime parsing
 static RE_RFC2822_WITH_WEEKDAY_4DIGIT: Lazy<Regex> = Lazy::new(|| {
@@ -16,12 +17,9 @@ static RE_RFC2822_NO_WEEKDAY: Lazy<Regex> = Lazy::new(|| {
     Regex::new(r"^(\d{1,2})\s+(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)\s+(\d{4})\s+(\d{2}):(\d{2}):(\d{2})\s+([+-])(\d{2})(\d{2})$").unwrap()
 });
 
-/// Parse RFC2822 datetime string and return Python datetime object
+/// Parse RFC2822 datetime string into the field's output (a Python datetime by default)
 /// Format: Mon, 21 Nov 2011 10:21:36 +1000
-pub fn parse_rfc2822_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    
+pub fn parse_rfc2822_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
     // Map month abbreviations to numbers
     let month_map = get_abbreviated_month_map();
     
@@ -42,10 +40,9 @@ pub fn parse_rfc2822_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let tz_min: i32 = tz_min_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone minute"))?;
             let sign = if sign_str == "+" { 1 } else { -1 };
             let offset_minutes = sign * (tz_hour * 60 + tz_min);
-            let tzinfo = create_fixed_tz(py, offset_minutes, "")?;
+            let parsed = CivilDateTime { hour, minute, second, utc_offset: Some(offset_minutes * 60), ..CivilDateTime::date(year, month, day) };
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -66,10 +63,9 @@ pub fn parse_rfc2822_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let tz_min: i32 = tz_min_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone minute"))?;
             let sign = if sign_str == "+" { 1 } else { -1 };
             let offset_minutes = sign * (tz_hour * 60 + tz_min);
-            let tzinfo = create_fixed_tz(py, offset_minutes, "")?;
+            let parsed = CivilDateTime { hour, minute, second, utc_offset: Some(offset_minutes * 60), ..CivilDateTime::date(year, month, day) };
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -90,10 +86,9 @@ pub fn parse_rfc2822_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let tz_min: i32 = tz_min_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone minute"))?;
             let sign = if sign_str == "+" { 1 } else { -1 };
             let offset_minutes = sign * (tz_hour * 60 + tz_min);
-            let tzinfo = create_fixed_tz(py, offset_minutes, "")?;
+            let parsed = CivilDateTime { hour, minute, second, utc_offset: Some(offset_minutes * 60), ..CivilDateTime::date(year, month, day) };
             
-            let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-            return Ok(dt.to_object(py));
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -1,6 +1,8 @@
 use pyo3::prelude::*;
+use pyo3::types::{PyDateAccess, PyDateTime, PyTimeAccess};
 use regex::Regex;
-use crate::datetime::common::get_month_map;
+use formatparse_core::{CivilDateTime, DateTimeOutput, StrftimeKind, StrftimeProgram};
+use crate::datetime::common::{create_timezone, date_value, datetime_value, get_month_map, local_year, new_date, new_date_from_ordinal_day, new_datetime, new_time};
 
 /// Check if a PyErr is a regex group redefinition error from strptime
 fn is_regex_group_redefinition_error(err: &PyErr) -> bool {
@@ -11,11 +13,6 @@ fn is_regex_group_redefinition_error(err: &PyErr) -> bool {
 /// Fallback parser for strftime format strings when strptime fails due to regex group conflicts
 /// This manually parses the format string and extracts datetime components
 fn parse_strftime_fallback(py: Python, value: &str, format_str: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    let date_class = datetime_module.getattr("date")?;
-    let time_class = datetime_module.getattr("time")?;
-    
     // Month name mapping
     let month_map = get_month_map();
     
@@ -170,26 +167,27 @@ fn parse_strftime_fallback(py: Python, value: &str, format_str: &str) -> PyResul
     
     if has_time && !has_date {
         // Time only
-        let time_obj = time_class.call1((
+        new_time(
+            py,
             hour.unwrap_or(0),
             minute.unwrap_or(0),
             second.unwrap_or(0),
-            microsecond.unwrap_or(0)
-        ))?;
-        Ok(time_obj.to_object(py))
+            microsecond.unwrap_or(0),
+            &py.None(),
+        )
     } else if has_date && !has_time {
         // Date only
         let year_val = year.unwrap_or(1970);
         let month_val = month.unwrap_or(1);
         let day_val = day.unwrap_or(1);
-        let date = date_class.call1((year_val, month_val, day_val))?;
-        Ok(date.to_object(py))
+        new_date(py, year_val, month_val, day_val)
     } else {
         // Both date and time (or neither - default to datetime)
         let year_val = year.unwrap_or(1970);
         let month_val = month.unwrap_or(1);
         let day_val = day.unwrap_or(1);
-        let dt = datetime_class.call1((
+        new_datetime(
+            py,
             year_val,
             month_val,
             day_val,
@@ -197,18 +195,65 @@ fn parse_strftime_fallback(py: Python, value: &str, format_str: &str) -> PyResul
             minute.unwrap_or(0),
             second.unwrap_or(0),
             microsecond.unwrap_or(0),
-            py.None()
-        ))?;
-        Ok(dt.to_object(py))
+            &py.None(),
+        )
+    }
+}
+
+/// The datetime.timezone for a %z offset in seconds (None without one)
+fn offset_timezone(py: Python, utc_offset: Option<i32>) -> PyResult<PyObject> {
+    match utc_offset {
+        Some(offset) => create_timezone(py, offset),
+        None => Ok(py.None()),
+    }
+}
+
+/// Parse a strftime-style value with its compiled program (FieldSpec.strftime_program)
+///
+/// Gives what strptime would: a date, time or datetime depending on the directives, with
+/// 1900-01-01 for missing date parts (the current year for a day of the year without one)
+/// and a datetime.timezone for %z. Other outputs apply to dates and datetimes; times stay times.
+pub fn parse_strftime_with_program(py: Python, value: &str, program: &StrftimeProgram, format_str: &str, output: DateTimeOutput) -> PyResult<PyObject> {
+    let parsed = program.parse(value)
+        .ok_or_else(|| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Value '{}' does not match format '{}'", value, format_str)))?;
+    if program.kind() == StrftimeKind::Time {
+        let tzinfo = offset_timezone(py, parsed.utc_offset)?;
+        return new_time(py, parsed.hour, parsed.minute, parsed.second, parsed.microsecond, &tzinfo);
+    }
+    let default_year = if parsed.year.is_none() && parsed.day_of_year.is_some() {
+        local_year(py)?
+    } else {
+        1900
+    };
+    let (year, month, day) = parsed.date(default_year);
+    if output != DateTimeOutput::DateTime {
+        let civil = CivilDateTime {
+            hour: parsed.hour,
+            minute: parsed.minute,
+            second: parsed.second,
+            microsecond: parsed.microsecond,
+            utc_offset: parsed.utc_offset,
+            ..CivilDateTime::date(year, month, day)
+        };
+        return match program.kind() {
+            StrftimeKind::Date => date_value(py, civil, output),
+            _ => datetime_value(py, civil, output),
+        };
+    }
+    match program.kind() {
+        StrftimeKind::Date => new_date(py, year, month, day),
+        _ => {
+            let tzinfo = offset_timezone(py, parsed.utc_offset)?;
+            new_datetime(py, year, month, day, parsed.hour, parsed.minute, parsed.second, parsed.microsecond, &tzinfo)
+        },
     }
 }
 
 /// Parse strftime-style datetime using Python's strptime
+/// (for formats with directives the compiled programs don't read, such as %c or %Z)
 pub fn parse_strftime_datetime(py: Python, value: &str, format_str: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
+    let datetime_module = py.import("datetime")?;
     let datetime_class = datetime_module.getattr("datetime")?;
-    let date_class = datetime_module.getattr("date")?;
-    let time_class = datetime_module.getattr("time")?;
     
     // Determine if format contains time components
     let has_time = format_str.contains("%H") || format_str.contains("%M") || format_str.contains("%S") || format_str.contains("%f");
@@ -267,12 +312,8 @@ pub fn parse_strftime_datetime(py: Python, value: &str, format_str: &str) -> PyR
         let strptime = datetime_class.getattr("strptime")?;
         match strptime.call1((full_value.as_str(), full_format.as_str())) {
             Ok(dt) => {
-                let hour: u8 = dt.getattr("hour")?.extract().unwrap_or(0);
-                let minute: u8 = dt.getattr("minute")?.extract().unwrap_or(0);
-                let second: u8 = dt.getattr("second")?.extract().unwrap_or(0);
-                let microsecond: u32 = dt.getattr("microsecond")?.extract().unwrap_or(0);
-                let time_obj = time_class.call1((hour, minute, second, microsecond))?;
-                Ok(time_obj.to_object(py))
+                let dt = dt.downcast::<PyDateTime>()?;
+                new_time(py, dt.get_hour(), dt.get_minute(), dt.get_second(), dt.get_microsecond(), &py.None())
             },
             Err(e) => {
                 // Check if this is a regex group redefinition error
@@ -294,26 +335,15 @@ pub fn parse_strftime_datetime(py: Python, value: &str, format_str: &str) -> PyR
                     let year: i32 = caps.get(1).unwrap().as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid year"))?;
                     let day_of_year: u16 = caps.get(2).unwrap().as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid day of year"))?;
                     // Create date from year and day of year
-                    let jan1 = date_class.call1((year, 1, 1))?;
-                    let timedelta = datetime_module.getattr("timedelta")?;
-                    let days = timedelta.call1((day_of_year as i32 - 1,))?;
-                    let add_method = jan1.getattr("__add__")?;
-                    let result_date = add_method.call1((days,))?;
-                    return Ok(result_date.to_object(py));
+                    return new_date_from_ordinal_day(py, year, day_of_year);
                 }
             }
             // Handle %j without year (use current year)
             if let Ok(re) = Regex::new(r"^(\d{1,3})$") {
                 if let Some(caps) = re.captures(value) {
-                    let today = datetime_class.call_method0("today")?;
-                    let year: i32 = today.getattr("year")?.extract()?;
+                    let year = local_year(py)?;
                     let day_of_year: u16 = caps.get(1).unwrap().as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid day of year"))?;
-                    let jan1 = date_class.call1((year, 1, 1))?;
-                    let timedelta = datetime_module.getattr("timedelta")?;
-                    let days = timedelta.call1((day_of_year as i32 - 1,))?;
-                    let add_method = jan1.getattr("__add__")?;
-                    let result_date = add_method.call1((days,))?;
-                    return Ok(result_date.to_object(py));
+                    return new_date_from_ordinal_day(py, year, day_of_year);
                 }
             }
         }
@@ -324,11 +354,8 @@ pub fn parse_strftime_datetime(py: Python, value: &str, format_str: &str) -> PyR
         match strptime.call1((value, format_str)) {
             Ok(dt) => {
                 // Convert datetime to date
-                let year: i32 = dt.getattr("year")?.extract()?;
-                let month: u8 = dt.getattr("month")?.extract()?;
-                let day: u8 = dt.getattr("day")?.extract()?;
-                let date = date_class.call1((year, month, day))?;
-                Ok(date.to_object(py))
+                let dt = dt.downcast::<PyDateTime>()?;
+                new_date(py, dt.get_year(), dt.get_month(), dt.get_day())
             },
             Err(e) => {
                 // Check if this is a regex group redefinition error
@@ -349,8 +376,7 @@ pub fn parse_strftime_datetime(py: Python, value: &str, format_str: &str) -> PyR
                             let year: i32 = caps.get(1).unwrap().as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid year"))?;
                             let month: u8 = caps.get(2).unwrap().as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid month"))?;
                             let day: u8 = caps.get(3).unwrap().as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid day"))?;
-                            let date = date_class.call1((year, month, day))?;
-                            return Ok(date.to_object(py));
+                            return new_date(py, year, month, day);
                         }
                     }
                 }
@@ -362,7 +388,7 @@ pub fn parse_strftime_datetime(py: Python, value: &str, format_str: &str) -> PyR
         // Both date and time: return datetime
         let strptime = datetime_class.getattr("strptime")?;
         match strptime.call1((value, format_str)) {
-            Ok(dt) => Ok(dt.to_object(py)),
+            Ok(dt) => Ok(dt.unbind()),
             Err(e) => {
                 // Check if this is a regex group redefinition error
                 if is_regex_group_redefinition_error(&e) {
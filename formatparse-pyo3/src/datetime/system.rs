@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::get_abbreviated_month_map;
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, get_abbreviated_month_map, local_year};
 
 // Cached regex pattern for system datetime parsing
 static RE_SYSTEM_DATETIME: Lazy<Regex> = Lazy::new(|| {
@@ -9,11 +10,8 @@ static RE_SYSTEM_DATETIME: Lazy<Regex> = Lazy::new(|| {
 });
 
 /// Parse Linux system log format: Nov 21 10:21:36 (year is current year)
-pub fn parse_system_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    let today = datetime_class.call_method0("today")?;
-    let current_year: i32 = today.getattr("year")?.extract()?;
+pub fn parse_system_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
+    let current_year = local_year(py)?;
     
     let month_map = get_abbreviated_month_map();
     
@@ -28,8 +26,8 @@ pub fn parse_system_datetime(py: Python, value: &str) -> PyResult<PyObject> {
             let minute: u8 = minute_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid minute"))?;
             let second: u8 = second_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid second"))?;
             
-            let dt = datetime_class.call1((current_year, month, day, hour, minute, second, 0, py.None()))?;
-            return Ok(dt.to_object(py));
+            let parsed = CivilDateTime { hour, minute, second, ..CivilDateTime::date(current_year, month, day) };
+            return datetime_value(py, parsed, output);
         }
     }
     
@@ -1,7 +1,7 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::{create_fixed_tz, parse_time_with_ampm, RE_TZ_COLON};
+use crate::datetime::common::{create_fixed_tz, new_time, parse_time_with_ampm, RE_TZ_COLON};
 
 // Cached regex pattern for timezone in time string
 static RE_TIME_TZ: Lazy<Regex> = Lazy::new(|| {
@@ -10,9 +10,6 @@ static RE_TIME_TZ: Lazy<Regex> = Lazy::new(|| {
 
 /// Parse time format: 10:21:36, 10:21:36 AM, 10:21:36 PM, 10:21 - returns time object
 pub fn parse_time(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let time_class = datetime_module.getattr("time")?;
-    
     let parse_tz = |tz_str: &str| -> PyResult<PyObject> {
         if let Some(caps) = RE_TZ_COLON.captures(tz_str) {
             if let (Some(sign_match), Some(hour_match), Some(min_match)) = (caps.get(1), caps.get(2), caps.get(3)) {
@@ -37,7 +34,6 @@ pub fn parse_time(py: Python, value: &str) -> PyResult<PyObject> {
     
     let (hour, minute, second) = parse_time_with_ampm(time_str)?;
     
-    let time_obj = time_class.call1((hour, minute, second, 0, tzinfo))?;
-    Ok(time_obj.to_object(py))
+    new_time(py, hour, minute, second, 0, &tzinfo)
 }
 
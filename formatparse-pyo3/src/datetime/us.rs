@@ -1,7 +1,8 @@
 use pyo3::prelude::*;
 use regex::Regex;
 use once_cell::sync::Lazy;
-use crate::datetime::common::{get_month_map, create_fixed_tz, RE_TZ_COLON, RE_TZ_4DIGIT, RE_TZ_IN_STRING_EXTENDED};
+use formatparse_core::{CivilDateTime, DateTimeOutput};
+use crate::datetime::common::{datetime_value, get_month_map, parse_timezone_offset, RE_TZ_IN_STRING_EXTENDED};
 
 // Cached regex patterns for US datetime parsing
 static RE_US_NUMERIC: Lazy<Regex> = Lazy::new(|| {
@@ -13,38 +14,12 @@ static RE_US_NAMED: Lazy<Regex> = Lazy::new(|| {
 });
 
 /// Parse US (month/day) datetime format - similar to global but different order
-pub fn parse_us_datetime(py: Python, value: &str) -> PyResult<PyObject> {
-    let datetime_module = py.import_bound("datetime")?;
-    let datetime_class = datetime_module.getattr("datetime")?;
-    
+pub fn parse_us_datetime(py: Python, value: &str, output: DateTimeOutput) -> PyResult<PyObject> {
     let month_map = get_month_map();
     
-    let parse_tz = |tz_str: &str| -> PyResult<PyObject> {
-        // Handle formats: +1000, +10:00, +10:30, etc.
-        if let Some(caps) = RE_TZ_COLON.captures(tz_str) {
-            if let (Some(sign_match), Some(hour_match), Some(min_match)) = (caps.get(1), caps.get(2), caps.get(3)) {
-                let sign = if sign_match.as_str() == "+" { 1 } else { -1 };
-                let hour: i32 = hour_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone"))?;
-                let min: i32 = min_match.as_str().parse().unwrap_or(0);
-                let offset_minutes = sign * (hour * 60 + min);
-                return create_fixed_tz(py, offset_minutes, "");
-            }
-        }
-        // Also handle 4-digit format: +1000 (10 hours, 00 minutes)
-        if let Some(caps) = RE_TZ_4DIGIT.captures(tz_str) {
-            if let (Some(sign_match), Some(tz_match)) = (caps.get(1), caps.get(2)) {
-                let sign = if sign_match.as_str() == "+" { 1 } else { -1 };
-                let tz_str = tz_match.as_str();
-                // Regex ensures exactly 4 digits, but add defensive check
-                if tz_str.len() >= 4 {
-                    let hour: i32 = tz_str[..2].parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone"))?;
-                    let min: i32 = tz_str[2..4].parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid timezone"))?;
-                    let offset_minutes = sign * (hour * 60 + min);
-                    return create_fixed_tz(py, offset_minutes, "");
-                }
-            }
-        }
-        Ok(py.None())
+    // Handle formats: +1000, +10:00, +10:30, etc.
+    let parse_tz = |tz_str: &str| -> PyResult<Option<i32>> {
+        parse_timezone_offset(tz_str)
     };
     
     let parse_time_with_ampm = |time_str: &str| -> Result<(u8, u8, u8), PyErr> {
@@ -58,7 +33,7 @@ pub fn parse_us_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                 let day: u8 = day_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid day"))?;
                 let year: i32 = year_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid year"))?;
                 
-                let (hour, minute, second, tzinfo) = if let Some(time_part) = caps.get(4) {
+                let (hour, minute, second, utc_offset) = if let Some(time_part) = caps.get(4) {
                     let time_str = time_part.as_str().trim();
                     // Try to match timezone: +1000, +10:00, +10:30, etc.
                     if let Some(tz_match) = RE_TZ_IN_STRING_EXTENDED.captures(time_str).and_then(|c| c.get(1)) {
@@ -69,14 +44,14 @@ pub fn parse_us_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                         (h, m, s, tz)
                     } else {
                         let (h, m, s) = parse_time_with_ampm(time_str)?;
-                        (h, m, s, py.None())
+                        (h, m, s, None)
                     }
                 } else {
-                    (0, 0, 0, py.None())
+                    (0, 0, 0, None)
                 };
                 
-                let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-                return Ok(dt.to_object(py));
+                let parsed = CivilDateTime { hour, minute, second, utc_offset, ..CivilDateTime::date(year, month, day) };
+                return datetime_value(py, parsed, output);
         }
     }
     
@@ -88,7 +63,7 @@ pub fn parse_us_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                 let day: u8 = day_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid day"))?;
                 let year: i32 = year_match.as_str().parse().map_err(|_| PyErr::new::<pyo3::exceptions::PyValueError, _>("Invalid year"))?;
                 
-                let (hour, minute, second, tzinfo) = if let Some(time_part) = caps.get(4) {
+                let (hour, minute, second, utc_offset) = if let Some(time_part) = caps.get(4) {
                     let time_str = time_part.as_str().trim();
                     // Try to match timezone: +1000, +10:00, +10:30, etc.
                     if let Some(tz_match) = RE_TZ_IN_STRING_EXTENDED.captures(time_str).and_then(|c| c.get(1)) {
@@ -99,14 +74,14 @@ pub fn parse_us_datetime(py: Python, value: &str) -> PyResult<PyObject> {
                         (h, m, s, tz)
                     } else {
                         let (h, m, s) = parse_time_with_ampm(time_str)?;
-                        (h, m, s, py.None())
+                        (h, m, s, None)
                     }
                 } else {
-                    (0, 0, 0, py.None())
+                    (0, 0, 0, None)
                 };
                 
-                let dt = datetime_class.call1((year, month, day, hour, minute, second, 0, tzinfo))?;
-                return Ok(dt.to_object(py));
+                let parsed = CivilDateTime { hour, minute, second, utc_offset, ..CivilDateTime::date(year, month, day) };
+                return datetime_value(py, parsed, output);
         }
     }
     
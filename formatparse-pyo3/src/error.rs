@@ -109,6 +109,13 @@ pub mod errors {
         )
     }
 
+    /// Create an error for a projected field that isn't in the pattern
+    pub fn unknown_field_error(name: &str) -> PyErr {
+        PyErr::new::<pyo3::exceptions::PyValueError, _>(
+            format!("Field '{}' is not in the pattern", name)
+        )
+    }
+
     /// Create a validation error (used to signal invalid alignment+precision combinations)
     /// This error should be caught and converted to None in matching code
     pub fn validation_error(msg: &str) -> PyErr {
@@ -0,0 +1,142 @@
+use pyo3::prelude::*;
+use pyo3::types::PyString;
+use std::collections::HashMap;
+use std::sync::Arc;
+use crate::parser::FormatParser;
+use crate::parser::matching::{allow_threads_for, build_match_result, capture_fields, match_with_captures_raw, CapturedMatch};
+use crate::parser::predicate::{accepts_object, Filter};
+
+/// Lazy iterator over the matches of a pattern in a string
+/// Each call to `__next__` resumes the regex search from the end of the previous match,
+/// so only the match being returned is located and converted
+#[pyclass]
+pub struct FindIter {
+    parser: Arc<FormatParser>,
+    string: Py<PyString>,  // Kept alive (not copied) for the lifetime of the iterator
+    case_sensitive: bool,
+    extra_types: HashMap<String, PyObject>,
+    evaluate_result: bool,
+    raw: bool,  // Convert without Python (same fast path as findall)
+    filter: Option<Filter>,  // where= conditions (rejected matches are skipped)
+    pos: Option<usize>,  // Byte offset where the next search starts (None once exhausted)
+    last_end: Option<usize>,  // End of the previous regex match
+}
+
+impl FindIter {
+    pub fn new(
+        parser: Arc<FormatParser>,
+        string: Py<PyString>,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+        filter: Option<Filter>,
+    ) -> Self {
+        let extra_types = extra_types.unwrap_or_default();
+        let raw = parser.raw_convertible && extra_types.is_empty() && evaluate_result;
+        Self {
+            parser,
+            string,
+            case_sensitive,
+            extra_types,
+            evaluate_result,
+            raw,
+            filter,
+            pos: Some(0),
+            last_end: None,
+        }
+    }
+
+    /// Convert a match to a ParseResult (or Match), or None if the match is rejected
+    /// (including by the where= filter)
+    fn convert(&self, py: Python, captured: &CapturedMatch, string: &str) -> PyResult<Option<PyObject>> {
+        let parser = &self.parser;
+        if self.raw {
+            // Matches whose values can't be converted are skipped, as in findall
+            return match match_with_captures_raw(
+                captured,
+                string,
+                &parser.field_specs,
+                &parser.field_names,
+                &parser.has_nested_dict_fields,
+                self.filter.as_ref(),
+            ) {
+                Ok(Some(raw_data)) => Ok(Some(raw_data.to_parse_result(py)?.into_any())),
+                _ => Ok(None),
+            };
+        }
+        let result = build_match_result(
+            captured,
+            string,
+            &parser.pattern,
+            &parser.field_specs,
+            &parser.field_names,
+            &parser.normalized_names,
+            py,
+            &self.extra_types,
+            self.evaluate_result,
+        )?;
+        Ok(result.filter(|result| accepts_object(self.filter.as_ref(), py, result)))
+    }
+}
+
+#[pymethods]
+impl FindIter {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    /// Find and convert the next match
+    fn __next__(&mut self, py: Python) -> PyResult<Option<PyObject>> {
+        let string_obj = self.string.clone_ref(py);
+        let string = string_obj.bind(py).to_str()?;
+
+        // Strings without the pattern's literal text can't match (checked before the first search)
+        if self.pos == Some(0) && !self.parser.may_match(string, self.case_sensitive) {
+            self.pos = None;
+        }
+
+        while let Some(start) = self.pos {
+            let parser = &self.parser;
+            let case_sensitive = self.case_sensitive;
+            // Only the remainder of the string is searched, so release the GIL based on its length
+            let captured = allow_threads_for(py, string.len() - start, || {
+                parser.get_search_regex(case_sensitive)
+                    .captures_at(string, start)
+                    .map(|captures| capture_fields(
+                        &captures,
+                        &parser.field_specs,
+                        &parser.normalized_names,
+                        &parser.custom_type_groups,
+                    ))
+            });
+
+            let captured = match captured {
+                Some(captured) => captured,
+                None => {
+                    self.pos = None;
+                    break;
+                }
+            };
+
+            // Resume after the match; step over one character after an empty match
+            let (match_start, match_end) = captured.span;
+            self.pos = if match_start == match_end {
+                string[match_end..].chars().next().map(|c| match_end + c.len_utf8())
+            } else {
+                Some(match_end)
+            };
+
+            // Like captures_iter, an empty match right where the previous match ended doesn't count
+            if match_start == match_end && self.last_end == Some(match_start) {
+                continue;
+            }
+            self.last_end = Some(match_end);
+
+            if let Some(result) = self.convert(py, &captured, string)? {
+                return Ok(Some(result));
+            }
+        }
+
+        Ok(None)
+    }
+}
@@ -4,14 +4,12 @@
 
 use pyo3::prelude::*;
 use pyo3::exceptions::PyValueError;
-use pyo3::types::{PyDict, PyList};
+use pyo3::types::{PyDict, PyList, PyString};
 use std::collections::HashMap;
-use std::sync::{Arc, Mutex};
-use once_cell::sync::Lazy;
-use lru::LruCache;
-use std::num::NonZeroUsize;
-use std::hash::{Hash, Hasher};
-use std::collections::hash_map::DefaultHasher;
+use std::path::PathBuf;
+use formatparse_core::DateTimeOutput;
+use crate::parser::predicate::{accepts_object, Filter};
+use crate::parser::{datetime_output_from_name, Text};
 
 // Use formatparse-core for pure Rust types (imported below via pub use)
 
@@ -20,8 +18,16 @@ mod error;
 mod parser;
 mod result;
 mod results;
+mod columns;
+mod numpy;
+mod arrow;
 mod types;
 mod match_rs;
+mod parse_file;
+mod finditer;
+mod scanner;
+mod pattern_set;
+mod cache;
 
 pub use datetime::FixedTzOffset;
 pub use parser::{FormatParser, Format};
@@ -32,86 +38,43 @@ pub use types::conversion::*;
 pub use formatparse_core::{FieldType, FieldSpec};
 pub use formatparse_core::strftime_to_regex;
 pub use match_rs::Match;
-
-// Pattern cache for compiled FormatParser instances
-// Cache size: 1000 patterns
-// Using u64 hash as key for faster lookups
-// Using Arc to avoid expensive clones
-static PATTERN_CACHE: Lazy<Mutex<LruCache<u64, Arc<FormatParser>>>> = Lazy::new(|| {
-    Mutex::new(LruCache::new(NonZeroUsize::new(1000).unwrap()))
-});
-
-/// Create a cache key hash from pattern and extra_types
-fn create_cache_key_hash(pattern: &str, extra_types: &Option<HashMap<String, PyObject>>) -> u64 {
-    let mut hasher = DefaultHasher::new();
-    pattern.hash(&mut hasher);
-    if let Some(extra_types) = extra_types {
-        // Sort keys for consistent hashing
-        let mut keys: Vec<&String> = extra_types.keys().collect();
-        keys.sort();
-        for key in keys {
-            key.hash(&mut hasher);
-        }
-    }
-    hasher.finish()
-}
-
-/// Get or create a FormatParser from cache
-fn get_or_create_parser(
-    pattern: &str,
-    extra_types: Option<HashMap<String, PyObject>>,
-) -> PyResult<Arc<FormatParser>> {
-    let cache_key = create_cache_key_hash(pattern, &extra_types);
-    
-    // Try to get from cache (minimize lock scope)
-    let cached = {
-        let mut cache = PATTERN_CACHE.lock().unwrap();
-        cache.get(&cache_key).cloned()
-    };
-    
-    if let Some(cached_parser) = cached {
-        return Ok(cached_parser);
-    }
-    
-    // Not in cache, create new parser
-    let parser = Arc::new(FormatParser::new_with_extra_types(pattern, extra_types)?);
-    
-    // Store in cache (minimize lock scope)
-    {
-        let mut cache = PATTERN_CACHE.lock().unwrap();
-        cache.put(cache_key, parser.clone());
-    }
-    
-    Ok(parser)
-}
+pub use parse_file::ParseFileIterator;
+pub use finditer::FindIter;
+pub use scanner::Scanner;
+pub use pattern_set::PatternSet;
+use cache::get_or_create_parser;
 
 /// Parse a string using a format specification
 #[pyfunction]
-#[pyo3(signature = (pattern, string, extra_types=None, case_sensitive=false, evaluate_result=true))]
+#[pyo3(signature = (pattern, string, extra_types=None, case_sensitive=false, evaluate_result=true, fields=None, datetime_output="datetime"))]
 fn parse(
     pattern: &str,
-    string: &str,
+    string: Text<'_>,
     extra_types: Option<HashMap<String, PyObject>>,
     case_sensitive: bool,
     evaluate_result: bool,
+    fields: Option<Vec<String>>,
+    datetime_output: &str,
 ) -> PyResult<Option<PyObject>> {
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    
     // Validate input lengths
     formatparse_core::validate_pattern_length(pattern)
         .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
-    formatparse_core::validate_input_length(string)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
     
     // Check for null bytes in inputs
     if pattern.contains('\0') {
         return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
     }
-    if string.contains('\0') {
-        return Err(pyo3::exceptions::PyValueError::new_err("Input string contains null byte"));
-    }
+    string.validate()?;
     
     // Use cached parser if available
-    match get_or_create_parser(pattern, extra_types.clone()) {
-        Ok(parser) => parser.parse_internal(string, case_sensitive, extra_types, evaluate_result),
+    match get_or_create_parser(pattern, extra_types.clone(), fields, datetime_output) {
+        // Bytes that aren't valid UTF-8 can't match the whole pattern
+        Ok(parser) => match string.whole_str()? {
+            Some(string) => parser.parse_internal(string, case_sensitive, extra_types, evaluate_result),
+            None => Ok(None),
+        },
         Err(e) => {
             let err_msg = e.to_string();
             // Propagate NotImplementedError (for unsupported features like quoted keys)
@@ -130,16 +93,26 @@ fn parse(
 
 /// Search for a pattern in a string
 #[pyfunction]
-#[pyo3(signature = (pattern, string, pos=0, endpos=None, extra_types=None, case_sensitive=true, evaluate_result=true))]
+#[pyo3(signature = (pattern, string, pos=0, endpos=None, extra_types=None, case_sensitive=true, evaluate_result=true, datetime_output="datetime"))]
 fn search(
+    py: Python<'_>,
     pattern: &str,
-    string: &str,
+    string: Text<'_>,
     pos: usize,
     endpos: Option<usize>,
     extra_types: Option<HashMap<String, PyObject>>,
     case_sensitive: bool,
     evaluate_result: bool,
+    datetime_output: &str,
 ) -> PyResult<Option<PyObject>> {
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    let string = match &string {
+        Text::Str(string) => string.to_str()?,
+        Text::Bytes(buffer) => return search_bytes(
+            py, pattern, &string, buffer, pos, endpos, extra_types, case_sensitive, evaluate_result, datetime_output,
+        ),
+    };
+    
     // Validate pos parameter
     if pos > string.len() {
         return Ok(None);
@@ -168,7 +141,7 @@ fn search(
         return Err(pyo3::exceptions::PyValueError::new_err("Input string contains null byte"));
     }
     
-    let parser = get_or_create_parser(pattern, extra_types.clone())?;
+    let parser = get_or_create_parser(pattern, extra_types.clone(), None, datetime_output)?;
     let search_string = &string[pos..end];
     
     if let Some(result) = parser.search_pattern(search_string, case_sensitive, extra_types, evaluate_result)? {
@@ -178,7 +151,7 @@ fn search(
                 let result_value = parse_result.borrow();
                 let adjusted = result_value.clone().with_offset(pos);
                 // Py::new() is already optimized when GIL is held
-                Ok(Some(Py::new(py, adjusted)?.to_object(py)))
+                Ok(Some(Py::new(py, adjusted)?.into_any()))
             } else {
                 // It's a Match object - we need to adjust its span
                 // For now, just return it as-is (Match spans are relative to search start)
@@ -190,142 +163,320 @@ fn search(
     }
 }
 
+/// search() over a bytes-like object: spans are byte offsets into the whole buffer
+fn search_bytes(
+    py: Python<'_>,
+    pattern: &str,
+    string: &Text<'_>,
+    buffer: &crate::parser::bytes_input::ByteBuffer,
+    pos: usize,
+    endpos: Option<usize>,
+    extra_types: Option<HashMap<String, PyObject>>,
+    case_sensitive: bool,
+    evaluate_result: bool,
+    datetime_output: DateTimeOutput,
+) -> PyResult<Option<PyObject>> {
+    let len = buffer.as_bytes().len();
+    let end = endpos.unwrap_or(len);
+    if pos > len || end > len || end < pos {
+        return Ok(None);
+    }
+    
+    formatparse_core::validate_pattern_length(pattern)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
+    if pattern.contains('\0') {
+        return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
+    }
+    string.validate()?;
+    
+    let parser = get_or_create_parser(pattern, extra_types.clone(), None, datetime_output)?;
+    parser.search_bytes(py, buffer, pos, end, case_sensitive, &extra_types.unwrap_or_default(), evaluate_result)
+}
+
 /// Find all matches of a pattern in a string
 #[pyfunction]
-#[pyo3(signature = (pattern, string, extra_types=None, case_sensitive=false, evaluate_result=true))]
+#[pyo3(signature = (pattern, string, extra_types=None, case_sensitive=false, evaluate_result=true, parallel=false, columns=false, r#where=None, datetime_output="datetime"))]
 fn findall(
+    py: Python<'_>,
     pattern: &str,
-    string: &str,
+    string: Text<'_>,
     extra_types: Option<HashMap<String, PyObject>>,
     case_sensitive: bool,
     evaluate_result: bool,
+    parallel: bool,
+    columns: bool,
+    r#where: Option<&Bound<'_, PyAny>>,
+    datetime_output: &str,
 ) -> PyResult<PyObject> {
+    crate::columns::validate_batch_output(evaluate_result, columns, false, false)?;
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    
     // Validate input lengths
     formatparse_core::validate_pattern_length(pattern)
         .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
-    formatparse_core::validate_input_length(string)
-        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
     
     // Check for null bytes in inputs
     if pattern.contains('\0') {
         return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
     }
-    if string.contains('\0') {
-        return Err(pyo3::exceptions::PyValueError::new_err("Input string contains null byte"));
-    }
+    string.validate()?;
+    
+    let parser = get_or_create_parser(pattern, extra_types.clone(), None, datetime_output)?;
+    let filter = Filter::from_py(r#where, &parser.field_names, evaluate_result)?;
+    let filter = filter.as_ref();
     
-    let parser = get_or_create_parser(pattern, extra_types.clone())?;
+    let string = match &string {
+        Text::Str(string) => string.to_str()?,
+        Text::Bytes(buffer) => return parser.findall_bytes(
+            py,
+            buffer,
+            case_sensitive,
+            &extra_types.unwrap_or_default(),
+            evaluate_result,
+            parallel,
+            columns,
+            filter,
+        ),
+    };
     
     // Fast path: if no custom converters and evaluate_result=True, use raw matching
     // This defers all Python object creation until the end (batch conversion)
-    // CRITICAL: Do ALL regex matching OUTSIDE GIL, then batch convert inside GIL
+    // Datetime/custom types and nested dicts need Python, so they never take the raw path
     let has_custom_converters = extra_types.as_ref().map(|et| !et.is_empty()).unwrap_or(false);
-    let has_nested_dicts = parser.has_nested_dict_fields.iter().any(|&b| b);
     
-    if !has_custom_converters && evaluate_result && !has_nested_dicts {
-        // Use raw matching path: collect all raw data first (NO GIL), then batch convert
-        let mut raw_results = Vec::new();
-        let search_regex = parser.get_search_regex(case_sensitive);
-        let mut last_end = 0;
-        
-        // Collect all raw matches OUTSIDE GIL (no Python objects created yet)
-        // This is the key optimization: all CPU work happens without GIL
-        for captures in search_regex.captures_iter(string) {
-            let full_match = captures.get(0).unwrap();
-            let match_start = full_match.start();
-            let match_end = full_match.end();
-            
-            if match_start < last_end {
-                continue;
-            }
-            
-            // Try raw matching (no Python objects, no GIL needed)
-            if let Ok(Some(raw_data)) = crate::parser::matching::match_with_captures_raw(
-                &captures,
-                string,
-                match_start,
-                &parser.field_specs,
-                &parser.field_names,
-                &parser.normalized_names,
-                &parser.custom_type_groups,
-                &parser.has_nested_dict_fields,
-            ) {
-                raw_results.push(raw_data);
-                last_end = match_end;
-                
-                if match_start == match_end {
-                    last_end += 1;
-                }
-            }
-        }
+    if !has_custom_converters && evaluate_result && parser.raw_convertible {
+        // Collect all raw matches with the GIL released (no Python objects created yet)
+        let raw_results = if parallel {
+            py.allow_threads(|| parser.findall_raw_parallel(string, case_sensitive, filter))
+        } else {
+            crate::parser::matching::allow_threads_for(py, string.len(), || {
+                parser.findall_raw(string, case_sensitive, filter)
+            })
+        };
         
         // Return Results object with raw data (lazy conversion)
         // This avoids creating all ParseResult objects upfront
         // The Results object is lightweight - just stores raw data
-        return Python::with_gil(|py| -> PyResult<PyObject> {
-            let results = Results::new(raw_results);
-            Ok(Py::new(py, results)?.to_object(py))
-        });
+        let results = Results::new(raw_results).with_output_columns(parser.output_columns());
+        if columns {
+            // Columns are built straight from the raw data
+            return results.columns(py);
+        }
+        return Ok(Py::new(py, results)?.into_any());
     }
     
     // Fallback: use Python path (for custom converters or evaluate_result=False)
-    // Optimized: Collect results first, then create PyList with items directly
-    Python::with_gil(|py| -> PyResult<PyObject> {
-        let search_regex = parser.get_search_regex(case_sensitive);
-        let mut results = Vec::new();
-        let mut last_end = 0;
-        let extra_types_for_matching = extra_types.as_ref().map(|et| et.clone()).unwrap_or_default();
+    // Regex matching still runs without the GIL; only result building needs it
+    let captured_matches = if parallel {
+        py.allow_threads(|| parser.findall_captures_parallel(string, case_sensitive))
+    } else {
+        crate::parser::matching::allow_threads_for(py, string.len(), || {
+            parser.findall_captures(string, case_sensitive)
+        })
+    };
+    
+    let mut results = Vec::with_capacity(captured_matches.len());
+    let mut last_end = 0;
+    let extra_types_for_matching = extra_types.unwrap_or_default();
+    
+    for captured in &captured_matches {
+        let (match_start, match_end) = captured.span;
+        
+        if match_start < last_end {
+            continue;
+        }
         
-        for captures in search_regex.captures_iter(string) {
-            let full_match = captures.get(0).unwrap();
-            let match_start = full_match.start();
-            let match_end = full_match.end();
+        if let Some(result) = crate::parser::matching::build_match_result(
+            captured,
+            string,
+            &parser.pattern,
+            &parser.field_specs,
+            &parser.field_names,
+            &parser.normalized_names,
+            py,
+            &extra_types_for_matching,
+            evaluate_result,
+        )?.filter(|result| accepts_object(filter, py, result)) {
+            results.push(result);
+            last_end = match_end;
             
-            if match_start < last_end {
-                continue;
+            if match_start == match_end {
+                last_end += 1;
             }
-            
-            let extra_types_ref = &extra_types_for_matching;
-            
-            if let Some(result) = crate::parser::matching::match_with_captures(
-                &captures,
-                string,
-                match_start,
-                &parser.pattern,
-                &parser.field_specs,
-                &parser.field_names,
-                &parser.normalized_names,
-                &parser.custom_type_groups,
-                &parser.has_nested_dict_fields,
-                py,
-                extra_types_ref,
-                evaluate_result,
-            )? {
-                results.push(result);
-                last_end = match_end;
-                
-                if match_start == match_end {
-                    last_end += 1;
-                }
+        }
+    }
+    
+    if columns {
+        return crate::columns::object_columns(py, &results, &parser.output_columns());
+    }
+    
+    // Create PyList with items directly (more efficient than empty + append)
+    Ok(PyList::new(py, &results)?.into_any().unbind())
+}
+
+/// Count the non-overlapping matches of a pattern in a string (the matches findall returns)
+#[pyfunction]
+#[pyo3(signature = (pattern, string, extra_types=None, case_sensitive=false, evaluate_result=true))]
+fn count(
+    py: Python<'_>,
+    pattern: &str,
+    string: Text<'_>,
+    extra_types: Option<HashMap<String, PyObject>>,
+    case_sensitive: bool,
+    evaluate_result: bool,
+) -> PyResult<usize> {
+    // Validate input lengths
+    formatparse_core::validate_pattern_length(pattern)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
+    
+    // Check for null bytes in inputs
+    if pattern.contains('\0') {
+        return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
+    }
+    string.validate()?;
+    
+    // Nothing is converted, so the default output shares the cache entry with findall()
+    let parser = get_or_create_parser(pattern, extra_types.clone(), None, DateTimeOutput::DateTime)?;
+    let custom_converters = extra_types.unwrap_or_default();
+    match &string {
+        Text::Str(string) => parser.count_matches(py, string.to_str()?, case_sensitive, &custom_converters, evaluate_result),
+        Text::Bytes(buffer) => parser.count_bytes(py, buffer, case_sensitive, &custom_converters, evaluate_result),
+    }
+}
+
+/// Lazily iterate over the matches of a pattern in a string
+#[pyfunction]
+#[pyo3(signature = (pattern, string, extra_types=None, case_sensitive=false, evaluate_result=true, r#where=None, datetime_output="datetime"))]
+fn finditer(
+    pattern: &str,
+    string: &Bound<'_, PyString>,
+    extra_types: Option<HashMap<String, PyObject>>,
+    case_sensitive: bool,
+    evaluate_result: bool,
+    r#where: Option<&Bound<'_, PyAny>>,
+    datetime_output: &str,
+) -> PyResult<FindIter> {
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    let string_value = string.to_str()?;
+    
+    // Validate input lengths
+    formatparse_core::validate_pattern_length(pattern)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
+    formatparse_core::validate_input_length(string_value)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
+    
+    // Check for null bytes in inputs
+    if pattern.contains('\0') {
+        return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
+    }
+    if string_value.contains('\0') {
+        return Err(pyo3::exceptions::PyValueError::new_err("Input string contains null byte"));
+    }
+    
+    let parser = get_or_create_parser(pattern, extra_types.clone(), None, datetime_output)?;
+    let filter = Filter::from_py(r#where, &parser.field_names, evaluate_result)?;
+    Ok(FindIter::new(parser, string.clone().unbind(), case_sensitive, extra_types, evaluate_result, filter))
+}
+
+/// Parse many strings with the same pattern, in parallel across all cores
+#[pyfunction]
+#[pyo3(signature = (pattern, strings, extra_types=None, case_sensitive=false, evaluate_result=true, columns=false, as_numpy=false, out=None, r#where=None, datetime_output="datetime"))]
+fn parse_many(
+    py: Python<'_>,
+    pattern: &str,
+    strings: Vec<String>,
+    extra_types: Option<HashMap<String, PyObject>>,
+    case_sensitive: bool,
+    evaluate_result: bool,
+    columns: bool,
+    as_numpy: bool,
+    out: Option<&Bound<'_, PyAny>>,
+    r#where: Option<&Bound<'_, PyAny>>,
+    datetime_output: &str,
+) -> PyResult<PyObject> {
+    crate::columns::validate_batch_output(evaluate_result, columns, as_numpy, out.is_some())?;
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    
+    // Validate pattern length
+    formatparse_core::validate_pattern_length(pattern)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
+    
+    // Check for null bytes in pattern
+    if pattern.contains('\0') {
+        return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
+    }
+    
+    // Look up the parser once for the whole batch (one cache access instead of one per string)
+    match get_or_create_parser(pattern, extra_types.clone(), None, datetime_output) {
+        Ok(parser) => {
+            let filter = Filter::from_py(r#where, &parser.field_names, evaluate_result)?;
+            let batch = parser.parse_many_internal(py, strings, case_sensitive, extra_types, evaluate_result, true, filter.as_ref())?;
+            crate::columns::finish_batch(py, batch, &parser.output_columns(), columns, as_numpy, out)
+        }
+        Err(e) => {
+            let err_msg = e.to_string();
+            // Same handling as parse(): unsupported features raise, unterminated fields never match
+            if err_msg.contains("not supported") {
+                return Err(e);
+            }
+            if err_msg.contains("Expected '}'") {
+                let results = Results::from_entries(vec![None; strings.len()]);
+                let batch = Py::new(py, results)?.into_any();
+                crate::columns::finish_batch(py, batch, &[], columns, as_numpy, out)
+            } else {
+                Err(e)
             }
         }
-        
-        // Create PyList with items directly (more efficient than empty + append)
-        // Convert PyObject to Bound<PyAny> for PyList::new_bound
-        let items: Vec<_> = results.iter()
-            .map(|obj| obj.bind(py))
-            .collect();
-        let results_list = PyList::new_bound(py, items);
-        Ok(results_list.to_object(py))
-    })
+    }
+}
+
+/// Parse a file line by line, yielding batches of results
+#[pyfunction]
+#[pyo3(signature = (pattern, path, extra_types=None, case_sensitive=false, evaluate_result=true, batch_size=10000, include_unmatched=false, r#where=None, datetime_output="datetime"))]
+fn parse_file(
+    pattern: &str,
+    path: PathBuf,
+    extra_types: Option<HashMap<String, PyObject>>,
+    case_sensitive: bool,
+    evaluate_result: bool,
+    batch_size: usize,
+    include_unmatched: bool,
+    r#where: Option<&Bound<'_, PyAny>>,
+    datetime_output: &str,
+) -> PyResult<ParseFileIterator> {
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    // Validate pattern length
+    formatparse_core::validate_pattern_length(pattern)
+        .map_err(|e| pyo3::exceptions::PyValueError::new_err(e))?;
+    
+    // Check for null bytes in pattern
+    if pattern.contains('\0') {
+        return Err(pyo3::exceptions::PyValueError::new_err("Pattern contains null byte"));
+    }
+    
+    let parser = get_or_create_parser(pattern, extra_types.clone(), None, datetime_output)?;
+    let filter = Filter::from_py(r#where, &parser.field_names, evaluate_result)?;
+    ParseFileIterator::open(
+        parser,
+        &path,
+        case_sensitive,
+        extra_types,
+        evaluate_result,
+        batch_size,
+        include_unmatched,
+        filter,
+    )
 }
 
 /// Compile a pattern into a FormatParser for reuse
 #[pyfunction]
-#[pyo3(signature = (pattern, extra_types=None))]
+#[pyo3(signature = (pattern, extra_types=None, fields=None, engine="auto", datetime_output="datetime"))]
 fn compile(
     pattern: &str,
     extra_types: Option<HashMap<String, PyObject>>,
+    fields: Option<Vec<String>>,
+    engine: &str,
+    datetime_output: &str,
 ) -> PyResult<FormatParser> {
     // Validate pattern length
     formatparse_core::validate_pattern_length(pattern)
@@ -336,7 +487,9 @@ fn compile(
         return Err(PyValueError::new_err("Pattern contains null byte"));
     }
     
-    FormatParser::new_with_extra_types(pattern, extra_types)
+    let datetime_output = datetime_output_from_name(datetime_output)?;
+    let parser = FormatParser::new_with_engine(pattern, extra_types, fields, parser::Engine::from_name(engine)?)?;
+    Ok(parser.with_datetime_output(datetime_output))
 }
 
 /// Extract format specification components from a format string
@@ -417,7 +570,7 @@ fn extract_format(
     
     // Build result dictionary
     Python::with_gil(|py| {
-        let result = PyDict::new_bound(py);
+        let result = PyDict::new(py);
         result.set_item("type", type_str)?;
         
         // Extract width
@@ -451,19 +604,33 @@ fn extract_format(
 
 
 /// Python module definition
-#[pymodule]
+/// gil_used = false: every class is safe to share between threads, so importing the module
+/// doesn't re-enable the GIL on free-threaded Python (3.13t)
+#[pymodule(gil_used = false)]
 fn _formatparse(_py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     m.add_function(wrap_pyfunction!(parse, m)?)?;
     m.add_function(wrap_pyfunction!(search, m)?)?;
     m.add_function(wrap_pyfunction!(findall, m)?)?;
+    m.add_function(wrap_pyfunction!(finditer, m)?)?;
+    m.add_function(wrap_pyfunction!(count, m)?)?;
+    m.add_function(wrap_pyfunction!(parse_many, m)?)?;
+    m.add_function(wrap_pyfunction!(parse_file, m)?)?;
     m.add_function(wrap_pyfunction!(compile, m)?)?;
     m.add_function(wrap_pyfunction!(extract_format, m)?)?;
+    m.add_function(wrap_pyfunction!(cache::cache_info, m)?)?;
+    m.add_function(wrap_pyfunction!(cache::set_cache_size, m)?)?;
+    m.add_function(wrap_pyfunction!(cache::clear_cache, m)?)?;
+    m.add_function(wrap_pyfunction!(datetime::common::set_builtin_timezones, m)?)?;
     m.add_class::<ParseResult>()?;
     m.add_class::<FormatParser>()?;
     m.add_class::<Format>()?;
     m.add_class::<FixedTzOffset>()?;
     m.add_class::<Match>()?;
     m.add_class::<Results>()?;
+    m.add_class::<ParseFileIterator>()?;
+    m.add_class::<FindIter>()?;
+    m.add_class::<Scanner>()?;
+    m.add_class::<PatternSet>()?;
     Ok(())
 }
 
@@ -5,7 +5,7 @@ use pyo3::prelude::*;
 use std::collections::HashMap;
 
 /// Match object that stores raw regex captures without type conversion
-#[pyclass]
+#[pyclass(frozen)]
 pub struct Match {
     pattern: String,
     field_specs: Vec<FieldSpec>,
@@ -48,9 +48,7 @@ impl Match {
                         // Regular flat field name
                         // Check for repeated field names - values must match
                         if let Some(existing_value) = named.get(original_name.as_str()) {
-                            let existing_obj = existing_value.to_object(py);
-                            let converted_obj = converted.to_object(py);
-                            let are_equal: bool = existing_obj.bind(py).eq(converted_obj.bind(py)).unwrap_or(false);
+                            let are_equal: bool = existing_value.bind(py).eq(&converted).unwrap_or(false);
                             if !are_equal {
                                 return Err(error::repeated_name_error(original_name));
                             }
@@ -65,7 +63,7 @@ impl Match {
         
         let parse_result = ParseResult::new_with_spans(fixed, named, self.span, self.field_spans.clone());
         // Py::new() is already optimized when GIL is held
-        Ok(Py::new(py, parse_result)?.to_object(py))
+        Ok(Py::new(py, parse_result)?.into_any())
     }
 }
 
@@ -0,0 +1,287 @@
+//! NumPy structured-array output
+//!
+//! NumPy is imported only when this output is requested, so it stays an optional dependency.
+//! Values are written straight into the array's memory through the buffer protocol.
+
+use std::cell::Cell;
+use pyo3::prelude::*;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyImportError, PyValueError};
+use pyo3::types::{PyBool, PyByteArray, PyFloat, PyInt, PySlice};
+use formatparse_core::FieldType;
+use crate::columns::{batch_items, borrow_parse_results, Column, ColumnKey};
+use crate::parser::raw_match::{RawMatchData, RawValue};
+use crate::results::Results;
+
+/// Storage type of a numeric field in the structured array
+#[derive(Clone, Copy, Debug, PartialEq)]
+enum NumpyKind {
+    Int64,
+    Float64,
+    Bool,
+}
+
+impl NumpyKind {
+    /// NumPy storage for a field type, or None if the field isn't numeric
+    fn for_field_type(field_type: &FieldType) -> Option<Self> {
+        match field_type {
+            FieldType::Integer | FieldType::NumberWithThousands => Some(NumpyKind::Int64),
+            FieldType::Float
+            | FieldType::Scientific
+            | FieldType::GeneralNumber
+            | FieldType::Percentage => Some(NumpyKind::Float64),
+            FieldType::Boolean => Some(NumpyKind::Bool),
+            _ => None,
+        }
+    }
+
+    fn dtype_code(self) -> &'static str {
+        match self {
+            NumpyKind::Int64 => "i8",
+            NumpyKind::Float64 => "f8",
+            NumpyKind::Bool => "?",
+        }
+    }
+}
+
+/// A numeric value read from a match
+#[derive(Clone, Copy, Debug)]
+enum NumericValue {
+    Int(i64),
+    Float(f64),
+    Bool(bool),
+}
+
+impl NumericValue {
+    fn from_raw(value: &RawValue) -> Option<Self> {
+        match value {
+            RawValue::Integer(n) => Some(NumericValue::Int(*n)),
+            RawValue::Float(f) => Some(NumericValue::Float(*f)),
+            RawValue::Boolean(b) => Some(NumericValue::Bool(*b)),
+            _ => None,
+        }
+    }
+
+    fn from_object(value: &Bound<'_, PyAny>) -> Option<Self> {
+        // bool first: it is a subclass of int
+        if value.is_exact_instance_of::<PyBool>() {
+            value.extract().ok().map(NumericValue::Bool)
+        } else if value.is_instance_of::<PyInt>() {
+            value.extract().ok().map(NumericValue::Int)
+        } else if value.is_instance_of::<PyFloat>() {
+            value.extract().ok().map(NumericValue::Float)
+        } else {
+            None
+        }
+    }
+}
+
+/// Write one value at a byte offset (native endian)
+/// Missing values are written as 0 (int), NaN (float) or False (bool)
+fn write_value(cells: &[Cell<u8>], offset: usize, kind: NumpyKind, value: Option<NumericValue>) {
+    let write_bytes = |bytes: &[u8]| {
+        for (cell, &byte) in cells[offset..offset + bytes.len()].iter().zip(bytes) {
+            cell.set(byte);
+        }
+    };
+    match kind {
+        NumpyKind::Int64 => {
+            let n = match value {
+                Some(NumericValue::Int(n)) => n,
+                Some(NumericValue::Bool(b)) => b as i64,
+                _ => 0,
+            };
+            write_bytes(&n.to_ne_bytes());
+        }
+        NumpyKind::Float64 => {
+            let f = match value {
+                Some(NumericValue::Float(f)) => f,
+                Some(NumericValue::Int(n)) => n as f64,  // 'g' fields hold ints or floats
+                _ => f64::NAN,
+            };
+            write_bytes(&f.to_ne_bytes());
+        }
+        NumpyKind::Bool => {
+            let b = match value {
+                Some(NumericValue::Bool(b)) => b,
+                Some(NumericValue::Int(n)) => n != 0,
+                _ => false,
+            };
+            write_bytes(&[b as u8]);
+        }
+    }
+}
+
+/// Name of a column in the structured dtype (positional fields use their index)
+fn field_name(key: &ColumnKey) -> String {
+    match key {
+        ColumnKey::Fixed(index) => index.to_string(),
+        ColumnKey::Named(name) => name.clone(),
+    }
+}
+
+/// Fill a structured array with `rows` rows (allocated, or the first rows of `out`)
+/// `cell(row, key)` reads one value; only numeric fields are included in the dtype
+fn fill_array<'py, F>(
+    py: Python<'py>,
+    columns: &[Column],
+    rows: usize,
+    out: Option<&Bound<'py, PyAny>>,
+    cell: F,
+) -> PyResult<PyObject>
+where
+    F: Fn(usize, &ColumnKey) -> Option<NumericValue>,
+{
+    let numpy = py.import("numpy")
+        .map_err(|_| PyImportError::new_err("NumPy output requires numpy to be installed"))?;
+
+    let fields: Vec<(&ColumnKey, NumpyKind)> = columns.iter()
+        .filter_map(|column| NumpyKind::for_field_type(&column.field_type).map(|kind| (&column.key, kind)))
+        .collect();
+    let dtype_spec: Vec<(String, &str)> = fields.iter()
+        .map(|(key, kind)| (field_name(key), kind.dtype_code()))
+        .collect();
+    let dtype = numpy.getattr("dtype")?.call1((dtype_spec,))?;
+
+    let array = match out {
+        Some(out) => {
+            let out_dtype = out.getattr("dtype")?;
+            if !out_dtype.eq(&dtype)? {
+                return Err(PyValueError::new_err(format!(
+                    "out has dtype {}, expected {}",
+                    out_dtype.str()?, dtype.str()?
+                )));
+            }
+            if out.getattr("ndim")?.extract::<usize>()? != 1 {
+                return Err(PyValueError::new_err("out must be a 1-dimensional array"));
+            }
+            let out_rows = out.len()?;
+            if out_rows < rows {
+                return Err(PyValueError::new_err(format!(
+                    "out has {} rows, but {} are needed",
+                    out_rows, rows
+                )));
+            }
+            // Fill (and return) a view of the first rows
+            out.get_item(PySlice::new(py, 0, rows as isize, 1))?
+        }
+        None => numpy.call_method1("empty", (rows, &dtype))?,
+    };
+
+    if rows == 0 || fields.is_empty() {
+        return Ok(array.unbind());
+    }
+
+    // Byte offsets come from the dtype itself, so they always agree with NumPy's layout
+    let itemsize: usize = dtype.getattr("itemsize")?.extract()?;
+    let dtype_fields = dtype.getattr("fields")?;
+    let offsets: Vec<usize> = fields.iter()
+        .map(|(key, _)| dtype_fields.get_item(field_name(key))?.get_item(1)?.extract())
+        .collect::<PyResult<_>>()?;
+
+    // Flat byte view of the rows (no copy); fails for non-contiguous arrays
+    let bytes_view = array.call_method1("view", (numpy.getattr("uint8")?,))?;
+    let buffer = PyBuffer::<u8>::get(&bytes_view)?;
+    let cells = buffer.as_mut_slice(py)
+        .ok_or_else(|| PyValueError::new_err("out must be a writable, C-contiguous array"))?;
+
+    for row in 0..rows {
+        let row_start = row * itemsize;
+        for ((key, kind), offset) in fields.iter().zip(&offsets) {
+            write_value(cells, row_start + offset, *kind, cell(row, key));
+        }
+    }
+
+    Ok(array.unbind())
+}
+
+/// Write raw match data into a NumPy structured array (no per-match Python objects)
+/// None entries (unmatched inputs) are written as missing values
+pub fn raw_to_numpy(
+    py: Python,
+    entries: &[Option<RawMatchData>],
+    columns: &[Column],
+    out: Option<&Bound<'_, PyAny>>,
+) -> PyResult<PyObject> {
+    fill_array(py, columns, entries.len(), out, |row, key| {
+        key.raw_cell(&entries[row]).and_then(NumericValue::from_raw)
+    })
+}
+
+/// Write ParseResult objects into a NumPy structured array (None items are unmatched inputs)
+pub fn object_to_numpy(
+    py: Python,
+    results: &[PyObject],
+    columns: &[Column],
+    out: Option<&Bound<'_, PyAny>>,
+) -> PyResult<PyObject> {
+    let parse_results = borrow_parse_results(py, results);
+    fill_array(py, columns, results.len(), out, |row, key| {
+        parse_results[row].as_ref()
+            .and_then(|result| key.object_cell(py, result))
+            .and_then(|value| NumericValue::from_object(value.bind(py)))
+    })
+}
+
+/// Convert a batch (Results, or a list of ParseResult/None) to a NumPy structured array
+pub fn batch_to_numpy(
+    py: Python,
+    batch: &PyObject,
+    columns: &[Column],
+    out: Option<&Bound<'_, PyAny>>,
+) -> PyResult<PyObject> {
+    let batch = batch.bind(py);
+    if let Ok(results) = batch.downcast::<Results>() {
+        return results.borrow().to_numpy_array(py, out);
+    }
+    object_to_numpy(py, &batch_items(batch)?, columns, out)
+}
+
+/// Wrap a 0/1 byte mask in a NumPy bool array (sharing the bytes, no copy)
+pub fn mask_to_numpy(py: Python, mask: &[u8]) -> PyResult<PyObject> {
+    let numpy = py.import("numpy")
+        .map_err(|_| PyImportError::new_err("NumPy output requires numpy to be installed"))?;
+    let bytes = PyByteArray::new(py, mask);
+    Ok(numpy.call_method1("frombuffer", (bytes, numpy.getattr("bool_")?))?.unbind())
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn read_cells(cells: &[Cell<u8>]) -> Vec<u8> {
+        cells.iter().map(|cell| cell.get()).collect()
+    }
+
+    #[test]
+    fn test_kind_for_field_type() {
+        assert_eq!(NumpyKind::for_field_type(&FieldType::Integer), Some(NumpyKind::Int64));
+        assert_eq!(NumpyKind::for_field_type(&FieldType::Percentage), Some(NumpyKind::Float64));
+        assert_eq!(NumpyKind::for_field_type(&FieldType::String), None);
+        assert_eq!(NumpyKind::for_field_type(&FieldType::DateTimeISO), None);
+    }
+
+    #[test]
+    fn test_write_value() {
+        let cells = vec![Cell::new(0u8); 17];
+        write_value(&cells, 0, NumpyKind::Int64, Some(NumericValue::Int(-2)));
+        write_value(&cells, 8, NumpyKind::Float64, Some(NumericValue::Int(3)));
+        write_value(&cells, 16, NumpyKind::Bool, Some(NumericValue::Bool(true)));
+        let bytes = read_cells(&cells);
+        assert_eq!(i64::from_ne_bytes(bytes[0..8].try_into().unwrap()), -2);
+        assert_eq!(f64::from_ne_bytes(bytes[8..16].try_into().unwrap()), 3.0);
+        assert_eq!(bytes[16], 1);
+    }
+
+    #[test]
+    fn test_write_missing_values() {
+        let cells = vec![Cell::new(0xffu8); 17];
+        write_value(&cells, 0, NumpyKind::Int64, None);
+        write_value(&cells, 8, NumpyKind::Float64, None);
+        write_value(&cells, 16, NumpyKind::Bool, None);
+        let bytes = read_cells(&cells);
+        assert_eq!(i64::from_ne_bytes(bytes[0..8].try_into().unwrap()), 0);
+        assert!(f64::from_ne_bytes(bytes[8..16].try_into().unwrap()).is_nan());
+        assert_eq!(bytes[16], 0);
+    }
+}
@@ -0,0 +1,159 @@
+use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
+use std::collections::HashMap;
+use std::fs::File;
+use std::io::{BufRead, BufReader};
+use std::path::Path;
+use std::sync::Arc;
+use crate::parser::FormatParser;
+use crate::parser::predicate::Filter;
+
+/// Read buffer size for parse_file (large reads keep syscall overhead low on big logs)
+const READ_BUFFER_SIZE: usize = 1024 * 1024;
+
+/// Iterator over a file that parses it line by line, yielding one batch per `batch_size` lines
+/// Lines are read and matched in Rust with the GIL released; only one batch is held in memory
+#[pyclass]
+pub struct ParseFileIterator {
+    parser: Arc<FormatParser>,
+    reader: Option<BufReader<File>>,  // None once the file is exhausted
+    case_sensitive: bool,
+    extra_types: Option<HashMap<String, PyObject>>,
+    evaluate_result: bool,
+    batch_size: usize,
+    include_unmatched: bool,
+    filter: Option<Filter>,  // where= conditions (rejected lines count as unmatched)
+    line_number: usize,  // Number of lines read so far (for error messages)
+}
+
+impl ParseFileIterator {
+    pub fn open(
+        parser: Arc<FormatParser>,
+        path: &Path,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+        batch_size: usize,
+        include_unmatched: bool,
+        filter: Option<Filter>,
+    ) -> PyResult<Self> {
+        if batch_size == 0 {
+            return Err(PyValueError::new_err("batch_size must be greater than 0"));
+        }
+
+        // Open eagerly so a missing file raises FileNotFoundError at call time
+        let file = File::open(path)?;
+
+        Ok(Self {
+            parser,
+            reader: Some(BufReader::with_capacity(READ_BUFFER_SIZE, file)),
+            case_sensitive,
+            extra_types,
+            evaluate_result,
+            batch_size,
+            include_unmatched,
+            filter,
+            line_number: 0,
+        })
+    }
+}
+
+/// Read up to `max_lines` lines, stripping the line terminator ("\n" or "\r\n")
+/// Returns an empty Vec at end of file
+fn read_lines<R: BufRead>(reader: &mut R, max_lines: usize, first_line: usize) -> PyResult<Vec<String>> {
+    let mut lines = Vec::with_capacity(max_lines.min(4096));
+    let mut buf = Vec::new();
+
+    while lines.len() < max_lines {
+        buf.clear();
+        if reader.read_until(b'\n', &mut buf)? == 0 {
+            break;
+        }
+        if buf.ends_with(b"\n") {
+            buf.pop();
+            if buf.ends_with(b"\r") {
+                buf.pop();
+            }
+        }
+        let line = String::from_utf8(std::mem::take(&mut buf)).map_err(|_| {
+            PyValueError::new_err(format!(
+                "Line {} is not valid UTF-8",
+                first_line + lines.len() + 1
+            ))
+        })?;
+        lines.push(line);
+    }
+
+    Ok(lines)
+}
+
+#[pymethods]
+impl ParseFileIterator {
+    fn __iter__(slf: PyRef<'_, Self>) -> PyRef<'_, Self> {
+        slf
+    }
+
+    /// Read and parse the next batch of lines
+    /// Returns a Results object (or a list when Python conversion is needed)
+    fn __next__(&mut self, py: Python) -> PyResult<Option<PyObject>> {
+        loop {
+            let batch_size = self.batch_size;
+            let first_line = self.line_number;
+            let lines = match self.reader.as_mut() {
+                Some(reader) => py.allow_threads(|| read_lines(reader, batch_size, first_line))?,
+                None => return Ok(None),
+            };
+
+            if lines.is_empty() {
+                // End of file - close it now rather than when the iterator is collected
+                self.reader = None;
+                return Ok(None);
+            }
+            self.line_number += lines.len();
+
+            let extra_types = self.extra_types.as_ref().map(|et| et.clone());
+            let batch = self.parser.parse_many_internal(
+                py,
+                lines,
+                self.case_sensitive,
+                extra_types,
+                self.evaluate_result,
+                self.include_unmatched,
+                self.filter.as_ref(),
+            )?;
+
+            // Skip batches where no line matched (unless unmatched lines are reported)
+            if self.include_unmatched || batch.bind(py).len()? > 0 {
+                return Ok(Some(batch));
+            }
+        }
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+    use std::io::Cursor;
+
+    #[test]
+    fn test_read_lines_strips_terminators() {
+        let mut reader = Cursor::new(b"a\nb\r\nc".to_vec());
+        let lines = read_lines(&mut reader, 10, 0).unwrap();
+        assert_eq!(lines, vec!["a", "b", "c"]);
+    }
+
+    #[test]
+    fn test_read_lines_in_batches() {
+        let mut reader = Cursor::new(b"1\n2\n3\n4\n5\n".to_vec());
+        assert_eq!(read_lines(&mut reader, 2, 0).unwrap(), vec!["1", "2"]);
+        assert_eq!(read_lines(&mut reader, 2, 2).unwrap(), vec!["3", "4"]);
+        assert_eq!(read_lines(&mut reader, 2, 4).unwrap(), vec!["5"]);
+        assert!(read_lines(&mut reader, 2, 5).unwrap().is_empty());
+    }
+
+    #[test]
+    fn test_read_lines_keeps_empty_lines() {
+        let mut reader = Cursor::new(b"a\n\nb\n".to_vec());
+        assert_eq!(read_lines(&mut reader, 10, 0).unwrap(), vec!["a", "", "b"]);
+    }
+}
@@ -5,13 +5,18 @@
 //! - `regex`: Builds regex patterns from field specifications
 //! - `matching`: Executes regex matches and extracts values
 //! - `format_parser`: Main FormatParser struct and Format class
+//! - `predicate`: Field-value filters (`where=`)
+//! - `bytes_input`: Matching bytes-like objects in place
 
 pub mod pattern;
 // regex module is in formatparse-core
 pub mod matching;
 pub mod format_parser;
 pub mod raw_match;
+pub mod predicate;
+pub mod bytes_input;
 
-pub use format_parser::{FormatParser, Format};
+pub use format_parser::{datetime_output_from_name, Engine, FormatParser, Format};
 pub use pattern::parse_field_path;
+pub use bytes_input::Text;
 
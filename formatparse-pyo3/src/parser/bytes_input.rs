@@ -0,0 +1,351 @@
+//! Bytes-like input: bytes, bytearray, memoryview, mmap and other buffer-protocol objects
+//!
+//! Buffers are matched without decoding them into a str (`bytes` and read-only mmaps also
+//! without copying them, see ByteBuffer). An anchored match (parse, matches) covers the
+//! whole input, so the buffer is decoded as a whole; searching runs `regex::bytes` versions
+//! of the search regexes over the raw bytes and decodes only the text of each match.
+//! Spans are byte offsets into the buffer.
+
+use crate::parser::format_parser::parallel_chunks;
+use crate::parser::matching::{
+    allow_threads_for, build_match_result_at, custom_pattern_groups, field_groups,
+    match_with_captures_raw, CapturedMatch, FieldGroup,
+};
+use crate::parser::predicate::{accepts_object, Filter};
+use crate::parser::raw_match::RawMatchData;
+use crate::parser::FormatParser;
+use crate::results::Results;
+use formatparse_core::parser::validate_input_length;
+use pyo3::buffer::PyBuffer;
+use pyo3::exceptions::{PyTypeError, PyValueError};
+use pyo3::prelude::*;
+use pyo3::types::{PyBytes, PyList, PyString};
+use rayon::prelude::*;
+use std::collections::HashMap;
+
+/// The bytes of a bytes-like input
+///
+/// Only memory that nothing can write to is matched in place: `bytes`, and read-only mmaps.
+/// Any other buffer (bytearray, a writable mmap, a memoryview, which can be a read-only
+/// view of writable memory) is copied once, since another thread could write to it while
+/// it is matched, with or without the GIL.
+pub struct ByteBuffer {
+    data: BufferData,
+}
+
+enum BufferData {
+    /// Exported by an immutable object, which can't free or resize it while it is held
+    Shared(PyBuffer<u8>),
+    Copied(Vec<u8>),
+}
+
+impl ByteBuffer {
+    fn new(obj: &Bound<'_, PyAny>, buffer: PyBuffer<u8>) -> PyResult<Self> {
+        let data = if buffer.is_c_contiguous() && is_immutable(obj, &buffer)? {
+            BufferData::Shared(buffer)
+        } else {
+            BufferData::Copied(buffer.to_vec(obj.py())?)
+        };
+        Ok(Self { data })
+    }
+
+    pub fn as_bytes(&self) -> &[u8] {
+        let buffer = match &self.data {
+            BufferData::Shared(buffer) => buffer,
+            BufferData::Copied(bytes) => return bytes,
+        };
+        let len = buffer.len_bytes();
+        if len == 0 {
+            return &[];
+        }
+        // Safety: the buffer is contiguous, holds `len` bytes, stays exported while self
+        // lives, and its exporter is immutable
+        unsafe { std::slice::from_raw_parts(buffer.buf_ptr() as *const u8, len) }
+    }
+}
+
+/// Whether nothing can write to the memory `obj` exports: it is a `bytes` or a read-only mmap
+fn is_immutable(obj: &Bound<'_, PyAny>, buffer: &PyBuffer<u8>) -> PyResult<bool> {
+    if obj.is_exact_instance_of::<PyBytes>() {
+        return Ok(true);
+    }
+    if !buffer.readonly() {
+        return Ok(false);
+    }
+    let mmap_type = obj.py().import("mmap")?.getattr("mmap")?;
+    Ok(obj.get_type().is(&mmap_type))
+}
+
+/// The string argument of a matching function: a str, or a bytes-like object
+pub enum Text<'py> {
+    Str(Bound<'py, PyString>),
+    Bytes(ByteBuffer),
+}
+
+impl<'py> FromPyObject<'py> for Text<'py> {
+    fn extract_bound(obj: &Bound<'py, PyAny>) -> PyResult<Self> {
+        if let Ok(string) = obj.downcast::<PyString>() {
+            return Ok(Text::Str(string.clone()));
+        }
+        match PyBuffer::<u8>::get(obj) {
+            Ok(buffer) => Ok(Text::Bytes(ByteBuffer::new(obj, buffer)?)),
+            Err(_) => Err(PyTypeError::new_err(format!(
+                "expected str or a bytes-like object, got '{}'",
+                obj.get_type().name()?
+            ))),
+        }
+    }
+}
+
+impl Text<'_> {
+    /// Check the input length and reject null bytes (the same checks for str and bytes)
+    pub fn validate(&self) -> PyResult<()> {
+        let data = match self {
+            Text::Str(string) => string.to_str()?.as_bytes(),
+            Text::Bytes(buffer) => buffer.as_bytes(),
+        };
+        validate_input_length(data)
+            .map_err(|e| PyValueError::new_err(e))?;
+        if data.contains(&0) {
+            return Err(PyValueError::new_err("Input string contains null byte"));
+        }
+        Ok(())
+    }
+
+    /// The whole input as a str, for anchored matching: a buffer is decoded without copying
+    /// None if it isn't valid UTF-8 (the regexes only match UTF-8, so it can't match)
+    pub fn whole_str(&self) -> PyResult<Option<&str>> {
+        match self {
+            Text::Str(string) => string.to_str().map(Some),
+            Text::Bytes(buffer) => Ok(std::str::from_utf8(buffer.as_bytes()).ok()),
+        }
+    }
+}
+
+/// Keep the matches findall returns, in order: `convert` gives None for a rejected match,
+/// and a match starting inside the last kept one (or right after a kept empty one) is skipped
+fn keep_matches<T>(
+    captured: &[CapturedMatch],
+    mut convert: impl FnMut(&CapturedMatch) -> PyResult<Option<T>>,
+) -> PyResult<Vec<T>> {
+    let mut kept = Vec::new();
+    let mut last_end = 0;
+    for captured_match in captured {
+        let (match_start, match_end) = captured_match.span;
+        if match_start < last_end {
+            continue;
+        }
+        if let Some(result) = convert(captured_match)? {
+            kept.push(result);
+            last_end = if match_start == match_end { match_end + 1 } else { match_end };
+        }
+    }
+    Ok(kept)
+}
+
+/// Text of a match in a buffer (the regexes only match UTF-8, so this shouldn't fail)
+fn match_text(data: &[u8], (start, end): (usize, usize)) -> PyResult<&str> {
+    std::str::from_utf8(&data[start..end])
+        .map_err(|e| PyValueError::new_err(format!("Match at byte {} is not valid UTF-8: {}", start, e)))
+}
+
+impl FormatParser {
+    /// Capture groups of every field, for reading `regex::bytes` matches
+    fn bytes_field_groups(&self, case_sensitive: bool, custom_type_groups: &[usize]) -> Vec<FieldGroup> {
+        field_groups(
+            self.get_search_regex(case_sensitive),
+            &self.field_specs,
+            &self.normalized_names,
+            custom_type_groups,
+        )
+    }
+
+    /// Captures of the first `limit` matches in `data[start..end]`, with spans into `data`
+    /// (no GIL needed)
+    fn bytes_captures(
+        &self,
+        regex: &regex::bytes::Regex,
+        groups: &[FieldGroup],
+        data: &[u8],
+        (start, end): (usize, usize),
+        limit: usize,
+    ) -> Vec<CapturedMatch> {
+        regex.captures_iter(&data[start..end])
+            .take(limit)
+            .map(|captures| {
+                let found = captures.get(0).unwrap();
+                let mut captured = CapturedMatch {
+                    span: (found.start(), found.end()),
+                    fields: groups.iter().map(|group| group.read_bytes(&captures)).collect(),
+                };
+                captured.offset_by(start);
+                captured
+            })
+            .collect()
+    }
+
+    /// Convert a match in a buffer to raw data, decoding only the matched bytes
+    /// None if a value doesn't convert or `filter` rejects the match
+    fn raw_bytes_match(&self, data: &[u8], captured: &CapturedMatch, filter: Option<&Filter>) -> Option<RawMatchData> {
+        let start = captured.span.0;
+        let text = std::str::from_utf8(&data[start..captured.span.1]).ok()?;
+        let mut raw_data = match_with_captures_raw(
+            &captured.relative_to(start),
+            text,
+            &self.field_specs,
+            &self.field_names,
+            &self.has_nested_dict_fields,
+            filter,
+        ).ok()??;
+        raw_data.offset_by(start);
+        Some(raw_data)
+    }
+
+    /// Build the result of a match in a buffer (ParseResult, or Match without
+    /// evaluate_result), decoding only the matched bytes
+    fn build_bytes_match(
+        &self,
+        py: Python,
+        data: &[u8],
+        captured: &CapturedMatch,
+        custom_converters: &HashMap<String, PyObject>,
+        evaluate_result: bool,
+        filter: Option<&Filter>,
+    ) -> PyResult<Option<PyObject>> {
+        let text = match_text(data, captured.span)?;
+        Ok(build_match_result_at(
+            captured,
+            text,
+            captured.span.0,
+            &self.pattern,
+            &self.field_specs,
+            &self.field_names,
+            &self.normalized_names,
+            py,
+            custom_converters,
+            evaluate_result,
+        )?.filter(|result| accepts_object(filter, py, result)))
+    }
+
+    /// search() over `buffer[pos..endpos]` (spans are offsets into the whole buffer)
+    pub(crate) fn search_bytes(
+        &self,
+        py: Python,
+        buffer: &ByteBuffer,
+        pos: usize,
+        endpos: usize,
+        case_sensitive: bool,
+        custom_converters: &HashMap<String, PyObject>,
+        evaluate_result: bool,
+    ) -> PyResult<Option<PyObject>> {
+        let data = buffer.as_bytes();
+        if !self.may_match_bytes(&data[pos..endpos], case_sensitive) {
+            return Ok(None);
+        }
+        let regex = self.get_bytes_search_regex(case_sensitive)?;
+        let pattern_groups = match custom_pattern_groups(&self.field_specs, custom_converters, py) {
+            Ok(groups) => groups,
+            // Invalid regex_group_count is only reported when the input matches (as for str)
+            Err(e) => return if regex.is_match(&data[pos..endpos]) { Err(e) } else { Ok(None) },
+        };
+        let groups = self.bytes_field_groups(case_sensitive, &pattern_groups);
+        let captured = allow_threads_for(py, endpos - pos, || {
+            self.bytes_captures(regex, &groups, data, (pos, endpos), 1).pop()
+        });
+        match captured {
+            Some(captured) => self.build_bytes_match(py, data, &captured, custom_converters, evaluate_result, None),
+            None => Ok(None),
+        }
+    }
+
+    /// findall() over a buffer: a Results object (or columns) when every value converts
+    /// without Python, else a list of results (see formatparse.findall)
+    pub(crate) fn findall_bytes(
+        &self,
+        py: Python,
+        buffer: &ByteBuffer,
+        case_sensitive: bool,
+        custom_converters: &HashMap<String, PyObject>,
+        evaluate_result: bool,
+        parallel: bool,
+        columns: bool,
+        filter: Option<&Filter>,
+    ) -> PyResult<PyObject> {
+        let data = buffer.as_bytes();
+        let regex = self.get_bytes_search_regex(case_sensitive)?;
+        let groups = self.bytes_field_groups(case_sensitive, &self.custom_type_groups);
+        let chunks = if !self.may_match_bytes(data, case_sensitive) {
+            Vec::new()
+        } else if parallel {
+            parallel_chunks(data)
+        } else {
+            vec![(0, data.len())]
+        };
+
+        if custom_converters.is_empty() && evaluate_result && self.raw_convertible {
+            // Matching and conversion both run in Rust, one chunk per rayon task
+            let raw_results = allow_threads_for(py, data.len(), || {
+                chunks.par_iter()
+                    .map(|&chunk| {
+                        let captured = self.bytes_captures(regex, &groups, data, chunk, usize::MAX);
+                        keep_matches(&captured, |captured| Ok(self.raw_bytes_match(data, captured, filter)))
+                    })
+                    .collect::<PyResult<Vec<_>>>()
+            })?;
+            let results = Results::new(raw_results.into_iter().flatten().collect())
+                .with_output_columns(self.output_columns());
+            if columns {
+                return results.columns(py);
+            }
+            return Ok(Py::new(py, results)?.into_any());
+        }
+
+        let captured: Vec<CapturedMatch> = allow_threads_for(py, data.len(), || {
+            chunks.par_iter()
+                .flat_map_iter(|&chunk| self.bytes_captures(regex, &groups, data, chunk, usize::MAX))
+                .collect()
+        });
+        let results = keep_matches(&captured, |captured| {
+            self.build_bytes_match(py, data, captured, custom_converters, evaluate_result, filter)
+        })?;
+        if columns {
+            return crate::columns::object_columns(py, &results, &self.output_columns());
+        }
+        Ok(PyList::new(py, &results)?.into_any().unbind())
+    }
+
+    /// count() over a buffer (see formatparse.count)
+    pub(crate) fn count_bytes(
+        &self,
+        py: Python,
+        buffer: &ByteBuffer,
+        case_sensitive: bool,
+        custom_converters: &HashMap<String, PyObject>,
+        evaluate_result: bool,
+    ) -> PyResult<usize> {
+        let data = buffer.as_bytes();
+        if !self.may_match_bytes(data, case_sensitive) {
+            return Ok(0);
+        }
+        let regex = self.get_bytes_search_regex(case_sensitive)?;
+        if !evaluate_result {
+            return Ok(allow_threads_for(py, data.len(), || regex.find_iter(data).count()));
+        }
+        let groups = self.bytes_field_groups(case_sensitive, &self.custom_type_groups);
+        if self.raw_convertible && custom_converters.is_empty() {
+            return allow_threads_for(py, data.len(), || {
+                let captured = self.bytes_captures(regex, &groups, data, (0, data.len()), usize::MAX);
+                keep_matches(&captured, |captured| Ok(self.raw_bytes_match(data, captured, None).map(|_| ())))
+                    .map(|kept| kept.len())
+            });
+        }
+
+        // Datetime and custom types are only converted in Python
+        let captured = allow_threads_for(py, data.len(), || {
+            self.bytes_captures(regex, &groups, data, (0, data.len()), usize::MAX)
+        });
+        keep_matches(&captured, |captured| {
+            self.build_bytes_match(py, data, captured, custom_converters, true, None)
+        }).map(|kept| kept.len())
+    }
+}
@@ -1,17 +1,29 @@
-use crate::error;
-use formatparse_core::FieldSpec;
+use crate::parser::matching::CapturedMatch;
+use crate::parser::raw_match::RawMatchData;
+use crate::parser::predicate::{accepts_object, Filter};
+use crate::parser::bytes_input::Text;
+use crate::parse_file::ParseFileIterator;
+use crate::finditer::FindIter;
+use crate::scanner::Scanner;
+use crate::results::Results;
+use crate::columns::Column;
+use formatparse_core::{DateTimeOutput, FieldSpec, Prefilter, SplitMatch, SplitMatcher};
 use formatparse_core::parser::{validate_pattern_length, validate_input_length, MAX_FIELDS};
 use pyo3::prelude::*;
 use pyo3::exceptions::PyValueError;
-use pyo3::types::{PyString, PyTuple};
+use pyo3::types::{PyByteArray, PyList, PyString, PyTuple};
+use once_cell::sync::OnceCell;
+use rayon::prelude::*;
 use regex::Regex;
 use std::collections::HashMap;
+use std::path::PathBuf;
+use std::sync::Arc;
 
-#[pyclass(module = "_formatparse")]
+#[pyclass(module = "_formatparse", frozen)]
 #[derive(Clone)]
 pub struct FormatParser {
     #[pyo3(get)]
-    // Note: This field is actually used in __getstate__, format getter, and accessed from Python.
+    // Note: This field is actually used in __getnewargs__, format getter, and accessed from Python.
     // The dead_code warning is a false positive - the compiler doesn't recognize PyO3 getter usage.
     pub pattern: String,
     regex: Regex,
@@ -28,6 +40,69 @@ pub struct FormatParser {
     pub(crate) custom_type_groups: Vec<usize>,  // Cached pattern_groups per field (for custom types)
     pub(crate) field_count: usize,  // Cached field count for fast path optimizations
     pub(crate) has_nested_dict_fields: Vec<bool>,  // Cached flags: does field name contain '[' (nested dict)?
+    pub(crate) raw_convertible: bool,  // Cached flag: can every field be converted without Python (no GIL needed)?
+    fields: Option<Vec<String>>,  // Field projection: only these fields are captured (None = all fields)
+    prefilter: Option<Prefilter>,  // Literal text every match contains (rejects inputs before the regex runs)
+    engine: Engine,  // Requested matching engine (kept for pickling)
+    datetime_output: DateTimeOutput,  // What datetime fields convert to (also set on each FieldSpec)
+    split: Option<SplitMatcher>,  // Delimiter-split matcher for parse(), if the pattern allows it
+    prefix_regexes: OnceCell<PrefixRegexes>,  // Compiled on first use by Scanner.match/skip
+    bytes_search_regexes: OnceCell<BytesSearchRegexes>,  // Compiled on first search of bytes input
+}
+
+/// Regexes matching the pattern at the start of a string (not anchored at the end)
+#[derive(Clone)]
+struct PrefixRegexes {
+    case_sensitive: Regex,
+    case_insensitive: Option<Regex>,
+}
+
+/// `regex::bytes` versions of the search regexes, for bytes-like input
+#[derive(Clone)]
+struct BytesSearchRegexes {
+    case_sensitive: regex::bytes::Regex,
+    case_insensitive: Option<regex::bytes::Regex>,
+}
+
+/// Engine used for anchored matching (parse, parse_many, parse_file)
+#[derive(Clone, Copy, Debug, PartialEq)]
+pub enum Engine {
+    /// The split engine when the pattern allows it, else the regex
+    Auto,
+    /// Always the split engine (patterns that don't allow it are rejected)
+    Split,
+    /// Always the regex
+    Regex,
+}
+
+impl Engine {
+    pub fn from_name(name: &str) -> PyResult<Self> {
+        match name {
+            "auto" => Ok(Engine::Auto),
+            "split" => Ok(Engine::Split),
+            "regex" => Ok(Engine::Regex),
+            _ => Err(PyValueError::new_err(format!(
+                "engine must be 'auto', 'split' or 'regex', not '{}'",
+                name
+            ))),
+        }
+    }
+
+    pub fn name(&self) -> &'static str {
+        match self {
+            Engine::Auto => "auto",
+            Engine::Split => "split",
+            Engine::Regex => "regex",
+        }
+    }
+}
+
+/// Parse a `datetime_output=` argument
+pub fn datetime_output_from_name(name: &str) -> PyResult<DateTimeOutput> {
+    DateTimeOutput::from_name(name).ok_or_else(|| PyValueError::new_err(format!(
+        "datetime_output must be 'datetime', 'epoch_s', 'epoch_ns' or 'iso', not '{}'",
+        name
+    )))
 }
 
 impl FormatParser {
@@ -36,6 +111,26 @@ impl FormatParser {
     }
 
     pub fn new_with_extra_types(pattern: &str, extra_types: Option<HashMap<String, PyObject>>) -> PyResult<Self> {
+        Self::new_with_fields(pattern, extra_types, None)
+    }
+
+    /// Compile a pattern that captures only the given fields (all fields if None)
+    /// The other fields still have to match, but they aren't captured or converted
+    pub fn new_with_fields(
+        pattern: &str,
+        extra_types: Option<HashMap<String, PyObject>>,
+        fields: Option<Vec<String>>,
+    ) -> PyResult<Self> {
+        Self::new_with_engine(pattern, extra_types, fields, Engine::Auto)
+    }
+
+    /// Compile a pattern with an explicit matching engine (see `Engine`)
+    pub fn new_with_engine(
+        pattern: &str,
+        extra_types: Option<HashMap<String, PyObject>>,
+        fields: Option<Vec<String>>,
+        engine: Engine,
+    ) -> PyResult<Self> {
         // Validate pattern length
         validate_pattern_length(pattern)
             .map_err(|e| PyValueError::new_err(e))?;
@@ -62,7 +157,7 @@ impl FormatParser {
             Ok(patterns)
         })?;
         
-        let (regex_str_with_anchors, regex_str, field_specs, field_names, normalized_names, name_mapping) = crate::parser::pattern::parse_pattern(pattern, extra_types.as_ref(), &custom_patterns)?;
+        let (regex_str_with_anchors, regex_str, field_specs, field_names, normalized_names, name_mapping) = crate::parser::pattern::parse_pattern(pattern, extra_types.as_ref(), &custom_patterns, fields.as_deref())?;
         
         // Validate field count
         if field_specs.len() > MAX_FIELDS {
@@ -76,19 +171,9 @@ impl FormatParser {
         // Pre-compute custom type validation results (pattern_groups per field)
         // This avoids calling validate_custom_type_pattern for every match
         let custom_type_groups = Python::with_gil(|py| -> PyResult<Vec<usize>> {
-            let mut groups = Vec::with_capacity(field_specs.len());
             let empty_map = std::collections::HashMap::new();
             let custom_converters = extra_types.as_ref().map(|et| et as &HashMap<String, PyObject>).unwrap_or(&empty_map);
-            
-            for spec in &field_specs {
-                if !custom_converters.is_empty() {
-                    let pattern_groups = crate::parser::matching::validate_custom_type_pattern(spec, custom_converters, py)?;
-                    groups.push(pattern_groups);
-                } else {
-                    groups.push(0);
-                }
-            }
-            Ok(groups)
+            crate::parser::matching::custom_pattern_groups(&field_specs, custom_converters, py)
         })?;
         
         // Pre-compute which fields have nested dict names (contain '[')
@@ -97,6 +182,13 @@ impl FormatParser {
             .map(|name_opt| name_opt.as_ref().map(|n| n.contains('[')).unwrap_or(false))
             .collect();
         
+        // Pre-compute whether matches can be converted without Python (no custom converters,
+        // no datetime/custom types, no nested dicts) - enables the GIL-free batch paths
+        let has_custom_converters = extra_types.as_ref().map(|et| !et.is_empty()).unwrap_or(false);
+        let raw_convertible = !has_custom_converters
+            && field_specs.iter().all(|spec| crate::parser::raw_match::is_raw_convertible(&spec.field_type))
+            && !has_nested_dict_fields.iter().any(|&b| b);
+        
         // Build regex with DOTALL flag
         let regex = formatparse_core::build_regex(&regex_str_with_anchors)
             .map_err(|e| crate::error::core_error_to_py_err(e))?;
@@ -110,6 +202,18 @@ impl FormatParser {
         let search_regex_case_insensitive = formatparse_core::build_search_regex(regex.as_str(), false)
             .ok();
 
+        let split = match engine {
+            Engine::Regex => None,
+            Engine::Auto | Engine::Split => SplitMatcher::new(pattern, &field_specs)
+                .map_err(|e| crate::error::core_error_to_py_err(e))?,
+        };
+        if engine == Engine::Split && split.is_none() {
+            return Err(PyValueError::new_err(format!(
+                "Pattern '{}' can't be matched by the split engine",
+                pattern
+            )));
+        }
+
         Ok(Self {
             pattern: pattern.to_string(),
             regex,
@@ -125,9 +229,36 @@ impl FormatParser {
             custom_type_groups,
             field_count: field_specs.len(),  // Cache field count for fast path
             has_nested_dict_fields,  // Cache nested dict flags
+            raw_convertible,
+            fields,
+            prefilter: Prefilter::new(pattern),
+            engine,
+            datetime_output: DateTimeOutput::DateTime,
+            split,
+            prefix_regexes: OnceCell::new(),
+            bytes_search_regexes: OnceCell::new(),
         })
     }
 
+    /// Copy of this parser that converts with other converters (no recompilation)
+    /// The converters must have the same names, patterns and group counts as the current ones
+    pub(crate) fn with_extra_types(&self, extra_types: Option<HashMap<String, PyObject>>) -> Self {
+        Self {
+            stored_extra_types: extra_types,
+            ..self.clone()
+        }
+    }
+
+    /// This parser with datetime fields converted to another output (see `DateTimeOutput`)
+    /// Only the conversion changes, so the compiled regexes and matchers are kept
+    pub(crate) fn with_datetime_output(mut self, datetime_output: DateTimeOutput) -> Self {
+        for spec in &mut self.field_specs {
+            spec.datetime_output = datetime_output;
+        }
+        self.datetime_output = datetime_output;
+        self
+    }
+
     pub fn search_pattern(
         &self,
         string: &str,
@@ -135,60 +266,397 @@ impl FormatParser {
         extra_types: Option<HashMap<String, PyObject>>,
         evaluate_result: bool,
     ) -> PyResult<Option<PyObject>> {
-        // Use pre-compiled search regex
-        let search_regex = if case_sensitive {
-            &self.search_regex
-        } else {
-            self.search_regex_case_insensitive.as_ref().unwrap_or(&self.search_regex)
-        };
-        
+        if !self.may_match(string, case_sensitive) {
+            return Ok(None);
+        }
+        let custom_converters = extra_types.unwrap_or_default();
+        self.match_and_build(false, string, case_sensitive, &custom_converters, evaluate_result)
+    }
+
+    pub(crate) fn parse_internal(
+        &self,
+        string: &str,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+    ) -> PyResult<Option<PyObject>> {
+        if !self.may_match(string, case_sensitive) {
+            return Ok(None);
+        }
+        // Custom type handling is done in convert_value
+        let custom_converters = extra_types.unwrap_or_default();
+        self.match_and_build(true, string, case_sensitive, &custom_converters, evaluate_result)
+    }
+    
+    /// Match with the GIL released, then reacquire it only to build Python objects
+    /// `anchored` matches the whole string (parse), otherwise the first match is searched for
+    fn match_and_build(
+        &self,
+        anchored: bool,
+        string: &str,
+        case_sensitive: bool,
+        custom_converters: &HashMap<String, PyObject>,
+        evaluate_result: bool,
+    ) -> PyResult<Option<PyObject>> {
+        let regex = if anchored { self.get_regex(case_sensitive) } else { self.get_search_regex(case_sensitive) };
         Python::with_gil(|py| {
-            if search_regex.captures(string).is_some() {
-                let extra_types_ref = &extra_types.as_ref().map(|et| et.clone()).unwrap_or_default();
-                return crate::parser::matching::match_with_regex(
-                    search_regex,
+            // Custom type patterns are validated against the converters used for this call
+            let pattern_groups = match crate::parser::matching::custom_pattern_groups(&self.field_specs, custom_converters, py) {
+                Ok(groups) => groups,
+                // Invalid regex_group_count is only reported when the string matches
+                Err(e) => return if regex.is_match(string) { Err(e) } else { Ok(None) },
+            };
+            
+            // Regex execution and capture extraction don't touch Python objects
+            let captured = crate::parser::matching::allow_threads_for(py, string.len(), || {
+                if anchored {
+                    self.capture_anchored(string, case_sensitive, &pattern_groups)
+                } else {
+                    crate::parser::matching::capture_with_regex(
+                        regex,
+                        string,
+                        &self.field_specs,
+                        &self.normalized_names,
+                        &pattern_groups,
+                    )
+                }
+            });
+            
+            match captured {
+                Some(captured) => crate::parser::matching::build_match_result(
+                    &captured,
                     string,
                     &self.pattern,
                     &self.field_specs,
                     &self.field_names,
                     &self.normalized_names,
                     py,
-                    extra_types_ref,
+                    custom_converters,
                     evaluate_result,
-                );
+                ),
+                None => Ok(None),
             }
-            Ok(None)
         })
     }
+    
+    /// Match a single string and return raw data (no Python objects, no GIL needed)
+    /// Only valid when `raw_convertible` is true; strings rejected by `filter` give Ok(None)
+    pub(crate) fn parse_raw(
+        &self,
+        string: &str,
+        case_sensitive: bool,
+        filter: Option<&Filter>,
+    ) -> Result<Option<RawMatchData>, String> {
+        validate_input_length(string)?;
+        if string.contains('\0') {
+            return Err("Input string contains null byte".to_string());
+        }
+        if !self.may_match(string, case_sensitive) {
+            return Ok(None);
+        }
+        
+        let captured = self.capture_anchored(string, case_sensitive, &self.custom_type_groups);
+        match captured {
+            Some(captured) => crate::parser::matching::match_with_captures_raw(
+                &captured,
+                string,
+                &self.field_specs,
+                &self.field_names,
+                &self.has_nested_dict_fields,
+                filter,
+            ),
+            None => Ok(None),
+        }
+    }
 
-    pub(crate) fn parse_internal(
+    /// Find all non-overlapping matches in a string and convert them to raw data (no GIL needed)
+    /// Matches whose values can't be converted, or that `filter` rejects, are skipped
+    /// Only valid when `raw_convertible` is true
+    pub(crate) fn findall_raw(&self, string: &str, case_sensitive: bool, filter: Option<&Filter>) -> Vec<RawMatchData> {
+        let mut raw_results = Vec::new();
+        if !self.may_match(string, case_sensitive) {
+            return raw_results;
+        }
+        let search_regex = self.get_search_regex(case_sensitive);
+        let mut last_end = 0;
+        
+        for captures in search_regex.captures_iter(string) {
+            let captured = crate::parser::matching::capture_fields(
+                &captures,
+                &self.field_specs,
+                &self.normalized_names,
+                &self.custom_type_groups,
+            );
+            let (match_start, match_end) = captured.span;
+            
+            if match_start < last_end {
+                continue;
+            }
+            
+            if let Ok(Some(raw_data)) = crate::parser::matching::match_with_captures_raw(
+                &captured,
+                string,
+                &self.field_specs,
+                &self.field_names,
+                &self.has_nested_dict_fields,
+                filter,
+            ) {
+                raw_results.push(raw_data);
+                last_end = match_end;
+                
+                if match_start == match_end {
+                    last_end += 1;
+                }
+            }
+        }
+        raw_results
+    }
+    
+    /// Count the matches findall() would return, without collecting them
+    /// Without `evaluate_result` every regex match counts. With it, a match only counts if
+    /// its fields convert: checked in Rust when possible, else by converting in Python
+    pub(crate) fn count_matches(
         &self,
+        py: Python,
         string: &str,
         case_sensitive: bool,
-        extra_types: Option<HashMap<String, PyObject>>,
+        custom_converters: &HashMap<String, PyObject>,
         evaluate_result: bool,
-    ) -> PyResult<Option<PyObject>> {
-        Python::with_gil(|py| {
-            // Use existing regex (custom type handling is done in convert_value)
-            let regex = if case_sensitive {
-                &self.regex
-            } else {
-                self.regex_case_insensitive.as_ref().unwrap_or(&self.regex)
-            };
-
-            let extra_types_ref = &extra_types.as_ref().map(|et| et.clone()).unwrap_or_default();
-            crate::parser::matching::match_with_regex(
-                regex,
+    ) -> PyResult<usize> {
+        if !self.may_match(string, case_sensitive) {
+            return Ok(0);
+        }
+        if !evaluate_result {
+            let search_regex = self.get_search_regex(case_sensitive);
+            return Ok(crate::parser::matching::allow_threads_for(py, string.len(), || {
+                search_regex.find_iter(string).count()
+            }));
+        }
+        if self.raw_convertible && custom_converters.is_empty() {
+            return Ok(crate::parser::matching::allow_threads_for(py, string.len(), || {
+                self.count_raw(string, case_sensitive)
+            }));
+        }
+        
+        // Datetime and custom types are only converted in Python
+        let captured_matches = crate::parser::matching::allow_threads_for(py, string.len(), || {
+            self.findall_captures(string, case_sensitive)
+        });
+        let mut count = 0;
+        let mut last_end = 0;
+        for captured in &captured_matches {
+            let (match_start, match_end) = captured.span;
+            if match_start < last_end {
+                continue;
+            }
+            let result = crate::parser::matching::build_match_result(
+                captured,
                 string,
                 &self.pattern,
                 &self.field_specs,
                 &self.field_names,
                 &self.normalized_names,
                 py,
-                extra_types_ref,
-                evaluate_result,
-            )
-        })
+                custom_converters,
+                true,
+            )?;
+            if result.is_some() {
+                count += 1;
+                last_end = if match_start == match_end { match_end + 1 } else { match_end };
+            }
+        }
+        Ok(count)
+    }
+    
+    /// Count the matches `findall_raw` would keep (no GIL needed)
+    /// Spans are read from one reused set of capture locations and fields are only checked
+    /// for convertibility, so nothing is allocated per match
+    fn count_raw(&self, string: &str, case_sensitive: bool) -> usize {
+        let search_regex = self.get_search_regex(case_sensitive);
+        let groups = crate::parser::matching::field_groups(
+            search_regex,
+            &self.field_specs,
+            &self.normalized_names,
+            &self.custom_type_groups,
+        );
+        // Repeated names must capture equal values, which needs the converted values
+        let mut names = std::collections::HashSet::new();
+        let has_repeated_names = !self.field_names.iter().flatten().all(|name| names.insert(name));
+        
+        let mut locations = search_regex.capture_locations();
+        let mut count = 0;
+        let mut at = 0;
+        let mut last_end = None;
+        while let Some(found) = search_regex.captures_read_at(&mut locations, string, at) {
+            let (start, end) = (found.start(), found.end());
+            // Same iteration as find_iter: an empty match right after the previous match is
+            // skipped, and the search moves one character past an empty match
+            if start != end || last_end != Some(end) {
+                let accepted = if has_repeated_names {
+                    let captured = CapturedMatch {
+                        span: (start, end),
+                        fields: groups.iter().map(|group| group.read(&locations)).collect(),
+                    };
+                    matches!(
+                        crate::parser::matching::match_with_captures_raw(
+                            &captured,
+                            string,
+                            &self.field_specs,
+                            &self.field_names,
+                            &self.has_nested_dict_fields,
+                            None,
+                        ),
+                        Ok(Some(_))
+                    )
+                } else {
+                    self.field_specs.iter().zip(&groups).all(|(spec, group)| {
+                        group.read(&locations).map_or(true, |(field_start, field_end)| {
+                            let value = &string[field_start..field_end];
+                            crate::types::conversion::validate_alignment_precision(spec, value)
+                                && crate::parser::raw_match::converts_raw(spec, value)
+                        })
+                    })
+                };
+                if accepted {
+                    count += 1;
+                }
+                last_end = Some(end);
+            }
+            at = if start != end {
+                end
+            } else {
+                match string[end..].chars().next() {
+                    Some(ch) => end + ch.len_utf8(),
+                    None => break,
+                }
+            };
+        }
+        count
+    }
+    
+    /// Collect the captures of every match in a string (no GIL needed)
+    pub(crate) fn findall_captures(&self, string: &str, case_sensitive: bool) -> Vec<CapturedMatch> {
+        if !self.may_match(string, case_sensitive) {
+            return Vec::new();
+        }
+        self.get_search_regex(case_sensitive)
+            .captures_iter(string)
+            .map(|captures| crate::parser::matching::capture_fields(
+                &captures,
+                &self.field_specs,
+                &self.normalized_names,
+                &self.custom_type_groups,
+            ))
+            .collect()
+    }
+    
+    /// Parallel `findall_raw`: split the string at newlines and search the chunks on the rayon pool
+    /// Matches never span chunk boundaries, so this is only for line-oriented patterns
+    pub(crate) fn findall_raw_parallel(&self, string: &str, case_sensitive: bool, filter: Option<&Filter>) -> Vec<RawMatchData> {
+        let chunks = parallel_chunks(string);
+        let per_chunk: Vec<Vec<RawMatchData>> = chunks.par_iter()
+            .map(|&(start, end)| {
+                let mut raw_results = self.findall_raw(&string[start..end], case_sensitive, filter);
+                for raw_data in raw_results.iter_mut() {
+                    raw_data.offset_by(start);
+                }
+                raw_results
+            })
+            .collect();
+        per_chunk.into_iter().flatten().collect()
+    }
+    
+    /// Parallel `findall_captures` (see `findall_raw_parallel`)
+    pub(crate) fn findall_captures_parallel(&self, string: &str, case_sensitive: bool) -> Vec<CapturedMatch> {
+        let chunks = parallel_chunks(string);
+        let per_chunk: Vec<Vec<CapturedMatch>> = chunks.par_iter()
+            .map(|&(start, end)| {
+                let mut captured = self.findall_captures(&string[start..end], case_sensitive);
+                for captured_match in captured.iter_mut() {
+                    captured_match.offset_by(start);
+                }
+                captured
+            })
+            .collect();
+        per_chunk.into_iter().flatten().collect()
+    }
+    
+    /// Parse many strings, matching in parallel without the GIL when possible
+    /// Returns a Results object on the fast path, or a list of parse results when Python
+    /// conversion is needed. Unmatched strings (and strings rejected by `filter`) are None if
+    /// `keep_unmatched`, otherwise dropped
+    pub(crate) fn parse_many_internal(
+        &self,
+        py: Python,
+        strings: Vec<String>,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+        keep_unmatched: bool,
+        filter: Option<&Filter>,
+    ) -> PyResult<PyObject> {
+        let has_custom_converters = extra_types.as_ref().map(|et| !et.is_empty()).unwrap_or(false);
+        
+        if self.raw_convertible && !has_custom_converters && evaluate_result {
+            // Fast path: all regex matching and conversion happens on the rayon pool, without the GIL
+            let outcomes: Vec<Result<Option<RawMatchData>, String>> = py.allow_threads(|| {
+                strings.par_iter()
+                    .map(|string| self.parse_raw(string, case_sensitive, filter))
+                    .collect()
+            });
+            
+            // Report the first error in input order (same error parse() would raise)
+            let mut entries = Vec::with_capacity(outcomes.len());
+            for outcome in outcomes {
+                let entry = outcome.map_err(PyValueError::new_err)?;
+                if keep_unmatched || entry.is_some() {
+                    entries.push(entry);
+                }
+            }
+            let results = Results::from_entries(entries).with_output_columns(self.output_columns());
+            return Ok(Py::new(py, results)?.into_any());
+        }
+        
+        // Fallback: custom converters, datetime types or evaluate_result=False need Python objects
+        let mut results = Vec::with_capacity(strings.len());
+        for string in &strings {
+            validate_input_length(string)
+                .map_err(|e| PyValueError::new_err(e))?;
+            if string.contains('\0') {
+                return Err(PyValueError::new_err("Input string contains null byte"));
+            }
+            let extra_types_for_call = extra_types.as_ref().map(|et| et.clone());
+            match self.parse_internal(string, case_sensitive, extra_types_for_call, evaluate_result)? {
+                Some(result) if accepts_object(filter, py, &result) => results.push(result),
+                _ if keep_unmatched => results.push(py.None()),
+                _ => {}
+            }
+        }
+        
+        Ok(PyList::new(py, &results)?.into_any().unbind())
+    }
+    
+    /// Merge stored extra_types with provided ones (provided take precedence, same as parse)
+    pub(crate) fn merge_extra_types(
+        &self,
+        py: Python,
+        extra_types: Option<HashMap<String, PyObject>>,
+    ) -> Option<HashMap<String, PyObject>> {
+        match extra_types {
+            Some(ref provided) if !provided.is_empty() => {
+                let mut merged = self.stored_extra_types.clone().unwrap_or_default();
+                for (k, v) in provided {
+                    merged.insert(k.clone(), v.clone_ref(py));
+                }
+                Some(merged)
+            }
+            _ => self.stored_extra_types.clone(),
+        }
+    }
+    
+    /// This pattern's fields as output columns, in pattern order (for columnar output)
+    pub(crate) fn output_columns(&self) -> Vec<Column> {
+        crate::columns::pattern_columns(&self.field_specs, &self.field_names)
     }
     
     #[allow(dead_code)]
@@ -206,6 +674,83 @@ impl FormatParser {
         &self.normalized_names
     }
     
+    /// Quick literal check: false if the string can't contain a match (see `Prefilter`)
+    pub(crate) fn may_match(&self, string: &str, case_sensitive: bool) -> bool {
+        formatparse_core::parser::prefilter::may_match(self.prefilter.as_ref(), string, case_sensitive)
+    }
+    
+    /// `may_match` for bytes input
+    pub(crate) fn may_match_bytes(&self, data: &[u8], case_sensitive: bool) -> bool {
+        self.prefilter.as_ref().map_or(true, |prefilter| prefilter.may_match_bytes(data, case_sensitive))
+    }
+    
+    /// Match the whole string: with the split engine when it can decide, else with the regex
+    pub(crate) fn capture_anchored(
+        &self,
+        string: &str,
+        case_sensitive: bool,
+        custom_type_groups: &[usize],
+    ) -> Option<CapturedMatch> {
+        if let Some(split) = &self.split {
+            match split.captures(string, case_sensitive) {
+                SplitMatch::Matched(fields) => return Some(CapturedMatch {
+                    span: (0, string.len()),
+                    fields: fields.into_iter().map(Some).collect(),
+                }),
+                SplitMatch::NoMatch => return None,
+                SplitMatch::Undecided => {}
+            }
+        }
+        crate::parser::matching::capture_with_regex(
+            self.get_regex(case_sensitive),
+            string,
+            &self.field_specs,
+            &self.normalized_names,
+            custom_type_groups,
+        )
+    }
+    
+    /// Whether the whole string matches (no captures, no conversion, no GIL needed)
+    pub(crate) fn is_match(&self, string: &str, case_sensitive: bool) -> bool {
+        if !self.may_match(string, case_sensitive) {
+            return false;
+        }
+        if let Some(split) = &self.split {
+            match split.captures(string, case_sensitive) {
+                SplitMatch::Matched(_) => return true,
+                SplitMatch::NoMatch => return false,
+                SplitMatch::Undecided => {}
+            }
+        }
+        self.get_regex(case_sensitive).is_match(string)
+    }
+    
+    /// Get the anchored parse regex for a given case sensitivity
+    pub(crate) fn get_regex(&self, case_sensitive: bool) -> &Regex {
+        if case_sensitive {
+            &self.regex
+        } else {
+            self.regex_case_insensitive.as_ref().unwrap_or(&self.regex)
+        }
+    }
+    
+    /// Get the regex matching the pattern at the start of a string (compiled on first use)
+    pub(crate) fn get_prefix_regex(&self, case_sensitive: bool) -> PyResult<&Regex> {
+        let regexes = self.prefix_regexes.get_or_try_init(|| -> PyResult<PrefixRegexes> {
+            let prefix = format!("^(?:{})", self.regex_str);
+            Ok(PrefixRegexes {
+                case_sensitive: formatparse_core::build_regex(&prefix)
+                    .map_err(|e| crate::error::core_error_to_py_err(e))?,
+                case_insensitive: formatparse_core::build_case_insensitive_regex(&prefix),
+            })
+        })?;
+        Ok(if case_sensitive {
+            &regexes.case_sensitive
+        } else {
+            regexes.case_insensitive.as_ref().unwrap_or(&regexes.case_sensitive)
+        })
+    }
+    
     /// Get the search regex for a given case sensitivity
     pub(crate) fn get_search_regex(&self, case_sensitive: bool) -> &Regex {
         if case_sensitive {
@@ -214,61 +759,68 @@ impl FormatParser {
             self.search_regex_case_insensitive.as_ref().unwrap_or(&self.search_regex)
         }
     }
+    
+    /// Get the search regex for bytes input (compiled on first use from the str regex, so
+    /// capture groups are numbered the same)
+    pub(crate) fn get_bytes_search_regex(&self, case_sensitive: bool) -> PyResult<&regex::bytes::Regex> {
+        let regexes = self.bytes_search_regexes.get_or_try_init(|| -> PyResult<BytesSearchRegexes> {
+            let build = |regex: &Regex| regex::bytes::Regex::new(regex.as_str())
+                .map_err(|e| PyValueError::new_err(format!("Invalid regex pattern: {}", e)));
+            Ok(BytesSearchRegexes {
+                case_sensitive: build(&self.search_regex)?,
+                case_insensitive: self.search_regex_case_insensitive.as_ref().map(build).transpose()?,
+            })
+        })?;
+        Ok(if case_sensitive {
+            &regexes.case_sensitive
+        } else {
+            regexes.case_insensitive.as_ref().unwrap_or(&regexes.case_sensitive)
+        })
+    }
+}
+
+/// Chunks smaller than this aren't worth a rayon task
+const PARALLEL_MIN_CHUNK_LEN: usize = 64 * 1024;
+
+/// Split a string (or bytes) at newline boundaries into chunks for parallel searching
+/// (a few chunks per rayon thread for load balancing, each at least PARALLEL_MIN_CHUNK_LEN)
+pub(crate) fn parallel_chunks<T: AsRef<[u8]> + ?Sized>(text: &T) -> Vec<(usize, usize)> {
+    let max_chunks = (text.as_ref().len() / PARALLEL_MIN_CHUNK_LEN)
+        .clamp(1, rayon::current_num_threads() * 4);
+    formatparse_core::split_at_newlines(text, max_chunks)
 }
 
 #[pymethods]
 impl FormatParser {
     #[new]
-    #[pyo3(signature = (pattern=None, extra_types=None))]
-    fn new_py(pattern: Option<&str>, extra_types: Option<HashMap<String, PyObject>>) -> PyResult<Self> {
-        match pattern {
-            Some(p) => {
-                // Validate pattern length if provided
-                validate_pattern_length(p)
-                    .map_err(|e| PyValueError::new_err(e))?;
-                Self::new_with_extra_types(p, extra_types)
-            },
-            None => {
-                // Create a dummy instance for unpickling - __setstate__ will initialize it properly
-                // We need to create a valid but minimal instance
-                let empty_regex = Regex::new("^$").map_err(|e| PyErr::new::<pyo3::exceptions::PyValueError, _>(format!("Invalid regex: {}", e)))?;
-                Ok(Self {
-                    pattern: String::new(),
-                    regex: empty_regex.clone(),
-                    regex_str: String::new(),
-                    regex_case_insensitive: None,
-                    search_regex: empty_regex.clone(),
-                    search_regex_case_insensitive: None,
-                    field_specs: Vec::new(),
-                    field_names: Vec::new(),
-                    normalized_names: Vec::new(),
-                    name_mapping: HashMap::new(),
-                    stored_extra_types: None,
-                    custom_type_groups: Vec::new(),
-                    field_count: 0,
-                    has_nested_dict_fields: Vec::new(),
-                })
-            }
-        }
+    #[pyo3(signature = (pattern, extra_types=None, fields=None, engine="auto", datetime_output="datetime"))]
+    fn new_py(
+        pattern: &str,
+        extra_types: Option<HashMap<String, PyObject>>,
+        fields: Option<Vec<String>>,
+        engine: &str,
+        datetime_output: &str,
+    ) -> PyResult<Self> {
+        let datetime_output = datetime_output_from_name(datetime_output)?;
+        let parser = Self::new_with_engine(pattern, extra_types, fields, Engine::from_name(engine)?)?;
+        Ok(parser.with_datetime_output(datetime_output))
     }
 
-    /// Parse a string using this compiled pattern
+    /// Parse a string (or bytes-like object) using this compiled pattern
     #[pyo3(signature = (string, case_sensitive=false, extra_types=None, evaluate_result=true))]
     fn parse(
         &self,
-        string: &str,
+        string: Text<'_>,
         case_sensitive: bool,
         extra_types: Option<HashMap<String, PyObject>>,
         evaluate_result: bool,
     ) -> PyResult<Option<PyObject>> {
-        // Validate input length
-        validate_input_length(string)
-            .map_err(|e| PyValueError::new_err(e))?;
-        
-        // Check for null bytes
-        if string.contains('\0') {
-            return Err(PyValueError::new_err("Input string contains null byte"));
-        }
+        // Validate input length and check for null bytes
+        string.validate()?;
+        let string = match string.whole_str()? {
+            Some(string) => string,
+            None => return Ok(None),
+        };
         // Merge stored extra_types with provided extra_types (provided takes precedence)
         let merged_extra_types = Python::with_gil(|py| -> PyResult<Option<HashMap<String, PyObject>>> {
             let mut merged = self.stored_extra_types.clone().unwrap_or_default();
@@ -282,6 +834,176 @@ impl FormatParser {
         self.parse_internal(string, case_sensitive, merged_extra_types, evaluate_result)
     }
 
+    /// Parse many strings using this compiled pattern
+    /// Strings are matched in parallel with the GIL released; results keep input order
+    /// and are None for strings that don't match (or are rejected by `where`)
+    #[pyo3(signature = (strings, case_sensitive=false, extra_types=None, evaluate_result=true, columns=false, as_numpy=false, out=None, r#where=None))]
+    fn parse_many(
+        &self,
+        py: Python,
+        strings: Vec<String>,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+        columns: bool,
+        as_numpy: bool,
+        out: Option<&Bound<'_, PyAny>>,
+        r#where: Option<&Bound<'_, PyAny>>,
+    ) -> PyResult<PyObject> {
+        crate::columns::validate_batch_output(evaluate_result, columns, as_numpy, out.is_some())?;
+        let merged_extra_types = self.merge_extra_types(py, extra_types);
+        let filter = Filter::from_py(r#where, &self.field_names, evaluate_result)?;
+        let batch = self.parse_many_internal(py, strings, case_sensitive, merged_extra_types, evaluate_result, true, filter.as_ref())?;
+        crate::columns::finish_batch(py, batch, &self.output_columns(), columns, as_numpy, out)
+    }
+
+    /// Check whether a string matches this pattern, without capturing or converting fields
+    /// Values that would fail conversion (like an invalid date) still count as a match
+    #[pyo3(signature = (string, case_sensitive=false))]
+    fn matches(&self, py: Python, string: Text<'_>, case_sensitive: bool) -> PyResult<bool> {
+        string.validate()?;
+        let string = match string.whole_str()? {
+            Some(string) => string,
+            None => return Ok(false),
+        };
+        Ok(crate::parser::matching::allow_threads_for(py, string.len(), || {
+            self.is_match(string, case_sensitive)
+        }))
+    }
+
+    /// Check many strings (or bytes-like objects) at once (in parallel, with the GIL released)
+    /// Returns a bytearray with 1 for each matching string and 0 for the others, or a NumPy
+    /// bool array with `as_numpy=True`
+    #[pyo3(signature = (strings, case_sensitive=false, as_numpy=false))]
+    fn match_mask(
+        &self,
+        py: Python,
+        strings: Vec<Text<'_>>,
+        case_sensitive: bool,
+        as_numpy: bool,
+    ) -> PyResult<PyObject> {
+        // None for buffers that aren't UTF-8, which can't match
+        let whole_strs = strings.iter()
+            .map(|string| {
+                string.validate()?;
+                string.whole_str()
+            })
+            .collect::<PyResult<Vec<Option<&str>>>>()?;
+        let mask: Vec<u8> = py.allow_threads(|| {
+            whole_strs.par_iter()
+                .map(|string| string.is_some_and(|string| self.is_match(string, case_sensitive)) as u8)
+                .collect()
+        });
+        if as_numpy {
+            return crate::numpy::mask_to_numpy(py, &mask);
+        }
+        Ok(PyByteArray::new(py, &mask).into_any().unbind())
+    }
+
+    /// Count the non-overlapping matches in a string (see formatparse.count)
+    #[pyo3(signature = (string, case_sensitive=false, extra_types=None, evaluate_result=true))]
+    fn count(
+        &self,
+        py: Python,
+        string: Text<'_>,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+    ) -> PyResult<usize> {
+        string.validate()?;
+        let custom_converters = self.merge_extra_types(py, extra_types).unwrap_or_default();
+        match &string {
+            Text::Str(string) => self.count_matches(py, string.to_str()?, case_sensitive, &custom_converters, evaluate_result),
+            Text::Bytes(buffer) => self.count_bytes(py, buffer, case_sensitive, &custom_converters, evaluate_result),
+        }
+    }
+
+    /// Parse a file line by line using this compiled pattern
+    /// Returns an iterator of batches (see formatparse.parse_file)
+    #[pyo3(signature = (path, case_sensitive=false, extra_types=None, evaluate_result=true, batch_size=10000, include_unmatched=false, r#where=None))]
+    fn parse_file(
+        &self,
+        py: Python,
+        path: PathBuf,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+        batch_size: usize,
+        include_unmatched: bool,
+        r#where: Option<&Bound<'_, PyAny>>,
+    ) -> PyResult<ParseFileIterator> {
+        let merged_extra_types = self.merge_extra_types(py, extra_types);
+        let filter = Filter::from_py(r#where, &self.field_names, evaluate_result)?;
+        ParseFileIterator::open(
+            Arc::new(self.clone()),
+            &path,
+            case_sensitive,
+            merged_extra_types,
+            evaluate_result,
+            batch_size,
+            include_unmatched,
+            filter,
+        )
+    }
+
+    /// Lazily iterate over the matches of this pattern in a string (see formatparse.finditer)
+    #[pyo3(signature = (string, case_sensitive=false, extra_types=None, evaluate_result=true, r#where=None))]
+    fn finditer(
+        &self,
+        py: Python,
+        string: &Bound<'_, PyString>,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+        r#where: Option<&Bound<'_, PyAny>>,
+    ) -> PyResult<FindIter> {
+        let string_value = string.to_str()?;
+        validate_input_length(string_value)
+            .map_err(|e| PyValueError::new_err(e))?;
+        if string_value.contains('\0') {
+            return Err(PyValueError::new_err("Input string contains null byte"));
+        }
+        
+        let merged_extra_types = self.merge_extra_types(py, extra_types);
+        let filter = Filter::from_py(r#where, &self.field_names, evaluate_result)?;
+        Ok(FindIter::new(
+            Arc::new(self.clone()),
+            string.clone().unbind(),
+            case_sensitive,
+            merged_extra_types,
+            evaluate_result,
+            filter,
+        ))
+    }
+
+    /// Scan a string with this pattern: search()/match()/skip() start at a cursor that moves
+    /// past each match (see formatparse.Scanner)
+    #[pyo3(signature = (string, pos=0, case_sensitive=true, extra_types=None, evaluate_result=true))]
+    fn scanner(
+        slf: &Bound<'_, Self>,
+        string: &Bound<'_, PyString>,
+        pos: usize,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+    ) -> PyResult<Scanner> {
+        let string_value = string.to_str()?;
+        validate_input_length(string_value)
+            .map_err(|e| PyValueError::new_err(e))?;
+        if string_value.contains('\0') {
+            return Err(PyValueError::new_err("Input string contains null byte"));
+        }
+        let merged_extra_types = slf.get().merge_extra_types(slf.py(), extra_types);
+        Scanner::new(
+            slf.clone().unbind(),
+            string.clone(),
+            pos,
+            case_sensitive,
+            merged_extra_types,
+            evaluate_result,
+        )
+    }
+
     /// Get the list of named field names (returns normalized names for compatibility)
     #[getter]
     fn named_fields(&self) -> Vec<String> {
@@ -327,6 +1049,22 @@ impl FormatParser {
         result
     }
 
+    /// Engine used by parse(): "split" or "regex"
+    #[getter]
+    fn engine(&self) -> &'static str {
+        if self.split.is_some() {
+            Engine::Split.name()
+        } else {
+            Engine::Regex.name()
+        }
+    }
+
+    /// What datetime fields convert to: "datetime", "epoch_s", "epoch_ns" or "iso"
+    #[getter]
+    fn datetime_output(&self) -> &'static str {
+        self.datetime_output.name()
+    }
+
     /// Get the format object for formatting values into the pattern
     #[getter]
     fn format(&self) -> Format {
@@ -335,65 +1073,37 @@ impl FormatParser {
         }
     }
 
-    /// Search for the pattern in a string
+    /// Search for the pattern in a string (or bytes-like object)
     #[pyo3(signature = (string, case_sensitive=true, extra_types=None, evaluate_result=true))]
     fn search(
         &self,
-        string: &str,
+        py: Python,
+        string: Text<'_>,
         case_sensitive: bool,
         extra_types: Option<HashMap<String, PyObject>>,
         evaluate_result: bool,
     ) -> PyResult<Option<PyObject>> {
-        // Validate input length
-        validate_input_length(string)
-            .map_err(|e| PyValueError::new_err(e))?;
+        // Validate input length and check for null bytes
+        string.validate()?;
         
-        // Check for null bytes
-        if string.contains('\0') {
-            return Err(PyValueError::new_err("Input string contains null byte"));
+        match &string {
+            Text::Str(string) => self.search_pattern(string.to_str()?, case_sensitive, extra_types, evaluate_result),
+            Text::Bytes(buffer) => {
+                let end = buffer.as_bytes().len();
+                self.search_bytes(py, buffer, 0, end, case_sensitive, &extra_types.unwrap_or_default(), evaluate_result)
+            }
         }
-        
-        self.search_pattern(string, case_sensitive, extra_types, evaluate_result)
     }
 
-    /// Get state for pickling
-    fn __getstate__(&self, py: Python) -> PyResult<PyObject> {
-        use pyo3::types::PyDict;
-        let state = PyDict::new_bound(py);
-        state.set_item("pattern", &self.pattern)?;
-        Ok(state.into())
-    }
-
-    /// Set state from pickle - reconstructs the parser
-    fn __setstate__(&mut self, _py: Python, state: &Bound<'_, PyAny>) -> PyResult<()> {
-        use pyo3::types::PyDict;
-        let dict = state.downcast::<PyDict>()?;
-        let pattern: String = dict.get_item("pattern")?.ok_or_else(|| error::missing_field_error("pattern"))?.extract()?;
-        
-        // Reconstruct the parser from the pattern
-        let reconstructed = Self::new_with_extra_types(&pattern, None)?;
-        
-        // Copy all fields from reconstructed parser
-        self.pattern = reconstructed.pattern;
-        self.regex_str = reconstructed.regex_str;
-        self.regex = reconstructed.regex;
-        self.regex_case_insensitive = reconstructed.regex_case_insensitive;
-        self.search_regex = reconstructed.search_regex;
-        self.search_regex_case_insensitive = reconstructed.search_regex_case_insensitive;
-        self.field_specs = reconstructed.field_specs;
-        self.field_names = reconstructed.field_names;
-        self.normalized_names = reconstructed.normalized_names;
-        self.name_mapping = reconstructed.name_mapping;
-        self.stored_extra_types = reconstructed.stored_extra_types;
-        self.custom_type_groups = reconstructed.custom_type_groups;
-        self.field_count = reconstructed.field_count;
-        self.has_nested_dict_fields = reconstructed.has_nested_dict_fields;
-        Ok(())
+    /// Constructor arguments for pickling: the parser is recompiled from its pattern
+    /// (the class is frozen, so it can't be rebuilt in place with __setstate__)
+    fn __getnewargs__(&self) -> (String, Option<PyObject>, Option<Vec<String>>, &'static str, &'static str) {
+        (self.pattern.clone(), None, self.fields.clone(), self.engine.name(), self.datetime_output.name())
     }
 }
 
 /// Format object that formats values into a pattern string
-#[pyclass]
+#[pyclass(frozen)]
 pub struct Format {
     pattern: String,
 }
@@ -403,7 +1113,7 @@ impl Format {
     /// Format values into the pattern string using Python's format() method
     fn format(&self, py: Python, args: &Bound<'_, PyAny>) -> PyResult<String> {
         // Use Python's string format method to format values into the pattern
-        let pattern_obj = PyString::new_bound(py, &self.pattern);
+        let pattern_obj = PyString::new(py, &self.pattern);
         let format_method = pattern_obj.getattr("format")?;
         
         // Call format with the args (can be a single value, tuple, or *args)
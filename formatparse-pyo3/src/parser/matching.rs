@@ -4,9 +4,11 @@ use formatparse_core::FieldSpec;
 use crate::parser::raw_match::convert_value_raw;
 use crate::match_rs::Match;
 use crate::parser::raw_match::{RawMatchData, RawValue};
+use crate::parser::predicate::{accepts_raw, Filter};
 use pyo3::prelude::*;
+use pyo3::marker::Ungil;
 use pyo3::types::PyDict;
-use regex::{Regex, Captures};
+use regex::{CaptureLocations, Captures, Regex};
 use std::collections::HashMap;
 
 /// Count the number of capturing groups in a regex pattern
@@ -84,7 +86,7 @@ pub fn get_nested_dict_value(
         match current_dict.get_item(key.as_str())? {
             Some(v) => {
                 // Get the PyObject to continue navigation
-                current_obj = v.to_object(py);
+                current_obj = v.unbind();
             },
             None => return Ok(None), // Path doesn't exist
         }
@@ -121,13 +123,13 @@ pub fn insert_nested_dict(
         } else {
             // It's not a dict, we can't nest - this is an error case
             // For now, just replace it (this shouldn't happen in practice)
-            let new_dict = PyDict::new_bound(py);
-            named.insert(first_key.clone(), new_dict.to_object(py));
+            let new_dict = PyDict::new(py);
+            named.insert(first_key.clone(), new_dict.clone().unbind());
             new_dict
         }
     } else {
-        let new_dict = PyDict::new_bound(py);
-        named.insert(first_key.clone(), new_dict.to_object(py));
+        let new_dict = PyDict::new(py);
+        named.insert(first_key.clone(), new_dict.clone().unbind());
         new_dict
     };
     
@@ -139,13 +141,13 @@ pub fn insert_nested_dict(
                 dict.clone()
             } else {
                 // Not a dict, replace it
-                let new_dict = PyDict::new_bound(py);
-                current_dict.set_item(key.as_str(), new_dict.to_object(py))?;
+                let new_dict = PyDict::new(py);
+                current_dict.set_item(key.as_str(), &new_dict)?;
                 new_dict
             }
         } else {
-            let new_dict = PyDict::new_bound(py);
-            current_dict.set_item(key.as_str(), new_dict.to_object(py))?;
+            let new_dict = PyDict::new(py);
+            current_dict.set_item(key.as_str(), &new_dict)?;
             new_dict
         };
         current_dict = nested_dict;
@@ -241,33 +243,86 @@ pub fn validate_custom_type_pattern(
     Ok(pattern_groups)
 }
 
-/// Match using existing captures and return raw data (no Python objects)
-/// This is used for batch processing to defer Python object creation
-/// Returns None if custom converters are needed (they require Python)
-pub fn match_with_captures_raw(
+/// Inputs shorter than this are matched without releasing the GIL
+/// (releasing and reacquiring it costs more than matching a short string)
+pub const RELEASE_GIL_MIN_LEN: usize = 1024;
+
+/// Run a pure-Rust closure, releasing the GIL when the input is long enough to be worth it
+pub fn allow_threads_for<T, F>(py: Python, input_len: usize, f: F) -> T
+where
+    F: Ungil + FnOnce() -> T,
+    T: Ungil,
+{
+    if input_len >= RELEASE_GIL_MIN_LEN {
+        py.allow_threads(f)
+    } else {
+        f()
+    }
+}
+
+/// Byte spans of a regex match and of each field's capture group
+/// Built without touching Python, so it can be produced with the GIL released
+#[derive(Clone, Debug)]
+pub struct CapturedMatch {
+    pub span: (usize, usize),
+    pub fields: Vec<Option<(usize, usize)>>,  // One entry per field spec (None if the group didn't participate)
+}
+
+impl CapturedMatch {
+    /// Shift all spans by an offset (for matches found in a slice of a larger string)
+    pub fn offset_by(&mut self, offset: usize) {
+        self.span = (self.span.0 + offset, self.span.1 + offset);
+        for field in self.fields.iter_mut().flatten() {
+            *field = (field.0 + offset, field.1 + offset);
+        }
+    }
+
+    /// Spans relative to `base` (for converting the match from a slice that starts there)
+    pub fn relative_to(&self, base: usize) -> Self {
+        Self {
+            span: (self.span.0 - base, self.span.1 - base),
+            fields: self.fields.iter()
+                .map(|field| field.map(|(start, end)| (start - base, end - base)))
+                .collect(),
+        }
+    }
+}
+
+/// Compute pattern_groups per field for the given custom converters
+/// Also validates regex_group_count, so it must run before matching (requires GIL)
+pub fn custom_pattern_groups(
+    field_specs: &[FieldSpec],
+    custom_converters: &HashMap<String, PyObject>,
+    py: Python,
+) -> PyResult<Vec<usize>> {
+    let mut groups = Vec::with_capacity(field_specs.len());
+    for spec in field_specs {
+        if !custom_converters.is_empty() {
+            groups.push(validate_custom_type_pattern(spec, custom_converters, py)?);
+        } else {
+            groups.push(0);
+        }
+    }
+    Ok(groups)
+}
+
+/// Resolve the capture group of every field into byte spans (no Python objects, no GIL needed)
+pub fn capture_fields(
     captures: &Captures,
-    _string: &str,
-    _match_start: usize,
     field_specs: &[FieldSpec],
-    field_names: &[Option<String>],
     normalized_names: &[Option<String>],
-    custom_type_groups: &[usize],
-    has_nested_dict_fields: &[bool],
-) -> Result<Option<RawMatchData>, String> {
+    custom_type_groups: &[usize],  // Pre-computed pattern_groups per field
+) -> CapturedMatch {
     let full_match = captures.get(0).unwrap();
-    let start = full_match.start();
-    let end = full_match.end();
-    
-    let field_count = field_specs.len();
-    let mut raw_data = RawMatchData::with_capacity(field_count);
-    raw_data.span = (start, end);
-    
+    let mut fields = Vec::with_capacity(field_specs.len());
     let mut group_offset = 0;
-    let mut actual_capture_index = 1;
+    // Track the actual capture group index (accounts for both named and unnamed groups)
+    let mut actual_capture_index = 1;  // Start at 1 (group 0 is full match)
     
     for (i, spec) in field_specs.iter().enumerate() {
         let pattern_groups = custom_type_groups.get(i).copied().unwrap_or(0);
         
+        // Extract capture group
         let cap = extract_capture(
             captures,
             i,
@@ -276,17 +331,117 @@ pub fn match_with_captures_raw(
             actual_capture_index,
             group_offset,
         );
+        fields.push(cap.map(|c| (c.start(), c.end())));
         
-        if normalized_names.get(i).and_then(|n| n.as_ref()).is_none() {
-            actual_capture_index += 1;
-        } else {
-            actual_capture_index += 1;
-        }
+        // Named groups still consume an index in the regex, so always increment
+        actual_capture_index += 1;
         
-        if let Some(cap) = cap {
-            let value_str = cap.as_str();
-            let field_start = cap.start();
-            let field_end = cap.end();
+        // Increment group offset for alignment patterns (they add an extra group)
+        if spec.alignment.is_some() {
+            group_offset += 1;
+        }
+        // Increment group offset for custom patterns with groups (the groups inside the pattern become part of the overall regex)
+        if pattern_groups > 0 {
+            group_offset += pattern_groups;
+        }
+    }
+    
+    CapturedMatch {
+        span: (full_match.start(), full_match.end()),
+        fields,
+    }
+}
+
+/// Capture groups a field's span is read from (the same lookup as `extract_capture`)
+#[derive(Clone, Copy, Debug)]
+pub struct FieldGroup {
+    group: Option<usize>,
+    fallback: Option<usize>,  // Outer group of an aligned unnamed field
+}
+
+impl FieldGroup {
+    /// Span of the field in the last match read into `locations`
+    pub fn read(&self, locations: &CaptureLocations) -> Option<(usize, usize)> {
+        self.group.and_then(|group| locations.get(group))
+            .or_else(|| self.fallback.and_then(|group| locations.get(group)))
+    }
+
+    /// Span of the field in a `regex::bytes` match (same group layout as the str regex)
+    pub fn read_bytes(&self, captures: &regex::bytes::Captures) -> Option<(usize, usize)> {
+        let span = |group: usize| captures.get(group).map(|found| (found.start(), found.end()));
+        self.group.and_then(span).or_else(|| self.fallback.and_then(span))
+    }
+}
+
+/// Resolve the capture group of every field once, so matches can be read from reused
+/// `CaptureLocations` instead of allocating `Captures` per match
+pub fn field_groups(
+    regex: &Regex,
+    field_specs: &[FieldSpec],
+    normalized_names: &[Option<String>],
+    custom_type_groups: &[usize],
+) -> Vec<FieldGroup> {
+    let mut groups = Vec::with_capacity(field_specs.len());
+    let mut group_offset = 0;
+    for (i, spec) in field_specs.iter().enumerate() {
+        let capture_index = i + 1 + group_offset;
+        groups.push(match normalized_names.get(i) {
+            Some(Some(name)) => FieldGroup {
+                group: regex.capture_names().position(|group_name| group_name == Some(name.as_str())),
+                fallback: None,
+            },
+            _ if spec.alignment.is_some() => FieldGroup {
+                group: Some(capture_index + 1),
+                fallback: Some(capture_index),
+            },
+            _ => FieldGroup { group: Some(capture_index), fallback: None },
+        });
+        if spec.alignment.is_some() {
+            group_offset += 1;
+        }
+        group_offset += custom_type_groups.get(i).copied().unwrap_or(0);
+    }
+    groups
+}
+
+/// Run a regex and resolve field spans in one step (no Python objects, no GIL needed)
+pub fn capture_with_regex(
+    regex: &Regex,
+    string: &str,
+    field_specs: &[FieldSpec],
+    normalized_names: &[Option<String>],
+    custom_type_groups: &[usize],
+) -> Option<CapturedMatch> {
+    regex.captures(string)
+        .map(|captures| capture_fields(&captures, field_specs, normalized_names, custom_type_groups))
+}
+
+/// Convert a captured match to raw data (no Python objects)
+/// This is used for batch processing to defer Python object creation
+/// Returns Ok(None) if the match is rejected (including by `filter`), Err if a value can't be
+/// converted without Python
+pub fn match_with_captures_raw(
+    captured: &CapturedMatch,
+    string: &str,
+    field_specs: &[FieldSpec],
+    field_names: &[Option<String>],
+    has_nested_dict_fields: &[bool],
+    filter: Option<&Filter>,
+) -> Result<Option<RawMatchData>, String> {
+    let field_count = field_specs.len();
+    let mut raw_data = RawMatchData::with_capacity(field_count);
+    raw_data.span = captured.span;
+    
+    let mut fixed_index = 0;
+    
+    for (i, spec) in field_specs.iter().enumerate() {
+        if let Some(Some((field_start, field_end))) = captured.fields.get(i).copied() {
+            let value_str = &string[field_start..field_end];
+            
+            // Validate alignment+precision constraints (same check as the Python path)
+            if !crate::types::conversion::validate_alignment_precision(spec, value_str) {
+                return Ok(None);
+            }
             
             // Try to convert to raw value (fails for custom types and datetime)
             match crate::parser::raw_match::convert_value_raw(spec, value_str) {
@@ -310,21 +465,22 @@ pub fn match_with_captures_raw(
                         raw_data.field_spans.insert(original_name.clone(), (field_start, field_end));
                     } else {
                         raw_data.fixed.push(raw_value);
+                        // Store span by fixed index (matches build_match_result)
+                        raw_data.field_spans.insert(fixed_index.to_string(), (field_start, field_end));
+                        fixed_index += 1;
                     }
                 }
-                Err(_) => {
-                    // Type requires Python conversion (custom or datetime)
-                    return Err("Type requires Python conversion".to_string());
+                Err(e) => {
+                    // Conversion failed, or the type requires Python conversion (custom or datetime)
+                    return Err(e);
                 }
             }
         }
-        
-        if spec.alignment.is_some() {
-            group_offset += 1;
-        }
-        if pattern_groups > 0 {
-            group_offset += pattern_groups;
-        }
+    }
+    
+    // Filtered-out matches are dropped here, before any Python object exists
+    if !accepts_raw(filter, &raw_data) {
+        return Ok(None);
     }
     
     Ok(Some(raw_data))
@@ -342,75 +498,70 @@ fn values_equal(a: &RawValue, b: &RawValue) -> bool {
     }
 }
 
-/// Match using existing captures (optimized for findall)
-/// Note: captures are from the full string, so positions are already absolute
-pub fn match_with_captures(
-    captures: &Captures,
-    _string: &str,
-    _match_start: usize,
+/// Build a ParseResult (or Match when evaluate_result=False) from a captured match
+/// This is the only step of matching that needs the GIL
+/// Note: spans in `captured` index into `string` and are reported as-is
+pub fn build_match_result(
+    captured: &CapturedMatch,
+    string: &str,
+    pattern: &str,
+    field_specs: &[FieldSpec],
+    field_names: &[Option<String>],
+    normalized_names: &[Option<String>],
+    py: Python,
+    custom_converters: &HashMap<String, PyObject>,
+    evaluate_result: bool,
+) -> PyResult<Option<PyObject>> {
+    build_match_result_at(
+        captured,
+        string,
+        0,
+        pattern,
+        field_specs,
+        field_names,
+        normalized_names,
+        py,
+        custom_converters,
+        evaluate_result,
+    )
+}
+
+/// `build_match_result` for a match in a larger input, of which `string` is the part
+/// starting at byte `base` (values are read from `string`, spans are reported as-is)
+pub fn build_match_result_at(
+    captured: &CapturedMatch,
+    string: &str,
+    base: usize,
     pattern: &str,
     field_specs: &[FieldSpec],
     field_names: &[Option<String>],
     normalized_names: &[Option<String>],
-    custom_type_groups: &[usize],  // Pre-computed pattern_groups per field
-    has_nested_dict_fields: &[bool],  // Pre-computed flags: does field name contain '['?
     py: Python,
     custom_converters: &HashMap<String, PyObject>,
     evaluate_result: bool,
 ) -> PyResult<Option<PyObject>> {
-    let full_match = captures.get(0).unwrap();
-    let start = full_match.start();  // Already absolute position in full string
-    let end = full_match.end();      // Already absolute position in full string
-    
     // Pre-allocate with capacity based on expected field count
     let field_count = field_specs.len();
-    // Fast path: for single-field patterns, use optimized allocation
     let mut fixed = Vec::with_capacity(field_count);
-    let mut named: HashMap<String, PyObject> = HashMap::with_capacity(field_count.max(1));
-    let mut field_spans: HashMap<String, (usize, usize)> = HashMap::with_capacity(field_count.max(1));
+    let mut named: HashMap<String, PyObject> = HashMap::with_capacity(field_count);
+    let mut field_spans: HashMap<String, (usize, usize)> = HashMap::with_capacity(field_count);
     let mut captures_vec = Vec::with_capacity(field_count);  // For Match object when evaluate_result=False
     let mut named_captures = HashMap::with_capacity(field_count);  // For Match object when evaluate_result=False
-    let mut group_offset = 0;
-    // Track the actual capture group index (accounts for both named and unnamed groups)
-    let mut actual_capture_index = 1;  // Start at 1 (group 0 is full match)
+
+    let (start, end) = captured.span;
+    let mut fixed_index = 0;
     
     for (i, spec) in field_specs.iter().enumerate() {
-        // Use pre-computed pattern_groups (cached during FormatParser creation)
-        let pattern_groups = custom_type_groups.get(i).copied().unwrap_or(0);
-        
-        // Extract capture group
-        let cap = extract_capture(
-            captures,
-            i,
-            normalized_names,
-            spec,
-            actual_capture_index,
-            group_offset,
-        );
-        
-        // Increment actual_capture_index for the next field (both named and unnamed groups consume an index)
-        // But only increment if we actually used a positional group (not a named group)
-        if normalized_names.get(i).and_then(|n| n.as_ref()).is_none() {
-            actual_capture_index += 1;
-        } else {
-            // Named groups still consume an index in the regex, so increment
-            actual_capture_index += 1;
-        }
-        
-        if let Some(cap) = cap {
-            let value_str = cap.as_str();
-            let field_start = cap.start();
-            let field_end = cap.end();
+        if let Some(Some((field_start, field_end))) = captured.fields.get(i).copied() {
+            let value_str = &string[field_start - base..field_end - base];
             
             // Store raw capture for Match object (only if needed)
-            // Only allocate strings when evaluate_result=False (Match objects need owned strings)
             if !evaluate_result {
                 captures_vec.push(Some(value_str.to_string()));
                 if let Some(norm_name) = normalized_names.get(i).and_then(|n| n.as_ref()) {
                     named_captures.insert(norm_name.clone(), value_str.to_string());
                 }
             }
-            // For evaluate_result=True, we don't need to store raw captures, saving allocations
             
             if evaluate_result {
                 // Validate alignment+precision constraints (issue #3)
@@ -423,17 +574,15 @@ pub fn match_with_captures(
 
                 // Use original field name (with hyphens/dots) for the result
                 if let Some(ref original_name) = field_names[i] {
-                    // Use pre-computed flag to avoid contains('[') check in hot path
-                    if has_nested_dict_fields.get(i).copied().unwrap_or(false) {
+                    // Check if this is a dict-style field name (contains [])
+                    if original_name.contains('[') {
                         // Parse the path and insert into nested dict structure
                         let path = crate::parser::pattern::parse_field_path(original_name);
                         // Check for repeated field names - compare values if path already exists
                         if let Some(existing_value) = get_nested_dict_value(&named, &path, py)? {
                             // Compare values using Python's equality (batch GIL operation)
                             let are_equal: bool = {
-                                let existing_obj = existing_value.to_object(py);
-                                let converted_obj = converted.to_object(py);
-                                existing_obj.bind(py).eq(converted_obj.bind(py)).unwrap_or(false)
+                                existing_value.bind(py).eq(&converted).unwrap_or(false)
                             };
                             if !are_equal {
                                 // Values don't match for repeated name
@@ -448,51 +597,54 @@ pub fn match_with_captures(
                         match named.get(original_name) {
                             Some(existing_value) => {
                                 // Field exists - check if values match (repeated name case)
+                                // Compare values using Python's equality (batch GIL operation)
                                 let are_equal: bool = {
-                                    let existing_obj = existing_value.to_object(py);
-                                    let converted_obj = converted.to_object(py);
-                                    existing_obj.bind(py).eq(converted_obj.bind(py)).unwrap_or(false)
+                                    existing_value.bind(py).eq(&converted).unwrap_or(false)
                                 };
                                 if !are_equal {
                                     // Values don't match for repeated name
                                     return Ok(None);
                                 }
-                            },
+                                // Store span for repeated name
+                                field_spans.insert(original_name.clone(), (field_start, field_end));
+                            }
                             None => {
-                                // New field - insert it
-                                named.insert(original_name.clone(), converted);
+                                // First occurrence - just insert (common case)
+                                // Reuse the clone for both insertions
+                                let name_for_named = original_name.clone();
+                                named.insert(name_for_named.clone(), converted);
+                                field_spans.insert(name_for_named, (field_start, field_end));
                             }
                         }
                     }
-                    
-                    // Store field span (already absolute position in original string)
-                    field_spans.insert(original_name.clone(), (field_start, field_end));
                 } else {
-                    // Positional field
                     fixed.push(converted);
+                    // Store span by fixed index (only if needed - most cases don't need spans)
+                    // Use format! only when necessary to avoid allocation
+                    field_spans.insert(fixed_index.to_string(), (field_start, field_end));
+                    fixed_index += 1;
+                }
+            } else {
+                // Store span even when not evaluating
+                if let Some(ref original_name) = field_names[i] {
+                    field_spans.insert(original_name.clone(), (field_start, field_end));
+                } else {
+                    let index_str = fixed_index.to_string();
+                    field_spans.insert(index_str, (field_start, field_end));
+                    fixed_index += 1;
                 }
             }
-        }
-        
-        // Increment group offset for alignment patterns (they add an extra group)
-        if spec.alignment.is_some() {
-            group_offset += 1;
-        }
-        // Increment group offset for custom patterns with groups (the groups inside the pattern become part of the overall regex)
-        if pattern_groups > 0 {
-            group_offset += pattern_groups;
+        } else {
+            captures_vec.push(None);
         }
     }
 
-    // Create result object (positions are already absolute)
     if evaluate_result {
         let parse_result = ParseResult::new_with_spans(fixed, named, (start, end), field_spans);
         // Py::new() is already optimized when GIL is held
-        Ok(Some(Py::new(py, parse_result)?.to_object(py)))
+        Ok(Some(Py::new(py, parse_result)?.into_any()))
     } else {
         // Create Match object with raw captures
-        // Note: pattern is static, but Match needs owned String - this is acceptable
-        // as Match objects are only created when evaluate_result=False (less common)
         let match_obj = Match::new(
             pattern.to_string(),
             field_specs.to_vec(),
@@ -503,191 +655,7 @@ pub fn match_with_captures(
             (start, end),
             field_spans,
         );
-        Ok(Some(Py::new(py, match_obj)?.to_object(py)))
-    }
-}
-
-/// Match a regex against a string and extract results
-pub fn match_with_regex(
-    regex: &Regex,
-    string: &str,
-    pattern: &str,
-    field_specs: &[FieldSpec],
-    field_names: &[Option<String>],
-    normalized_names: &[Option<String>],
-    py: Python,
-    custom_converters: &HashMap<String, PyObject>,
-    evaluate_result: bool,
-) -> PyResult<Option<PyObject>> {
-    if let Some(captures) = regex.captures(string) {
-        // Pre-allocate with capacity based on expected field count
-        let field_count = field_specs.len();
-        let mut fixed = Vec::with_capacity(field_count);
-        let mut named: HashMap<String, PyObject> = HashMap::with_capacity(field_count);
-        let mut field_spans: HashMap<String, (usize, usize)> = HashMap::with_capacity(field_count);
-        let mut captures_vec = Vec::with_capacity(field_count);  // For Match object when evaluate_result=False
-        let mut named_captures = HashMap::with_capacity(field_count);  // For Match object when evaluate_result=False
-
-        let full_match = captures.get(0).unwrap();
-        let start = full_match.start();
-        let end = full_match.end();
-
-        let mut fixed_index = 0;
-        let mut group_offset = 0;
-        // Track the actual capture group index (accounts for both named and unnamed groups)
-        let mut actual_capture_index = 1;  // Start at 1 (group 0 is full match)
-        
-        for (i, spec) in field_specs.iter().enumerate() {
-            // Validate regex_group_count for custom types with capturing groups (only if custom types exist)
-            let pattern_groups = if !custom_converters.is_empty() {
-                validate_custom_type_pattern(spec, &custom_converters, py)?
-            } else {
-                0
-            };
-            
-            // Extract capture group
-            let cap = extract_capture(
-                &captures,
-                i,
-                normalized_names,
-                spec,
-                actual_capture_index,
-                group_offset,
-            );
-            
-            // Increment actual_capture_index for the next field (both named and unnamed groups consume an index)
-            // But only increment if we actually used a positional group (not a named group)
-            if normalized_names.get(i).and_then(|n| n.as_ref()).is_none() {
-                actual_capture_index += 1;
-            } else {
-                // Named groups still consume an index in the regex, so increment
-                actual_capture_index += 1;
-            }
-            
-            if let Some(cap) = cap {
-                let value_str = cap.as_str();
-                let field_start = cap.start();
-                let field_end = cap.end();
-                
-                // Store raw capture for Match object (only if needed)
-                if !evaluate_result {
-                    captures_vec.push(Some(value_str.to_string()));
-                    if let Some(norm_name) = normalized_names.get(i).and_then(|n| n.as_ref()) {
-                        named_captures.insert(norm_name.clone(), value_str.to_string());
-                    }
-                }
-                
-                if evaluate_result {
-                    // Validate alignment+precision constraints (issue #3)
-                    // This prevents invalid cases where fill characters are in wrong positions
-                    if !crate::types::conversion::validate_alignment_precision(spec, value_str) {
-                        return Ok(None);
-                    }
-                    
-                    let converted = crate::types::conversion::convert_value(spec, value_str, py, &custom_converters)?;
-
-                    // Use original field name (with hyphens/dots) for the result
-                    if let Some(ref original_name) = field_names[i] {
-                        // Check if this is a dict-style field name (contains [])
-                        if original_name.contains('[') {
-                            // Parse the path and insert into nested dict structure
-                            let path = crate::parser::pattern::parse_field_path(original_name);
-                            // Check for repeated field names - compare values if path already exists
-                            if let Some(existing_value) = get_nested_dict_value(&named, &path, py)? {
-                                // Compare values using Python's equality (batch GIL operation)
-                                let are_equal: bool = {
-                                    let existing_obj = existing_value.to_object(py);
-                                    let converted_obj = converted.to_object(py);
-                                    existing_obj.bind(py).eq(converted_obj.bind(py)).unwrap_or(false)
-                                };
-                                if !are_equal {
-                                    // Values don't match for repeated name
-                                    return Ok(None);
-                                }
-                            }
-                            insert_nested_dict(&mut named, &path, converted, py)?;
-                        } else {
-                            // Regular flat field name
-                            // Fast path: most fields are not repeated, so check first
-                            // Use get() directly instead of contains_key + get (one less lookup)
-                            match named.get(original_name) {
-                                Some(existing_value) => {
-                                    // Field exists - check if values match (repeated name case)
-                                    // Compare values using Python's equality (batch GIL operation)
-                                    let are_equal: bool = {
-                                        let existing_obj = existing_value.to_object(py);
-                                        let converted_obj = converted.to_object(py);
-                                        existing_obj.bind(py).eq(converted_obj.bind(py)).unwrap_or(false)
-                                    };
-                                    if !are_equal {
-                                        // Values don't match for repeated name
-                                        return Ok(None);
-                                    }
-                                    // Store span for repeated name
-                                    field_spans.insert(original_name.clone(), (field_start, field_end));
-                                }
-                                None => {
-                                    // First occurrence - just insert (common case)
-                                    // Reuse the clone for both insertions
-                                    let name_for_named = original_name.clone();
-                                    named.insert(name_for_named.clone(), converted);
-                                    field_spans.insert(name_for_named, (field_start, field_end));
-                                }
-                            }
-                        }
-                    } else {
-                        fixed.push(converted);
-                        // Store span by fixed index (only if needed - most cases don't need spans)
-                        // Use format! only when necessary to avoid allocation
-                        field_spans.insert(fixed_index.to_string(), (field_start, field_end));
-                        fixed_index += 1;
-                    }
-                } else {
-                    // Store span even when not evaluating
-                    if let Some(ref original_name) = field_names[i] {
-                        field_spans.insert(original_name.clone(), (field_start, field_end));
-                    } else {
-                        let index_str = fixed_index.to_string();
-                        field_spans.insert(index_str, (field_start, field_end));
-                        fixed_index += 1;
-                    }
-                }
-            } else {
-                captures_vec.push(None);
-            }
-            
-            // Increment group offset for alignment patterns (they add an extra group)
-            if spec.alignment.is_some() {
-                group_offset += 1;
-            }
-            // Increment group offset for custom patterns with groups (the groups inside the pattern become part of the overall regex)
-            if pattern_groups > 0 {
-                group_offset += pattern_groups;
-            }
-        }
-
-        if evaluate_result {
-            let parse_result = ParseResult::new_with_spans(fixed, named, (start, end), field_spans);
-            // Py::new() is already optimized when GIL is held
-            Ok(Some(Py::new(py, parse_result)?.to_object(py)))
-        } else {
-            // Create Match object with raw captures
-            let match_obj = Match::new(
-                pattern.to_string(),
-                field_specs.to_vec(),
-                field_names.to_vec(),
-                normalized_names.to_vec(),
-                captures_vec,
-                named_captures,
-                (start, end),
-                field_spans,
-            );
-            // Use Py::new_bound for better performance
-            // Py::new() is already optimized when GIL is held
-            Ok(Some(Py::new(py, match_obj)?.to_object(py)))
-        }
-    } else {
-        Ok(None)
+        // Py::new() is already optimized when GIL is held
+        Ok(Some(Py::new(py, match_obj)?.into_any()))
     }
 }
-
@@ -5,10 +5,13 @@ use regex;
 use std::collections::HashMap;
 
 /// Parse a format pattern string into regex parts, field specs, and names
+/// With `fields`, only the listed fields are captured; the others are matched by non-capturing
+/// groups and left out of the returned field specs and names
 pub fn parse_pattern(
     pattern: &str,
     extra_types: Option<&HashMap<String, PyObject>>,
     custom_patterns: &HashMap<String, String>,
+    fields: Option<&[String]>,
 ) -> PyResult<(String, String, Vec<FieldSpec>, Vec<Option<String>>, Vec<Option<String>>, HashMap<String, String>)> {
     // Pre-allocate with estimated capacity based on pattern length
     let estimated_fields = pattern.matches('{').count();
@@ -142,6 +145,15 @@ pub fn parse_pattern(
                     }
                 }
                 
+                // Fields left out of the projection are matched but not captured
+                if !is_selected_field(name.as_deref(), fields) {
+                    regex_parts.push(format!("(?:{})", formatparse_core::non_capturing(&pattern)));
+                    if chars.next() != Some('}') {
+                        return Err(error::pattern_error("Expected '}' after field specification"));
+                    }
+                    continue;
+                }
+                
                 // Handle name normalization for regex groups
                 if let Some(ref original_name) = name {
                     // Check if field name is numeric (numbered field like {0}, {1}) - these should be positional
@@ -204,11 +216,38 @@ pub fn parse_pattern(
         regex_parts.push(escaped);
     }
 
+    // Every projected field must exist in the pattern
+    if let Some(fields) = fields {
+        for field in fields {
+            let selection = Some(std::slice::from_ref(field));
+            if !field_name_types.keys().any(|name| is_selected_field(Some(name.as_str()), selection)) {
+                return Err(error::unknown_field_error(field));
+            }
+        }
+    }
+
     let regex_str = regex_parts.join("");
     let regex_str_with_anchors = format!("^{}$", regex_str);
     Ok((regex_str_with_anchors, regex_str, field_specs, field_names, normalized_names, name_mapping))
 }
 
+/// Check whether a field is kept by a projection (no projection keeps every field)
+/// Unnamed fields are only kept without a projection; nested names like "a[b]" are
+/// kept by either their full name or their top-level name
+pub fn is_selected_field(name: Option<&str>, fields: Option<&[String]>) -> bool {
+    let fields = match fields {
+        Some(fields) => fields,
+        None => return true,
+    };
+    match name {
+        Some(name) => {
+            let top_level = name.split('[').next().unwrap_or(name);
+            fields.iter().any(|field| field == name || field == top_level)
+        }
+        None => false,
+    }
+}
+
 /// Normalize field name (hyphens/dots -> underscores) and handle collisions
 pub fn normalize_field_name(name: &str, _name_mapping: &mut HashMap<String, String>, existing_normalized: &[Option<String>]) -> String {
     // Normalize: replace hyphens and dots with underscores
@@ -464,7 +503,7 @@ pub fn parse_format_spec(format_spec: &str, spec: &mut FieldSpec, _extra_types:
     } else if type_str.starts_with('%') {
         // Strftime-style pattern starting with %
         spec.field_type = FieldType::DateTimeStrftime;
-        spec.strftime_format = Some(type_str.clone());
+        spec.set_strftime_format(type_str.clone());
     } else {
         // Extract type name (alphabetic characters only)
         let type_name: String = type_str.chars().filter(|c| c.is_alphabetic()).collect();
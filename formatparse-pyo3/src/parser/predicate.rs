@@ -0,0 +1,305 @@
+//! Field-value filters (`where=`)
+//!
+//! Conditions are evaluated on raw match data right after conversion, so matches that are
+//! filtered out never become Python objects. The Python path (custom types, datetimes)
+//! evaluates the same conditions on the converted values.
+
+use std::cmp::Ordering;
+use pyo3::prelude::*;
+use pyo3::basic::CompareOp;
+use pyo3::exceptions::{PyTypeError, PyValueError};
+use pyo3::types::{PyBool, PyFloat, PyInt, PyString};
+use regex::Regex;
+use crate::error;
+use crate::parser::raw_match::{RawMatchData, RawValue};
+use crate::result::ParseResult;
+use crate::types::conversion::infallible_object;
+
+/// A constant a field value is compared with
+#[derive(Clone, Debug, PartialEq)]
+enum Operand {
+    Int(i64),
+    Float(f64),
+    Bool(bool),
+    Str(String),
+}
+
+impl Operand {
+    fn from_object(value: &Bound<'_, PyAny>) -> PyResult<Self> {
+        // bool first: it is a subclass of int
+        if value.is_instance_of::<PyBool>() {
+            Ok(Operand::Bool(value.extract()?))
+        } else if value.is_instance_of::<PyInt>() {
+            Ok(Operand::Int(value.extract()?))
+        } else if value.is_instance_of::<PyFloat>() {
+            Ok(Operand::Float(value.extract()?))
+        } else if value.is_instance_of::<PyString>() {
+            Ok(Operand::Str(value.extract()?))
+        } else {
+            Err(PyTypeError::new_err(format!(
+                "where values must be int, float, bool or str, not {}",
+                value.get_type().name()?
+            )))
+        }
+    }
+
+    fn to_object(&self, py: Python) -> PyObject {
+        match self {
+            Operand::Int(n) => infallible_object(py, n),
+            Operand::Float(f) => infallible_object(py, f),
+            Operand::Bool(b) => infallible_object(py, b),
+            Operand::Str(s) => infallible_object(py, s),
+        }
+    }
+
+    /// Order a raw value against this operand (None if they aren't comparable)
+    /// Numbers compare across int/float and bools compare as 0/1, as in Python
+    fn compare_raw(&self, value: &RawValue) -> Option<Ordering> {
+        let as_number = |value: &RawValue| match value {
+            RawValue::Integer(n) => Some(*n as f64),
+            RawValue::Float(f) => Some(*f),
+            RawValue::Boolean(b) => Some(*b as i64 as f64),
+            _ => None,
+        };
+        match (value, self) {
+            (RawValue::Integer(a), Operand::Int(b)) => Some(a.cmp(b)),
+            (RawValue::String(a), Operand::Str(b)) => Some(a.as_str().cmp(b.as_str())),
+            (RawValue::String(_), _) | (_, Operand::Str(_)) => None,
+            (value, Operand::Int(b)) => as_number(value)?.partial_cmp(&(*b as f64)),
+            (value, Operand::Float(b)) => as_number(value)?.partial_cmp(b),
+            (value, Operand::Bool(b)) => as_number(value)?.partial_cmp(&(*b as i64 as f64)),
+        }
+    }
+}
+
+/// A condition on one field value
+#[derive(Clone, Debug)]
+enum Condition {
+    Compare(CompareOp, Operand),
+    In(Vec<Operand>),
+    Prefix(String),
+    Regex(Regex),  // Matches anywhere in the value (anchor with ^/$ as needed)
+}
+
+/// Check an ordering against a comparison operator
+fn ordering_holds(op: CompareOp, ordering: Ordering) -> bool {
+    match op {
+        CompareOp::Lt => ordering == Ordering::Less,
+        CompareOp::Le => ordering != Ordering::Greater,
+        CompareOp::Eq => ordering == Ordering::Equal,
+        CompareOp::Ne => ordering != Ordering::Equal,
+        CompareOp::Gt => ordering == Ordering::Greater,
+        CompareOp::Ge => ordering != Ordering::Less,
+    }
+}
+
+impl Condition {
+    fn parse(op: &str, value: &Bound<'_, PyAny>) -> PyResult<Self> {
+        let compare_op = match op {
+            "==" => Some(CompareOp::Eq),
+            "!=" => Some(CompareOp::Ne),
+            "<" => Some(CompareOp::Lt),
+            "<=" => Some(CompareOp::Le),
+            ">" => Some(CompareOp::Gt),
+            ">=" => Some(CompareOp::Ge),
+            _ => None,
+        };
+        if let Some(compare_op) = compare_op {
+            return Ok(Condition::Compare(compare_op, Operand::from_object(value)?));
+        }
+        match op {
+            "in" => {
+                if value.is_instance_of::<PyString>() {
+                    return Err(PyTypeError::new_err("'in' expects a collection of values, not a string"));
+                }
+                let operands = value.try_iter()?
+                    .map(|item| Operand::from_object(&item?))
+                    .collect::<PyResult<_>>()?;
+                Ok(Condition::In(operands))
+            }
+            "prefix" => Ok(Condition::Prefix(value.extract()?)),
+            "regex" => {
+                let pattern: String = value.extract()?;
+                let regex = Regex::new(&pattern)
+                    .map_err(|e| error::regex_error(&e.to_string()))?;
+                Ok(Condition::Regex(regex))
+            }
+            _ => Err(PyValueError::new_err(format!(
+                "Unknown where operator '{}' (expected ==, !=, <, <=, >, >=, in, prefix or regex)",
+                op
+            ))),
+        }
+    }
+
+    /// Evaluate against a raw value; values of another type never satisfy a condition
+    /// (except !=)
+    fn matches_raw(&self, value: &RawValue) -> bool {
+        match self {
+            Condition::Compare(op, operand) => match operand.compare_raw(value) {
+                Some(ordering) => ordering_holds(*op, ordering),
+                None => *op == CompareOp::Ne,
+            },
+            Condition::In(operands) => operands.iter()
+                .any(|operand| operand.compare_raw(value) == Some(Ordering::Equal)),
+            Condition::Prefix(prefix) => matches!(value, RawValue::String(s) if s.starts_with(prefix.as_str())),
+            Condition::Regex(regex) => matches!(value, RawValue::String(s) if regex.is_match(s)),
+        }
+    }
+
+    /// Evaluate against a converted value with Python comparison semantics
+    /// Comparisons Python can't make (e.g. str < int) don't satisfy the condition
+    fn matches_object(&self, py: Python, value: &Bound<'_, PyAny>) -> bool {
+        let compare = |operand: &Operand, op: CompareOp| {
+            value.rich_compare(operand.to_object(py), op)
+                .and_then(|result| result.is_truthy())
+                .unwrap_or(false)
+        };
+        match self {
+            Condition::Compare(op, operand) => compare(operand, *op),
+            Condition::In(operands) => operands.iter().any(|operand| compare(operand, CompareOp::Eq)),
+            Condition::Prefix(prefix) => value.downcast::<PyString>()
+                .ok()
+                .and_then(|s| s.to_str().ok().map(|s| s.starts_with(prefix.as_str())))
+                .unwrap_or(false),
+            Condition::Regex(regex) => value.downcast::<PyString>()
+                .ok()
+                .and_then(|s| s.to_str().ok().map(|s| regex.is_match(s)))
+                .unwrap_or(false),
+        }
+    }
+}
+
+/// A condition on a named field
+#[derive(Clone, Debug)]
+struct Predicate {
+    field: String,
+    condition: Condition,
+}
+
+/// Conditions a match has to satisfy to be returned (all of them)
+/// A match where a filtered field didn't participate is rejected
+#[derive(Clone, Debug)]
+pub struct Filter {
+    predicates: Vec<Predicate>,
+}
+
+impl Filter {
+    /// Build a filter from `where=`: an iterable of (field, operator, value) tuples
+    /// Fields must be named fields of the pattern; `evaluate_result=False` can't be filtered
+    pub fn from_py(
+        where_: Option<&Bound<'_, PyAny>>,
+        field_names: &[Option<String>],
+        evaluate_result: bool,
+    ) -> PyResult<Option<Self>> {
+        let where_ = match where_ {
+            Some(where_) if !where_.is_none() => where_,
+            _ => return Ok(None),
+        };
+        if !evaluate_result {
+            return Err(PyValueError::new_err("where requires evaluate_result=True"));
+        }
+
+        let mut predicates = Vec::new();
+        for item in where_.try_iter()? {
+            let (field, op, value): (String, String, Bound<'_, PyAny>) = item?.extract()
+                .map_err(|_| PyTypeError::new_err("where must be a list of (field, operator, value) tuples"))?;
+            let known = field_names.iter()
+                .flatten()
+                .any(|name| name.split('[').next() == Some(field.as_str()));
+            if !known {
+                return Err(error::unknown_field_error(&field));
+            }
+            predicates.push(Predicate {
+                field,
+                condition: Condition::parse(&op, &value)?,
+            });
+        }
+
+        Ok(if predicates.is_empty() { None } else { Some(Self { predicates }) })
+    }
+
+    /// Check raw match data (no Python objects, no GIL needed)
+    pub fn matches_raw(&self, raw_data: &RawMatchData) -> bool {
+        self.predicates.iter().all(|predicate| {
+            raw_data.named.get(&predicate.field)
+                .map_or(false, |value| predicate.condition.matches_raw(value))
+        })
+    }
+
+    /// Check a ParseResult; any other object (e.g. None) is rejected
+    pub fn matches_object(&self, py: Python, result: &PyObject) -> bool {
+        let result = match result.bind(py).downcast::<ParseResult>() {
+            Ok(result) => result.borrow(),
+            Err(_) => return false,
+        };
+        self.predicates.iter().all(|predicate| {
+            result.named.get(&predicate.field)
+                .map_or(false, |value| predicate.condition.matches_object(py, value.bind(py)))
+        })
+    }
+}
+
+/// Apply an optional filter to raw data
+pub fn accepts_raw(filter: Option<&Filter>, raw_data: &RawMatchData) -> bool {
+    filter.map_or(true, |filter| filter.matches_raw(raw_data))
+}
+
+/// Apply an optional filter to a converted result
+pub fn accepts_object(filter: Option<&Filter>, py: Python, result: &PyObject) -> bool {
+    filter.map_or(true, |filter| filter.matches_object(py, result))
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    fn compare(op: CompareOp, operand: Operand) -> Condition {
+        Condition::Compare(op, operand)
+    }
+
+    #[test]
+    fn test_compare_numbers() {
+        let value = RawValue::Integer(503);
+        assert!(compare(CompareOp::Ge, Operand::Int(500)).matches_raw(&value));
+        assert!(!compare(CompareOp::Lt, Operand::Int(500)).matches_raw(&value));
+        assert!(compare(CompareOp::Gt, Operand::Float(502.5)).matches_raw(&value));
+        assert!(compare(CompareOp::Eq, Operand::Float(0.5)).matches_raw(&RawValue::Float(0.5)));
+        assert!(compare(CompareOp::Eq, Operand::Int(1)).matches_raw(&RawValue::Boolean(true)));
+    }
+
+    #[test]
+    fn test_compare_mismatched_types() {
+        let value = RawValue::String("500".to_string());
+        assert!(!compare(CompareOp::Eq, Operand::Int(500)).matches_raw(&value));
+        assert!(!compare(CompareOp::Gt, Operand::Int(0)).matches_raw(&value));
+        assert!(compare(CompareOp::Ne, Operand::Int(500)).matches_raw(&value));
+    }
+
+    #[test]
+    fn test_in_prefix_regex() {
+        let method = RawValue::String("POST".to_string());
+        let set = Condition::In(vec![Operand::Str("GET".to_string()), Operand::Str("POST".to_string())]);
+        assert!(set.matches_raw(&method));
+        assert!(Condition::Prefix("PO".to_string()).matches_raw(&method));
+        assert!(!Condition::Prefix("GE".to_string()).matches_raw(&method));
+        assert!(Condition::Regex(Regex::new("^P.S").unwrap()).matches_raw(&method));
+        assert!(!Condition::Prefix("1".to_string()).matches_raw(&RawValue::Integer(1)));
+    }
+
+    #[test]
+    fn test_filter_requires_every_predicate() {
+        let filter = Filter {
+            predicates: vec![
+                Predicate { field: "status".to_string(), condition: compare(CompareOp::Ge, Operand::Int(500)) },
+                Predicate { field: "path".to_string(), condition: Condition::Prefix("/api".to_string()) },
+            ],
+        };
+        let mut raw_data = RawMatchData::new();
+        raw_data.named.insert("status".to_string(), RawValue::Integer(502));
+        assert!(!filter.matches_raw(&raw_data));  // path didn't participate
+        raw_data.named.insert("path".to_string(), RawValue::String("/api/v1".to_string()));
+        assert!(filter.matches_raw(&raw_data));
+        raw_data.named.insert("status".to_string(), RawValue::Integer(200));
+        assert!(!filter.matches_raw(&raw_data));
+    }
+}
@@ -1,6 +1,7 @@
 use std::collections::HashMap;
 use pyo3::prelude::*;
 use formatparse_core::{FieldSpec, FieldType};
+use crate::types::conversion::infallible_object;
 
 /// Raw match data without Python objects (for batch processing)
 /// This allows us to collect all matches first, then batch convert to Python objects
@@ -40,6 +41,32 @@ impl RawMatchData {
             field_spans: HashMap::with_capacity(field_count),
         }
     }
+    
+    /// Shift all spans by an offset (for matches found in a chunk of a larger string)
+    pub fn offset_by(&mut self, offset: usize) {
+        self.span = (self.span.0 + offset, self.span.1 + offset);
+        for span in self.field_spans.values_mut() {
+            *span = (span.0 + offset, span.1 + offset);
+        }
+    }
+}
+
+/// Check whether a field type can be converted by `convert_value_raw`
+/// DateTime and custom types build Python objects, so they must use the Python path
+pub fn is_raw_convertible(field_type: &FieldType) -> bool {
+    !matches!(
+        field_type,
+        FieldType::DateTimeISO
+            | FieldType::DateTimeRFC2822
+            | FieldType::DateTimeGlobal
+            | FieldType::DateTimeUS
+            | FieldType::DateTimeCtime
+            | FieldType::DateTimeHTTP
+            | FieldType::DateTimeTime
+            | FieldType::DateTimeSystem
+            | FieldType::DateTimeStrftime
+            | FieldType::Custom(_)
+    )
 }
 
 /// Convert a value string to RawValue (no Python objects created)
@@ -227,14 +254,24 @@ pub fn convert_value_raw(spec: &FieldSpec, value: &str) -> Result<RawValue, Stri
     }
 }
 
+/// Whether `convert_value_raw` would succeed, without building the value
+/// (text types always convert; only numeric types are parsed)
+pub fn converts_raw(spec: &FieldSpec, value: &str) -> bool {
+    match spec.field_type {
+        FieldType::String | FieldType::Boolean | FieldType::Letters | FieldType::Word
+        | FieldType::NonLetters | FieldType::NonWhitespace | FieldType::NonDigits => true,
+        _ => convert_value_raw(spec, value).is_ok(),
+    }
+}
+
 /// Convert RawValue to PyObject (batch conversion)
 impl RawValue {
     pub fn to_py_object(&self, py: Python) -> PyObject {
         match self {
-            RawValue::String(s) => s.to_object(py),
-            RawValue::Integer(n) => n.to_object(py),
-            RawValue::Float(f) => f.to_object(py),
-            RawValue::Boolean(b) => b.to_object(py),
+            RawValue::String(s) => infallible_object(py, s),
+            RawValue::Integer(n) => infallible_object(py, n),
+            RawValue::Float(f) => infallible_object(py, f),
+            RawValue::Boolean(b) => infallible_object(py, b),
             RawValue::None => py.None(),
         }
     }
@@ -474,6 +511,26 @@ mod tests {
         assert!(result.is_err());
     }
 
+    #[test]
+    fn test_raw_match_data_offset_by() {
+        let mut data = RawMatchData::new();
+        data.span = (2, 8);
+        data.field_spans.insert("name".to_string(), (4, 6));
+        data.offset_by(100);
+        assert_eq!(data.span, (102, 108));
+        assert_eq!(data.field_spans["name"], (104, 106));
+    }
+
+    #[test]
+    fn test_is_raw_convertible() {
+        assert!(is_raw_convertible(&FieldType::String));
+        assert!(is_raw_convertible(&FieldType::Integer));
+        assert!(is_raw_convertible(&FieldType::Percentage));
+        assert!(!is_raw_convertible(&FieldType::DateTimeISO));
+        assert!(!is_raw_convertible(&FieldType::DateTimeStrftime));
+        assert!(!is_raw_convertible(&FieldType::Custom("Number".to_string())));
+    }
+
     #[test]
     fn test_convert_value_raw_invalid_float() {
         let spec = FieldSpec {
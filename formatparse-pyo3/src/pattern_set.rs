@@ -0,0 +1,157 @@
+use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
+use regex::RegexSet;
+use std::collections::HashMap;
+use crate::parser::{FormatParser, Text};
+use crate::parser::matching::allow_threads_for;
+use formatparse_core::parser::validate_pattern_length;
+
+/// A collection of patterns matched together
+/// A single RegexSet scan finds which patterns match a string; captures are then
+/// extracted only for the matching pattern instead of trying every pattern in turn
+#[pyclass(module = "_formatparse", frozen)]
+pub struct PatternSet {
+    parsers: Vec<FormatParser>,
+    regex_set: RegexSet,  // Anchored parse regexes of all patterns (case-sensitive)
+    regex_set_case_insensitive: Option<RegexSet>,  // None if it couldn't be built (e.g. too large)
+}
+
+impl PatternSet {
+    /// Get the regex set for a given case sensitivity (None if there is no case-insensitive set)
+    fn get_regex_set(&self, case_sensitive: bool) -> Option<&RegexSet> {
+        if case_sensitive {
+            Some(&self.regex_set)
+        } else {
+            self.regex_set_case_insensitive.as_ref()
+        }
+    }
+
+    /// Indices of the patterns whose regex matches the string, in ascending order
+    fn matching_indices(&self, py: Python, string: &str, case_sensitive: bool) -> Vec<usize> {
+        let regex_set = self.get_regex_set(case_sensitive);
+        allow_threads_for(py, string.len(), || match regex_set {
+            Some(regex_set) => regex_set.matches(string).into_iter().collect(),
+            // Without the case-insensitive set, try each pattern's own case-insensitive regex
+            // (never the case-sensitive set, which would miss strings differing in case)
+            None => self.parsers.iter()
+                .enumerate()
+                .filter(|(_, parser)| parser.get_regex(false).is_match(string))
+                .map(|(index, _)| index)
+                .collect(),
+        })
+    }
+}
+
+#[pymethods]
+impl PatternSet {
+    #[new]
+    #[pyo3(signature = (patterns, extra_types=None))]
+    fn new_py(patterns: Vec<String>, extra_types: Option<HashMap<String, PyObject>>) -> PyResult<Self> {
+        let mut parsers = Vec::with_capacity(patterns.len());
+        for pattern in &patterns {
+            validate_pattern_length(pattern)
+                .map_err(|e| PyValueError::new_err(e))?;
+            if pattern.contains('\0') {
+                return Err(PyValueError::new_err("Pattern contains null byte"));
+            }
+            parsers.push(FormatParser::new_with_extra_types(pattern, extra_types.clone())?);
+        }
+
+        // The set is built from the same anchored regexes that each FormatParser matches with
+        let regex_strs: Vec<&str> = parsers.iter()
+            .map(|parser| parser.get_regex(true).as_str())
+            .collect();
+        let regex_set = formatparse_core::build_regex_set(&regex_strs, true)
+            .map_err(|e| crate::error::core_error_to_py_err(e))?;
+        // The (?i) set is larger and can exceed the size limit when the case-sensitive one
+        // doesn't; matching_indices then falls back to the patterns' own regexes
+        let regex_set_case_insensitive = formatparse_core::build_regex_set(&regex_strs, false).ok();
+
+        Ok(Self {
+            parsers,
+            regex_set,
+            regex_set_case_insensitive,
+        })
+    }
+
+    /// Parse a string (or bytes-like object) with the first pattern (in list order) that
+    /// matches it
+    /// Returns (index, result) or None if no pattern matches
+    #[pyo3(signature = (string, case_sensitive=false, evaluate_result=true))]
+    fn parse(
+        &self,
+        py: Python,
+        string: Text<'_>,
+        case_sensitive: bool,
+        evaluate_result: bool,
+    ) -> PyResult<Option<(usize, PyObject)>> {
+        string.validate()?;
+        let string = match string.whole_str()? {
+            Some(string) => string,
+            None => return Ok(None),
+        };
+
+        // A regex match can still be rejected during conversion (e.g. alignment checks),
+        // in which case the next matching pattern is tried
+        for index in self.matching_indices(py, string, case_sensitive) {
+            let parser = &self.parsers[index];
+            let extra_types = parser.merge_extra_types(py, None);
+            if let Some(result) = parser.parse_internal(string, case_sensitive, extra_types, evaluate_result)? {
+                return Ok(Some((index, result)));
+            }
+        }
+        Ok(None)
+    }
+
+    /// Indices of all patterns whose regex matches the string (no conversion is done)
+    #[pyo3(signature = (string, case_sensitive=false))]
+    fn matches(&self, py: Python, string: Text<'_>, case_sensitive: bool) -> PyResult<Vec<usize>> {
+        string.validate()?;
+        let string = match string.whole_str()? {
+            Some(string) => string,
+            None => return Ok(Vec::new()),
+        };
+        Ok(self.matching_indices(py, string, case_sensitive))
+    }
+
+    /// The pattern strings, in index order
+    #[getter]
+    fn patterns(&self) -> Vec<String> {
+        self.parsers.iter().map(|parser| parser.pattern.clone()).collect()
+    }
+
+    /// The compiled parser for the pattern at an index
+    fn parser(&self, index: usize) -> PyResult<FormatParser> {
+        self.parsers.get(index)
+            .cloned()
+            .ok_or_else(|| pyo3::exceptions::PyIndexError::new_err("pattern index out of range"))
+    }
+
+    fn __len__(&self) -> usize {
+        self.parsers.len()
+    }
+
+    fn __repr__(&self) -> String {
+        format!("<PatternSet with {} patterns>", self.parsers.len())
+    }
+}
+
+#[cfg(test)]
+mod tests {
+    use super::*;
+
+    #[test]
+    #[cfg(feature = "python-tests")]
+    fn test_case_insensitive_without_set() {
+        pyo3::prepare_freethreaded_python();
+        Python::with_gil(|py| {
+            let patterns = vec!["ERROR {code:d}".to_string(), "warn {msg}".to_string()];
+            let mut set = PatternSet::new_py(patterns, None).unwrap();
+            // As if the case-insensitive set had exceeded the size limit
+            set.regex_set_case_insensitive = None;
+            assert_eq!(set.matching_indices(py, "error 5", false), vec![0]);
+            assert_eq!(set.matching_indices(py, "WARN disk", false), vec![1]);
+            assert!(set.matching_indices(py, "error 5", true).is_empty());
+        });
+    }
+}
@@ -1,11 +1,12 @@
 use pyo3::prelude::*;
 use pyo3::types::{PyTuple, PySlice};
 use std::collections::HashMap;
+use crate::types::conversion::infallible_object;
 
-#[pyclass]
+#[pyclass(frozen)]
 #[derive(Clone)]
 pub struct ParseResult {
-    fixed: Vec<PyObject>,
+    pub(crate) fixed: Vec<PyObject>,
     #[pyo3(get)]
     pub named: HashMap<String, PyObject>,
     pub span: (usize, usize),
@@ -58,8 +59,8 @@ impl ParseResult {
     #[getter]
     fn fixed(&self) -> PyResult<PyObject> {
         Python::with_gil(|py| {
-            let tuple = PyTuple::new_bound(py, &self.fixed);
-            Ok(tuple.to_object(py))
+            let tuple = PyTuple::new(py, &self.fixed)?;
+            Ok(tuple.into_any().unbind())
         })
     }
 
@@ -90,7 +91,7 @@ impl ParseResult {
         Python::with_gil(|py| {
             // Try to extract as slice first
             if let Ok(slice) = key.downcast::<PySlice>() {
-                let len = self.fixed.len() as std::os::raw::c_long;
+                let len = self.fixed.len() as isize;
                 let indices = slice.indices(len)?;
                 
                 let mut result = Vec::new();
@@ -102,8 +103,8 @@ impl ParseResult {
                     idx += indices.step;
                 }
                 
-                let tuple = PyTuple::new_bound(py, &result);
-                Ok(tuple.to_object(py))
+                let tuple = PyTuple::new(py, &result)?;
+                Ok(tuple.into_any().unbind())
             } else if let Ok(idx) = key.extract::<usize>() {
                 self.fixed
                     .get(idx)
@@ -135,17 +136,17 @@ impl ParseResult {
     #[getter]
     fn spans(&self) -> PyResult<PyObject> {
         Python::with_gil(|py| {
-            let dict = pyo3::types::PyDict::new_bound(py);
+            let dict = pyo3::types::PyDict::new(py);
             for (key, value) in &self.field_spans {
                 let py_key: PyObject = if let Ok(idx) = key.parse::<usize>() {
-                    idx.to_object(py)
+                    infallible_object(py, idx)
                 } else {
-                    key.to_object(py)
+                    infallible_object(py, key)
                 };
-                let py_value = PyTuple::new_bound(py, &[value.0, value.1]);
+                let py_value = PyTuple::new(py, [value.0, value.1])?;
                 dict.set_item(py_key, py_value)?;
             }
-            Ok(dict.to_object(py))
+            Ok(dict.into_any().unbind())
         })
     }
 }
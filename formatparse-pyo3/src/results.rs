@@ -1,47 +1,79 @@
 use pyo3::prelude::*;
 use pyo3::exceptions::{PyIndexError, PyTypeError};
-use pyo3::types::PyList;
+use pyo3::types::{PyCapsule, PyList, PyTuple};
+use once_cell::sync::OnceCell;
 use crate::parser::raw_match::RawMatchData;
+use crate::columns::Column;
 
 /// Results container that stores raw match data and lazily converts to ParseResult
 /// This avoids creating all ParseResult objects upfront, improving performance
 /// The struct itself is lightweight - just a Vec of raw data
-#[pyclass]
+/// Entries are None for inputs that did not match (used by parse_many)
+#[pyclass(frozen)]
 pub struct Results {
-    raw_data: Vec<RawMatchData>,
-    // Cache for converted ParseResult objects (lazy evaluation)
-    cached_results: Option<PyObject>,
+    raw_data: Vec<Option<RawMatchData>>,
+    // Cache for converted ParseResult objects (lazy evaluation, set once even when shared
+    // between threads)
+    cached_results: OnceCell<PyObject>,
+    // Fields of the pattern that produced the matches, in pattern order (for to_columns)
+    output_columns: Vec<Column>,
 }
 
 impl Results {
     pub fn new(raw_data: Vec<RawMatchData>) -> Self {
+        Self::from_entries(raw_data.into_iter().map(Some).collect())
+    }
+    
+    /// Create Results where unmatched entries are None (one entry per input string)
+    pub fn from_entries(raw_data: Vec<Option<RawMatchData>>) -> Self {
         Self {
             raw_data,
-            cached_results: None,
+            cached_results: OnceCell::new(),
+            output_columns: Vec::new(),
+        }
+    }
+    
+    /// Set the columns reported by to_columns (from the pattern's fields)
+    pub fn with_output_columns(mut self, output_columns: Vec<Column>) -> Self {
+        self.output_columns = output_columns;
+        self
+    }
+    
+    /// Build one column per field straight from the raw data (see `to_columns`)
+    pub fn columns(&self, py: Python) -> PyResult<PyObject> {
+        crate::columns::raw_columns(py, &self.raw_data, &self.output_columns)
+    }
+    
+    /// Write the numeric fields into a NumPy structured array (see `to_numpy`)
+    pub fn to_numpy_array(&self, py: Python, out: Option<&Bound<'_, PyAny>>) -> PyResult<PyObject> {
+        crate::numpy::raw_to_numpy(py, &self.raw_data, &self.output_columns, out)
+    }
+    
+    /// Convert one entry to a ParseResult, or None if it did not match
+    fn entry_to_object(entry: &Option<RawMatchData>, py: Python) -> PyResult<PyObject> {
+        match entry {
+            Some(raw_data) => Ok(raw_data.to_parse_result(py)?.into_any()),
+            None => Ok(py.None()),
         }
     }
     
     /// Convert all raw data to ParseResult objects (called lazily)
-    fn convert_all(&mut self, py: Python) -> PyResult<PyObject> {
-        if let Some(ref cached) = self.cached_results {
+    fn convert_all(&self, py: Python) -> PyResult<PyObject> {
+        if let Some(cached) = self.cached_results.get() {
             return Ok(cached.clone_ref(py));
         }
         
         let mut py_results: Vec<PyObject> = Vec::with_capacity(self.raw_data.len());
-        for raw_data in &self.raw_data {
-            let parse_result = raw_data.to_parse_result(py)?;
-            py_results.push(parse_result.to_object(py));
+        for entry in &self.raw_data {
+            py_results.push(Self::entry_to_object(entry, py)?);
         }
         
-        let items: Vec<_> = py_results.iter()
-            .map(|obj| obj.bind(py))
-            .collect();
-        let results_list = PyList::new_bound(py, items);
-        let list_obj = results_list.to_object(py);
+        let list_obj = PyList::new(py, &py_results)?.into_any().unbind();
         
-        // Cache the result
-        self.cached_results = Some(list_obj.clone_ref(py));
-        Ok(list_obj)
+        // Cache the result (if another thread converted first, return its list so every
+        // caller sees the same objects)
+        let _ = self.cached_results.set(list_obj);
+        Ok(self.cached_results.get().unwrap().clone_ref(py))
     }
     
     /// Convert a single raw data item to ParseResult (for lazy indexing)
@@ -50,9 +82,7 @@ impl Results {
             return Err(PyIndexError::new_err("list index out of range"));
         }
         
-        let raw_data = &self.raw_data[index];
-        let parse_result = raw_data.to_parse_result(py)?;
-        Ok(parse_result.to_object(py))
+        Self::entry_to_object(&self.raw_data[index], py)
     }
 }
 
@@ -81,12 +111,11 @@ impl Results {
         } else if key.is_instance_of::<pyo3::types::PySlice>() {
             // Slice access - convert all items to a list and let Python handle slicing
             // This is less optimal but necessary for slice support
-            let mut results = Results::new(self.raw_data.clone());
-            let list = results.convert_all(py)?;
+            let list = self.convert_all(py)?;
             // Use Python's __getitem__ to handle the slice
             let list_bound = list.bind(py);
             let slice_result = list_bound.get_item(key)?;
-            Ok(slice_result.to_object(py))
+            Ok(slice_result.unbind())
         } else {
             Err(PyTypeError::new_err("list indices must be integers or slices"))
         }
@@ -101,8 +130,47 @@ impl Results {
         })
     }
     
+    /// Convert to a dict of columns, one per field (keyed by name, or index for positional fields)
+    /// Int, float and bool columns are array.array objects, other columns are lists;
+    /// no ParseResult objects are created
+    fn to_columns(&self, py: Python) -> PyResult<PyObject> {
+        self.columns(py)
+    }
+    
+    /// Convert to a NumPy structured array with one row per entry and one field per numeric
+    /// field of the pattern (int64, float64 or bool, from the field type)
+    /// Values are written straight from the raw data; pass `out` to reuse a preallocated array
+    #[pyo3(signature = (out=None))]
+    fn to_numpy(&self, py: Python, out: Option<&Bound<'_, PyAny>>) -> PyResult<PyObject> {
+        self.to_numpy_array(py, out)
+    }
+    
+    /// Arrow PyCapsule interface: (schema, array) capsules for a struct array with one row
+    /// per entry and one child per field; unmatched entries are rows of nulls
+    /// `requested_schema` is accepted for protocol compatibility and ignored
+    #[pyo3(signature = (requested_schema=None))]
+    fn __arrow_c_array__<'py>(
+        &self,
+        py: Python<'py>,
+        requested_schema: Option<&Bound<'py, PyAny>>,
+    ) -> PyResult<Bound<'py, PyTuple>> {
+        let _ = requested_schema;
+        crate::arrow::arrow_c_array(py, &self.raw_data, &self.output_columns)
+    }
+    
+    /// Arrow PyCapsule interface: a stream capsule yielding the entries as a single batch
+    #[pyo3(signature = (requested_schema=None))]
+    fn __arrow_c_stream__<'py>(
+        &self,
+        py: Python<'py>,
+        requested_schema: Option<&Bound<'py, PyAny>>,
+    ) -> PyResult<Bound<'py, PyCapsule>> {
+        let _ = requested_schema;
+        crate::arrow::arrow_c_stream(py, &self.raw_data, &self.output_columns)
+    }
+    
     /// Convert to list (forces conversion of all items)
-    fn to_list(&mut self, py: Python) -> PyResult<PyObject> {
+    fn to_list(&self, py: Python) -> PyResult<PyObject> {
         self.convert_all(py)
     }
     
@@ -137,7 +205,7 @@ impl ResultsIterator {
             let results = self.results.bind(py);
             // Convert all items in a single batch (one GIL block)
             let list = results.call_method0("to_list")?;
-            self.cached_list = Some(list.to_object(py));
+            self.cached_list = Some(list.unbind());
         }
         
         // Now iterate over the cached list (no FFI overhead)
@@ -150,7 +218,7 @@ impl ResultsIterator {
         
         let item = list_bound.get_item(self.index)?;
         self.index += 1;
-        Ok(Some(item.to_object(py)))
+        Ok(Some(item.unbind()))
     }
 }
 
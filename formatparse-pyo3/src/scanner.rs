@@ -0,0 +1,205 @@
+use pyo3::prelude::*;
+use pyo3::exceptions::PyValueError;
+use pyo3::types::PyString;
+use std::collections::HashMap;
+use crate::parser::FormatParser;
+use crate::parser::matching::{allow_threads_for, build_match_result, capture_fields, match_with_captures_raw, CapturedMatch};
+
+/// Cursor over a string for repeated searching and matching with one pattern
+/// (FormatParser.scanner). The string is kept as a Python object and read in place on
+/// every call; successful calls move the cursor to the end of their match.
+#[pyclass]
+pub struct Scanner {
+    parser: Py<FormatParser>,
+    string: Py<PyString>,
+    pos: usize,  // Byte offset of the cursor
+    case_sensitive: bool,
+    extra_types: HashMap<String, PyObject>,
+    evaluate_result: bool,
+    may_match: bool,  // False if the string lacks the pattern's literal text (nothing can match)
+}
+
+impl Scanner {
+    pub fn new(
+        parser: Py<FormatParser>,
+        string: Bound<'_, PyString>,
+        pos: usize,
+        case_sensitive: bool,
+        extra_types: Option<HashMap<String, PyObject>>,
+        evaluate_result: bool,
+    ) -> PyResult<Self> {
+        let string_value = string.to_str()?;
+        check_pos(string_value, pos)?;
+        let may_match = parser.get().may_match(string_value, case_sensitive);
+        Ok(Self {
+            parser,
+            string: string.unbind(),
+            pos,
+            case_sensitive,
+            extra_types: extra_types.unwrap_or_default(),
+            evaluate_result,
+            may_match,
+        })
+    }
+
+    /// Convert a match (ParseResult, or Match without evaluate_result), the same way
+    /// FormatParser.search does; None if the match is rejected
+    fn convert(&self, py: Python, captured: &CapturedMatch, string: &str) -> PyResult<Option<PyObject>> {
+        let parser = self.parser.get();
+        if parser.raw_convertible && self.extra_types.is_empty() && self.evaluate_result {
+            if let Ok(Some(raw_data)) = match_with_captures_raw(
+                captured,
+                string,
+                &parser.field_specs,
+                &parser.field_names,
+                &parser.has_nested_dict_fields,
+                None,
+            ) {
+                return Ok(Some(raw_data.to_parse_result(py)?.into_any()));
+            }
+        }
+        build_match_result(
+            captured,
+            string,
+            &parser.pattern,
+            &parser.field_specs,
+            &parser.field_names,
+            &parser.normalized_names,
+            py,
+            &self.extra_types,
+            self.evaluate_result,
+        )
+    }
+
+    /// Convert a match and move the cursor past it (the cursor stays put if there is none)
+    fn advance(&mut self, py: Python, captured: Option<CapturedMatch>, string: &str) -> PyResult<Option<PyObject>> {
+        let captured = match captured {
+            Some(captured) => captured,
+            None => return Ok(None),
+        };
+        let result = self.convert(py, &captured, string)?;
+        if result.is_some() {
+            self.pos = next_pos(string, captured.span);
+        }
+        Ok(result)
+    }
+}
+
+/// Cursor position after a match (one character further after an empty match, so repeated
+/// calls make progress)
+fn next_pos(string: &str, (start, end): (usize, usize)) -> usize {
+    if start == end {
+        string[end..].chars().next().map_or(end, |c| end + c.len_utf8())
+    } else {
+        end
+    }
+}
+
+fn check_pos(string: &str, pos: usize) -> PyResult<()> {
+    if pos > string.len() || !string.is_char_boundary(pos) {
+        return Err(PyValueError::new_err(format!(
+            "pos {} is not a character boundary of the string (length {})",
+            pos,
+            string.len()
+        )));
+    }
+    Ok(())
+}
+
+#[pymethods]
+impl Scanner {
+    /// Find the next match at or after the cursor and move the cursor to its end
+    fn search(&mut self, py: Python) -> PyResult<Option<PyObject>> {
+        if !self.may_match {
+            return Ok(None);
+        }
+        let string_obj = self.string.clone_ref(py);
+        let string = string_obj.bind(py).to_str()?;
+        let parser = self.parser.get();
+        let (start, case_sensitive) = (self.pos, self.case_sensitive);
+        let captured = allow_threads_for(py, string.len() - start, || {
+            parser.get_search_regex(case_sensitive)
+                .captures_at(string, start)
+                .map(|captures| capture_fields(
+                    &captures,
+                    &parser.field_specs,
+                    &parser.normalized_names,
+                    &parser.custom_type_groups,
+                ))
+        });
+        self.advance(py, captured, string)
+    }
+
+    /// Match the pattern starting exactly at the cursor and move the cursor to its end
+    #[pyo3(name = "match")]
+    fn match_at(&mut self, py: Python) -> PyResult<Option<PyObject>> {
+        if !self.may_match {
+            return Ok(None);
+        }
+        let string_obj = self.string.clone_ref(py);
+        let string = string_obj.bind(py).to_str()?;
+        let parser = self.parser.get();
+        let regex = parser.get_prefix_regex(self.case_sensitive)?;
+        let start = self.pos;
+        // The prefix regex is anchored at the start of the slice, which begins at the cursor
+        let rest = &string[start..];
+        let captured = allow_threads_for(py, rest.len(), || {
+            regex.captures(rest).map(|captures| {
+                let mut captured = capture_fields(
+                    &captures,
+                    &parser.field_specs,
+                    &parser.normalized_names,
+                    &parser.custom_type_groups,
+                );
+                captured.offset_by(start);
+                captured
+            })
+        });
+        self.advance(py, captured, string)
+    }
+
+    /// Move the cursor past a match starting exactly at the cursor, without converting it
+    /// Returns whether there was one
+    fn skip(&mut self, py: Python) -> PyResult<bool> {
+        if !self.may_match {
+            return Ok(false);
+        }
+        let string_obj = self.string.clone_ref(py);
+        let string = string_obj.bind(py).to_str()?;
+        let regex = self.parser.get().get_prefix_regex(self.case_sensitive)?;
+        let start = self.pos;
+        let rest = &string[start..];
+        match allow_threads_for(py, rest.len(), || regex.find(rest)) {
+            Some(found) => {
+                self.pos = next_pos(string, (start + found.start(), start + found.end()));
+                Ok(true)
+            }
+            None => Ok(false),
+        }
+    }
+
+    /// Byte offset of the cursor (can be moved to any character boundary)
+    #[getter]
+    fn pos(&self) -> usize {
+        self.pos
+    }
+
+    #[setter]
+    fn set_pos(&mut self, py: Python, pos: usize) -> PyResult<()> {
+        check_pos(self.string.bind(py).to_str()?, pos)?;
+        self.pos = pos;
+        Ok(())
+    }
+
+    /// The scanned string
+    #[getter]
+    fn string(&self, py: Python) -> Py<PyString> {
+        self.string.clone_ref(py)
+    }
+
+    /// Whether the cursor is at the end of the string
+    #[getter]
+    fn eos(&self, py: Python) -> PyResult<bool> {
+        Ok(self.pos == self.string.bind(py).to_str()?.len())
+    }
+}
@@ -1,7 +1,9 @@
 use crate::datetime;
 use crate::error;
 use formatparse_core::{FieldSpec, FieldType};
+use pyo3::conversion::{BoundObject, IntoPyObject};
 use pyo3::prelude::*;
+use pyo3::IntoPyObjectExt;
 use std::collections::HashMap;
 
 #[cfg(test)]
@@ -266,7 +268,7 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
             FieldType::String => {
                 // Fast path: no alignment means no trimming needed
                 if spec.alignment.is_none() {
-                    Ok(value.to_object(py))
+                    value.into_py_any(py)
                 } else {
                     // Strip fill characters and whitespace based on alignment
                     let trimmed = match spec.alignment {
@@ -296,7 +298,7 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                         },
                         _ => value,  // No alignment: keep as-is
                     };
-                    Ok(trimmed.to_object(py))
+                    trimmed.into_py_any(py)
                 }
             },
             FieldType::Integer => {
@@ -304,7 +306,7 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                 if spec.fill.is_none() && spec.alignment != Some('=') && spec.original_type_char.is_none() {
                     // Try parsing directly first (most common case)
                     if let Ok(n) = value.trim().parse::<i64>() {
-                        return Ok(n.to_object(py));
+                        return n.into_py_any(py);
                     }
                 }
                 
@@ -381,19 +383,19 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                     result.map(|n| if is_negative { -n } else { n })
                 };
                 match v {
-                    Ok(n) => Ok(n.to_object(py)),
+                    Ok(n) => n.into_py_any(py),
                     Err(_) => Err(error::conversion_error(value, "integer")),
                 }
             }
             FieldType::Float => {
                 // Fast path: try parsing directly first (most floats don't have leading/trailing spaces)
                 match value.parse::<f64>() {
-                    Ok(n) => Ok(n.to_object(py)),
+                    Ok(n) => n.into_py_any(py),
                     Err(_) => {
                         // Fallback: strip whitespace and try again
                         let trimmed = value.trim();
                         match trimmed.parse::<f64>() {
-                            Ok(n) => Ok(n.to_object(py)),
+                            Ok(n) => n.into_py_any(py),
                             Err(_) => Err(error::conversion_error(value, "float")),
                         }
                     }
@@ -412,19 +414,19 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                         matches!(lower.as_str(), "true" | "1" | "yes" | "on")
                     }
                 };
-                Ok(b.to_object(py))
+                b.into_py_any(py)
             }
-            FieldType::Letters => Ok(value.to_object(py)),  // Letters are just strings
-            FieldType::Word => Ok(value.to_object(py)),     // Words are just strings
-            FieldType::NonLetters => Ok(value.to_object(py)), // Non-letters are just strings
-            FieldType::NonWhitespace => Ok(value.to_object(py)), // Non-whitespace are just strings
-            FieldType::NonDigits => Ok(value.to_object(py)), // Non-digits are just strings
+            FieldType::Letters => value.into_py_any(py),  // Letters are just strings
+            FieldType::Word => value.into_py_any(py),     // Words are just strings
+            FieldType::NonLetters => value.into_py_any(py), // Non-letters are just strings
+            FieldType::NonWhitespace => value.into_py_any(py), // Non-whitespace are just strings
+            FieldType::NonDigits => value.into_py_any(py), // Non-digits are just strings
             FieldType::NumberWithThousands => {
                 // Strip thousands separators (comma or dot) and parse as integer
                 let trimmed = value.trim();
                 let cleaned = trimmed.replace(",", "").replace(".", "");
                 match cleaned.parse::<i64>() {
-                    Ok(n) => Ok(n.to_object(py)),
+                    Ok(n) => n.into_py_any(py),
                     Err(_) => Err(error::conversion_error(value, "number with thousands")),
                 }
             },
@@ -432,7 +434,7 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                 // Parse as float (supports scientific notation)
                 let trimmed = value.trim();
                 match trimmed.parse::<f64>() {
-                    Ok(n) => Ok(n.to_object(py)),
+                    Ok(n) => n.into_py_any(py),
                     Err(_) => Err(error::conversion_error(value, "scientific notation")),
                 }
             },
@@ -442,17 +444,17 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                 let lower = trimmed.to_lowercase();
                 // Check for nan/inf first
                 if lower == "nan" {
-                    Ok(f64::NAN.to_object(py))
+                    f64::NAN.into_py_any(py)
                 } else if lower == "inf" || lower == "+inf" {
-                    Ok(f64::INFINITY.to_object(py))
+                    f64::INFINITY.into_py_any(py)
                 } else if lower == "-inf" {
-                    Ok(f64::NEG_INFINITY.to_object(py))
+                    f64::NEG_INFINITY.into_py_any(py)
                 } else {
                     // Try int first
                     if let Ok(n) = trimmed.parse::<i64>() {
-                        Ok(n.to_object(py))
+                        n.into_py_any(py)
                     } else if let Ok(n) = trimmed.parse::<f64>() {
-                        Ok(n.to_object(py))
+                        n.into_py_any(py)
                     } else {
                         Err(error::conversion_error(value, "number"))
                     }
@@ -463,44 +465,58 @@ pub fn convert_value(spec: &FieldSpec, value: &str, py: Python, custom_converter
                 let trimmed = value.trim();
                 let num_str = trimmed.trim_end_matches('%');
                 match num_str.parse::<f64>() {
-                    Ok(n) => Ok((n / 100.0).to_object(py)),
+                    Ok(n) => (n / 100.0).into_py_any(py),
                     Err(_) => Err(error::conversion_error(value, "percentage")),
                 }
             },
             FieldType::DateTimeISO => {
-                datetime::parse_iso_datetime(py, value)
+                datetime::parse_iso_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeRFC2822 => {
-                datetime::parse_rfc2822_datetime(py, value)
+                datetime::parse_rfc2822_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeGlobal => {
-                datetime::parse_global_datetime(py, value)
+                datetime::parse_global_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeUS => {
-                datetime::parse_us_datetime(py, value)
+                datetime::parse_us_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeCtime => {
-                datetime::parse_ctime_datetime(py, value)
+                datetime::parse_ctime_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeHTTP => {
-                datetime::parse_http_datetime(py, value)
+                datetime::parse_http_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeTime => {
                 datetime::parse_time(py, value)
             },
             FieldType::DateTimeSystem => {
-                datetime::parse_system_datetime(py, value)
+                datetime::parse_system_datetime(py, value, spec.datetime_output)
             },
             FieldType::DateTimeStrftime => {
-                if let Some(fmt) = &spec.strftime_format {
-                    datetime::parse_strftime_datetime(py, value, fmt)
+                if let (Some(program), Some(fmt)) = (&spec.strftime_program, &spec.strftime_format) {
+                    datetime::parse_strftime_with_program(py, value, program, fmt, spec.datetime_output)
+                } else if let Some(fmt) = &spec.strftime_format {
+                    let parsed = datetime::parse_strftime_datetime(py, value, fmt)?;
+                    datetime::convert_py_datetime(py, parsed, spec.datetime_output)
                 } else {
-                    Ok(value.to_object(py))
+                    value.into_py_any(py)
                 }
             },
             FieldType::Custom(_) => {
                 // Already handled above
-                Ok(value.to_object(py))
+                value.into_py_any(py)
             }
         }
     }
+
+/// Convert a value whose conversion can't fail (str, int, float, bool) to a Python object
+pub fn infallible_object<'py, T>(py: Python<'py>, value: T) -> PyObject
+where
+    T: IntoPyObject<'py, Error = std::convert::Infallible>,
+{
+    match value.into_pyobject(py) {
+        Ok(object) => object.into_any().unbind(),
+        Err(never) => match never {},
+    }
+}
@@ -4,6 +4,7 @@ Parse strings using a specification based on the Python format() syntax.
 This is a Rust-backed implementation of the parse library for better performance.
 """
 
+from collections import namedtuple
 from datetime import timedelta, tzinfo
 from typing import Any, Callable, Optional, Union
 import re
@@ -13,9 +14,19 @@ from _formatparse import (  # type: ignore[import-not-found]
     parse as _parse,
     search as _search,
     findall as _findall,
+    finditer as _finditer,
+    count as _count,
+    parse_many as _parse_many,
+    parse_file as _parse_file,
     compile as _compile,
+    cache_info as _cache_info,
+    set_cache_size as _set_cache_size,
+    clear_cache as _clear_cache,
+    set_builtin_timezones as _set_builtin_timezones,
     ParseResult,
     FormatParser,
+    PatternSet,
+    Scanner,
     FixedTzOffset as _FixedTzOffset,
 )
 
@@ -43,19 +54,47 @@ class RepeatedNameError(ValueError):
 
 
 # Wrap compile to catch RepeatedNameError
-def compile(pattern: str):
+def compile(pattern: str, fields=None, engine="auto", datetime_output="datetime"):
     """Compile a pattern into a FormatParser for repeated use.
     
     Compiling a pattern allows you to reuse the same pattern multiple times
     without recompiling the regex, which improves performance for repeated
     parsing operations.
     
+    With ``fields``, only the listed named fields are captured and converted.
+    The other fields must still match, but they are compiled as non-capturing
+    groups and left out of the results (including their spans), which makes
+    matching cheaper for patterns with many fields.
+    
+    ``engine`` selects how :meth:`FormatParser.parse` (and ``parse_many``,
+    ``parse_file``) match. Patterns made of plain ``{}`` fields and simple
+    ``d``/``f``/``l``/``w``/``S`` fields separated by literal text can be matched
+    by splitting the string at the literals instead of running the regex, with
+    the same results. ``"auto"`` uses that split engine when the pattern allows
+    it, ``"split"`` requires it and ``"regex"`` never uses it.
+    ``parser.engine`` tells which one was chosen.
+    
+    ``datetime_output`` sets what the datetime types (``ti``, ``te``, ``th``,
+    ``ts``, ``ta``, ``tg``, ``tc`` and strftime formats) convert to. Instead of a
+    ``datetime`` object, ``"epoch_s"`` and ``"epoch_ns"`` give an int of seconds or
+    nanoseconds since the Unix epoch, and ``"iso"`` gives an ISO 8601 string. These
+    are computed in Rust, with the value's UTC offset applied (values without one
+    are taken as UTC). Time-only values (``tt``, ``%H:%M``) stay ``time`` objects.
+    
     :param pattern: Format specification pattern (e.g., ``"{name}: {age:d}"``)
     :type pattern: str
+    :param fields: Names of the fields to capture (default: all fields)
+    :type fields: list of str, optional
+    :param engine: ``"auto"`` (default), ``"split"`` or ``"regex"``
+    :type engine: str
+    :param datetime_output: ``"datetime"`` (default), ``"epoch_s"``, ``"epoch_ns"`` or ``"iso"``
+    :type datetime_output: str
     :returns: FormatParser object that can be used to parse strings
     :rtype: FormatParser
     :raises RepeatedNameError: If a repeated field name has mismatched types
-    :raises ValueError: If pattern is invalid
+    :raises ValueError: If pattern is invalid, a name in ``fields`` is not in the pattern,
+        ``engine="split"`` is used with a pattern the split engine can't match, or
+        ``datetime_output`` is unknown
     
     Example::
     
@@ -70,9 +109,22 @@ def compile(pattern: str):
         'Bob'
         >>> result2.named['age']
         25
+        >>> parser = compile("{date} {level} {host} {msg}", fields=["level", "msg"])
+        >>> result = parser.parse("2024-01-01 ERROR web1 disk full")
+        >>> result.named['level'], result.named['msg']
+        ('ERROR', 'disk full')
+        >>> 'host' in result.named
+        False
+        >>> compile("{ip} - {user} [{ts}]").engine
+        'split'
+        >>> compile("{ip} - {user} [{ts}]", engine="regex").engine
+        'regex'
+        >>> parser = compile("[{ts:th}]", datetime_output="epoch_s")
+        >>> parser.parse("[21/Nov/2011:10:21:36 +1000]")['ts']
+        1321834896
     """
     try:
-        return _compile(pattern)
+        return _compile(pattern, None, fields, engine, datetime_output)
     except ValueError as e:
         if "Repeated name" in str(e) and "mismatched types" in str(e):
             raise RepeatedNameError(str(e)) from e
@@ -86,6 +138,8 @@ def parse(
     extra_types=None,
     case_sensitive=False,
     evaluate_result=True,
+    fields=None,
+    datetime_output="datetime",
 ):
     """Parse a string using a format specification.
     
@@ -95,14 +149,20 @@ def parse(
     
     :param pattern: Format specification pattern (e.g., ``"{name}: {age:d}"``)
     :type pattern: str
-    :param string: String to parse
-    :type string: str
+    :param string: String to parse, or a bytes-like object (``bytes``,
+        ``bytearray``, ``memoryview``, ``mmap``) matched without decoding it
+    :type string: str or bytes-like
     :param extra_types: Optional dictionary of custom type converters
     :type extra_types: dict, optional
     :param case_sensitive: Whether matching should be case sensitive (default: False)
     :type case_sensitive: bool
     :param evaluate_result: Whether to evaluate and convert result types (default: True)
     :type evaluate_result: bool
+    :param fields: Names of the fields to capture (default: all fields, see :func:`compile`)
+    :type fields: list of str, optional
+    :param datetime_output: What datetime fields convert to: ``"datetime"`` (default),
+        ``"epoch_s"``, ``"epoch_ns"`` or ``"iso"`` (see :func:`compile`)
+    :type datetime_output: str
     :returns: ParseResult object if match found, None otherwise
     :rtype: ParseResult or None
     :raises ValueError: If pattern is invalid
@@ -117,8 +177,10 @@ def parse(
         >>> result = parse("{}, {}", "Hello, World")
         >>> result.fixed
         ('Hello', 'World')
+        >>> parse("at {when:ti}", "at 2011-11-21T10:21:36+10:00", datetime_output="iso")['when']
+        '2011-11-21T00:21:36+00:00'
     """
-    return _parse(pattern, string, extra_types, case_sensitive, evaluate_result)
+    return _parse(pattern, string, extra_types, case_sensitive, evaluate_result, fields, datetime_output)
 
 
 def search(
@@ -129,6 +191,7 @@ def search(
     extra_types=None,
     case_sensitive=True,
     evaluate_result=True,
+    datetime_output="datetime",
 ):
     """Search for a pattern anywhere in a string.
     
@@ -137,8 +200,8 @@ def search(
     
     :param pattern: Format specification pattern
     :type pattern: str
-    :param string: String to search
-    :type string: str
+    :param string: String to search, or a bytes-like object (see findall())
+    :type string: str or bytes-like
     :param pos: Start position for search (default: 0)
     :type pos: int
     :param endpos: End position for search (default: None for end of string)
@@ -149,6 +212,8 @@ def search(
     :type case_sensitive: bool
     :param evaluate_result: Whether to evaluate and convert result types (default: True)
     :type evaluate_result: bool
+    :param datetime_output: What datetime fields convert to (see :func:`compile`)
+    :type datetime_output: str
     :returns: ParseResult object if match found, None otherwise
     :rtype: ParseResult or None
     :raises ValueError: If pattern is invalid
@@ -178,7 +243,7 @@ def search(
             return None
 
     return _search(
-        pattern, string, pos, endpos, extra_types, case_sensitive, evaluate_result
+        pattern, string, pos, endpos, extra_types, case_sensitive, evaluate_result, datetime_output
     )
 
 
@@ -188,24 +253,54 @@ def findall(
     extra_types=None,
     case_sensitive=False,
     evaluate_result=True,
+    parallel=False,
+    columns=False,
+    where=None,
+    datetime_output="datetime",
 ):
     """Find all matches of a pattern in a string.
     
     Searches for all non-overlapping occurrences of the pattern in the string
     and returns a list-like Results object containing all matches.
     
+    ``string`` can also be a bytes-like object (``bytes``, ``bytearray``,
+    ``memoryview``, ``mmap``...), such as data read from a socket or a memory-mapped
+    log. It is searched without decoding it to a str first: only the text of each
+    match is decoded (it must be UTF-8, the rest of the buffer needn't be), and spans
+    are byte offsets into the buffer. ``bytes`` and read-only ``mmap`` objects are
+    searched in place; other buffers, which could be written to during the search,
+    are copied once first.
+    
     :param pattern: Format specification pattern
     :type pattern: str
-    :param string: String to search
-    :type string: str
+    :param string: String or bytes-like object to search
+    :type string: str or bytes-like
     :param extra_types: Optional dictionary of custom type converters
     :type extra_types: dict, optional
     :param case_sensitive: Whether matching should be case sensitive (default: False)
     :type case_sensitive: bool
     :param evaluate_result: Whether to evaluate and convert result types (default: True)
     :type evaluate_result: bool
-    :returns: Results object (list-like) containing ParseResult objects
-    :rtype: Results
+    :param parallel: Split the string at newlines and search the pieces on all CPU
+        cores (default: False). Matches never cross the split points, so only use
+        this for line-oriented patterns whose matches don't contain newlines.
+    :type parallel: bool
+    :param columns: Return a dict with one column per field instead of a Results
+        object (default: False). See Results.to_columns().
+    :type columns: bool
+    :param where: Only keep matches whose named fields satisfy every condition, given
+        as ``(field, operator, value)`` tuples. Operators are ``==``, ``!=``, ``<``,
+        ``<=``, ``>``, ``>=``, ``in`` (value is a collection), ``prefix`` and
+        ``regex`` (Rust regex syntax, matched anywhere in the value). Conditions are
+        checked in Rust before any Python object is created.
+    :type where: list of tuple, optional
+    :param datetime_output: What datetime fields convert to (see :func:`compile`)
+    :type datetime_output: str
+    :returns: Results object (list-like) containing ParseResult objects, or a dict
+        of columns if ``columns`` is True
+    :rtype: Results or dict
+    :raises ValueError: If ``columns`` is True and ``evaluate_result`` is False, or
+        ``where`` names an unknown field or operator
     
     Example::
     
@@ -223,8 +318,338 @@ def findall(
         1
         2
         3
+        >>> findall("ID:{id:d}", "ID:1 ID:2 ID:3", columns=True)
+        {'id': array('q', [1, 2, 3])}
+        >>> [r['id'] for r in findall("ID:{id:d}", "ID:1 ID:2 ID:3", where=[("id", ">=", 2)])]
+        [2, 3]
+        >>> [r.spans['id'] for r in findall("ID:{id:d}", b"\\xff ID:1 ID:2")]
+        [(5, 6), (10, 11)]
+    """
+    return _findall(
+        pattern,
+        string,
+        extra_types,
+        case_sensitive,
+        evaluate_result,
+        parallel,
+        columns,
+        where,
+        datetime_output,
+    )
+
+
+def finditer(
+    pattern: str,
+    string: str,
+    extra_types=None,
+    case_sensitive=False,
+    evaluate_result=True,
+    where=None,
+    datetime_output="datetime",
+):
+    """Iterate over the matches of a pattern in a string.
+    
+    Like findall(), but lazy: the string is scanned one match at a time as the
+    iterator is advanced, and only the match being returned is converted. Use it
+    when you only need the first few matches or want to stop early.
+    
+    :param pattern: Format specification pattern
+    :type pattern: str
+    :param string: String to search
+    :type string: str
+    :param extra_types: Optional dictionary of custom type converters
+    :type extra_types: dict, optional
+    :param case_sensitive: Whether matching should be case sensitive (default: False)
+    :type case_sensitive: bool
+    :param evaluate_result: Whether to evaluate and convert result types (default: True)
+    :type evaluate_result: bool
+    :param where: Skip matches that fail these ``(field, operator, value)``
+        conditions (see findall())
+    :type where: list of tuple, optional
+    :param datetime_output: What datetime fields convert to (see :func:`compile`)
+    :type datetime_output: str
+    :returns: Iterator of ParseResult objects (Match objects if evaluate_result is False)
+    :rtype: Iterator[ParseResult]
+    
+    Example::
+    
+        >>> it = finditer("ID:{id:d}", "ID:1 ID:2 ID:3")
+        >>> next(it).named['id']
+        1
+        >>> [r.named['id'] for r in it]
+        [2, 3]
+    """
+    return _finditer(pattern, string, extra_types, case_sensitive, evaluate_result, where, datetime_output)
+
+
+def count(
+    pattern: str,
+    string: str,
+    extra_types=None,
+    case_sensitive=False,
+    evaluate_result=True,
+):
+    """Count the matches of a pattern in a string.
+    
+    Returns ``len(findall(pattern, string, ...))`` without building the matches:
+    no results, strings or Python objects are created for them. With
+    ``evaluate_result`` (the default), a match only counts if its fields can be
+    converted to their types, like in findall(); without it, every match of the
+    pattern counts.
+    
+    :param pattern: Format specification pattern
+    :type pattern: str
+    :param string: String to search, or a bytes-like object (see findall())
+    :type string: str or bytes-like
+    :param extra_types: Optional dictionary of custom type converters
+    :type extra_types: dict, optional
+    :param case_sensitive: Whether matching should be case sensitive (default: False)
+    :type case_sensitive: bool
+    :param evaluate_result: Whether matches must convert to count (default: True)
+    :type evaluate_result: bool
+    :returns: Number of non-overlapping matches
+    :rtype: int
+    
+    Example::
+    
+        >>> count("ID:{id:d}", "ID:1 ID:2 ID:x")
+        2
+        >>> log = "ERROR 1\\nerror 2\\nWARN 3"
+        >>> count("ERROR {code:d}", log), count("ERROR {code:d}", log, case_sensitive=True)
+        (2, 1)
+    """
+    return _count(pattern, string, extra_types, case_sensitive, evaluate_result)
+
+
+def parse_many(
+    pattern: str,
+    strings,
+    extra_types=None,
+    case_sensitive=False,
+    evaluate_result=True,
+    columns=False,
+    as_numpy=False,
+    out=None,
+    where=None,
+    datetime_output="datetime",
+):
+    """Parse many strings with the same format specification.
+    
+    Equivalent to calling parse() on every string, but the pattern is looked up
+    once and the strings are matched in parallel on all CPU cores with the GIL
+    released. Results keep the input order, with None for strings that don't match.
+    
+    Patterns with datetime or custom types (or ``evaluate_result=False``) need
+    Python-level conversion; they are parsed one string at a time and a plain
+    list is returned instead.
+    
+    :param pattern: Format specification pattern (e.g., ``"{name}: {age:d}"``)
+    :type pattern: str
+    :param strings: Strings to parse (a list, tuple, or any iterable of str)
+    :type strings: Iterable[str]
+    :param extra_types: Optional dictionary of custom type converters
+    :type extra_types: dict, optional
+    :param case_sensitive: Whether matching should be case sensitive (default: False)
+    :type case_sensitive: bool
+    :param evaluate_result: Whether to evaluate and convert result types (default: True)
+    :type evaluate_result: bool
+    :param columns: Return a dict with one column per field instead of a Results
+        object (default: False). Rows of unmatched strings hold None.
+    :type columns: bool
+    :param as_numpy: Return a NumPy structured array with one row per input string
+        and one field per numeric field (default: False). See Results.to_numpy().
+        Requires NumPy.
+    :type as_numpy: bool
+    :param out: Preallocated structured array to write into when ``as_numpy`` is
+        True. It must have the pattern's dtype and at least ``len(strings)`` rows;
+        a view of the rows written is returned.
+    :type out: numpy.ndarray, optional
+    :param where: ``(field, operator, value)`` conditions (see findall()); strings
+        that match but fail a condition give None, like unmatched strings
+    :type where: list of tuple, optional
+    :param datetime_output: What datetime fields convert to (see :func:`compile`)
+    :type datetime_output: str
+    :returns: Results object (list-like) with one ParseResult or None per input
+        string, a dict of columns if ``columns`` is True, or a structured array if
+        ``as_numpy`` is True
+    :rtype: Results or dict or numpy.ndarray
+    :raises TypeError: If strings is a single str or contains non-string items
+    :raises ValueError: If pattern is invalid, a value can't be converted, the
+        output options conflict, or ``out`` doesn't fit
+    :raises ImportError: If ``as_numpy`` is True and NumPy isn't installed
+    
+    Example::
+    
+        >>> results = parse_many("{name}: {age:d}", ["Alice: 30", "invalid", "Bob: 25"])
+        >>> len(results)
+        3
+        >>> results[0].named['age']
+        30
+        >>> results[1] is None
+        True
+        >>> results[2].named['name']
+        'Bob'
+    """
+    if isinstance(strings, str):
+        raise TypeError("parse_many() expects an iterable of strings, not a single str")
+    if not isinstance(strings, (list, tuple)):
+        strings = list(strings)
+    return _parse_many(
+        pattern,
+        strings,
+        extra_types,
+        case_sensitive,
+        evaluate_result,
+        columns,
+        as_numpy,
+        out,
+        where,
+        datetime_output,
+    )
+
+
+def parse_file(
+    pattern: str,
+    path,
+    extra_types=None,
+    case_sensitive=False,
+    evaluate_result=True,
+    batch_size=10000,
+    include_unmatched=False,
+    where=None,
+    datetime_output="datetime",
+):
+    """Parse a text file line by line with the same format specification.
+    
+    The file is read in Rust with buffered I/O and each line (without its
+    trailing newline) is matched against the pattern like parse(). Lines are
+    processed ``batch_size`` at a time in parallel with the GIL released, so
+    memory use stays flat regardless of file size.
+    
+    The returned iterator yields one Results object per batch. Lines that don't
+    match are skipped, or reported as None if ``include_unmatched`` is True (in
+    which case every batch has exactly one entry per line). Spans are relative
+    to the start of each line.
+    
+    :param pattern: Format specification pattern (e.g., ``"{name}: {age:d}"``)
+    :type pattern: str
+    :param path: Path of a UTF-8 text file
+    :type path: str or os.PathLike
+    :param extra_types: Optional dictionary of custom type converters
+    :type extra_types: dict, optional
+    :param case_sensitive: Whether matching should be case sensitive (default: False)
+    :type case_sensitive: bool
+    :param evaluate_result: Whether to evaluate and convert result types (default: True)
+    :type evaluate_result: bool
+    :param batch_size: Number of lines read and parsed per batch (default: 10000)
+    :type batch_size: int
+    :param include_unmatched: Yield None for lines that don't match (default: False)
+    :type include_unmatched: bool
+    :param where: ``(field, operator, value)`` conditions (see findall()); lines
+        that fail a condition are treated like unmatched lines
+    :type where: list of tuple, optional
+    :param datetime_output: What datetime fields convert to (see :func:`compile`)
+    :type datetime_output: str
+    :returns: Iterator of Results batches (lists when Python conversion is needed)
+    :rtype: Iterator[Results]
+    :raises FileNotFoundError: If the file doesn't exist
+    :raises ValueError: If pattern is invalid, batch_size is 0, or the file isn't valid UTF-8
+    
+    Example::
+    
+        >>> for batch in parse_file("{level}: {message}", "app.log"):  # doctest: +SKIP
+        ...     for result in batch:
+        ...         print(result.named['level'])
+    """
+    return _parse_file(
+        pattern,
+        path,
+        extra_types,
+        case_sensitive,
+        evaluate_result,
+        batch_size,
+        include_unmatched,
+        where,
+        datetime_output,
+    )
+
+
+CacheInfo = namedtuple("CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"])
+
+
+def cache_info():
+    """Report statistics of the pattern cache.
+    
+    The module-level functions (parse(), search(), findall(), ...) keep the
+    most recently used compiled patterns in an LRU cache. A miss means the
+    pattern had to be compiled; an eviction means a cached pattern was dropped
+    to make room for another one (or because the cache was shrunk).
+    
+    :returns: Named tuple of hits, misses, evictions, maxsize and currsize
+    :rtype: CacheInfo
+    
+    Example::
+    
+        >>> clear_cache()
+        >>> _ = parse("{n:d}", "1")
+        >>> _ = parse("{n:d}", "2")
+        >>> cache_info()
+        CacheInfo(hits=1, misses=1, evictions=0, maxsize=1000, currsize=1)
+    """
+    return CacheInfo(*_cache_info())
+
+
+def set_cache_size(size: int):
+    """Change how many compiled patterns the pattern cache keeps.
+    
+    The initial size is 1000, or the value of the ``FORMATPARSE_CACHE_SIZE``
+    environment variable when the module is first used. Shrinking the cache
+    evicts the least recently used patterns.
+    
+    :param size: Maximum number of cached patterns
+    :type size: int
+    :raises ValueError: If size is less than 1
+    
+    Example::
+    
+        >>> set_cache_size(5000)
+        >>> cache_info().maxsize
+        5000
+    """
+    _set_cache_size(size)
+
+
+def clear_cache():
+    """Remove every compiled pattern from the pattern cache and reset its statistics.
+    
+    Example::
+    
+        >>> clear_cache()
+        >>> cache_info().currsize
+        0
+    """
+    _clear_cache()
+
+
+def set_builtin_timezones(enabled: bool = True):
+    """Choose the tzinfo type of parsed datetimes and times that carry an offset.
+    
+    By default their tzinfo is a :class:`FixedTzOffset`. When enabled, it is a
+    standard-library ``datetime.timezone`` instead, which pickles without
+    formatparse and compares equal to other ``datetime.timezone`` objects.
+    Either way, values with the same offset share one tzinfo object.
+    
+    :param enabled: Use ``datetime.timezone`` (True) or FixedTzOffset (False)
+    :type enabled: bool
+    
+    Example::
+    
+        >>> set_builtin_timezones()
+        >>> parse("{:ti}", "2011-11-21T10:21:36+10:00")[0].tzinfo
+        datetime.timezone(datetime.timedelta(seconds=36000))
+        >>> set_builtin_timezones(False)
     """
-    return _findall(pattern, string, extra_types, case_sensitive, evaluate_result)
+    _set_builtin_timezones(enabled)
 
 
 # Create a tzinfo-compatible wrapper for FixedTzOffset
@@ -330,7 +755,10 @@ dt_format_to_regex = {
     "%H": r"\d{1,2}",  # Hour (0-23 or 00-23) - flexible
     "%M": r"\d{1,2}",  # Minute (0-59 or 00-59) - flexible
     "%S": r"\d{1,2}",  # Second (0-59 or 00-59) - flexible
+    "%I": r"\d{1,2}",  # Hour on a 12-hour clock (1-12 or 01-12) - flexible
+    "%p": r"[AaPp][Mm]",  # AM/PM
     "%f": r"\d{1,6}",  # Microseconds
+    "%z": r"(?:[Zz]|[+-]\d{2}(?::?\d{2}){1,2})",  # UTC offset
     "%b": r"[A-Za-z]{3}",  # Abbreviated month name
     "%B": r"[A-Za-z]+",  # Full month name
     "%a": r"[A-Za-z]{3}",  # Abbreviated weekday
@@ -769,5 +1197,14 @@ __all__ = [
     "parse",
     "search",
     "findall",
+    "finditer",
+    "count",
+    "parse_many",
+    "parse_file",
     "with_pattern",
+    "cache_info",
+    "set_cache_size",
+    "clear_cache",
+    "set_builtin_timezones",
+    "CacheInfo",
 ]
@@ -0,0 +1,74 @@
+"""Tests for Arrow export of Results (Arrow PyCapsule interface)"""
+
+import pytest
+from formatparse import findall, parse_many
+
+pa = pytest.importorskip("pyarrow")
+
+
+def test_record_batch_types_from_field_types():
+    """Test each field becomes a column typed from its format spec"""
+    results = findall("<{name} {count:d} {ratio:f}>", "<a 1 0.5> <b 2 1.5>")
+    batch = pa.record_batch(results)
+    assert batch.schema.names == ["name", "count", "ratio"]
+    assert batch.schema.field("name").type == pa.string()
+    assert batch.schema.field("count").type == pa.int64()
+    assert batch.schema.field("ratio").type == pa.float64()
+    assert batch.to_pydict() == {
+        "name": ["a", "b"],
+        "count": [1, 2],
+        "ratio": [0.5, 1.5],
+    }
+
+
+def test_positional_fields_named_by_index():
+    """Test positional fields are named by their index"""
+    batch = pa.record_batch(findall("({:d},{})", "(1,x) (2,y)"))
+    assert batch.schema.names == ["0", "1"]
+    assert batch.column(0).to_pylist() == [1, 2]
+    assert batch.column(1).to_pylist() == ["x", "y"]
+
+
+def test_unmatched_entries_are_null_rows():
+    """Test inputs parse_many couldn't match become rows of nulls"""
+    results = parse_many("{n:d} {word}", ["1 a", "junk", "3 c"])
+    batch = pa.record_batch(results)
+    assert batch.num_rows == 3
+    assert batch.column("n").to_pylist() == [1, None, 3]
+    assert batch.column("word").to_pylist() == ["a", None, "c"]
+    assert batch.column("n").null_count == 1
+
+
+def test_general_number_column_is_float():
+    """Test 'g' fields, which can hold ints or floats, export as float64"""
+    batch = pa.record_batch(findall("[{x:g}]", "[1] [2.5]"))
+    assert batch.schema.field("x").type == pa.float64()
+    assert batch.column("x").to_pylist() == [1.0, 2.5]
+
+
+def test_empty_results():
+    """Test no matches gives an empty batch with the full schema"""
+    batch = pa.record_batch(findall("ID:{id:d}", "nothing"))
+    assert batch.num_rows == 0
+    assert batch.schema.names == ["id"]
+
+
+def test_table_from_stream():
+    """Test the stream interface (pa.table) gives the same data"""
+    results = findall("{key}={value:d};", "a=1;b=2;c=3;")
+    table = pa.table(results)
+    assert table.num_rows == 3
+    assert table.column("key").to_pylist() == ["a", "b", "c"]
+    assert table.column("value").to_pylist() == [1, 2, 3]
+
+
+def test_capsules_can_be_exported_repeatedly():
+    """Test each export builds independent buffers"""
+    results = findall("{n:d},", "1,2,3,")
+    first = pa.record_batch(results)
+    second = pa.record_batch(results)
+    del first
+    assert second.column("n").to_pylist() == [1, 2, 3]
+    # Capsules that are never imported are released without leaking or crashing
+    results.__arrow_c_array__()
+    results.__arrow_c_stream__()
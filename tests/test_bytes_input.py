@@ -0,0 +1,124 @@
+"""Tests for bytes-like input (bytes, bytearray, memoryview, mmap) matched without decoding"""
+
+import mmap
+
+import pytest
+from formatparse import PatternSet, compile, count, findall, parse, search, with_pattern
+
+LOG = b"\xff\xfe garbage\nERROR 12: disk full\n\x80 INFO 3: ok\nERROR 7: fan\n"
+
+
+@pytest.mark.parametrize("wrap", [bytes, bytearray, memoryview])
+def test_parse_bytes_like(wrap):
+    """Test parse() gives the same result for bytes-like input as for str"""
+    result = parse("{name}: {age:d}", wrap(b"Alice: 30"))
+    assert result.named == {"name": "Alice", "age": 30}
+    assert result.spans == parse("{name}: {age:d}", "Alice: 30").spans
+
+
+def test_parse_invalid_utf8_does_not_match():
+    """Test bytes that aren't UTF-8 can't match a whole-string pattern"""
+    assert parse("{name}: {age:d}", b"Al\xffce: 30") is None
+    assert not compile("{name}: {age:d}").matches(b"Al\xffce: 30")
+    assert compile("{name}: {age:d}").matches(b"Al\xc3\xafce: 30")
+
+
+def test_findall_decodes_only_matches():
+    """Test findall() over bytes with invalid UTF-8 outside the matches"""
+    results = findall("ERROR {code:d}: {msg}\n", LOG)
+    assert [(r["code"], r["msg"]) for r in results] == [(12, "disk full"), (7, "fan")]
+    assert isinstance(results[0]["msg"], str)
+
+
+def test_spans_are_byte_offsets():
+    """Test spans index into the buffer"""
+    data = "é ERROR 5: x\n".encode()
+    result = findall("ERROR {code:d}: {msg}\n", data)[0]
+    start, end = result.spans["code"]
+    assert data[start:end] == b"5"
+    assert data[slice(*result.spans["msg"])] == b"x"
+
+
+def test_findall_python_paths():
+    """Test bytes input with evaluate_result=False, custom types and where="""
+    raw = findall("ERROR {code:d}: {msg}\n", LOG, evaluate_result=False)
+    assert [match.evaluate_result()["code"] for match in raw] == [12, 7]
+
+    @with_pattern(r"\d+")
+    def number(text):
+        return int(text) * 10
+
+    converted = findall("ERROR {code:Number}: {msg}\n", LOG, extra_types={"Number": number})
+    assert [r["code"] for r in converted] == [120, 70]
+    kept = findall("ERROR {code:d}: {msg}\n", LOG, where=[("code", "<", 10)])
+    assert [r["msg"] for r in kept] == ["fan"]
+
+
+def test_findall_parallel_and_columns():
+    """Test parallel findall and columns over bytes match the sequential results"""
+    data = b"".join(b"\x80 id=%d;\n" % i for i in range(50000))
+    sequential = findall("id={id:d};", data)
+    assert len(sequential) == 50000
+    assert [r["id"] for r in findall("id={id:d};", data, parallel=True)] == list(range(50000))
+    assert list(findall("id={id:d};", data, columns=True)["id"]) == list(range(50000))
+
+
+def test_search_bytes_with_positions():
+    """Test search() over bytes honours pos/endpos and keeps absolute spans"""
+    result = search("ERROR {code:d}:", LOG, pos=30)
+    assert result["code"] == 7
+    assert LOG[slice(*result.spans["code"])] == b"7"
+    assert search("ERROR {code:d}:", LOG, pos=30, endpos=40) is None
+    assert compile("ERROR {code:d}:").search(bytearray(LOG))["code"] == 12
+
+
+def test_count_bytes():
+    """Test count() over bytes"""
+    assert count("ERROR {code:d}:", LOG) == 2
+    assert count("error {code:d}:", LOG, case_sensitive=True) == 0
+    assert compile("{level:w} {code:d}:").count(LOG) == 3
+    assert compile("{level:w} {code:d}:").count(LOG, evaluate_result=False) == 3
+
+
+def test_mmap_input(tmp_path):
+    """Test a memory-mapped file is searched in place"""
+    path = tmp_path / "app.log"
+    path.write_bytes(LOG)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        assert [r["code"] for r in findall("ERROR {code:d}:", mapped)] == [12, 7]
+        assert search("INFO {code:d}:", mapped)["code"] == 3
+
+
+def test_writable_buffers():
+    """Test bytearrays, read-only views of them and non-contiguous views are matched"""
+    data = bytearray(LOG)
+    view = memoryview(data).toreadonly()
+    assert [r["code"] for r in findall("ERROR {code:d}:", view)] == [12, 7]
+    assert parse("{a}={b:d}", memoryview(bytearray(b"x=1")).toreadonly())["b"] == 1
+    assert parse("{n:d}", memoryview(b"1a2b3c")[::2])["n"] == 123
+    assert count("ERROR {code:d}:", data) == 2
+
+
+def test_pattern_set_and_match_mask():
+    """Test PatternSet.parse/matches and match_mask() take bytes-like input too"""
+    patterns = PatternSet(["{name}: {age:d}", "{key}={value}"])
+    index, result = patterns.parse(b"Alice: 30")
+    assert (index, result.named) == (0, {"name": "Alice", "age": 30})
+    assert patterns.matches(bytearray(b"a=b")) == [1]
+    assert patterns.parse(b"Al\xffce: 30") is None
+    assert patterns.matches(b"a=\xff") == []
+
+    lines = [b"GET /a 200", bytearray(b"POST /b 500"), "garbage", b"GET /\xff 200"]
+    assert list(compile("{method} {path} {status:d}").match_mask(lines)) == [1, 1, 0, 0]
+    with pytest.raises(ValueError, match="null byte"):
+        compile("{}").match_mask([b"ok", b"bad\0"])
+
+
+def test_invalid_input():
+    """Test unsupported objects and null bytes are rejected"""
+    with pytest.raises(TypeError):
+        parse("{x}", 42)
+    with pytest.raises(TypeError):
+        findall("{x:d}", [1, 2])
+    with pytest.raises(ValueError):
+        findall("{x:d}", b"1\x002")
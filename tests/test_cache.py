@@ -0,0 +1,200 @@
+"""Tests for the pattern cache (cache_info, set_cache_size, clear_cache and cache keys)"""
+
+import gc
+import os
+import subprocess
+import sys
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from formatparse import cache_info, clear_cache, parse, set_cache_size, with_pattern, CacheInfo
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    maxsize = cache_info().maxsize
+    clear_cache()
+    yield
+    set_cache_size(maxsize)
+    clear_cache()
+
+
+def test_cache_info_counts_hits_and_misses():
+    """Test repeated patterns are hits and new ones are misses"""
+    parse("{a:d}", "1")
+    parse("{a:d}", "2")
+    parse("{b:d}", "3")
+    info = cache_info()
+    assert isinstance(info, CacheInfo)
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 2, 0, 2)
+
+
+def test_cache_info_counts_evictions():
+    """Test patterns pushed out of a full cache are counted"""
+    set_cache_size(2)
+    for i in range(5):
+        parse(f"p{i} {{x}}", f"p{i} y")
+    info = cache_info()
+    assert info.maxsize == 2
+    assert info.currsize == 2
+    assert info.evictions == 3
+
+
+def test_set_cache_size_shrinks_cache():
+    """Test shrinking the cache evicts the least recently used patterns"""
+    for i in range(4):
+        parse(f"p{i} {{x}}", f"p{i} y")
+    set_cache_size(1)
+    info = cache_info()
+    assert (info.maxsize, info.currsize, info.evictions) == (1, 1, 3)
+    parse("p3 {x}", "p3 y")
+    assert cache_info().hits == 1
+
+
+def test_clear_cache_resets_statistics():
+    """Test clear_cache drops the patterns and the counters"""
+    parse("{a}", "x")
+    parse("{a}", "x")
+    clear_cache()
+    info = cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 0, 0, 0)
+
+
+def test_set_cache_size_rejects_zero():
+    """Test a cache size below 1 raises ValueError"""
+    with pytest.raises(ValueError):
+        set_cache_size(0)
+
+
+def test_cache_size_from_environment():
+    """Test FORMATPARSE_CACHE_SIZE sets the initial cache size"""
+    env = dict(os.environ, FORMATPARSE_CACHE_SIZE="42")
+    output = subprocess.run(
+        [sys.executable, "-c", "import formatparse; print(formatparse.cache_info().maxsize)"],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert output.stdout.strip() == "42"
+
+
+def test_converters_with_same_name_are_cached_separately():
+    """Test converters registered under one name don't share a cached parser"""
+
+    @with_pattern(r"\d+")
+    def digits(text):
+        return int(text)
+
+    @with_pattern(r"[a-z]+")
+    def letters(text):
+        return text.upper()
+
+    assert parse("{v:Value}", "42", extra_types={"Value": digits})["v"] == 42
+    assert parse("{v:Value}", "abc", extra_types={"Value": letters})["v"] == "ABC"
+    assert parse("{v:Value}", "abc", extra_types={"Value": digits}) is None
+    assert cache_info().misses == 2
+
+
+def test_converter_group_count_is_part_of_the_key():
+    """Test a different regex_group_count compiles a new parser"""
+
+    def pair(text):
+        return text
+
+    pair.pattern = r"(\d)-(\d)"
+    pair.regex_group_count = 2
+    assert parse("{p:Pair}/{n:d}", "1-2/3", extra_types={"Pair": pair})["n"] == 3
+    pair.regex_group_count = 0
+    with pytest.raises(ValueError):
+        parse("{p:Pair}/{n:d}", "1-2/3", extra_types={"Pair": pair})
+
+
+def test_same_converters_hit_the_cache():
+    """Test repeated calls with the same converter objects are cache hits"""
+
+    @with_pattern(r"\d+")
+    def number(text):
+        return int(text)
+
+    for text in ("1", "2", "3"):
+        assert parse("n={n:Number}", f"n={text}", extra_types={"Number": number})["n"] == int(text)
+    info = cache_info()
+    assert (info.hits, info.misses) == (2, 1)
+
+
+def test_new_converter_reuses_compiled_structure():
+    """Test a new converter function with the same pattern converts with the new function"""
+    results = []
+    for scale in (1, 10, 100):
+
+        @with_pattern(r"\d+")
+        def scaled(text, scale=scale):
+            return int(text) * scale
+
+        results.append(parse("{n:Scaled}", "7", extra_types={"Scaled": scaled})["n"])
+    assert results == [7, 70, 700]
+
+
+def test_cache_shared_between_threads():
+    """Test a pattern compiled in one thread is a hit in others"""
+    parse("t={n:d}", "t=1")
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(lambda i: parse("t={n:d}", f"t={i}")["n"], range(8)))
+    assert results == list(range(8))
+    info = cache_info()
+    assert (info.hits, info.misses) == (8, 1)
+
+
+def test_clear_cache_applies_to_every_thread():
+    """Test parsers cached by a thread aren't hits after clear_cache()"""
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pool.submit(parse, "c={n:d}", "c=1").result()
+        clear_cache()
+        pool.submit(parse, "c={n:d}", "c=2").result()
+    info = cache_info()
+    assert (info.hits, info.misses) == (0, 1)
+
+
+def test_front_cache_hits_keep_pattern_in_shared_cache():
+    """Test a pattern only hit in the thread's front cache survives churn of other patterns"""
+    set_cache_size(4)
+    parse("hot={n:d}", "hot=0")
+    for i in range(20):
+        parse(f"cold{i}={{n:d}}", f"cold{i}=1")
+        assert parse("hot={n:d}", f"hot={i}")["n"] == i
+    info = cache_info()
+    assert (info.hits, info.misses, info.evictions) == (20, 21, 17)
+
+
+def test_clear_cache_releases_converters():
+    """Test clear_cache() frees converters cached by a thread that is still alive"""
+    parsed = threading.Event()
+    done = threading.Event()
+
+    def worker():
+        @with_pattern(r"\d+")
+        def number(text):
+            return int(text)
+
+        refs.append(weakref.ref(number))
+        parse("w={n:Number}", "w=1", extra_types={"Number": number})
+        del number
+        parsed.set()
+        done.wait()
+
+    refs = []
+    thread = threading.Thread(target=worker)
+    thread.start()
+    try:
+        parsed.wait()
+        gc.collect()
+        assert refs[0]() is not None
+        clear_cache()
+        gc.collect()
+        assert refs[0]() is None
+    finally:
+        done.set()
+        thread.join()
@@ -0,0 +1,66 @@
+"""Tests for count() and FormatParser.count() (must agree with len(findall()))"""
+
+import pytest
+from formatparse import compile, count, findall, with_pattern
+
+LOG = "\n".join(
+    [
+        "ERROR 500: disk full",
+        "error 404: not found",
+        "INFO 200: ok",
+        "ERROR 5x: bad code",
+        "ERROR 99999999999999999999: overflow",
+    ]
+)
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        "ERROR {code:d}:",
+        "{level} {code:d}:",
+        "{code:d}",
+        "{:f}",
+        "{word:w}",
+        "{key}={key};",
+        "[{name:>}]",
+        "",
+    ],
+)
+def test_count_agrees_with_findall(pattern):
+    """Test count() gives len(findall()) for a range of patterns"""
+    text = LOG + "\na=a; b=c; [ x] 1.5 2.5"
+    for case_sensitive in (False, True):
+        for evaluate_result in (True, False):
+            expected = len(findall(pattern, text, case_sensitive=case_sensitive, evaluate_result=evaluate_result))
+            assert count(pattern, text, case_sensitive=case_sensitive, evaluate_result=evaluate_result) == expected
+
+
+def test_count_evaluate_result():
+    """Test matches whose values can't be converted only count without evaluate_result"""
+    assert count("ERROR {code:d}:", LOG) == 2
+    assert count("ERROR {code:d}:", LOG, evaluate_result=False) == 3
+    assert count("ERROR {code:d}:", LOG, case_sensitive=True) == 1
+
+
+def test_count_datetime_and_custom_types():
+    """Test types converted in Python are counted like findall() keeps them"""
+    text = "at 2024-01-15 and 2024-13-45 and 2023-06-01"
+    assert count("{:ti}", text) == len(findall("{:ti}", text))
+
+    @with_pattern(r"[a-z]+")
+    def upper(text):
+        return text.upper()
+
+    text = "<abc> <AB1> <a>"
+    assert count("<{:Upper}>", text, {"Upper": upper}) == 2
+    assert count("<{:Upper}>", text, {"Upper": upper}, case_sensitive=True) == 2
+
+
+def test_compiled_parser_count():
+    """Test FormatParser.count() matches the module-level function"""
+    parser = compile("{level} {code:d}:")
+    assert parser.count(LOG) == count("{level} {code:d}:", LOG)
+    assert parser.count("") == 0
+    with pytest.raises(ValueError, match="null byte"):
+        parser.count("a\0b")
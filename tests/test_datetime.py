@@ -1,7 +1,7 @@
 """Comprehensive tests for datetime parsing formats"""
 
-from datetime import datetime, time
-from formatparse import parse, FixedTzOffset
+from datetime import date, datetime, time, timedelta, timezone
+from formatparse import findall, parse, set_builtin_timezones, FixedTzOffset
 
 
 def test_iso8601_basic():
@@ -373,3 +373,39 @@ def test_http_date_various_formats():
         assert result is not None
         dt = result.named["dt"]
         assert dt.year == 2023 or dt.year == 2024
+
+
+def test_tzinfo_shared_between_values():
+    """Test values with the same offset share one tzinfo object"""
+    results = findall("<{dt:ti}>", "<2023-12-25T10:30:00+05:00> <2023-12-26T11:00:00+05:00>")
+    first, second = (r["dt"] for r in results)
+    assert isinstance(first.tzinfo, FixedTzOffset)
+    assert first.tzinfo is second.tzinfo
+    assert first.utcoffset() == timedelta(hours=5)
+
+
+def test_builtin_timezones():
+    """Test set_builtin_timezones() switches parsed offsets to datetime.timezone"""
+    set_builtin_timezones()
+    try:
+        dt = parse("{dt:ti}", "2023-12-25T10:30:00-05:30")["dt"]
+        assert dt.tzinfo == timezone(timedelta(hours=-5, minutes=-30))
+        assert parse("{dt:ti}", "2023-12-25T10:30:00Z")["dt"].tzinfo.tzname(None) == "UTC"
+        assert parse("{t:tt}", "10:30:00 PM +1:00")["t"].tzinfo == timezone(timedelta(hours=1))
+    finally:
+        set_builtin_timezones(False)
+    assert isinstance(parse("{dt:ti}", "2023-12-25T10:30:00Z")["dt"].tzinfo, FixedTzOffset)
+
+
+def test_strftime_directives():
+    """Test strftime formats with 12-hour clocks, names, offsets and days of the year"""
+    result = parse("{dt:%a %d %B %Y %I:%M %p}", "sun 16 february 1997 1:05 PM")
+    assert result.named["dt"] == datetime(1997, 2, 16, 13, 5)
+    assert parse("{t:%H%M}", "930").named["t"] == time(9, 30)
+    assert parse("{d:%y-%j}", "24-060").named["d"] == date(2024, 2, 29)
+
+    dt = parse("{dt:%Y-%m-%d %H:%M %z}", "2023-11-21 13:23 -05:30").named["dt"]
+    assert dt.utcoffset() == timedelta(hours=-5, minutes=-30)
+    assert isinstance(dt.tzinfo, timezone)
+    assert parse("{dt:%Y-%m-%dT%H:%M%z}", "2023-11-21T13:23Z").named["dt"].tzinfo == timezone.utc
+
@@ -0,0 +1,120 @@
+"""Tests for datetime_output: datetime fields as epoch ints or ISO strings"""
+
+import pickle
+from datetime import time, timezone
+
+import pytest
+from formatparse import compile, findall, finditer, parse, parse_many, search
+
+SAMPLES = {
+    "ti": "2011-11-21T10:21:36.123456+10:00",
+    "te": "Mon, 21 Nov 2011 10:21:36 +1000",
+    "tg": "21/11/2011 10:21:36 PM +10:00",
+    "ta": "11/21/2011 10:21:36 PM -05:30",
+    "tc": "Mon Nov 21 10:21:36 2011",
+    "th": "21/Nov/2011:10:21:36 +1000",
+    "ts": "Nov 21 10:21:36",
+    "%Y-%m-%d %H:%M:%S.%f %z": "2011-11-21 10:21:36.5 -0200",
+}
+
+
+def as_utc(dt):
+    """The instant a parsed datetime stands for (naive values are UTC)"""
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+@pytest.mark.parametrize("spec", list(SAMPLES))
+def test_epoch_output(spec):
+    """Test epoch_s and epoch_ns give the instant of the datetime value"""
+    pattern = f"<{{dt:{spec}}}>"
+    value = f"<{SAMPLES[spec]}>"
+    expected = as_utc(parse(pattern, value)["dt"])
+    seconds = int(expected.timestamp())
+
+    assert parse(pattern, value, datetime_output="epoch_s")["dt"] == seconds
+    nanos = parse(pattern, value, datetime_output="epoch_ns")["dt"]
+    assert nanos == seconds * 1_000_000_000 + expected.microsecond * 1000
+
+
+@pytest.mark.parametrize("spec", list(SAMPLES))
+def test_iso_output(spec):
+    """Test iso gives the value in UTC, formatted like isoformat()"""
+    pattern = f"<{{dt:{spec}}}>"
+    value = f"<{SAMPLES[spec]}>"
+    dt = parse(pattern, value)["dt"]
+    expected = dt.isoformat() if dt.tzinfo is None else dt.astimezone(timezone.utc).isoformat()
+    assert parse(pattern, value, datetime_output="iso")["dt"] == expected
+
+
+def test_offsets_normalized_to_utc():
+    """Test values at different offsets for the same instant give the same output"""
+    text = "2011-11-21T10:21:36+10:00 2011-11-21T00:21:36Z 2011-11-20T19:21:36-05:00"
+    values = [r["dt"] for r in findall("{dt:ti}", text, datetime_output="epoch_s")]
+    assert values == [1321834896] * 3
+    iso = [r["dt"] for r in findall("{dt:ti}", text, datetime_output="iso")]
+    assert iso == ["2011-11-21T00:21:36+00:00"] * 3
+
+
+def test_dates_and_times():
+    """Test date-only strftime values, time-only values and the strptime fallback"""
+    assert parse("{d:%Y-%m-%d}", "2024-02-29", datetime_output="iso")["d"] == "2024-02-29"
+    assert parse("{d:%Y-%m-%d}", "1970-01-02", datetime_output="epoch_s")["d"] == 86400
+    assert parse("{d:ti}", "1970-01-02", datetime_output="epoch_s")["d"] == 86400
+    assert parse("{t:tt}", "10:21:36 PM", datetime_output="epoch_s")["t"] == time(22, 21, 36)
+    assert parse("{t:%H:%M}", "10:21", datetime_output="iso")["t"] == time(10, 21)
+    # %c isn't compiled, so this value goes through strptime
+    result = parse("{dt:%c}", "Mon Nov 21 10:21:36 2011", datetime_output="epoch_s")
+    assert result["dt"] == 1321870896
+
+
+def test_out_of_range_in_utc():
+    """Test values that leave years 1-9999 when moved to UTC raise OverflowError, like astimezone()"""
+    for value in ["9999-12-31T23:00:00-05:00", "0001-01-01T00:00:00+05:00"]:
+        with pytest.raises(OverflowError):
+            as_utc(parse("{dt:ti}", value)["dt"])
+        for output in ["iso", "epoch_s", "epoch_ns"]:
+            with pytest.raises(OverflowError):
+                parse("{dt:ti}", value, datetime_output=output)
+    last = "9999-12-31T18:59:59-05:00"
+    assert parse("{dt:ti}", last, datetime_output="iso")["dt"] == "9999-12-31T23:59:59+00:00"
+
+
+def test_compiled_parser_output():
+    """Test datetime_output set at compile time, and kept through pickling"""
+    parser = compile("[{ts:th}] {msg}", datetime_output="epoch_ns")
+    assert parser.datetime_output == "epoch_ns"
+    assert compile("[{ts:th}] {msg}").datetime_output == "datetime"
+
+    line = "[21/Nov/2011:10:21:36 +1000] GET /"
+    assert parser.parse(line)["ts"] == 1321834896 * 10**9
+    assert parser.search("x " + line)["ts"] == 1321834896 * 10**9
+    assert [r["ts"] for r in parser.parse_many([line, "bad"]) if r] == [1321834896 * 10**9]
+
+    restored = pickle.loads(pickle.dumps(parser))
+    assert restored.datetime_output == "epoch_ns"
+    assert restored.parse(line)["ts"] == 1321834896 * 10**9
+
+
+def test_per_call_output_and_cache():
+    """Test calls with different outputs for one pattern don't share cached parsers"""
+    line = "at 2011-11-21T10:21:36Z"
+    assert parse("at {dt:ti}", line, datetime_output="iso")["dt"] == "2011-11-21T10:21:36+00:00"
+    assert parse("at {dt:ti}", line)["dt"].year == 2011
+    assert search("{dt:ti}", line, datetime_output="epoch_s")["dt"] == 1321870896
+    assert next(finditer("{dt:ti}", line, datetime_output="epoch_s"))["dt"] == 1321870896
+    assert parse_many("at {dt:ti}", [line], datetime_output="iso")[0]["dt"].endswith("+00:00")
+
+
+def test_invalid_output():
+    """Test unknown datetime_output names and invalid dates are rejected"""
+    with pytest.raises(ValueError, match="datetime_output"):
+        parse("{dt:ti}", "2011-11-21", datetime_output="epoch")
+    with pytest.raises(ValueError, match="datetime_output"):
+        compile("{dt:ti}", datetime_output="unix")
+    # Like datetime objects, epoch values aren't made for dates that don't exist
+    try:
+        assert parse("{dt:ti}", "2023-02-30T10:30:00", datetime_output="epoch_s") is None
+    except ValueError:
+        pass
@@ -0,0 +1,89 @@
+"""Tests for field projection (compile(..., fields=...), parse(..., fields=...))"""
+
+import pickle
+
+import pytest
+from formatparse import compile, parse, with_pattern, FormatParser
+
+
+LOG_PATTERN = "{date} {time} [{level}] {host}:{port:d} {status:d} {msg}"
+LOG_LINE = "2024-01-01 12:00:00 [ERROR] web1:8080 500 disk full"
+
+
+def test_compile_fields_only_captures_selected():
+    """Test only the selected fields end up in the result"""
+    parser = compile(LOG_PATTERN, fields=["level", "status"])
+    result = parser.parse(LOG_LINE)
+    assert result is not None
+    assert result.named == {"level": "ERROR", "status": 500}
+    assert result.fixed == ()
+
+
+def test_compile_fields_spans_only_for_selected():
+    """Test spans are only recorded for the selected fields"""
+    result = compile(LOG_PATTERN, fields=["port"]).parse(LOG_LINE)
+    start = LOG_LINE.index("8080")
+    assert result.spans == {"port": (start, start + 4)}
+
+
+def test_unselected_fields_still_have_to_match():
+    """Test unselected fields keep constraining the match"""
+    parser = compile("{id:d}-{name}", fields=["name"])
+    assert parser.parse("12-abc").named == {"name": "abc"}
+    assert parser.parse("xy-abc") is None
+
+
+def test_projection_matches_full_parse():
+    """Test the selected values are the same as with a full parse"""
+    full = parse(LOG_PATTERN, LOG_LINE)
+    projected = parse(LOG_PATTERN, LOG_LINE, fields=["host", "msg"])
+    assert projected.named == {"host": full["host"], "msg": full["msg"]}
+
+
+def test_projection_drops_positional_fields():
+    """Test unnamed fields are not captured when a projection is given"""
+    result = parse("{} {name} {:d}", "a b 3", fields=["name"])
+    assert result.fixed == ()
+    assert result.named == {"name": "b"}
+
+
+def test_unknown_field_raises():
+    """Test selecting a field the pattern doesn't have raises ValueError"""
+    with pytest.raises(ValueError, match="'missing'"):
+        compile("{a} {b}", fields=["missing"])
+
+
+def test_nested_field_selected_by_top_level_name():
+    """Test dict-style fields can be selected by their top-level name"""
+    result = parse("{d[a]}/{d[b]}/{x}", "1/2/3", fields=["d"])
+    assert result.named == {"d": {"a": "1", "b": "2"}}
+
+
+def test_unselected_alignment_and_custom_groups():
+    """Test groups inside unselected fields don't shift the selected fields"""
+
+    @with_pattern(r"(\d+)\.(\d+)", regex_group_count=2)
+    def version(text):
+        return tuple(int(part) for part in text.split("."))
+
+    parser = FormatParser("{pad:>5}|{ver:Version}|{name}", {"Version": version}, ["name"])
+    assert parser.parse("   ab|1.2|tool").named == {"name": "tool"}
+
+
+def test_projection_with_parse_many():
+    """Test batch APIs of a projected parser only return the selected fields"""
+    parser = compile("{name}: {age:d} ({city})", fields=["age"])
+    results = parser.parse_many(["Alice: 30 (Paris)", "junk", "Bob: 25 (Rome)"])
+    assert [r.named if r else None for r in results] == [{"age": 30}, None, {"age": 25}]
+
+
+def test_projection_survives_pickle():
+    """Test a pickled projected parser keeps its projection"""
+    parser = pickle.loads(pickle.dumps(compile("{a} {b}", fields=["b"])))
+    assert parser.parse("x y").named == {"b": "y"}
+
+
+def test_parse_cache_keeps_projections_apart():
+    """Test parse() with and without fields doesn't share a cached parser"""
+    assert parse("{a} {b}", "x y", fields=["a"]).named == {"a": "x"}
+    assert parse("{a} {b}", "x y").named == {"a": "x", "b": "y"}
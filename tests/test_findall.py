@@ -1,3 +1,5 @@
+import pytest
+
 import formatparse as parse
 
 
@@ -159,3 +161,79 @@ def test_findall_performance_lazy():
     assert len(items) == 1000
     assert items[0] == 0
     assert items[999] == 999
+
+
+def _log_buffer(num_lines):
+    return "".join(
+        f"ts={i} level=INFO code={i % 500} user=u{i % 7}\n" for i in range(num_lines)
+    )
+
+
+def test_findall_parallel_matches_sequential():
+    """Test parallel findall returns the same matches and spans as sequential"""
+    text = _log_buffer(50000)
+    pattern = "code={code:d} user={user:w}"
+    sequential = parse.findall(pattern, text)
+    parallel = parse.findall(pattern, text, parallel=True)
+    assert len(parallel) == len(sequential) == 50000
+    for a, b in zip(sequential, parallel):
+        assert a.named == b.named
+        assert a.span == b.span
+        assert a.spans == b.spans
+
+
+def test_findall_parallel_absolute_spans():
+    """Test parallel findall spans index into the whole input"""
+    text = _log_buffer(50000)
+    results = parse.findall("ts={ts:d} ", text, parallel=True)
+    assert len(results) == 50000
+    last = results[-1]
+    assert last.named["ts"] == 49999
+    start, end = last.span
+    assert text[start:end] == "ts=49999 "
+
+
+def test_findall_parallel_small_input():
+    """Test parallel findall on input too small to split"""
+    results = parse.findall("ID:{id:d}", "ID:1 ID:2\nID:3", parallel=True)
+    assert [r.named["id"] for r in results] == [1, 2, 3]
+
+
+def test_findall_parallel_python_path():
+    """Test parallel findall with evaluate_result=False"""
+    text = _log_buffer(20000)
+    matches = parse.findall("code={code:d} ", text, evaluate_result=False, parallel=True)
+    assert len(matches) == 20000
+    assert matches[123].evaluate_result().named["code"] == 123
+
+
+def test_findall_columns():
+    """Test findall(columns=True) returns one column per field"""
+    columns = parse.findall("ID:{id:d} ", "ID:1 ID:2 ID:3 ", columns=True)
+    assert list(columns) == ["id"]
+    assert columns["id"].typecode == "q"
+    assert list(columns["id"]) == [1, 2, 3]
+
+
+def test_findall_columns_python_conversion():
+    """Test columns=True with custom types that need Python conversion"""
+
+    @parse.with_pattern(r"yes|no")
+    def parse_flag(text):
+        return text == "yes"
+
+    columns = parse.findall(
+        "[{flag:Flag} {when:ti}]",
+        "[yes 2024-01-15] [no 2024-02-01]",
+        {"Flag": parse_flag},
+        columns=True,
+    )
+    assert columns["flag"].typecode == "B"
+    assert list(columns["flag"]) == [1, 0]
+    assert [d.month for d in columns["when"]] == [1, 2]
+
+
+def test_findall_columns_requires_evaluate_result():
+    """Test columns=True can't be combined with evaluate_result=False"""
+    with pytest.raises(ValueError):
+        parse.findall("{}", "a", evaluate_result=False, columns=True)
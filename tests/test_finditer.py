@@ -0,0 +1,86 @@
+"""Tests for finditer (lazy match iteration)"""
+
+import itertools
+
+import formatparse as parse
+from formatparse import with_pattern
+
+
+def test_finditer_matches_findall():
+    """Test finditer yields the same matches as findall"""
+    pattern = "ID:{id:d}"
+    string = "ID:1 ID:2 junk ID:3"
+    lazy = [(r.named["id"], r.spans["id"]) for r in parse.finditer(pattern, string)]
+    eager = [(r.named["id"], r.spans["id"]) for r in parse.findall(pattern, string)]
+    assert lazy == eager == [(1, (3, 4)), (2, (8, 9)), (3, (18, 19))]
+
+
+def test_finditer_is_lazy():
+    """Test finditer can be consumed partially"""
+    string = " ".join(f"n={i}" for i in range(10000))
+    it = parse.finditer("n={:d}", string)
+    first = [r.fixed[0] for r in itertools.islice(it, 3)]
+    assert first == [0, 1, 2]
+    # The iterator resumes where it stopped
+    assert next(it).fixed[0] == 3
+
+
+def test_finditer_exhausted():
+    """Test the iterator stays exhausted once finished"""
+    it = parse.finditer("x={:d}", "x=1")
+    assert [r.fixed[0] for r in it] == [1]
+    assert list(it) == []
+
+
+def test_finditer_no_matches():
+    """Test finditer with no matches or an empty string"""
+    assert list(parse.finditer("ID:{id:d}", "no matches here")) == []
+    assert list(parse.finditer("ID:{id:d}", "")) == []
+
+
+def test_finditer_html():
+    """Test the findall HTML example"""
+    s = "".join(r.fixed[0] for r in parse.finditer(">{}<", "<p>some <b>bold</b> text</p>"))
+    assert s == "some bold text"
+
+
+def test_finditer_case_sensitivity():
+    """Test case_sensitive is honoured"""
+    assert [r.fixed[0] for r in parse.finditer("x({})x", "X(hi)X")] == ["hi"]
+    assert list(parse.finditer("x({})x", "X(hi)X", case_sensitive=True)) == []
+
+
+def test_finditer_no_evaluate_result():
+    """Test finditer yields Match objects when evaluate_result is False"""
+    matches = list(parse.finditer("<{}>", "<a><b>", evaluate_result=False))
+    assert [m.evaluate_result().fixed[0] for m in matches] == ["a", "b"]
+
+
+def test_finditer_unicode():
+    """Test spans are correct after multi-byte characters"""
+    results = list(parse.finditer("[{}]", "é[a] ü[b]"))
+    assert [r.fixed[0] for r in results] == ["a", "b"]
+
+
+def test_finditer_custom_types():
+    """Test custom type converters are applied"""
+
+    @with_pattern(r"\d+")
+    def parse_number(text):
+        return int(text) * 2
+
+    results = parse.finditer("<{:Number}>", "<1> <2>", {"Number": parse_number})
+    assert [r.fixed[0] for r in results] == [2, 4]
+
+
+def test_finditer_datetime():
+    """Test datetime fields go through the Python conversion path"""
+    results = list(parse.finditer("at {:ti};", "at 2024-01-15T10:30:00; at 2024-02-01;"))
+    assert [r.fixed[0].month for r in results] == [1, 2]
+
+
+def test_formatparser_finditer():
+    """Test FormatParser.finditer"""
+    parser = parse.compile("{key}={value:d};")
+    results = parser.finditer("a=1;b=2;")
+    assert [(r.named["key"], r.named["value"]) for r in results] == [("a", 1), ("b", 2)]
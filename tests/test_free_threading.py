@@ -0,0 +1,111 @@
+"""Stress tests for sharing parsers between threads (free-threaded Python runs them without a GIL)"""
+
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import formatparse
+from formatparse import compile, findall, parse, PatternSet
+
+
+NUM_THREADS = 16
+ITERATIONS = 500
+LOG_PATTERN = "{host} [{level}] {status:d} {took:f}ms"
+
+
+def run_in_threads(work, num_threads=NUM_THREADS):
+    """Run work(thread_index) on every thread at once and return the results"""
+    barrier = threading.Barrier(num_threads)
+
+    def start(index):
+        barrier.wait()
+        return work(index)
+
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        return list(pool.map(start, range(num_threads)))
+
+
+@pytest.mark.skipif(
+    not hasattr(sys, "_is_gil_enabled"), reason="requires Python 3.13+"
+)
+def test_import_keeps_gil_disabled():
+    """Test importing the extension doesn't turn the GIL back on (free-threaded builds)"""
+    import sysconfig
+
+    if not sysconfig.get_config_var("Py_GIL_DISABLED"):
+        pytest.skip("requires a free-threaded build")
+    assert formatparse is not None
+    assert not sys._is_gil_enabled()
+
+
+def test_shared_compiled_parser():
+    """Test one compiled parser used from many threads at once"""
+    parser = compile(LOG_PATTERN)
+
+    def work(index):
+        for i in range(ITERATIONS):
+            result = parser.parse(f"web{index} [INFO] {i} 1.5ms")
+            assert result["host"] == f"web{index}"
+            assert result["status"] == i
+        return index
+
+    assert run_in_threads(work) == list(range(NUM_THREADS))
+
+
+def test_shared_parser_batch_methods():
+    """Test batch methods of one shared parser from many threads"""
+    parser = compile(LOG_PATTERN)
+    lines = [f"web{i} [WARN] {i} 2.0ms" for i in range(200)]
+
+    def work(index):
+        for _ in range(20):
+            results = parser.parse_many(lines)
+            assert [r["status"] for r in results] == list(range(200))
+            assert len(list(parser.finditer("\n".join(lines)))) == 200
+        return True
+
+    assert all(run_in_threads(work))
+
+
+def test_shared_results_object():
+    """Test one Results object converted and indexed from many threads"""
+    results = findall("{n:d},", ",".join(str(i) for i in range(1000)) + ",")
+
+    def work(index):
+        values = [r["n"] for r in results]
+        assert values == list(range(1000))
+        assert results[index]["n"] == index
+        return results.to_list()
+
+    lists = run_in_threads(work)
+    # Every thread sees the same converted list
+    assert all(current is lists[0] for current in lists)
+
+
+def test_module_functions_and_cache():
+    """Test module-level functions (and the pattern cache) from many threads"""
+    patterns = [f"id{i}={{value:d}}" for i in range(50)]
+
+    def work(index):
+        for i in range(ITERATIONS):
+            pattern_index = (index + i) % len(patterns)
+            result = parse(patterns[pattern_index], f"id{pattern_index}={i}")
+            assert result["value"] == i
+        return True
+
+    assert all(run_in_threads(work))
+
+
+def test_shared_pattern_set():
+    """Test one PatternSet used from many threads"""
+    patterns = PatternSet(["GET {path}", "POST {path} {size:d}"])
+
+    def work(index):
+        for i in range(ITERATIONS):
+            match_index, result = patterns.parse(f"POST /upload/{index} {i}")
+            assert match_index == 1
+            assert result["size"] == i
+        return True
+
+    assert all(run_in_threads(work))
@@ -0,0 +1,65 @@
+"""Tests for FormatParser.matches() and FormatParser.match_mask()"""
+
+import pytest
+from formatparse import FormatParser, compile
+
+LINES = ["GET /a 200", "POST /b 500", "garbage", "GET /c 20x", "get /d 404"]
+
+
+def test_matches_agrees_with_parse():
+    """Test matches() is True exactly for the strings parse() matches"""
+    for engine in ("auto", "regex"):
+        parser = compile("{method} {path} {status:d}", engine=engine)
+        for line in LINES:
+            assert parser.matches(line) == (parser.parse(line) is not None), line
+
+
+def test_matches_is_anchored_and_case_sensitive_option():
+    """Test matches() needs the whole string to match, like parse()"""
+    parser = compile("ERROR {code:d}")
+    assert parser.matches("ERROR 5")
+    assert parser.matches("error 5")
+    assert not parser.matches("error 5", case_sensitive=True)
+    assert not parser.matches("x ERROR 5")
+    assert not parser.matches("ERROR 5 x")
+
+
+def test_matches_skips_conversion():
+    """Test matches() doesn't run custom converters"""
+    calls = []
+
+    def convert(text):
+        calls.append(text)
+        return text
+
+    convert.pattern = r"\d+"
+    parser = FormatParser("id={:Id}", {"Id": convert})
+    assert parser.matches("id=42")
+    assert calls == []
+
+
+def test_match_mask_bytearray():
+    """Test match_mask() returns one 0/1 byte per input, in order"""
+    parser = compile("{method} {path} {status:d}")
+    mask = parser.match_mask(LINES)
+    assert isinstance(mask, bytearray)
+    assert list(mask) == [1, 1, 0, 0, 1]
+    assert list(parser.match_mask(LINES, case_sensitive=True)) == [1, 1, 0, 0, 1]
+    assert parser.match_mask([]) == bytearray()
+    assert sum(compile("GET {} {:d}").match_mask(LINES, case_sensitive=True)) == 1
+
+
+def test_match_mask_rejects_null_bytes():
+    """Test match_mask() validates its inputs like parse_many()"""
+    with pytest.raises(ValueError, match="null byte"):
+        compile("{}").match_mask(["ok", "bad\0"])
+
+
+def test_match_mask_numpy():
+    """Test as_numpy=True returns a bool array usable as a mask"""
+    np = pytest.importorskip("numpy")
+    parser = compile("{method} {path} {status:d}")
+    mask = parser.match_mask(LINES, as_numpy=True)
+    assert mask.dtype == np.bool_
+    assert mask.tolist() == [True, True, False, False, True]
+    assert np.array(LINES)[mask].tolist() == ["GET /a 200", "POST /b 500", "get /d 404"]
@@ -0,0 +1,107 @@
+"""Tests for NumPy structured-array output (Results.to_numpy, parse_many(as_numpy=True))"""
+
+import math
+
+import pytest
+from formatparse import findall, parse_many, compile, with_pattern
+
+np = pytest.importorskip("numpy")
+
+
+def test_to_numpy_dtype_from_field_types():
+    """Test the dtype has one field per numeric field, typed from the format spec"""
+    results = findall("<{name} {count:d} {ratio:f} {pct:%}>", "<a 1 0.5 50%> <b 2 1.5 25%>")
+    array = results.to_numpy()
+    assert array.dtype == np.dtype([("count", "i8"), ("ratio", "f8"), ("pct", "f8")])
+    assert array["count"].tolist() == [1, 2]
+    assert array["ratio"].tolist() == [0.5, 1.5]
+    assert array["pct"].tolist() == [0.5, 0.25]
+
+
+def test_to_numpy_positional_fields():
+    """Test positional fields are named by their index"""
+    array = findall("({:d},{:e})", "(1,1e3) (2,2.5e-1)").to_numpy()
+    assert array.dtype.names == ("0", "1")
+    assert array["0"].tolist() == [1, 2]
+    assert array["1"].tolist() == [1000.0, 0.25]
+
+
+def test_to_numpy_empty():
+    """Test no matches gives an empty array with the full dtype"""
+    array = findall("ID:{id:d}", "nothing").to_numpy()
+    assert array.shape == (0,)
+    assert array.dtype.names == ("id",)
+
+
+def test_parse_many_as_numpy_unmatched_rows():
+    """Test unmatched strings become rows of missing values (0 / NaN)"""
+    array = parse_many("{n:d} {x:f}", ["1 0.5", "junk", "3 2.5"], as_numpy=True)
+    assert array.shape == (3,)
+    assert array["n"].tolist() == [1, 0, 3]
+    assert array["x"][0] == 0.5
+    assert math.isnan(array["x"][1])
+
+
+def test_parse_many_as_numpy_general_number():
+    """Test 'g' fields hold ints and floats in a float64 field"""
+    array = parse_many("{:g}", ["1", "2.5"], as_numpy=True)
+    assert array["0"].tolist() == [1.0, 2.5]
+
+
+def test_parse_many_out_buffer_reused():
+    """Test out= is filled in place and a view of the written rows is returned"""
+    parser = compile("{n:d}")
+    out = np.zeros(5, dtype=[("n", "i8")])
+    view = parser.parse_many(["1", "2", "3"], as_numpy=True, out=out)
+    assert view.shape == (3,)
+    assert np.shares_memory(view, out)
+    assert out["n"].tolist() == [1, 2, 3, 0, 0]
+
+    parser.parse_many(["7", "8"], as_numpy=True, out=out)
+    assert out["n"].tolist() == [7, 8, 3, 0, 0]
+
+
+def test_parse_many_out_wrong_dtype():
+    """Test out= with the wrong dtype raises ValueError"""
+    out = np.zeros(2, dtype=[("n", "f8")])
+    with pytest.raises(ValueError):
+        parse_many("{n:d}", ["1"], as_numpy=True, out=out)
+
+
+def test_parse_many_out_too_small():
+    """Test out= with too few rows raises ValueError"""
+    out = np.zeros(1, dtype=[("n", "i8")])
+    with pytest.raises(ValueError):
+        parse_many("{n:d}", ["1", "2"], as_numpy=True, out=out)
+
+
+def test_parse_many_out_requires_as_numpy():
+    """Test out= without as_numpy=True raises ValueError"""
+    out = np.zeros(1, dtype=[("n", "i8")])
+    with pytest.raises(ValueError):
+        parse_many("{n:d}", ["1"], out=out)
+
+
+def test_parse_many_as_numpy_conflicting_options():
+    """Test as_numpy can't be combined with columns or evaluate_result=False"""
+    with pytest.raises(ValueError):
+        parse_many("{n:d}", ["1"], as_numpy=True, columns=True)
+    with pytest.raises(ValueError):
+        parse_many("{n:d}", ["1"], as_numpy=True, evaluate_result=False)
+
+
+def test_parse_many_as_numpy_python_conversion():
+    """Test patterns that need Python conversion produce the same array"""
+
+    @with_pattern(r"[a-z]+")
+    def parse_word(text):
+        return text.upper()
+
+    array = parse_many(
+        "{w:Word} {n:d} {when:ti}",
+        ["a 1 2024-01-01", "b 2 2024-01-02"],
+        {"Word": parse_word},
+        as_numpy=True,
+    )
+    assert array.dtype.names == ("n",)
+    assert array["n"].tolist() == [1, 2]
@@ -0,0 +1,132 @@
+"""Tests for parse_file (streaming file parsing in Rust)"""
+
+import pytest
+from formatparse import parse_file, compile, with_pattern
+
+
+@pytest.fixture
+def log_file(tmp_path):
+    path = tmp_path / "app.log"
+    path.write_text(
+        "INFO: started\n"
+        "garbage line\n"
+        "WARN: disk almost full\r\n"
+        "\n"
+        "ERROR: crashed\n",
+        encoding="utf-8",
+    )
+    return path
+
+
+def _flatten(batches):
+    return [result for batch in batches for result in batch]
+
+
+def test_parse_file_basic(log_file):
+    """Test matched lines are yielded in file order, unmatched lines skipped"""
+    results = _flatten(parse_file("{level}: {message}", log_file))
+    assert [r.named["level"] for r in results] == ["INFO", "WARN", "ERROR"]
+    assert [r.named["message"] for r in results] == [
+        "started",
+        "disk almost full",
+        "crashed",
+    ]
+
+
+def test_parse_file_accepts_str_path(log_file):
+    """Test the path can be given as a str"""
+    results = _flatten(parse_file("{level}: {message}", str(log_file)))
+    assert len(results) == 3
+
+
+def test_parse_file_include_unmatched(log_file):
+    """Test include_unmatched reports None for every unmatched line"""
+    results = _flatten(
+        parse_file("{level}: {message}", log_file, include_unmatched=True)
+    )
+    assert len(results) == 5
+    assert results[1] is None
+    assert results[3] is None
+    assert results[4].named["level"] == "ERROR"
+
+
+def test_parse_file_batches(tmp_path):
+    """Test lines are yielded in batches of batch_size"""
+    path = tmp_path / "numbers.log"
+    path.write_text("".join(f"n={i}\n" for i in range(25)), encoding="utf-8")
+    batches = list(parse_file("n={n:d}", path, batch_size=10))
+    assert [len(batch) for batch in batches] == [10, 10, 5]
+    assert [r.named["n"] for r in _flatten(batches)] == list(range(25))
+
+
+def test_parse_file_skips_empty_batches(tmp_path):
+    """Test batches without any match are not yielded"""
+    path = tmp_path / "sparse.log"
+    lines = ["noise"] * 30
+    lines[25] = "n=7"
+    path.write_text("\n".join(lines), encoding="utf-8")
+    batches = list(parse_file("n={n:d}", path, batch_size=10))
+    assert len(batches) == 1
+    assert batches[0][0].named["n"] == 7
+
+
+def test_parse_file_spans_are_per_line(log_file):
+    """Test spans are relative to the start of each line"""
+    results = _flatten(parse_file("{level}: {message}", log_file))
+    assert results[1].spans["level"] == (0, 4)
+
+
+def test_parse_file_empty_file(tmp_path):
+    """Test an empty file yields nothing"""
+    path = tmp_path / "empty.log"
+    path.write_text("", encoding="utf-8")
+    assert list(parse_file("{}", path)) == []
+
+
+def test_parse_file_missing_file(tmp_path):
+    """Test a missing file raises FileNotFoundError immediately"""
+    with pytest.raises(FileNotFoundError):
+        parse_file("{}", tmp_path / "missing.log")
+
+
+def test_parse_file_invalid_batch_size(log_file):
+    """Test batch_size must be positive"""
+    with pytest.raises(ValueError):
+        parse_file("{}", log_file, batch_size=0)
+
+
+def test_parse_file_invalid_utf8(tmp_path):
+    """Test invalid UTF-8 raises ValueError naming the line"""
+    path = tmp_path / "binary.log"
+    path.write_bytes(b"ok\n\xff\xfe\n")
+    with pytest.raises(ValueError, match="Line 2"):
+        list(parse_file("{}", path))
+
+
+def test_parse_file_datetime_fallback(tmp_path):
+    """Test datetime fields go through the Python conversion path"""
+    path = tmp_path / "dates.log"
+    path.write_text("at 2024-01-15T10:30:00\nat nothing\n", encoding="utf-8")
+    results = _flatten(parse_file("at {when:ti}", path))
+    assert len(results) == 1
+    assert results[0].named["when"].year == 2024
+
+
+def test_parse_file_custom_types(tmp_path):
+    """Test custom type converters are applied"""
+
+    @with_pattern(r"\d+")
+    def parse_number(text):
+        return int(text)
+
+    path = tmp_path / "custom.log"
+    path.write_text("x=1\nx=2\n", encoding="utf-8")
+    results = _flatten(parse_file("x={:Number}", path, {"Number": parse_number}))
+    assert [r.fixed[0] for r in results] == [1, 2]
+
+
+def test_formatparser_parse_file(log_file):
+    """Test FormatParser.parse_file uses the compiled pattern"""
+    parser = compile("{level}: {message}")
+    results = _flatten(parser.parse_file(log_file))
+    assert [r.named["level"] for r in results] == ["INFO", "WARN", "ERROR"]
@@ -0,0 +1,140 @@
+"""Tests for parse_many (batch parsing with the GIL released)"""
+
+import pytest
+from formatparse import parse, parse_many, compile, with_pattern
+
+
+def test_parse_many_basic():
+    """Test parse_many returns one result per input, in order"""
+    results = parse_many("{name}: {age:d}", ["Alice: 30", "Bob: 25", "Carol: 41"])
+    assert len(results) == 3
+    assert [r.named["name"] for r in results] == ["Alice", "Bob", "Carol"]
+    assert [r.named["age"] for r in results] == [30, 25, 41]
+
+
+def test_parse_many_unmatched_is_none():
+    """Test strings that don't match produce None at their position"""
+    results = parse_many("{name}: {age:d}", ["Alice: 30", "invalid", "Bob: 25"])
+    assert len(results) == 3
+    assert results[0].named["name"] == "Alice"
+    assert results[1] is None
+    assert results[2].named["name"] == "Bob"
+    assert list(results)[1] is None
+
+
+def test_parse_many_empty_input():
+    """Test parse_many with no strings"""
+    results = parse_many("{name}: {age:d}", [])
+    assert len(results) == 0
+    assert list(results) == []
+
+
+def test_parse_many_matches_parse():
+    """Test parse_many gives the same results as calling parse() per string"""
+    pattern = "{:d} {name} {value:f} {flag:b}"
+    strings = ["1 alpha 1.5 true", "2 beta -0.25 no", "x gamma 3.0 yes", "4 delta 2.5 on"]
+    results = parse_many(pattern, strings)
+    for string, result in zip(strings, results):
+        expected = parse(pattern, string)
+        if expected is None:
+            assert result is None
+        else:
+            assert result.fixed == expected.fixed
+            assert result.named == expected.named
+            assert result.spans == expected.spans
+
+
+def test_parse_many_large_batch():
+    """Test order is preserved for a batch large enough to be split across threads"""
+    strings = [f"ID:{i}" for i in range(10000)]
+    results = parse_many("ID:{id:d}", strings)
+    assert len(results) == 10000
+    assert [r.named["id"] for r in results] == list(range(10000))
+
+
+def test_parse_many_accepts_iterables():
+    """Test parse_many accepts tuples and generators"""
+    results = parse_many("ID:{id:d}", ("ID:1", "ID:2"))
+    assert [r.named["id"] for r in results] == [1, 2]
+    results = parse_many("ID:{id:d}", (f"ID:{i}" for i in range(3)))
+    assert [r.named["id"] for r in results] == [0, 1, 2]
+
+
+def test_parse_many_case_sensitive():
+    """Test case sensitivity matches parse() defaults"""
+    assert parse_many("x{}x", ["X1X"])[0].fixed == ("1",)
+    assert parse_many("x{}x", ["X1X"], case_sensitive=True)[0] is None
+
+
+def test_parse_many_datetime_fallback():
+    """Test datetime fields are converted through the Python path"""
+    results = parse_many("{dt:ti}", ["2024-01-15T10:30:00", "not a date"])
+    assert len(results) == 2
+    assert results[0].named["dt"].year == 2024
+    assert results[1] is None
+
+
+def test_parse_many_custom_types():
+    """Test custom type converters are applied to every string"""
+
+    @with_pattern(r"\d+")
+    def parse_number(text):
+        return int(text) * 2
+
+    results = parse_many("{:Number}", ["1", "21", "x"], {"Number": parse_number})
+    assert results[0].fixed == (2,)
+    assert results[1].fixed == (42,)
+    assert results[2] is None
+
+
+def test_parse_many_evaluate_result_false():
+    """Test evaluate_result=False returns Match objects"""
+    results = parse_many("{name}: {age:d}", ["Alice: 30"], evaluate_result=False)
+    assert results[0].evaluate_result().named["age"] == 30
+
+
+def test_parse_many_null_byte_raises():
+    """Test strings with null bytes raise like parse()"""
+    with pytest.raises(ValueError, match="null byte"):
+        parse_many("{name}", ["ok", "bad\x00string"])
+
+
+def test_parse_many_rejects_non_string_items():
+    """Test non-string items raise TypeError"""
+    with pytest.raises(TypeError):
+        parse_many("{name}", ["ok", 42])
+
+
+def test_formatparser_parse_many():
+    """Test FormatParser.parse_many uses the compiled pattern"""
+    parser = compile("{name}: {age:d}")
+    results = parser.parse_many(["Alice: 30", "nope", "Bob: 25"])
+    assert results[0].named["age"] == 30
+    assert results[1] is None
+    assert results[2].named["age"] == 25
+
+
+def test_parse_many_rejects_single_string():
+    """Test passing a single str instead of a list raises TypeError"""
+    with pytest.raises(TypeError):
+        parse_many("{}", "abc")
+
+
+def test_parse_many_columns():
+    """Test parse_many(columns=True) keeps one row per input string"""
+    columns = parse_many("{name}: {age:d}", ["Alice: 30", "nope", "Bob: 25"], columns=True)
+    assert columns["name"] == ["Alice", None, "Bob"]
+    # A column with unmatched rows can't be an array
+    assert columns["age"] == [30, None, 25]
+
+    columns = parse_many("{name}: {age:d}", ["Alice: 30", "Bob: 25"], columns=True)
+    assert columns["age"].typecode == "q"
+    assert list(columns["age"]) == [30, 25]
+
+
+def test_formatparser_parse_many_columns():
+    """Test FormatParser.parse_many(columns=True)"""
+    parser = compile("{:d},{:f}")
+    columns = parser.parse_many(["1,0.5", "2,1.5"], columns=True)
+    assert list(columns[0]) == [1, 2]
+    assert columns[1].typecode == "d"
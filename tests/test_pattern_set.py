@@ -0,0 +1,132 @@
+"""Tests for PatternSet (matching many patterns in one pass)"""
+
+import pytest
+from formatparse import PatternSet, FormatParser, with_pattern
+
+
+PATTERNS = [
+    "GET {path} {status:d}",
+    "POST {path} {status:d}",
+    "{method} {path} {status:d}",
+    "ERROR: {message}",
+]
+
+
+def test_pattern_set_parse():
+    """Test parse returns the index of the matching pattern with its result"""
+    patterns = PatternSet(PATTERNS)
+    index, result = patterns.parse("POST /login 302")
+    assert index == 1
+    assert result.named == {"path": "/login", "status": 302}
+
+    index, result = patterns.parse("ERROR: disk full")
+    assert index == 3
+    assert result.named["message"] == "disk full"
+
+
+def test_pattern_set_first_match_wins():
+    """Test the first pattern in list order is used when several match"""
+    patterns = PatternSet(PATTERNS)
+    index, result = patterns.parse("GET /index 200")
+    assert index == 0
+    assert "method" not in result.named
+
+    index, result = patterns.parse("PUT /index 201")
+    assert index == 2
+    assert result.named["method"] == "PUT"
+
+
+def test_pattern_set_no_match():
+    """Test parse returns None when no pattern matches"""
+    patterns = PatternSet(PATTERNS)
+    assert patterns.parse("nothing to see") is None
+    assert patterns.parse("") is None
+
+
+def test_pattern_set_matches():
+    """Test matches lists every matching pattern index"""
+    patterns = PatternSet(PATTERNS)
+    assert patterns.matches("GET /index 200") == [0, 2]
+    assert patterns.matches("nothing to see") == []
+
+
+def test_pattern_set_conversion_rejects_fall_through():
+    """Test a pattern rejected during conversion falls through to the next one"""
+    # Repeated names must capture equal values, which is only checked after matching
+    patterns = PatternSet(["{x}-{x}", "{a}-{b}"])
+    assert patterns.parse("1-1")[0] == 0
+    index, result = patterns.parse("1-2")
+    assert index == 1
+    assert result.named == {"a": "1", "b": "2"}
+
+
+def test_pattern_set_case_sensitivity():
+    """Test case_sensitive is honoured"""
+    patterns = PatternSet(["error: {}"])
+    assert patterns.parse("ERROR: x")[0] == 0
+    assert patterns.parse("ERROR: x", case_sensitive=True) is None
+    assert patterns.matches("ERROR: x", case_sensitive=True) == []
+
+
+def test_pattern_set_case_insensitive_many_patterns():
+    """Test case-insensitive matching with a large set (the default case_sensitive=False)"""
+    patterns = PatternSet([f"event{i} {{user}} {{count:d}} {{path:S}}" for i in range(300)])
+    index, result = patterns.parse("EVENT299 Bob 3 /x")
+    assert index == 299
+    assert result.named == {"user": "Bob", "count": 3, "path": "/x"}
+    assert patterns.matches("Event7 bob 3 /x") == [7]
+    assert patterns.matches("Event7 bob 3 /x", case_sensitive=True) == []
+
+
+def test_pattern_set_same_as_parse():
+    """Test results match FormatParser.parse for the chosen pattern"""
+    patterns = PatternSet(PATTERNS)
+    line = "DELETE /item/7 204"
+    index, result = patterns.parse(line)
+    expected = patterns.parser(index).parse(line)
+    assert result.named == expected.named
+    assert result.spans == expected.spans
+
+
+def test_pattern_set_no_evaluate_result():
+    """Test evaluate_result=False returns a Match object"""
+    patterns = PatternSet(PATTERNS)
+    index, match = patterns.parse("GET /a 200", evaluate_result=False)
+    assert index == 0
+    assert match.evaluate_result().named["status"] == 200
+
+
+def test_pattern_set_custom_types():
+    """Test extra_types are used by all patterns"""
+
+    @with_pattern(r"[A-Z]{3}")
+    def parse_code(text):
+        return text.lower()
+
+    patterns = PatternSet(["code {:Code}", "id {:d}"], {"Code": parse_code})
+    assert patterns.parse("code ABC")[1].fixed == ("abc",)
+    assert patterns.parse("id 5")[0] == 1
+
+
+def test_pattern_set_introspection():
+    """Test len, patterns and parser"""
+    patterns = PatternSet(PATTERNS)
+    assert len(patterns) == 4
+    assert patterns.patterns == PATTERNS
+    assert isinstance(patterns.parser(0), FormatParser)
+    assert patterns.parser(0).pattern == PATTERNS[0]
+    with pytest.raises(IndexError):
+        patterns.parser(4)
+
+
+def test_pattern_set_empty():
+    """Test an empty set never matches"""
+    patterns = PatternSet([])
+    assert len(patterns) == 0
+    assert patterns.parse("anything") is None
+
+
+def test_pattern_set_invalid_pattern():
+    """Test an invalid pattern raises when the set is built"""
+    with pytest.raises(ValueError):
+        PatternSet(["{name}", "{unclosed"])
@@ -5,8 +5,24 @@ Run with: pytest tests/test_performance.py --benchmark-only
 Run without benchmarks: pytest tests/test_performance.py --benchmark-skip
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
 import pytest
-from formatparse import parse, search, findall, compile, BidirectionalPattern
+from formatparse import (
+    parse,
+    search,
+    findall,
+    finditer,
+    parse_many,
+    compile,
+    BidirectionalPattern,
+    PatternSet,
+    cache_info,
+    set_cache_size,
+    clear_cache,
+    with_pattern,
+)
 
 
 @pytest.mark.benchmark
@@ -79,6 +95,205 @@ def test_findall_operation(benchmark):
     assert len(results) == 100
 
 
+LOG_BUFFER = "".join(
+    f"10.0.0.{i % 256} - [INFO] request {i} served code={i % 600}\n"
+    for i in range(100000)
+)
+
+
+@pytest.mark.benchmark(group="findall-large-buffer")
+def test_findall_large_buffer_sequential(benchmark):
+    """Benchmark: findall over a multi-megabyte log buffer on one thread"""
+    results = benchmark(findall, "served code={code:d}", LOG_BUFFER)
+    assert len(results) == 100000
+
+
+@pytest.mark.benchmark(group="findall-large-buffer")
+def test_findall_large_buffer_parallel(benchmark):
+    """Benchmark: findall over a multi-megabyte log buffer split across cores"""
+    results = benchmark(
+        findall, "served code={code:d}", LOG_BUFFER, parallel=True
+    )
+    assert len(results) == 100000
+
+
+@pytest.mark.benchmark(group="columnar")
+def test_findall_to_columns_via_results(benchmark):
+    """Benchmark: building columns from ParseResult objects in Python"""
+
+    def run():
+        results = findall("served code={code:d}", LOG_BUFFER)
+        return [r.named["code"] for r in results]
+
+    codes = benchmark(run)
+    assert len(codes) == 100000
+
+
+@pytest.mark.benchmark(group="columnar")
+def test_findall_columns(benchmark):
+    """Benchmark: findall(columns=True) building columns from raw data"""
+    columns = benchmark(findall, "served code={code:d}", LOG_BUFFER, columns=True)
+    assert len(columns["code"]) == 100000
+
+
+@pytest.mark.benchmark(group="where")
+def test_findall_filter_in_python(benchmark):
+    """Benchmark: keeping code >= 500 by filtering findall results in Python"""
+
+    def run():
+        results = findall("served code={code:d}", LOG_BUFFER)
+        return [r for r in results if r.named["code"] >= 500]
+
+    kept = benchmark(run)
+    assert len(kept) == 16600
+
+
+@pytest.mark.benchmark(group="where")
+def test_findall_where(benchmark):
+    """Benchmark: keeping code >= 500 with where= (filtered in Rust)"""
+    kept = benchmark(
+        findall, "served code={code:d}", LOG_BUFFER, where=[("code", ">=", 500)]
+    )
+    assert len(kept) == 16600
+
+
+# Sparse-hit logs: one line in 1000 has the pattern's literal text, so most input is
+# rejected by the literal prefilter before the regex runs
+SPARSE_LINES = [
+    f"2024-01-01 12:00:{i % 60:02d} [ERROR] code={i}: disk full"
+    if i % 1000 == 0
+    else f"2024-01-01 12:00:{i % 60:02d} [INFO] request {i} served"
+    for i in range(100000)
+]
+SPARSE_BUFFER = "\n".join(SPARSE_LINES)
+SPARSE_PATTERN = "[ERROR] code={code:d}: {msg}"
+
+
+@pytest.mark.benchmark(group="sparse-hits")
+def test_parse_many_sparse_hits(benchmark):
+    """Benchmark: parse_many over 100k lines where 0.1% contain the pattern's literals"""
+    results = benchmark(parse_many, "{date} {time} " + SPARSE_PATTERN, SPARSE_LINES)
+    assert sum(r is not None for r in results) == 100
+
+
+@pytest.mark.benchmark(group="sparse-hits")
+def test_search_sparse_misses(benchmark):
+    """Benchmark: search() on lines without the literal (rejected without running the regex)"""
+    parser = compile(SPARSE_PATTERN)
+    lines = SPARSE_LINES[1:1000]
+
+    def run():
+        return sum(parser.search(line, case_sensitive=True) is not None for line in lines)
+
+    assert benchmark(run) == 0
+
+
+@pytest.mark.benchmark(group="sparse-hits")
+def test_findall_sparse_hits(benchmark):
+    """Benchmark: findall over a 100k-line buffer with 100 matches"""
+    results = benchmark(findall, "code={code:d}:", SPARSE_BUFFER)
+    assert len(results) == 100
+
+
+@pytest.mark.benchmark(group="first-matches")
+def test_findall_first_matches(benchmark):
+    """Benchmark: first 100 matches of a large buffer with findall"""
+    results = benchmark(lambda: findall("served code={code:d}", LOG_BUFFER)[:100])
+    assert len(results) == 100
+
+
+@pytest.mark.benchmark(group="first-matches")
+def test_finditer_first_matches(benchmark):
+    """Benchmark: first 100 matches of a large buffer with lazy finditer"""
+    results = benchmark(
+        lambda: list(islice(finditer("served code={code:d}", LOG_BUFFER), 100))
+    )
+    assert len(results) == 100
+
+
+@pytest.mark.benchmark
+def test_parse_many_operation(benchmark):
+    """Benchmark: Batch parsing of many lines in parallel"""
+    pattern = "{ip} - [{level}] {message} ({code:d})"
+    lines = [f"10.0.0.{i % 256} - [INFO] request {i} served ({i})" for i in range(10000)]
+    results = benchmark(parse_many, pattern, lines)
+    assert len(results) == 10000
+    assert results[-1].named["code"] == 9999
+
+
+MANY_PATTERNS = [f"event{i} user={{user}} value={{value:d}}" for i in range(300)]
+
+
+@pytest.mark.benchmark(group="many-patterns")
+def test_many_patterns_sequential(benchmark):
+    """Benchmark: trying 300 compiled patterns in turn on one line"""
+    parsers = [compile(p) for p in MANY_PATTERNS]
+    line = "event299 user=alice value=42"
+
+    def run():
+        for index, parser in enumerate(parsers):
+            result = parser.parse(line)
+            if result is not None:
+                return index, result
+
+    index, result = benchmark(run)
+    assert index == 299
+
+
+@pytest.mark.benchmark(group="many-patterns")
+def test_many_patterns_pattern_set(benchmark):
+    """Benchmark: matching one line against 300 patterns with a PatternSet"""
+    patterns = PatternSet(MANY_PATTERNS)
+    index, result = benchmark(patterns.parse, "event299 user=alice value=42")
+    assert index == 299
+    assert result.named["value"] == 42
+
+
+# Pattern cache sizing: parse() cycling through 2000 distinct patterns. A cache
+# smaller than the working set recompiles on every call (LRU order), a larger one
+# only compiles each pattern once.
+CACHE_PATTERNS = [f"req{i} user={{user}} code={{code:d}}" for i in range(2000)]
+
+
+@pytest.fixture
+def restore_cache_size():
+    maxsize = cache_info().maxsize
+    yield
+    set_cache_size(maxsize)
+    clear_cache()
+
+
+@pytest.mark.benchmark(group="pattern-cache")
+@pytest.mark.parametrize("cache_size", [100, 1000, 5000])
+def test_parse_pattern_cache_size(benchmark, restore_cache_size, cache_size):
+    """Benchmark: parse() over 2000 distinct patterns with different cache sizes"""
+    set_cache_size(cache_size)
+    clear_cache()
+
+    def run():
+        for index, pattern in enumerate(CACHE_PATTERNS):
+            parse(pattern, f"req{index} user=alice code=200")
+
+    benchmark(run)
+    info = cache_info()
+    if cache_size >= len(CACHE_PATTERNS):
+        assert info.misses == len(CACHE_PATTERNS)
+    else:
+        assert info.evictions > 0
+
+
+@with_pattern(r"\d+")
+def _hex_id(text):
+    return int(text, 16)
+
+
+@pytest.mark.benchmark(group="pattern-cache")
+def test_parse_with_custom_converter(benchmark):
+    """Benchmark: parse() with extra_types (served from the pattern cache)"""
+    result = benchmark(parse, "id={id:Hex} user={user}", "id=1234 user=alice", {"Hex": _hex_id})
+    assert result.named["id"] == 0x1234
+
+
 @pytest.mark.benchmark
 def test_compile_pattern(benchmark):
     """Benchmark: Pattern compilation"""
@@ -167,3 +382,192 @@ def test_float_type_conversion(benchmark):
     assert result.named["value"] == 3.14159
     assert isinstance(result.named["value"], float)
 
+
+# Threaded scaling: the same total work on 1 and 4 threads. Matching runs with
+# the GIL released, so the 4-thread run should take a fraction of the 1-thread time.
+THREADED_PATTERN = "Start: {data} End {value:d}"
+THREADED_TEXT = "Start: " + "x" * 200000 + " End 42"
+THREADED_CALLS = 32
+
+
+def _parse_threaded(num_threads):
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        return list(
+            pool.map(
+                lambda _: parse(THREADED_PATTERN, THREADED_TEXT), range(THREADED_CALLS)
+            )
+        )
+
+
+@pytest.mark.benchmark(group="threaded-parse")
+def test_threaded_parse_long_input_1_thread(benchmark):
+    """Benchmark: Parsing long inputs from a single thread (scaling baseline)"""
+    results = benchmark(_parse_threaded, 1)
+    assert len(results) == THREADED_CALLS
+    assert all(r.named["value"] == 42 for r in results)
+
+
+@pytest.mark.benchmark(group="threaded-parse")
+def test_threaded_parse_long_input_4_threads(benchmark):
+    """Benchmark: Parsing long inputs from 4 threads (GIL released while matching)"""
+    results = benchmark(_parse_threaded, 4)
+    assert len(results) == THREADED_CALLS
+    assert all(r.named["value"] == 42 for r in results)
+
+
+# Pattern cache contention: many threads calling parse() with a handful of patterns.
+# Repeated patterns are served from each thread's front cache without taking the
+# shared cache lock.
+CONTENTION_PATTERNS = [f"svc{i} status={{status:d}} took={{took:f}}ms" for i in range(8)]
+CONTENTION_CALLS = 20000
+
+
+def _parse_contended(num_threads):
+    def work(offset):
+        total = 0
+        for i in range(CONTENTION_CALLS // num_threads):
+            index = (i + offset) % len(CONTENTION_PATTERNS)
+            total += parse(CONTENTION_PATTERNS[index], f"svc{index} status=200 took=1.5ms")["status"]
+        return total
+
+    with ThreadPoolExecutor(max_workers=num_threads) as pool:
+        return sum(pool.map(work, range(num_threads)))
+
+
+@pytest.mark.benchmark(group="cache-contention")
+def test_parse_cache_contention_1_thread(benchmark):
+    """Benchmark: parse() cache lookups from a single thread (baseline)"""
+    total = benchmark(_parse_contended, 1)
+    assert total == 200 * CONTENTION_CALLS
+
+
+@pytest.mark.benchmark(group="cache-contention")
+def test_parse_cache_contention_32_threads(benchmark):
+    """Benchmark: parse() cache lookups from 32 threads at once"""
+    total = benchmark(_parse_contended, 32)
+    assert total == 200 * (CONTENTION_CALLS // 32) * 32
+
+
+# Access-log lines made of plain fields separated by literals: parse() splits them at
+# the literals instead of running the regex unless engine="regex" is forced.
+ACCESS_PATTERN = "{ip} - {user} [{ts}] {status:d} {size:d}"
+ACCESS_LINES = [
+    f"10.0.{i % 256}.{i % 100} - user{i % 50} [10/Oct/2000:13:55:{i % 60:02d} -0700] 200 {i}"
+    for i in range(10000)
+]
+
+
+@pytest.mark.benchmark(group="split-engine")
+@pytest.mark.parametrize("engine", ["split", "regex"])
+def test_parse_access_log_engine(benchmark, engine):
+    """Benchmark: parse() of access-log lines with the split engine and with the regex"""
+    parser = compile(ACCESS_PATTERN, engine=engine)
+
+    def run():
+        return sum(parser.parse(line)["size"] for line in ACCESS_LINES)
+
+    assert benchmark(run) == sum(range(10000))
+
+
+@pytest.mark.benchmark(group="split-engine")
+@pytest.mark.parametrize("engine", ["split", "regex"])
+def test_parse_many_access_log_engine(benchmark, engine):
+    """Benchmark: parse_many() of access-log lines with the split engine and with the regex"""
+    parser = compile(ACCESS_PATTERN, engine=engine)
+    results = benchmark(parser.parse_many, ACCESS_LINES)
+    assert len(results) == len(ACCESS_LINES)
+
+
+# One long message holding many records: a scanner keeps the string and cursor on the
+# Rust side, while search(pos=...) has to take the string from Python on every call.
+RECORD_MESSAGE = "".join(f"val={i};" for i in range(5000))
+
+
+@pytest.mark.benchmark(group="scanner")
+def test_search_pos_loop(benchmark):
+    """Benchmark: walk the records of a message with repeated search(pos=...)"""
+    def run():
+        total, pos = 0, 0
+        while True:
+            result = search("val={v:d};", RECORD_MESSAGE, pos=pos)
+            if result is None:
+                return total
+            total += result["v"]
+            pos = result.spans["v"][1] + 1
+
+    assert benchmark(run) == sum(range(5000))
+
+
+@pytest.mark.benchmark(group="scanner")
+def test_scanner_search_loop(benchmark):
+    """Benchmark: walk the records of a message with a scanner"""
+    parser = compile("val={v:d};")
+
+    def run():
+        scanner = parser.scanner(RECORD_MESSAGE)
+        total = 0
+        while True:
+            result = scanner.search()
+            if result is None:
+                return total
+            total += result["v"]
+
+    assert benchmark(run) == sum(range(5000))
+
+
+# Log data as it arrives from a socket or mmap: findall() on the bytes searches them in
+# place, while the str route first decodes (copies and validates) the whole buffer.
+LOG_BYTES = "".join(
+    f"2024-01-01 12:00:{i % 60:02d} host{i % 8} ERROR code={i}\n" if i % 10 == 0
+    else f"2024-01-01 12:00:{i % 60:02d} host{i % 8} INFO request served\n"
+    for i in range(100000)
+).encode()
+
+
+@pytest.mark.benchmark(group="bytes-input")
+def test_findall_bytes_input(benchmark):
+    """Benchmark: findall() over a bytes buffer"""
+    results = benchmark(findall, "ERROR code={code:d}\n", LOG_BYTES)
+    assert len(results) == 10000
+
+
+@pytest.mark.benchmark(group="bytes-input")
+def test_findall_decoded_input(benchmark):
+    """Benchmark: decode the buffer, then findall() over the str"""
+    results = benchmark(lambda: findall("ERROR code={code:d}\n", LOG_BYTES.decode()))
+    assert len(results) == 10000
+
+
+# One sample per datetime type; each value is converted to a datetime/date/time object
+DATETIME_SAMPLES = {
+    "ti": "2011-11-21T10:21:36.123456+10:00",
+    "te": "Mon, 21 Nov 2011 10:21:36 +1000",
+    "tg": "21/11/2011 10:21:36 PM +10:00",
+    "ta": "11/21/2011 10:21:36 PM +10:00",
+    "tc": "Mon Nov 21 10:21:36 2011",
+    "th": "21/Nov/2011:10:21:36 +1000",
+    "ts": "Nov 21 10:21:36",
+    "tt": "10:21:36 PM +10:00",
+    "%Y-%m-%d %H:%M:%S": "2011-11-21 10:21:36",
+    "%d/%b/%Y:%H:%M:%S.%f %z": "21/Nov/2011:10:21:36.123456 +1000",
+}
+
+
+@pytest.mark.benchmark(group="datetime-types")
+@pytest.mark.parametrize("spec", list(DATETIME_SAMPLES))
+def test_parse_many_datetime_type(benchmark, spec):
+    """Benchmark: parse_many() of lines holding one datetime field of each type"""
+    parser = compile(f"at {{when:{spec}}} done")
+    lines = [f"at {DATETIME_SAMPLES[spec]} done"] * 10000
+    results = benchmark(parser.parse_many, lines)
+    assert all(result is not None for result in results)
+
+
+@pytest.mark.benchmark(group="datetime-output")
+@pytest.mark.parametrize("output", ["datetime", "epoch_s", "epoch_ns", "iso"])
+def test_parse_many_datetime_output(benchmark, output):
+    """Benchmark: parse_many() of HTTP log timestamps in each datetime_output mode"""
+    parser = compile("[{ts:th}] {status:d}", datetime_output=output)
+    lines = [f"[{DATETIME_SAMPLES['th']}] 200"] * 10000
+    results = benchmark(parser.parse_many, lines)
+    assert all(result is not None for result in results)
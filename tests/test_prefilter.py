@@ -0,0 +1,49 @@
+"""Tests for the required-literal prefilter (results must be the same as without it)"""
+
+from formatparse import compile, findall, finditer, parse, parse_many, search
+
+
+def test_search_without_literal():
+    """Test inputs lacking the pattern's literal text don't match"""
+    assert search("ERROR {code:d}: {msg}", "INFO 200: ok") is None
+    assert search("ERROR {code:d}: {msg}", "ERROR 500 no colon") is None
+    result = search("ERROR {code:d}: {msg}", "x ERROR 500: disk full")
+    assert result["code"] == 500
+
+
+def test_case_insensitive_literals():
+    """Test literals are found in any case when matching case-insensitively"""
+    assert parse("Error {code:d}", "ERROR 5")["code"] == 5
+    assert parse("Error {code:d}", "ERROR 5", case_sensitive=True) is None
+    assert len(findall("error={code:d};", "ERROR=1;Error=2;warn=3;")) == 2
+
+
+def test_case_insensitive_kelvin_sign():
+    """Test literals with k/s still match their non-ASCII case variants"""
+    # U+212A KELVIN SIGN is the same letter as k under Unicode case folding
+    assert parse("{n:d}kb", "5KB") is not None
+
+
+def test_escaped_braces_and_trailing_whitespace():
+    """Test escaped braces are literal text and trailing whitespace is flexible"""
+    assert parse("{{{name}}}", "{abc}")["name"] == "abc"
+    assert parse("{{{name}}}", "abc") is None
+    assert parse("level: {lvl}", "level:\t\tINFO")["lvl"] == "INFO"
+
+
+def test_parse_many_and_finditer_sparse():
+    """Test batch APIs skip lines without the literal and keep the matching ones"""
+    lines = [f"INFO request {i}" if i % 10 else f"ERROR {i}: boom" for i in range(50)]
+    results = parse_many("ERROR {code:d}: {msg}", lines)
+    assert [r["code"] for r in results if r is not None] == list(range(0, 50, 10))
+    text = "\n".join(lines)
+    assert [r["code"] for r in finditer("ERROR {code:d}: {msg:w}", text)] == list(range(0, 50, 10))
+    assert list(finditer("FATAL {code:d}", text)) == []
+
+
+def test_compiled_parser_prefilter():
+    """Test compiled parsers give the same answers with and without the literal"""
+    parser = compile("[{level}] {msg}")
+    assert parser.parse("INFO started") is None
+    assert parser.parse("[INFO] started").named == {"level": "INFO", "msg": "started"}
+    assert parser.search("no brackets here") is None
@@ -1,5 +1,7 @@
 """Comprehensive tests for the Results class (lazy evaluation for findall)"""
 
+from array import array
+
 import pytest
 from formatparse import findall
 
@@ -266,3 +268,39 @@ def test_results_evaluate_result_false():
     # Verify content - collect all matches
     content = "".join(m.evaluate_result().fixed[0] for m in results)
     assert content == "abc"
+
+
+def test_to_columns_typed_arrays():
+    """Test to_columns returns array.array for int, float and bool fields"""
+    results = findall("<{name} {age:d} {score:f}>", "<a 1 1.5> <b 2 2.5>")
+    columns = results.to_columns()
+    assert list(columns) == ["name", "age", "score"]
+    assert columns["name"] == ["a", "b"]
+    assert isinstance(columns["age"], array)
+    assert columns["age"].typecode == "q"
+    assert list(columns["age"]) == [1, 2]
+    assert columns["score"].typecode == "d"
+    assert list(columns["score"]) == [1.5, 2.5]
+
+
+def test_to_columns_positional_fields():
+    """Test positional fields are keyed by index"""
+    columns = findall("({}={:d})", "(a=1) (b=2)").to_columns()
+    assert columns[0] == ["a", "b"]
+    assert list(columns[1]) == [1, 2]
+
+
+def test_to_columns_empty():
+    """Test to_columns with no matches still has a column per field"""
+    columns = findall("ID:{id:d} {name}", "nothing").to_columns()
+    assert columns == {"id": [], "name": []}
+
+
+def test_to_columns_matches_results():
+    """Test columns hold the same values as the ParseResult objects"""
+    text = " ".join(f"[{i}:{i * 0.5}:w{i}]" for i in range(50))
+    results = findall("[{a:d}:{b:f}:{c}]", text)
+    columns = results.to_columns()
+    assert list(columns["a"]) == [r.named["a"] for r in results]
+    assert list(columns["b"]) == [r.named["b"] for r in results]
+    assert columns["c"] == [r.named["c"] for r in results]
@@ -0,0 +1,81 @@
+"""Tests for FormatParser.scanner() (cursor-based search/match/skip over one string)"""
+
+import pytest
+from formatparse import Scanner, compile, search
+
+MESSAGE = "HDR len=3;val=a;val=bb;val=ccc;END"
+
+
+def test_search_advances_cursor():
+    """Test search() finds successive matches and moves the cursor past each one"""
+    scanner = compile("val={v:w};").scanner(MESSAGE)
+    assert isinstance(scanner, Scanner)
+    assert [scanner.search()["v"] for _ in range(3)] == ["a", "bb", "ccc"]
+    assert scanner.pos == MESSAGE.index("END")
+    assert scanner.search() is None
+    assert scanner.pos == MESSAGE.index("END")
+
+
+def test_search_spans_are_absolute():
+    """Test spans are positions in the whole string, as with search(pos=...)"""
+    scanner = compile("val={v:w};").scanner(MESSAGE, pos=10)
+    result = scanner.search()
+    expected = search("val={v:w};", MESSAGE, pos=10)
+    assert result.spans == expected.spans
+    assert result.spans["v"] == (20, 22)
+
+
+def test_match_is_anchored_at_cursor():
+    """Test match() only matches at the cursor"""
+    parser = compile("val={v:w};")
+    scanner = parser.scanner(MESSAGE)
+    assert scanner.match() is None
+    assert scanner.pos == 0
+    scanner.pos = MESSAGE.index("val")
+    assert scanner.match()["v"] == "a"
+    assert scanner.match()["v"] == "bb"
+    assert scanner.match().spans["v"] == (27, 30)
+    assert scanner.match() is None
+
+
+def test_skip():
+    """Test skip() steps over a match at the cursor without converting it"""
+    header = compile("HDR len={n:d};").scanner(MESSAGE)
+    assert header.skip()
+    assert header.pos == MESSAGE.index("val")
+    assert not header.skip()
+    assert header.pos == MESSAGE.index("val")
+
+
+def test_mixed_parsers_protocol_loop():
+    """Test a typical loop: read a header, then records until the trailer"""
+    header, record, trailer = compile("HDR len={n:d};"), compile("val={v:w};"), compile("END")
+    scanner = header.scanner(MESSAGE)
+    count = scanner.match()["n"]
+    records = record.scanner(MESSAGE, pos=scanner.pos)
+    values = [records.match()["v"] for _ in range(count)]
+    assert values == ["a", "bb", "ccc"]
+    end = trailer.scanner(MESSAGE, pos=records.pos)
+    assert end.skip() and end.eos
+
+
+def test_case_sensitivity_and_evaluate_result():
+    """Test scanner options behave like FormatParser.search"""
+    parser = compile("VAL={v:w};")
+    assert parser.scanner(MESSAGE).search() is None
+    assert parser.scanner(MESSAGE, case_sensitive=False).search()["v"] == "a"
+    raw = compile("len={n:d};").scanner(MESSAGE, evaluate_result=False).search()
+    assert raw.evaluate_result().named == {"n": 3}
+
+
+def test_pos_validation():
+    """Test the cursor can only be set to character boundaries of the string"""
+    scanner = compile("{x}").scanner("héllo")
+    with pytest.raises(ValueError):
+        scanner.pos = 2
+    with pytest.raises(ValueError):
+        scanner.pos = 100
+    scanner.pos = 3
+    assert scanner.string == "héllo"
+    with pytest.raises(ValueError):
+        compile("{x}").scanner("abc", pos=4)
@@ -0,0 +1,124 @@
+"""Tests for the delimiter-split matching engine (results must be the same as the regex's)"""
+
+import pickle
+
+import pytest
+from formatparse import compile, parse_many
+
+ACCESS_PATTERN = "{ip} - {user} [{ts}] {status:d} {size:d}"
+ACCESS_LINES = [
+    '10.0.0.1 - bob [10/Oct/2000:13:55:36 -0700] 200 2326',
+    '10.0.0.2 - - [10/Oct/2000:13:55:37 -0700] 404 0',
+    '10.0.0.3 - a - b [x] [y] 500 12',
+    '10.0.0.4 - bob [10/Oct/2000:13:55:38 -0700] 200 -',
+    '10.0.0.5 bob [ts] 200 1',
+    '10.0.0.6 -  bob [ts]   301   7  ',
+    '',
+]
+
+
+def assert_same_results(pattern, strings, case_sensitive=False):
+    """Parse every string with both engines and compare the results"""
+    split = compile(pattern, engine="split")
+    regex = compile(pattern, engine="regex")
+    for string in strings:
+        expected = regex.parse(string, case_sensitive=case_sensitive)
+        result = split.parse(string, case_sensitive=case_sensitive)
+        if expected is None:
+            assert result is None, string
+        else:
+            assert result.fixed == expected.fixed, string
+            assert result.named == expected.named, string
+            assert result.spans == expected.spans, string
+
+
+def test_engine_selection():
+    """Test which patterns get the split engine"""
+    assert compile(ACCESS_PATTERN).engine == "split"
+    assert compile("{code:d}: {msg}").engine == "split"
+    assert compile(ACCESS_PATTERN, engine="regex").engine == "regex"
+    # Adjacent fields, widths and datetime types need the regex
+    assert compile("{a}{b}").engine == "regex"
+    assert compile("{name:>10} {x}").engine == "regex"
+    assert compile("{when:ti} {msg}").engine == "regex"
+
+
+def test_forcing_split_on_unsupported_pattern():
+    """Test engine="split" is rejected for patterns it can't match"""
+    with pytest.raises(ValueError, match="split engine"):
+        compile("{a}{b}", engine="split")
+    with pytest.raises(ValueError, match="engine"):
+        compile("{a}", engine="fast")
+
+
+def test_access_log_lines():
+    """Test log lines give the same results with both engines"""
+    assert_same_results(ACCESS_PATTERN, ACCESS_LINES)
+    result = compile(ACCESS_PATTERN).parse(ACCESS_LINES[0])
+    assert result.named == {
+        "ip": "10.0.0.1", "user": "bob", "ts": "10/Oct/2000:13:55:36 -0700",
+        "status": 200, "size": 2326,
+    }
+
+
+def test_no_fields_and_single_trailing_field():
+    """Test patterns without fields and with one field at the end"""
+    assert_same_results("hello world", ["hello world", "hello world  ", "hello  world", "HELLO WORLD", ""])
+    assert_same_results("hello world ", ["hello world", "hello world \n", "hello worlds"])
+    assert_same_results("name: {}", ["name: Ada Lovelace", "name:   x", "name:   ", "name: ", "nom: x"])
+    assert_same_results("{} items", ["3 items", "three  items  ", " items", "items"])
+
+
+def test_lazy_fields_take_first_delimiter():
+    """Test a plain field ends at the first occurrence of the following literal"""
+    assert_same_results("{a}:{b}", ["x:y:z", ":y", "x:", "x::"])
+    assert_same_results("{a}, {b}, {c}", ["1, 2, 3, 4", "1,2, 3, 4", "a, , b, c", "a,  b, c"])
+    assert compile("{a}:{b}").parse("x:y:z").fixed == ("x", "y:z")
+
+
+def test_typed_fields():
+    """Test typed fields end where the next literal starts"""
+    assert_same_results("{code:d}: {msg}", ["404: not found", "0x1A: hex", "4x4: no", "-7:  x"])
+    assert_same_results("{x:f},{y:f}", ["1.5,2.5", "1,2.5", ".5,-3.", "1.5,2.5,3.5"])
+    assert_same_results("{w:w}/{l:l} {s:S}", ["abc_1/xyz q", "a/b1 q", "a/b  q", "a/b"])
+    assert_same_results("svc{n:d} took={t:f}ms", ["svc1 took=1.5ms", "svc1 took=1.5 ms", "svc1 took=15ms"])
+
+
+def test_case_insensitive():
+    """Test case-insensitive matching gives the same results with both engines"""
+    strings = ["ERROR 5: disk full", "error 5: disk full", "Warn 5: x", "K"]
+    assert_same_results("Error {code:d}: {msg}", strings)
+    assert_same_results("Error {code:d}: {msg}", strings, case_sensitive=True)
+    # k and s also match non-ASCII letters, so these literals are left to the regex
+    assert_same_results("{n:d} kb", ["5 KB", "5 KB"])
+    # A letter ending a typed field matches in either case
+    assert compile("{n:d}pm").parse("5PM")["n"] == 5
+    assert_same_results("{n:d}pm", ["5pm", "5PM", "5Pm", "5 PM", "PM"])
+    assert_same_results("{n:d}pm", ["5pm", "5PM"], case_sensitive=True)
+    assert_same_results("{v:f}x", ["1.5x", "1.5X", "1.5xX", "x"])
+
+
+def test_unicode_input():
+    """Test multi-byte characters in fields and literals"""
+    assert_same_results("{a} → {b}", ["été → hiver", "→ → x", "a →"])
+    assert_same_results("{a}|{b}", ["日本|語", "|x"])
+
+
+def test_non_ascii_delimiters():
+    """Test non-ASCII literals after typed fields (\\d and \\w match non-ASCII digits and letters)"""
+    # The float regex's \d matches ٣ (ARABIC-INDIC DIGIT THREE), so the field can't end at it
+    assert compile("{x:f}٣").engine == "regex"
+    assert compile("{x:f}é").engine == "regex"
+    assert_same_results("{n:d}٣{w:w}", ["12٣ab", "12٣٣", "٣٣", "12٣"])
+    assert_same_results("{a}→{n:d}", ["été→5", "a→→5", "→5"])
+    assert_same_results("{x:f} → {s:S}", ["1.5 → é", "1.5 →  x", "1.5→x"])
+
+
+def test_parse_many_and_pickle():
+    """Test batch parsing and pickled parsers use the requested engine"""
+    parser = compile(ACCESS_PATTERN, engine="split")
+    results = parser.parse_many(ACCESS_LINES)
+    expected = compile(ACCESS_PATTERN, engine="regex").parse_many(ACCESS_LINES)
+    assert [r.named if r else None for r in results] == [r.named if r else None for r in expected]
+    assert len(parse_many(ACCESS_PATTERN, ACCESS_LINES)) == len(expected)
+    assert pickle.loads(pickle.dumps(compile(ACCESS_PATTERN, engine="regex"))).engine == "regex"
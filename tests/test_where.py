@@ -0,0 +1,127 @@
+"""Tests for where= filters on findall, finditer, parse_many and parse_file"""
+
+import pytest
+from formatparse import compile, findall, finditer, parse_file, parse_many, with_pattern
+
+
+LOG = "\n".join([
+    "GET /api/users 200",
+    "POST /api/orders 503",
+    "GET /index.html 404",
+    "DELETE /api/users 500",
+])
+LOG_PATTERN = "{method:w} {path:S} {status:d}"
+
+
+def statuses(results):
+    return [r["status"] for r in results]
+
+
+def test_findall_comparison():
+    """Test numeric comparisons against an int field"""
+    assert statuses(findall(LOG_PATTERN, LOG, where=[("status", ">=", 500)])) == [503, 500]
+    assert statuses(findall(LOG_PATTERN, LOG, where=[("status", "<", 300)])) == [200]
+    assert statuses(findall(LOG_PATTERN, LOG, where=[("status", "!=", 404)])) == [200, 503, 500]
+
+
+def test_findall_conditions_are_combined():
+    """Test every condition has to hold"""
+    results = findall(LOG_PATTERN, LOG, where=[("status", ">=", 500), ("method", "==", "POST")])
+    assert [r["path"] for r in results] == ["/api/orders"]
+
+
+def test_findall_in_prefix_regex():
+    """Test set membership, prefix and regex conditions"""
+    assert statuses(findall(LOG_PATTERN, LOG, where=[("method", "in", {"POST", "DELETE"})])) == [503, 500]
+    assert statuses(findall(LOG_PATTERN, LOG, where=[("path", "prefix", "/api")])) == [200, 503, 500]
+    assert statuses(findall(LOG_PATTERN, LOG, where=[("path", "regex", r"\.html$")])) == [404]
+
+
+def test_findall_float_compared_with_int():
+    """Test float fields compare with int values"""
+    results = findall("t={t:f};", "t=0.5;t=1.5;t=2.0;", where=[("t", ">", 1)])
+    assert [r["t"] for r in results] == [1.5, 2.0]
+
+
+def test_mismatched_types_never_match():
+    """Test comparing a string field with a number rejects the match"""
+    assert len(findall(LOG_PATTERN, LOG, where=[("method", ">", 1)])) == 0
+
+
+def test_findall_columns_with_where():
+    """Test columnar output only contains the kept matches"""
+    output = findall(LOG_PATTERN, LOG, columns=True, where=[("status", ">=", 500)])
+    assert list(output["status"]) == [503, 500]
+    assert output["method"] == ["POST", "DELETE"]
+
+
+def test_finditer_with_where():
+    """Test finditer skips rejected matches"""
+    it = finditer(LOG_PATTERN, LOG, where=[("status", ">=", 500)])
+    assert statuses(it) == [503, 500]
+
+
+def test_parse_many_rejected_strings_are_none():
+    """Test parse_many keeps input order with None for rejected strings"""
+    results = parse_many(LOG_PATTERN, LOG.splitlines(), where=[("method", "==", "GET")])
+    assert [r is not None for r in results] == [True, False, True, False]
+
+
+def test_parse_file_with_where(tmp_path):
+    """Test parse_file only yields kept lines"""
+    path = tmp_path / "access.log"
+    path.write_text(LOG + "\n")
+    batches = list(parse_file(LOG_PATTERN, path, where=[("status", ">=", 500)]))
+    assert [statuses(batch) for batch in batches] == [[503, 500]]
+
+
+def test_compiled_parser_with_where():
+    """Test the FormatParser batch methods accept where"""
+    parser = compile(LOG_PATTERN)
+    results = parser.parse_many(LOG.splitlines(), where=[("status", "==", 404)])
+    assert [r is not None for r in results] == [False, False, True, False]
+    assert statuses(parser.finditer(LOG, where=[("status", "==", 404)])) == [404]
+
+
+def test_where_on_python_conversion_path():
+    """Test conditions also apply when values are converted in Python"""
+
+    @with_pattern(r"\d+")
+    def number(text):
+        return int(text)
+
+    results = findall(
+        "{n:Number},",
+        "1,20,300,",
+        extra_types={"Number": number},
+        where=[("n", ">", 10)],
+    )
+    assert [r["n"] for r in results] == [20, 300]
+
+
+def test_where_unknown_field():
+    """Test an unknown field name raises ValueError"""
+    with pytest.raises(ValueError, match="'missing'"):
+        findall(LOG_PATTERN, LOG, where=[("missing", "==", 1)])
+
+
+def test_where_unknown_operator():
+    """Test an unknown operator raises ValueError"""
+    with pytest.raises(ValueError, match="operator"):
+        findall(LOG_PATTERN, LOG, where=[("status", "~", 1)])
+
+
+def test_where_invalid_values():
+    """Test malformed conditions raise TypeError"""
+    with pytest.raises(TypeError):
+        findall(LOG_PATTERN, LOG, where=[("status", ">=")])
+    with pytest.raises(TypeError):
+        findall(LOG_PATTERN, LOG, where=[("status", ">=", [500])])
+    with pytest.raises(TypeError):
+        findall(LOG_PATTERN, LOG, where=[("method", "in", "GET")])
+
+
+def test_where_requires_evaluate_result():
+    """Test where can't be combined with evaluate_result=False"""
+    with pytest.raises(ValueError, match="evaluate_result"):
+        findall(LOG_PATTERN, LOG, evaluate_result=False, where=[("status", ">=", 500)])